@@ -0,0 +1,79 @@
+"""Benchmark ADV: ``Decimal`` :class:`Bar` tuples vs :class:`BarSeries` arrays.
+
+Usage::
+
+    uv run python scripts/bench_bars.py [--symbols 5000] [--days 20] [--repeat 5]
+
+Builds ``--symbols`` synthetic daily-bar series of ``--days`` sessions and
+computes 20-day ADV for each two ways: the previous path (materialise
+``Decimal`` bars, sum ``close * volume`` in Python) and
+:meth:`BarSeries.adv_usd`. Reports the best wall time per symbol and checks
+that both agree to the cent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from decimal import Decimal
+
+import numpy as np
+
+from stockripper.data.bar_store import RECORD_DTYPE, BarSeries
+
+
+def _series(n_symbols: int, days: int) -> list[BarSeries]:
+    rng = np.random.default_rng(7)
+    out = []
+    for i in range(n_symbols):
+        records = np.zeros(days, dtype=RECORD_DTYPE)
+        records["day"] = np.arange(20_000, 20_000 + days)
+        records["ts"] = records["day"] * 86_400
+        close = np.round(rng.uniform(1.0, 500.0, days), 2)
+        for field in ("open", "high", "low", "close"):
+            records[field] = close
+        records["volume"] = rng.integers(1_000, 10_000_000, days)
+        out.append(BarSeries(symbol=f"S{i:05d}", records=records))
+    return out
+
+
+def _decimal_adv(series: BarSeries) -> Decimal:
+    bars = series.to_bars()
+    total = sum((b.dollar_volume for b in bars), start=Decimal("0"))
+    return (total / Decimal(len(bars))).quantize(Decimal("0.01"))
+
+
+def _array_adv(series: BarSeries) -> Decimal:
+    return Decimal(repr(series.adv_usd())).quantize(Decimal("0.01"))
+
+
+def _best(fn: Callable[[], list[Decimal]], repeat: int) -> tuple[float, list[Decimal]]:
+    best, result = float("inf"), []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    universe = _series(args.symbols, args.days)
+    print(f"{'mode':>8} {'total ms':>9} {'us/symbol':>10}")
+    results = {}
+    for mode, adv in (("decimal", _decimal_adv), ("arrays", _array_adv)):
+        best, results[mode] = _best(lambda adv=adv: [adv(s) for s in universe], args.repeat)
+        print(f"{mode:>8} {best * 1e3:>9.2f} {best * 1e6 / args.symbols:>10.2f}")
+    off = max(abs(a - b) for a, b in zip(results["decimal"], results["arrays"], strict=True))
+    if off > Decimal("0.01"):
+        raise SystemExit(f"ADV paths disagree by up to {off}")
+
+
+if __name__ == "__main__":
+    main()
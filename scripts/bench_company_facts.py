@@ -0,0 +1,132 @@
+"""Benchmark the full vs selective company-facts parse.
+
+Usage::
+
+    uv run python scripts/bench_company_facts.py [--file CIK0000320193.json]
+        [--tags 2000] [--points 40] [--repeat 3]
+
+Without ``--file`` a synthetic document is generated: ``--tags`` us-gaap
+tags of ``--points`` observations each, plus the handful of tags
+:func:`derive_fundamentals` reads. Each mode runs in a fresh spawned
+process and reports wall time, the tracemalloc peak, and how far the
+process's peak RSS rose above its level after reading the file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from stockripper.data.facts_stream import select_company_facts
+from stockripper.data.fundamentals import FUNDAMENTAL_FACTS, derive_fundamentals
+from stockripper.data.provenance import Provenance
+from stockripper.data.sec_edgar import CompanyFacts
+
+
+def _synthetic(tags: int, points: int) -> dict[str, Any]:
+    def series(base: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "start": f"{2000 + i // 4}-01-01",
+                "end": f"{2000 + i // 4}-12-31",
+                "val": base + i,
+                "accn": f"0000320193-{i:02d}-000001",
+                "fy": 2000 + i // 4,
+                "fp": "FY" if i % 4 == 3 else f"Q{i % 4 + 1}",
+                "form": "10-K" if i % 4 == 3 else "10-Q",
+                "filed": f"{2001 + i // 4}-02-01",
+            }
+            for i in range(points)
+        ]
+
+    us_gaap: dict[str, Any] = {
+        f"SyntheticTag{i:05d}": {
+            "label": f"Synthetic tag {i}",
+            "description": "Filler series the fundamentals deriver never reads.",
+            "units": {"USD": series(i)},
+        }
+        for i in range(tags)
+    }
+    for tag in ("Revenues", "NetIncomeLoss", "LongTermDebt", "StockholdersEquity"):
+        us_gaap[tag] = {"label": tag, "units": {"USD": series(10**9)}}
+    return {
+        "cik": 320193,
+        "entityName": "Synthetic Corp",
+        "facts": {
+            "dei": {
+                "EntityCommonStockSharesOutstanding": {"units": {"shares": series(10**9)}},
+            },
+            "us-gaap": us_gaap,
+        },
+    }
+
+
+def _derive(payload: dict[str, Any]) -> None:
+    facts = CompanyFacts(
+        cik="0000320193",
+        entity_name=payload.get("entityName"),
+        facts=payload.get("facts", {}),
+        provenance=Provenance.for_payload(provider="bench", source_url="bench", payload=b""),
+    )
+    derive_fundamentals(facts, latest_price=Decimal("100"))
+
+
+def _run(args: tuple[str, str, int]) -> tuple[float, int, int]:
+    """``(best seconds, tracemalloc peak bytes, RSS rise KiB)`` for one mode."""
+
+    mode, path, repeat = args
+    raw = Path(path).read_bytes()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if mode == "full":
+            _derive(json.loads(raw))
+        else:
+            _derive(select_company_facts(raw, FUNDAMENTAL_FACTS))
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    if mode == "full":
+        _derive(json.loads(raw))
+    else:
+        _derive(select_company_facts(raw, FUNDAMENTAL_FACTS))
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return best, peak, rss_after - rss_before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", type=Path, default=None)
+    parser.add_argument("--tags", type=int, default=2000)
+    parser.add_argument("--points", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = Path(tmp) / "companyfacts.json"
+            path.write_text(json.dumps(_synthetic(args.tags, args.points)))
+        size_mib = path.stat().st_size / (1024 * 1024)
+        print(f"document: {path.name} ({size_mib:.1f} MiB)", file=sys.stderr)
+        ctx = multiprocessing.get_context("spawn")
+        print(f"{'mode':>9} {'best s':>8} {'py peak MiB':>12} {'RSS rise MiB':>13}")
+        for mode in ("full", "selective"):
+            with ctx.Pool(1) as pool:
+                best, peak, rss_kib = pool.apply(_run, ((mode, str(path), args.repeat),))
+            print(f"{mode:>9} {best:>8.3f} {peak / 2**20:>12.1f} {rss_kib / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark provenance hashing: one-shot ``json.dumps`` vs :func:`canonical_hash`.
+
+Usage::
+
+    uv run python scripts/bench_provenance.py [--tags 2000] [--points 40]
+        [--bars 5000] [--repeat 5]
+
+Payloads are a synthetic EDGAR company-facts document (``--tags`` us-gaap
+tags of ``--points`` observations) and a list of ``--bars`` bar dicts, the
+shapes the adapters hash. Each is timed three ways: the previous one-shot
+encoding, the streamed :func:`canonical_hash`, and a repeat hash of the
+same object inside :func:`memoized_hashes`. The tracemalloc peak of one
+run is reported next to the best wall time. All three digests are checked
+to be equal.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from stockripper.data.provenance import canonical_hash, memoized_hashes
+
+
+def _one_shot(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _facts(tags: int, points: int) -> dict[str, Any]:
+    series = [
+        {
+            "end": f"{2000 + i // 4}-12-31",
+            "val": i * 1000,
+            "accn": f"0000320193-{i:02d}-000001",
+            "fy": 2000 + i // 4,
+            "fp": f"Q{i % 4 + 1}",
+            "form": "10-Q",
+            "filed": f"{2001 + i // 4}-02-01",
+        }
+        for i in range(points)
+    ]
+    return {
+        "cik": 320193,
+        "entityName": "Synthetic Corp",
+        "facts": {
+            "us-gaap": {
+                f"SyntheticTag{i:05d}": {"label": f"Tag {i}", "units": {"USD": list(series)}}
+                for i in range(tags)
+            },
+        },
+    }
+
+
+def _bars(n: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "symbol": "AAPL",
+            "timestamp": f"2026-01-01T00:00:{i % 60:02d}Z",
+            "open": 100.0 + i,
+            "high": 101.0 + i,
+            "low": 99.0 + i,
+            "close": 100.5 + i,
+            "volume": 1_000_000 + i,
+            "trade_count": 1000,
+            "vwap": 100.25 + i,
+        }
+        for i in range(n)
+    ]
+
+
+def _time(fn: Callable[[], str], repeat: int) -> tuple[float, int, str]:
+    best = float("inf")
+    digest = ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        digest = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, digest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tags", type=int, default=2000)
+    parser.add_argument("--points", type=int, default=40)
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {
+        "facts": _facts(args.tags, args.points),
+        "bars": _bars(args.bars),
+    }
+    print(f"{'payload':>8} {'mode':>10} {'best ms':>9} {'peak MiB':>9}")
+    for name, payload in payloads.items():
+        with memoized_hashes():
+            canonical_hash(payload)
+            modes: dict[str, Callable[[], str]] = {
+                "one-shot": lambda p=payload: _one_shot(p),
+                "streamed": lambda p=payload: canonical_hash(p[:] if isinstance(p, list) else dict(p)),
+                "memo hit": lambda p=payload: canonical_hash(p),
+            }
+            digests = set()
+            for mode, fn in modes.items():
+                best, peak, digest = _time(fn, args.repeat)
+                digests.add(digest)
+                print(f"{name:>8} {mode:>10} {best * 1e3:>9.2f} {peak / 2**20:>9.2f}")
+        if len(digests) != 1:
+            raise SystemExit(f"{name}: digests differ: {sorted(digests)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark the per-asset vs columnar universe engines.
+
+Usage::
+
+    uv run python scripts/bench_universe.py [--sizes 10000 25000 50000 100000]
+
+Builds a deterministic synthetic corpus per size, then times
+``UniverseBuilder.build_many`` over every default track policy with each
+engine. Snapshot loading is an in-memory dict lookup, so the numbers are
+pure evaluation cost. The columnar column-build is included in its time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import time
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+
+from stockripper.data import (
+    DEFAULT_UNIVERSE_POLICIES,
+    AssetRecord,
+    AssetSnapshot,
+    UniverseBuilder,
+    UniverseBuildRequest,
+)
+
+_CAPS = (500e9, 50e9, 5e9, 800e6, 150e6, 25e6)
+
+
+class _Snapshots:
+    def __init__(self, snapshots: Mapping[str, AssetSnapshot]) -> None:
+        self._snapshots = snapshots
+
+    def get_snapshots(
+        self, symbols: Iterable[str], *, as_of: dt.date,
+    ) -> Mapping[str, AssetSnapshot]:
+        return self._snapshots
+
+
+def _corpus(n: int) -> tuple[tuple[AssetRecord, ...], dict[str, AssetSnapshot]]:
+    rng = random.Random(n)
+    assets: list[AssetRecord] = []
+    snaps: dict[str, AssetSnapshot] = {}
+    for i in range(n):
+        symbol = f"S{i:06d}"
+        assets.append(
+            AssetRecord(
+                symbol=symbol,
+                name=symbol,
+                exchange="NYSE",
+                tradable=True,
+                shortable=i % 3 == 0,
+                fractionable=True,
+                is_etf=i % 25 == 0,
+                is_leveraged_etf=i % 75 == 0,
+            )
+        )
+        cap = _CAPS[i % len(_CAPS)]
+        snaps[symbol] = AssetSnapshot(
+            symbol=symbol,
+            last_price=Decimal(f"{rng.uniform(0.5, 500.0):.2f}"),
+            adv_usd_20d=Decimal(f"{cap * rng.uniform(0.0005, 0.005):.2f}"),
+            market_cap_usd=Decimal(str(int(cap))),
+            recent_8k_within_days=5 if i % 11 == 0 else None,
+            recent_news_count_30d=rng.randint(0, 12),
+        )
+    return tuple(assets), snaps
+
+
+def _time(builder: UniverseBuilder, requests: tuple[UniverseBuildRequest, ...]) -> float:
+    start = time.perf_counter()
+    builder.build_many(requests)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 25_000, 50_000, 100_000])
+    parser.add_argument("--limit", type=int, default=200)
+    args = parser.parse_args()
+
+    requests = tuple(
+        UniverseBuildRequest(
+            track_id=t, as_of=dt.date(2026, 5, 27), window_id="bench", limit=args.limit,
+        )
+        for t in DEFAULT_UNIVERSE_POLICIES
+    )
+    print(f"{'assets':>8} {'per-asset s':>12} {'columnar s':>11} {'speedup':>8}")
+    for n in args.sizes:
+        assets, snaps = _corpus(n)
+        provider = _Snapshots(snaps)
+        python = UniverseBuilder(assets_loader=lambda a=assets: a, snapshot_provider=provider)
+        columnar = UniverseBuilder(
+            assets_loader=lambda a=assets: a, snapshot_provider=provider, columnar=True,
+        )
+        t_py = _time(python, requests)
+        t_col = _time(columnar, requests)
+        print(f"{n:>8} {t_py:>12.3f} {t_col:>11.3f} {t_py / t_col:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,10 @@ import asyncio
 import contextlib
 import datetime as dt
 import sys
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Final
+from typing import TYPE_CHECKING, Any, Final, cast
 
 import typer
 from alembic import command as alembic_command
@@ -33,6 +34,10 @@ from stockripper.db import Base, build_engine, session_scope
 from stockripper.risk import DEFAULT_RISK_POLICIES
 from stockripper.tracks import DEFAULT_TRACKS, seed_default_tracks
 
+if TYPE_CHECKING:
+    from stockripper.data import UniverseBuilder, UniverseBuildRequest, UniverseBuildResult
+    from stockripper.data.blob_store import BlobStore
+
 app = typer.Typer(
     help="StockRipper — autonomous multi-agent paper-trading research laboratory.",
     no_args_is_help=True,
@@ -45,6 +50,7 @@ agents_app = typer.Typer(help="Inspect the Phase-3 agent graph (council, judges,
 prompts_app = typer.Typer(help="Inspect the content-addressed prompt registry.")
 kill_app = typer.Typer(help="Global kill-switch (halt every track immediately).")
 track_app = typer.Typer(help="Per-track pause control.")
+cache_app = typer.Typer(help="Data-cache statistics, purging and warming.")
 app.add_typer(db_app, name="db")
 app.add_typer(tracks_app, name="tracks")
 app.add_typer(universe_app, name="universe")
@@ -53,6 +59,7 @@ app.add_typer(agents_app, name="agents")
 app.add_typer(prompts_app, name="prompts")
 app.add_typer(kill_app, name="kill")
 app.add_typer(track_app, name="track")
+app.add_typer(cache_app, name="cache")
 console = Console()
 
 
@@ -376,12 +383,15 @@ def universe_policies() -> None:
 def universe_build(
     track: str = typer.Option(..., "--track", "-t", help="Track id to build the universe for."),
     limit: int = typer.Option(50, "--limit", "-n", help="Max candidates to print."),
+    database_url: str | None = typer.Option(None, "--database-url"),
 ) -> None:
     """Build the candidate universe for ``track`` using live Alpaca data.
 
-    Liquidity/cap data come from Alpaca's snapshot endpoint; news count is
-    sourced from the Alpaca News API. SEC EDGAR is not hit unless the
-    track's policy enables the recent-catalyst requirement.
+    Liquidity data come from Alpaca's snapshot endpoint; market cap joins
+    price with point-in-time shares outstanding from the database (see
+    ``research load-fundamentals``); news count is sourced from the Alpaca
+    News API. SEC EDGAR is not hit unless the track's policy enables the
+    recent-catalyst requirement.
     """
 
     try:
@@ -395,16 +405,24 @@ def universe_build(
         sys.exit(1)
 
     from stockripper.data import UniverseBuilder, UniverseBuildRequest
+    from stockripper.data.blob_store import BlobStore
     from stockripper.data.live import (
         AlpacaAssetsLoader,
         AlpacaSnapshotProvider,
     )
+    from stockripper.data.pit_fundamentals import PitSharesSource
+    from stockripper.db import build_session_factory
 
     loader = AlpacaAssetsLoader(settings=settings)
-    snapshot_provider = AlpacaSnapshotProvider(settings=settings)
+    snapshot_provider = AlpacaSnapshotProvider(
+        settings=settings,
+        shares=PitSharesSource.from_cache(build_session_factory(build_engine(database_url))),
+        blobs=BlobStore(),
+    )
     builder = UniverseBuilder(
         assets_loader=loader,
         snapshot_provider=snapshot_provider,
+        columnar=True,
     )
     request = UniverseBuildRequest(
         track_id=track,
@@ -447,18 +465,20 @@ def universe_build(
 def research_fundamentals(symbol: str) -> None:
     """Print derived fundamentals (market cap, revenue, etc) for ``symbol``."""
 
-    from stockripper.data.fundamentals import derive_fundamentals
+    from stockripper.data.blob_store import BlobStore
+    from stockripper.data.fundamentals import FUNDAMENTAL_FACTS, derive_fundamentals
     from stockripper.data.market_data import MarketDataAdapter
     from stockripper.data.sec_edgar import SecEdgarClient
 
-    md = MarketDataAdapter()
+    blobs = BlobStore()
+    md = MarketDataAdapter(blobs=blobs)
     snap = md.get_snapshot(symbol)
-    with SecEdgarClient() as edgar:
+    with SecEdgarClient(blobs=blobs) as edgar:
         cik = edgar.lookup_cik(symbol)
         if cik is None:
             console.print(f"[bold red]No CIK for[/] {symbol}")
             sys.exit(1)
-        facts = edgar.get_company_facts(cik)
+        facts = edgar.get_company_facts(cik, select=FUNDAMENTAL_FACTS)
     fund = derive_fundamentals(facts, latest_price=snap.last_price)
 
     table = Table(title=f"Fundamentals for {symbol} ({fund.entity_name})")
@@ -498,9 +518,10 @@ def research_news(
 ) -> None:
     """Print recent headlines for ``symbol`` from the Alpaca News API."""
 
+    from stockripper.data.blob_store import BlobStore
     from stockripper.data.news import NewsAdapter
 
-    adapter = NewsAdapter()
+    adapter = NewsAdapter(blobs=BlobStore())
     since = dt.datetime.now(dt.UTC) - dt.timedelta(days=days)
     items = adapter.get_recent_news([symbol], since=since, limit=limit)
 
@@ -517,6 +538,209 @@ def research_news(
     console.print(table)
 
 
+_BULK_ARCHIVE_ARGUMENT = typer.Argument(
+    ..., exists=True, dir_okay=False, help="companyfacts.zip or submissions.zip.",
+)
+_BULK_MANIFEST_OPTION = typer.Option(
+    None, "--manifest", help="Provenance JSONL path (default: <archive>.manifest.jsonl).",
+)
+
+
+@research_app.command("import-edgar-bulk")
+def research_import_edgar_bulk(
+    archive: Path = _BULK_ARCHIVE_ARGUMENT,
+    kind: str | None = typer.Option(
+        None, "--kind", help="companyfacts | submissions (default: inferred from the archive).",
+    ),
+    cik: list[str] = typer.Option(  # noqa: B008 - typer pattern
+        [], "--cik", help="Only import these CIKs. May be passed multiple times.",
+    ),
+    ttl_hours: float = typer.Option(24.0, "--ttl-hours", help="Cache TTL for imported entries."),
+    manifest: Path | None = _BULK_MANIFEST_OPTION,
+) -> None:
+    """Stream a nightly SEC bulk archive into the EDGAR cache."""
+
+    from stockripper.data.edgar_bulk import import_edgar_bulk
+
+    if kind not in (None, "companyfacts", "submissions"):
+        console.print(f"[bold red]unknown --kind {kind!r}[/]")
+        raise typer.Exit(code=2)
+    try:
+        report = import_edgar_bulk(
+            archive,
+            kind=kind,  # type: ignore[arg-type]
+            ciks=cik or None,
+            ttl=dt.timedelta(hours=ttl_hours),
+        )
+    except ValueError as exc:
+        console.print(f"[bold red]import failed:[/] {exc}")
+        raise typer.Exit(code=1) from exc
+    manifest_path = manifest if manifest is not None else archive.with_name(
+        archive.name + ".manifest.jsonl",
+    )
+    with manifest_path.open("w", encoding="utf-8") as fh:
+        for prov in report.provenance:
+            fh.write(prov.model_dump_json() + "\n")
+    console.print(
+        f"[bold green]imported[/] {report.imported} {report.kind} documents "
+        f"(skipped {report.skipped}, failed {len(report.failed)}); manifest: {manifest_path}"
+    )
+    for member in report.failed[:10]:
+        console.print(f"[yellow]failed:[/] {member}")
+
+
+@research_app.command("load-fundamentals")
+def research_load_fundamentals(
+    cik: list[str] = typer.Option(  # noqa: B008 - typer pattern
+        [], "--cik", help="Only load these CIKs (default: every cached filer).",
+    ),
+    database_url: str | None = typer.Option(None, "--database-url"),
+) -> None:
+    """Fill the point-in-time fundamentals table from cached company facts."""
+
+    from stockripper.data.pit_fundamentals import load_pit_fundamentals
+    from stockripper.db import build_session_factory
+
+    factory = build_session_factory(build_engine(database_url))
+    with session_scope(factory) as session:
+        report = load_pit_fundamentals(session, ciks=cik or None)
+    console.print(
+        f"[bold green]loaded[/] {report.observations} facts for {report.filers} filers "
+        f"({len(report.missing)} without cached company facts)"
+    )
+    for missing in report.missing[:10]:
+        console.print(f"[yellow]not cached:[/] {missing}")
+
+
+# ---------------------------------------------------------------------------
+# cache
+# ---------------------------------------------------------------------------
+_CACHE_ROOT_OPTION = typer.Option(
+    Path(".data-cache"), "--root", help="Cache directory (holds cache.sqlite3).",
+)
+
+
+def _open_cache(root: Path) -> Any:
+    from stockripper.data.cache import SqliteCache, default_sqlite_path
+
+    return SqliteCache(default_sqlite_path(root))
+
+
+def _mib(n: int) -> str:
+    return f"{n / (1024 * 1024):,.1f}"
+
+
+@cache_app.command("stats")
+def cache_stats(root: Path = _CACHE_ROOT_OPTION) -> None:
+    """Per-namespace sizes, compression, hit ratios and an age histogram."""
+
+    from stockripper.data.cache_maintenance import AGE_BUCKETS, age_histogram
+
+    cache = _open_cache(root)
+    usage = cache.usage()
+    counters = cache.stats()
+    ages = age_histogram(cache.entries())
+    now = dt.datetime.now(dt.UTC)
+    expired: dict[str, int] = {}
+    for info in cache.entries():
+        if info.expires_at <= now:
+            expired[info.namespace] = expired.get(info.namespace, 0) + 1
+
+    table = Table(title=f"Data cache ({cache.path})")
+    table.add_column("namespace", style="bold cyan")
+    table.add_column("entries", justify="right")
+    table.add_column("expired", justify="right")
+    table.add_column("disk MiB", justify="right")
+    table.add_column("logical MiB", justify="right")
+    table.add_column("ratio", justify="right")
+    table.add_column("hits", justify="right")
+    table.add_column("misses", justify="right")
+    table.add_column("hit %", justify="right")
+    for label, _bound in AGE_BUCKETS:
+        table.add_column(label, justify="right")
+    for ns in sorted(set(usage) | set(counters)):
+        u = usage.get(ns)
+        c = counters.get(ns)
+        hist = ages.get(ns, {})
+        table.add_row(
+            ns,
+            str(u.entries if u else 0),
+            str(expired.get(ns, 0)),
+            _mib(u.disk_bytes) if u else "0.0",
+            _mib(u.logical_bytes) if u else "0.0",
+            f"{u.compression_ratio:.1f}x" if u else "—",
+            str(c.hits if c else 0),
+            str(c.misses if c else 0),
+            f"{c.hit_ratio:.0%}" if c and (c.hits or c.misses) else "—",
+            *(str(hist.get(label, 0)) for label, _bound in AGE_BUCKETS),
+        )
+    console.print(table)
+
+
+@cache_app.command("purge")
+def cache_purge(
+    root: Path = _CACHE_ROOT_OPTION,
+    namespace: str | None = typer.Option(
+        None, "--namespace", "-n", help="With --all, restrict to one namespace.",
+    ),
+    everything: bool = typer.Option(
+        False, "--all", help="Delete every entry (in --namespace, if given), not just stale ones.",
+    ),
+) -> None:
+    """Purge expired entries and evict LRU entries over each namespace's budget."""
+
+    from stockripper.data.cache_maintenance import sweep
+
+    cache = _open_cache(root)
+    if everything:
+        removed = 0
+        for info in list(cache.entries(namespace)):
+            cache.delete(info.namespace, info.key)
+            removed += 1
+        console.print(f"[bold green]removed[/] {removed} entries")
+        return
+    report = sweep(cache)
+    console.print(
+        f"[bold green]purged[/] {report.expired} expired, evicted {report.evicted} "
+        f"({_mib(report.evicted_bytes)} MiB) over budget"
+    )
+
+
+@cache_app.command("warm")
+def cache_warm(
+    symbols: list[str] = typer.Argument(..., help="Tickers to prefetch SEC data for."),  # noqa: B008
+    facts: bool = typer.Option(True, "--facts/--no-facts", help="Prefetch XBRL company facts."),
+    submissions: bool = typer.Option(
+        True, "--submissions/--no-submissions", help="Prefetch the filing index.",
+    ),
+    root: Path = _CACHE_ROOT_OPTION,
+) -> None:
+    """Prefetch the SEC ticker map, filings and company facts into the cache."""
+
+    from stockripper.data.blob_store import BlobStore
+    from stockripper.data.cache import shared_cache
+    from stockripper.data.sec_edgar import SecEdgarClient, SecEdgarConfigError
+
+    try:
+        edgar = SecEdgarClient(cache=shared_cache(root), blobs=BlobStore(root / "blobs"))
+    except SecEdgarConfigError as exc:
+        console.print(f"[bold red]configuration error:[/] {exc}")
+        raise typer.Exit(code=1) from exc
+    warmed = missing = 0
+    with edgar:
+        for symbol, cik in edgar.lookup_ciks(symbols).items():
+            if cik is None:
+                console.print(f"[yellow]no CIK for[/] {symbol}")
+                missing += 1
+                continue
+            if submissions:
+                edgar.get_submissions(cik)
+            if facts:
+                edgar.get_company_facts(cik)
+            warmed += 1
+    console.print(f"[bold green]warmed[/] {warmed} symbols ({missing} without a CIK)")
+
+
 # ---------------------------------------------------------------------------
 # agents subcommands
 # ---------------------------------------------------------------------------
@@ -1033,12 +1257,18 @@ def _resolve_universe_per_track(
     *,
     track_ids: tuple[str, ...],
     fake: bool,
+    database_url: str | None = None,
+    builder: UniverseBuilder | None = None,
+    blobs: BlobStore | None = None,
 ) -> dict[str, tuple[str, ...]]:
     """Return the candidate symbols each track should evaluate this window.
 
     * ``--fake``  -> deterministic canned mini-universe per track philosophy.
     * live mode   -> calls :class:`UniverseBuilder` with Alpaca adapters and
-      surfaces each track's top-N admitted candidates.
+      surfaces each track's top-N admitted candidates. Pass ``builder``
+      (from :func:`_live_universe_builder`) to keep it for later
+      :func:`_refresh_universe_per_track` calls; otherwise one is built
+      over ``blobs``.
 
     Either way the operator does NOT hand-pick symbols; the per-track
     eligibility policy decides what enters the council. This matches the
@@ -1047,10 +1277,40 @@ def _resolve_universe_per_track(
     """
 
     if fake:
-        return {
-            tid: _CANNED_TRACK_UNIVERSE.get(tid, _CANNED_FALLBACK_UNIVERSE)
-            for tid in track_ids
-        }
+        return _canned_universe(track_ids)
+    if builder is None:
+        builder = _live_universe_builder(database_url, blobs=blobs)
+        if builder is None:
+            return _canned_universe(track_ids)
+    built = builder.build_many(_universe_requests(builder, track_ids))
+    return _universe_symbols(track_ids, {r.request.track_id: r for r in built})
+
+
+def _refresh_universe_per_track(
+    builder: UniverseBuilder, *, track_ids: tuple[str, ...],
+) -> dict[str, tuple[str, ...]]:
+    """Re-run today's universe for a later window from the morning build.
+
+    Only symbols near a policy boundary are re-priced (see
+    :meth:`UniverseBuilder.refresh_many`); membership changes are printed.
+    """
+
+    refreshed = builder.refresh_many(_universe_requests(builder, track_ids))
+    for refresh in refreshed:
+        if refresh.changed:
+            console.print(
+                f"[cyan]track={refresh.result.request.track_id}[/cyan] universe refresh "
+                f"({refresh.refetched} re-priced): "
+                f"+{len(refresh.added)} {', '.join(refresh.added[:8])} "
+                f"-{len(refresh.removed)} {', '.join(refresh.removed[:8])}"
+            )
+    return _universe_symbols(track_ids, {r.result.request.track_id: r.result for r in refreshed})
+
+
+def _live_universe_builder(
+    database_url: str | None, *, blobs: BlobStore | None = None,
+) -> UniverseBuilder | None:
+    """The Alpaca-backed builder, or ``None`` when live settings are unusable."""
 
     try:
         settings = load_settings()
@@ -1060,41 +1320,68 @@ def _resolve_universe_per_track(
             "[yellow]universe build: live settings unavailable "
             f"({exc}); falling back to canned mini-universe.[/]"
         )
-        return {
-            tid: _CANNED_TRACK_UNIVERSE.get(tid, _CANNED_FALLBACK_UNIVERSE)
-            for tid in track_ids
-        }
+        return None
 
-    from stockripper.data import UniverseBuilder, UniverseBuildRequest
+    from stockripper.data import UniverseBuilder
     from stockripper.data.live import AlpacaAssetsLoader, AlpacaSnapshotProvider
+    from stockripper.data.pit_fundamentals import PitSharesSource
+    from stockripper.db import build_session_factory
 
     loader = AlpacaAssetsLoader(settings=settings)
-    snapshot_provider = AlpacaSnapshotProvider(settings=settings)
-    builder = UniverseBuilder(
+    snapshot_provider = AlpacaSnapshotProvider(
+        settings=settings,
+        shares=PitSharesSource.from_cache(build_session_factory(build_engine(database_url))),
+        blobs=blobs,
+    )
+    return UniverseBuilder(
         assets_loader=loader,
         snapshot_provider=snapshot_provider,
+        columnar=True,
     )
+
+
+def _universe_requests(
+    builder: UniverseBuilder, track_ids: tuple[str, ...],
+) -> tuple[UniverseBuildRequest, ...]:
+    from stockripper.data import UniverseBuildRequest
+
     today = dt.date.today()
+    # One shared snapshot for every track with a policy; tracks without a
+    # registered universe policy get the tiny canned fallback.
+    return tuple(
+        UniverseBuildRequest(
+            track_id=tid,
+            as_of=today,
+            window_id=f"{today.isoformat()}-adhoc",
+            limit=25,
+        )
+        for tid in track_ids
+        if tid in builder.policies
+    )
+
+
+def _universe_symbols(
+    track_ids: tuple[str, ...], built: Mapping[str, UniverseBuildResult],
+) -> dict[str, tuple[str, ...]]:
     out: dict[str, tuple[str, ...]] = {}
     for tid in track_ids:
-        try:
-            result = builder.build(
-                UniverseBuildRequest(
-                    track_id=tid,
-                    as_of=today,
-                    window_id=f"{today.isoformat()}-adhoc",
-                    limit=25,
-                ),
-            )
-            out[tid] = tuple(c.symbol for c in result.candidates)
-        except KeyError:
-            # Track has no registered universe policy -> tiny fallback.
+        result = built.get(tid)
+        if result is None:
             out[tid] = _CANNED_TRACK_UNIVERSE.get(
                 tid, _CANNED_FALLBACK_UNIVERSE,
             )
+        else:
+            out[tid] = tuple(c.symbol for c in result.candidates)
     return out
 
 
+def _canned_universe(track_ids: tuple[str, ...]) -> dict[str, tuple[str, ...]]:
+    return {
+        tid: _CANNED_TRACK_UNIVERSE.get(tid, _CANNED_FALLBACK_UNIVERSE)
+        for tid in track_ids
+    }
+
+
 @agents_app.command("run-window")
 def agents_run_window(
     track: list[str] = typer.Option(  # noqa: B008 - typer pattern
@@ -1162,7 +1449,11 @@ def agents_run_window(
     from stockripper.agents.llm import LLMClient, OpenAIStructuredClient
     from stockripper.agents.registry import build_registry
     from stockripper.agents.window_runner import run_window
+    from stockripper.data.blob_store import BlobStore
 
+    # One store for every payload this window hashes: universe snapshots,
+    # evidence and the persisted track-run rows.
+    blobs = BlobStore()
     registry = build_registry()
     track_ids = (
         tuple(track) if track
@@ -1178,7 +1469,7 @@ def agents_run_window(
         symbols = explicit_symbols
     else:
         symbols_by_track = _resolve_universe_per_track(
-            track_ids=track_ids, fake=fake,
+            track_ids=track_ids, fake=fake, database_url=database_url, blobs=blobs,
         )
         symbols = ()  # fallback unused when symbols_by_track is set
         for tid in track_ids:
@@ -1269,6 +1560,7 @@ def agents_run_window(
                 llm_factory=llm_factory,
                 execution_adapter=execution_adapter,
                 event_emitter=emitter,
+                blobs=blobs,
             )
         finally:
             if emitter is not None and hasattr(emitter, "aclose"):
@@ -1397,6 +1689,7 @@ async def _run_one_scheduled_window(
     execute: bool,
     alpaca: bool,
     emitter: Any,
+    blobs: BlobStore,
 ) -> None:
     from stockripper.agents.window_runner import run_window
     from stockripper.execution.adapter import (
@@ -1429,6 +1722,7 @@ async def _run_one_scheduled_window(
         llm_factory=llm_factory,
         execution_adapter=execution_adapter,
         event_emitter=emitter,
+        blobs=blobs,
     )
     _print_window_result(result)
 
@@ -1501,6 +1795,7 @@ def run_day(
     from stockripper.agents.llm import OpenAIStructuredClient
     from stockripper.agents.registry import build_registry
     from stockripper.dashboard.events import HttpEventEmitter
+    from stockripper.data.blob_store import BlobStore
 
     try:
         settings = load_settings()
@@ -1533,8 +1828,12 @@ def run_day(
         tuple(track) if track
         else tuple(t.track_id for t in DEFAULT_TRACKS if t.enabled)
     )
+    blobs = BlobStore()
+    # Kept for the day so later windows refresh from the morning build.
+    universe_builder = None if fake else _live_universe_builder(database_url, blobs=blobs)
     symbols_by_track = _resolve_universe_per_track(
-        track_ids=track_ids, fake=fake,
+        track_ids=track_ids, fake=fake, database_url=database_url,
+        builder=universe_builder,
     )
     for tid in track_ids:
         picked = symbols_by_track.get(tid, ())
@@ -1563,6 +1862,7 @@ def run_day(
             )
 
     async def _drive() -> None:
+        nonlocal symbols_by_track
         emitter: Any = None
         if dashboard_url:
             emitter = HttpEventEmitter(dashboard_url)
@@ -1573,6 +1873,7 @@ def run_day(
             await _do_reconcile(factory, settings, "preflight", emitter)
 
             tz = ZoneInfo("America/New_York")
+            first_window = True
             for name, hh, mm in parsed_windows:
                 if not once:
                     now_et = dt.datetime.now(tz)
@@ -1592,6 +1893,11 @@ def run_day(
                             f"@ {target.time()} ET[/]"
                         )
                         await asyncio.sleep(delta)
+                if universe_builder is not None and not first_window:
+                    symbols_by_track = await asyncio.to_thread(
+                        _refresh_universe_per_track, universe_builder, track_ids=track_ids,
+                    )
+                first_window = False
                 await _run_one_scheduled_window(
                     registry=registry,
                     track_ids=track_ids,
@@ -1603,6 +1909,7 @@ def run_day(
                     execute=execute,
                     alpaca=alpaca,
                     emitter=emitter,
+                    blobs=blobs,
                 )
                 await _do_reconcile(
                     factory, settings, f"post-{name}", emitter,
@@ -1611,7 +1918,16 @@ def run_day(
             if emitter is not None and hasattr(emitter, "aclose"):
                 await emitter.aclose()
 
-    asyncio.run(_drive())
+    from stockripper.data.cache import SqliteCache, shared_cache
+    from stockripper.data.cache_maintenance import CacheSweeper
+
+    # Long-running: keep .data-cache inside its budgets while windows run.
+    # Sweep the store the adapters actually share, and persist its memory
+    # tier's hits with the SQLite counters.
+    tier = shared_cache()
+    backing = cast(SqliteCache, tier.backing)  # shared_cache always tiers SQLite
+    with CacheSweeper(backing, flush=tier.flush_stats):
+        asyncio.run(_drive())
 
 
 # ---------------------------------------------------------------------------
@@ -31,6 +31,8 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.types import CallToolResult, Tool
 
+from stockripper.data.rate_limit import Priority, PriorityTokenBucket, shared_alpaca_limiter
+
 # Resolve to the alpaca_mcp uv project living alongside this repo. This module
 # lives at src/stockripper/agents/alpaca_mcp_client.py, so the repo root is
 # parents[3] and the MCP project sits at <repo>/tools/alpaca_mcp.
@@ -43,6 +45,10 @@ ALPACA_MCP_DIRECTORY: Path = (
 # environment carries.
 _LIVE_TRADING_KEYS: tuple[str, ...] = ("ALPACA_MODE", "ALPACA_ALLOW_LIVE")
 
+# Server tools that hit the Alpaca market-data API. The server runs in its
+# own process, so these are paced here against the shared data budget.
+_DATA_TOOL_PREFIXES: tuple[str, ...] = ("get_stock_", "get_option_", "get_news")
+
 
 class AlpacaMcpSpawnError(RuntimeError):
     """Raised when the alpaca-mcp server cannot be spawned or initialised."""
@@ -94,10 +100,16 @@ class AlpacaMcpClient:
     Use :meth:`spawn` (preferred) to start the server as a stdio subprocess
     with the paper-only safety env baked in. The class is an async context
     manager that initialises the session and tears it down cleanly.
+
+    Market-data tools wait for a token from ``limiter`` (the process-wide
+    Alpaca budget by default) before the call is sent.
     """
 
-    def __init__(self, session: ClientSession) -> None:
+    def __init__(
+        self, session: ClientSession, *, limiter: PriorityTokenBucket | None = None,
+    ) -> None:
         self._session = session
+        self._limiter = limiter if limiter is not None else shared_alpaca_limiter()
         self._tools: tuple[Tool, ...] | None = None
 
     # ------------------------------------------------------------------
@@ -113,6 +125,7 @@ class AlpacaMcpClient:
         command: str | None = None,
         args: list[str] | None = None,
         env: dict[str, str] | None = None,
+        limiter: PriorityTokenBucket | None = None,
     ) -> Any:
         """Async context manager that spawns alpaca-mcp and yields a ready client.
 
@@ -146,7 +159,7 @@ class AlpacaMcpClient:
                 ClientSession(read, write) as session,
             ):
                 await session.initialize()
-                yield cls(session)
+                yield cls(session, limiter=limiter)
         except AlpacaMcpSpawnError:
             raise
         except Exception as exc:
@@ -172,10 +185,19 @@ class AlpacaMcpClient:
         return tuple(t.name for t in await self.list_tools(refresh=refresh))
 
     async def call_tool(
-        self, name: str, arguments: dict[str, Any] | None = None
+        self,
+        name: str,
+        arguments: dict[str, Any] | None = None,
+        *,
+        priority: Priority = Priority.EVIDENCE,
     ) -> CallToolResult:
-        """Invoke ``name`` on the server and return the raw MCP result."""
+        """Invoke ``name`` on the server and return the raw MCP result.
+
+        Market-data tools are paced at ``priority``.
+        """
 
+        if name.startswith(_DATA_TOOL_PREFIXES):
+            await self._limiter.acquire_async(priority)
         return await self._session.call_tool(name, arguments or {})
 
     # ------------------------------------------------------------------
@@ -24,6 +24,7 @@ from stockripper.agents.schemas import (
     PromptInjectionReport,
     RecommendationInstrument,
 )
+from stockripper.data.blob_store import BlobStore
 from stockripper.data.provenance import Provenance
 from stockripper.data.universe import Candidate
 from stockripper.data.universe_policy import InstrumentType as UniverseInstrumentType
@@ -71,6 +72,7 @@ def build_evidence_packet(
     provenances: Iterable[Provenance] = (),
     instrument: RecommendationInstrument | None = None,
     now: dt.datetime | None = None,
+    blobs: BlobStore | None = None,
 ) -> EvidencePacket:
     """Assemble a serializable :class:`EvidencePacket` for one candidate.
 
@@ -78,7 +80,9 @@ def build_evidence_packet(
     raw_text)`` tuples. Each excerpt is sanitized, hashed, and turned
     into a :class:`CandidateEvidenceRef`; the sanitized text is then
     scanned for prompt-injection patterns and the report is attached to
-    the packet so the council/judge skip injected payloads.
+    the packet so the council/judge skip injected payloads. With
+    ``blobs``, the raw text is kept there and the ref's
+    ``raw_content_uri`` points at it.
     """
 
     timestamp = now if now is not None else _now()
@@ -92,12 +96,13 @@ def build_evidence_packet(
             provider=source_type.value,
             source_url=source_url,
             payload=raw_text,
+            blobs=blobs,
         )
         refs.append(
             CandidateEvidenceRef(
                 source_type=source_type,
                 source_url=source_url,
-                raw_content_uri=None,
+                raw_content_uri=prov.raw_content_uri,
                 content_hash=prov.content_hash,
                 retrieved_at=timestamp,
                 summary=san.sanitized[:280] if san.sanitized else "(empty after sanitization)",
@@ -24,6 +24,7 @@ from stockripper.agents.schemas import (
     action_item_to_ledger_row,
     recommendation_to_ledger_row,
 )
+from stockripper.data.blob_store import BlobStore
 from stockripper.db.repository import Repository
 
 
@@ -45,13 +46,16 @@ def persist_track_run(
     run_id: str,
     result: TrackRunResult,
     completed_at: dt.datetime,
+    blobs: BlobStore | None = None,
 ) -> None:
     """Persist a successful (or partial) track run.
 
     Writes the TrackRun envelope, one AgentRun per envelope, recommendation
     rows for OK council outputs, and judge decision + decision actions when
     the judge ran successfully. Idempotent: re-running with identical
-    deterministic ids upserts existing rows.
+    deterministic ids upserts existing rows. With ``blobs``, each
+    recommendation's and the judge's raw model output is kept there and
+    the rows' ``raw_output_uri`` points at it.
 
     Caller controls the transaction boundary; this function only stages
     inserts/updates on the session.
@@ -88,11 +92,17 @@ def persist_track_run(
         ):
             row = recommendation_to_ledger_row(envelope.output)
             row["run_id"] = run_id
+            row["raw_output_uri"] = _keep_raw(blobs, envelope.raw_response_text)
             repo.upsert_recommendation(**row)
 
     decision = result.judge_decision
     if decision is not None:
-        _persist_judge_decision(repo, run_id=run_id, decision=decision)
+        _persist_judge_decision(
+            repo,
+            run_id=run_id,
+            decision=decision,
+            raw_output_uri=_keep_raw(blobs, result.judge_run.raw_response_text),
+        )
 
 
 def persist_skipped_track(
@@ -152,6 +162,12 @@ def persist_failed_track(
 # ---------------------------------------------------------------------------
 # Internals
 # ---------------------------------------------------------------------------
+def _keep_raw(blobs: BlobStore | None, text: str | None) -> str | None:
+    if blobs is None or not text:
+        return None
+    return blobs.put(text)
+
+
 def _persist_agent_run(
     repo: Repository,
     *,
@@ -190,6 +206,7 @@ def _persist_judge_decision(
     *,
     run_id: str,
     decision: JudgeDecision,
+    raw_output_uri: str | None = None,
 ) -> None:
     plan: ActionPlan = decision.plan
     repo.upsert_judge_decision(
@@ -198,7 +215,7 @@ def _persist_judge_decision(
         track_id=plan.track_id,
         judge_agent_id=plan.judge_agent_id,
         portfolio_posture=plan.portfolio_posture.value,
-        raw_output_uri=None,
+        raw_output_uri=raw_output_uri,
         created_at=plan.created_at,
     )
     for item in plan.items:
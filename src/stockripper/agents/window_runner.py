@@ -48,6 +48,7 @@ from stockripper.dashboard.events import (
     NullEventEmitter,
 )
 from stockripper.dashboard.events import EventEmitter as DashboardEmitter
+from stockripper.data.blob_store import BlobStore
 from stockripper.db.engine import build_session_factory, session_scope
 from stockripper.db.repository import Repository
 from stockripper.execution.adapter import (
@@ -132,6 +133,7 @@ async def run_window(
     packet_builder: PacketBuilder | None = None,
     execution_adapter: ExecutionAdapter | None = None,
     event_emitter: DashboardEmitter | None = None,
+    blobs: BlobStore | None = None,
 ) -> WindowRunResult:
     """Run every enabled (track, symbol) pair in parallel.
 
@@ -174,6 +176,10 @@ async def run_window(
         Override for tests; defaults to a wrapper around
         :func:`build_demo_packet` that injects a deterministic
         ``packet_id``.
+    blobs:
+        When given, raw council and judge outputs are kept in this
+        :class:`BlobStore` and the ledger rows point at them via
+        ``raw_output_uri``.
     """
 
     when = now if now is not None else _utcnow()
@@ -391,6 +397,7 @@ async def run_window(
             post_run_kill_reason=final_kill_reason
             if final_kill_engaged and not kill_engaged
             else None,
+            blobs=blobs,
         )
 
     submissions: tuple[SubmissionResult, ...] = ()
@@ -670,6 +677,7 @@ def _persist_window_outcomes(
     session_factory: sessionmaker[Session] | None,
     final_run_status: str,
     post_run_kill_reason: str | None,
+    blobs: BlobStore | None = None,
 ) -> None:
     fac = session_factory if session_factory is not None else build_session_factory()
     for o in outcomes:
@@ -706,6 +714,7 @@ def _persist_window_outcomes(
                         run_id=run_id,
                         result=o.result,
                         completed_at=completed_at,
+                        blobs=blobs,
                     )
         except Exception:
             LOG.exception(
@@ -0,0 +1,48 @@
+"""point-in-time fundamentals
+
+Revision ID: 20261018_pit_fundamentals
+Revises: 20260530_phase6_scoring
+Create Date: 2026-10-18 00:00:00.000000
+
+Adds ``fundamental_facts``: one row per reported fundamental, keyed by
+``(cik, fact, period_end, filed_date)`` so market-cap banding can read
+what was known on a given day for the whole universe at once.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20261018_pit_fundamentals"
+down_revision: str | None | Sequence[str] = "20260530_phase6_scoring"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fundamental_facts",
+        sa.Column("fact_id", sa.String(96), primary_key=True),
+        sa.Column("cik", sa.String(10), nullable=False),
+        sa.Column("fact", sa.String(32), nullable=False),
+        sa.Column("period_end", sa.Date(), nullable=False),
+        sa.Column("filed_date", sa.Date(), nullable=False),
+        sa.Column("value", sa.Numeric(24, 4), nullable=False),
+        sa.Column("unit", sa.String(16), nullable=False),
+        sa.Column("source_tag", sa.String(128), nullable=False),
+        sa.Column("form", sa.String(16), nullable=True),
+        sa.Column("fiscal_period", sa.String(8), nullable=True),
+        sa.Column("accession", sa.String(32), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint(
+            "cik", "fact", "period_end", "filed_date",
+            name="uq_fundamental_facts_cik_fact_period_filed",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fundamental_facts")
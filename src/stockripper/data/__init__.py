@@ -17,6 +17,7 @@ from stockripper.data.universe import (
     UniverseBuilder,
     UniverseBuildRequest,
     UniverseBuildResult,
+    UniverseRefresh,
 )
 from stockripper.data.universe_policy import (
     DEFAULT_UNIVERSE_POLICIES,
@@ -40,4 +41,5 @@ __all__ = (
     "UniverseBuildResult",
     "UniverseBuilder",
     "UniversePolicyParams",
+    "UniverseRefresh",
 )
@@ -0,0 +1,432 @@
+"""Local asset master: Alpaca's tradable-asset list, classified once and diffed daily.
+
+:class:`AlpacaAssetsLoader` used to download the full US-equity asset list
+(~10k names) for every universe build and tag leveraged ETFs by checking
+each symbol against a short allow-list. The master keeps the last list on
+disk as a columnar table with every classification already computed, so a
+build on a day the master is current reads it instead of refetching.
+
+Design notes:
+
+- **One ``.npz`` table.** Columns are arrays sorted by symbol (``symbol``,
+  ``name``, ``exchange`` as fixed-width unicode) plus a ``uint16`` bit set
+  of :class:`AssetFlag` per row and the ``as_of`` epoch-day. It is written
+  to ``<name>.tmp`` and ``os.replace``-d, so a reader always sees a whole
+  table.
+- **Classified once, vectorised.** ETF, leveraged / inverse ETF, OTC and
+  ADR flags come from NumPy string ops over the whole name and exchange
+  columns at refresh time, plus symbol allow-lists for funds the name
+  heuristics miss. A universe build only tests bits.
+- **Daily diff.** A refresh is joined against the stored table on the
+  sorted symbol column: symbols that appeared, symbols that left the active
+  list (delisted, halted or renamed) and, per surviving symbol, which fields
+  changed. Each diff is appended to ``diffs.jsonl`` before the table is
+  replaced, so a refresh that dies in between is simply repeated.
+- **Single process.** Like :class:`JsonFileCache`, writes are serialised
+  with an in-process lock only.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import enum
+import json
+import os
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+
+from stockripper.data.bar_store import day_to_date, epoch_day
+from stockripper.data.universe import AssetRecord
+
+_FORMAT_VERSION: Final[int] = 1
+_DEFAULT_ROOT: Final[Path] = Path(".data-cache") / "assets"
+
+
+class AssetFlag(enum.IntFlag):
+    """Per-asset bits stored in :attr:`AssetTable.flags`."""
+
+    TRADABLE = enum.auto()
+    SHORTABLE = enum.auto()
+    FRACTIONABLE = enum.auto()
+    MARGINABLE = enum.auto()
+    EASY_TO_BORROW = enum.auto()
+    ETF = enum.auto()
+    LEVERAGED_ETF = enum.auto()
+    INVERSE_ETF = enum.auto()
+    OTC = enum.auto()
+    ADR = enum.auto()
+
+
+# ---------------------------------------------------------------------------
+# Classification
+# ---------------------------------------------------------------------------
+# Alpaca's asset list carries no fund metadata, so these are heuristics over
+# the listed name. Markers are matched against the upper-cased name with
+# punctuation turned into spaces and a space on either side, so `` ETF ``
+# only matches the whole word.
+_ETF_MARKERS: Final[tuple[str, ...]] = (
+    " ETF ", " ETFS ", " ISHARES ", " SPDR ", " PROSHARES ", " DIREXION ",
+)
+_LEVERAGED_MARKERS: Final[tuple[str, ...]] = (" 2X ", " 3X ", "ULTRA", " LEVERAGED ")
+_INVERSE_MARKERS: Final[tuple[str, ...]] = (
+    " INVERSE ", "ULTRASHORT", " BEAR ", " -1X ", " -2X ", " -3X ",
+)
+_ADR_MARKERS: Final[tuple[str, ...]] = (
+    " ADR ", " ADRS ", " ADS ", " AMERICAN DEPOSITARY ", " DEPOSITARY SHARES ",
+    " DEPOSITARY RECEIPTS ",
+)
+_PUNCTUATION: Final[str] = ",.()/"
+# Well-known funds the markers above miss. A bare "Short" is not a marker:
+# it names short-duration bond funds as often as "ProShares Short QQQ".
+_LEVERAGED_SYMBOLS: Final[tuple[str, ...]] = (
+    "TQQQ", "SQQQ", "SPXL", "SPXS", "SOXL", "SOXS", "TNA", "TZA",
+    "UPRO", "SPXU", "FAZ", "FAS", "UVXY", "SVXY", "LABU", "LABD",
+)
+_INVERSE_SYMBOLS: Final[tuple[str, ...]] = (
+    "SQQQ", "SPXS", "SOXS", "TZA", "SPXU", "FAZ", "SVXY", "LABD",
+    "SH", "PSQ", "DOG", "SDS", "QID", "DXD",
+)
+_OTC_EXCHANGE: Final[str] = "OTC"
+
+
+def classify(
+    symbols: npt.NDArray[np.str_],
+    names: npt.NDArray[np.str_],
+    exchanges: npt.NDArray[np.str_],
+    *,
+    etf_attribute: npt.NDArray[np.bool_] | None = None,
+) -> npt.NDArray[np.uint16]:
+    """Instrument-type bits for whole columns at once.
+
+    ``etf_attribute`` marks rows whose Alpaca ``attributes`` already say
+    ``etf``. Leveraged and inverse funds are always also flagged as ETFs.
+    """
+
+    padded = np.strings.add(np.strings.add(" ", np.strings.upper(names)), " ")
+    for char in _PUNCTUATION:
+        padded = np.strings.replace(padded, char, " ")
+    etf = _contains_any(padded, _ETF_MARKERS)
+    if etf_attribute is not None:
+        etf |= etf_attribute
+    leveraged = (etf & _contains_any(padded, _LEVERAGED_MARKERS)) | np.isin(
+        symbols, _LEVERAGED_SYMBOLS,
+    )
+    inverse = (etf & _contains_any(padded, _INVERSE_MARKERS)) | np.isin(
+        symbols, _INVERSE_SYMBOLS,
+    )
+    etf |= leveraged | inverse
+
+    flags = np.zeros(len(symbols), dtype=np.uint16)
+    flags[etf] |= int(AssetFlag.ETF)
+    flags[leveraged] |= int(AssetFlag.LEVERAGED_ETF)
+    flags[inverse] |= int(AssetFlag.INVERSE_ETF)
+    flags[exchanges == _OTC_EXCHANGE] |= int(AssetFlag.OTC)
+    flags[~etf & _contains_any(padded, _ADR_MARKERS)] |= int(AssetFlag.ADR)
+    return flags
+
+
+def _contains_any(
+    names: npt.NDArray[np.str_], markers: Iterable[str],
+) -> npt.NDArray[np.bool_]:
+    found = np.zeros(len(names), dtype=np.bool_)
+    for marker in markers:
+        found |= np.strings.find(names, marker) >= 0
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Table
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True, eq=False)
+class AssetTable:
+    """The asset list as columns sorted by (unique) symbol.
+
+    Compared and hashed by identity; compare :attr:`records` for contents.
+    """
+
+    as_of: dt.date
+    symbol: npt.NDArray[np.str_]
+    name: npt.NDArray[np.str_]
+    exchange: npt.NDArray[np.str_]
+    flags: npt.NDArray[np.uint16]
+
+    @classmethod
+    def from_assets(cls, assets: Iterable[Any], *, as_of: dt.date) -> AssetTable:
+        """Build and classify a table from alpaca-py ``Asset`` objects.
+
+        Assets without a symbol are dropped; a repeated symbol keeps its
+        first row.
+        """
+
+        rows: list[tuple[str, str, str, int, bool]] = []
+        for asset in assets:
+            symbol = getattr(asset, "symbol", None)
+            if not symbol:
+                continue
+            bits = AssetFlag(0)
+            for flag, attr in _ATTRIBUTE_FLAGS:
+                if getattr(asset, attr, False):
+                    bits |= flag
+            attributes = getattr(asset, "attributes", None) or ()
+            rows.append(
+                (
+                    str(symbol).upper(),
+                    str(getattr(asset, "name", "") or ""),
+                    _enum_value(getattr(asset, "exchange", "")),
+                    int(bits),
+                    "etf" in {str(a).lower() for a in attributes},
+                )
+            )
+        if not rows:
+            return cls.empty(as_of)
+        symbols, names, exchanges, bits_col, etf_col = zip(*rows, strict=True)
+        symbol = np.array(symbols, dtype=np.str_)
+        _, first = np.unique(symbol, return_index=True)
+        name = np.array(names, dtype=np.str_)[first]
+        exchange = np.array(exchanges, dtype=np.str_)[first]
+        symbol = symbol[first]
+        flags = np.array(bits_col, dtype=np.uint16)[first]
+        flags |= classify(
+            symbol, name, exchange, etf_attribute=np.array(etf_col, dtype=np.bool_)[first],
+        )
+        return cls(as_of=as_of, symbol=symbol, name=name, exchange=exchange, flags=flags)
+
+    @classmethod
+    def empty(cls, as_of: dt.date) -> AssetTable:
+        return cls(
+            as_of=as_of,
+            symbol=np.array([], dtype=np.str_),
+            name=np.array([], dtype=np.str_),
+            exchange=np.array([], dtype=np.str_),
+            flags=np.array([], dtype=np.uint16),
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbol)
+
+    def has(self, flag: AssetFlag) -> npt.NDArray[np.bool_]:
+        """Rows carrying every bit of ``flag``."""
+
+        mask: npt.NDArray[np.bool_] = (self.flags & int(flag)) == int(flag)
+        return mask
+
+    def select(self, mask: npt.NDArray[np.bool_]) -> AssetTable:
+        return AssetTable(
+            as_of=self.as_of,
+            symbol=self.symbol[mask],
+            name=self.name[mask],
+            exchange=self.exchange[mask],
+            flags=self.flags[mask],
+        )
+
+    @cached_property
+    def records(self) -> tuple[AssetRecord, ...]:
+        """One :class:`AssetRecord` per row, built once per table."""
+
+        columns = {flag: self.has(flag).tolist() for flag in AssetFlag}
+        return tuple(
+            AssetRecord(
+                symbol=symbol,
+                name=name,
+                exchange=exchange,
+                tradable=columns[AssetFlag.TRADABLE][i],
+                shortable=columns[AssetFlag.SHORTABLE][i],
+                fractionable=columns[AssetFlag.FRACTIONABLE][i],
+                is_etf=columns[AssetFlag.ETF][i],
+                is_leveraged_etf=columns[AssetFlag.LEVERAGED_ETF][i],
+                is_inverse_etf=columns[AssetFlag.INVERSE_ETF][i],
+                is_otc=columns[AssetFlag.OTC][i],
+                is_adr=columns[AssetFlag.ADR][i],
+            )
+            for i, (symbol, name, exchange) in enumerate(
+                zip(self.symbol.tolist(), self.name.tolist(), self.exchange.tolist(), strict=True)
+            )
+        )
+
+
+_ATTRIBUTE_FLAGS: Final[tuple[tuple[AssetFlag, str], ...]] = (
+    (AssetFlag.TRADABLE, "tradable"),
+    (AssetFlag.SHORTABLE, "shortable"),
+    (AssetFlag.FRACTIONABLE, "fractionable"),
+    (AssetFlag.MARGINABLE, "marginable"),
+    (AssetFlag.EASY_TO_BORROW, "easy_to_borrow"),
+)
+
+
+def _enum_value(value: Any) -> str:
+    # alpaca-py enums mix in ``str`` but ``str()`` gives "AssetExchange.NYSE".
+    return str(getattr(value, "value", value) or "")
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class AssetDiff:
+    """What changed between two refreshes of the asset list.
+
+    ``changed`` maps a symbol present in both to the names of the fields
+    that differ: ``name``, ``exchange`` or a lower-cased :class:`AssetFlag`.
+    """
+
+    as_of: dt.date
+    previous_as_of: dt.date | None
+    added: tuple[str, ...] = ()
+    delisted: tuple[str, ...] = ()
+    changed: Mapping[str, tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.delisted or self.changed)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "as_of": self.as_of.isoformat(),
+            "previous_as_of": (
+                self.previous_as_of.isoformat() if self.previous_as_of is not None else None
+            ),
+            "added": list(self.added),
+            "delisted": list(self.delisted),
+            "changed": {symbol: list(fields) for symbol, fields in self.changed.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Any]) -> AssetDiff:
+        previous = data.get("previous_as_of")
+        return cls(
+            as_of=dt.date.fromisoformat(data["as_of"]),
+            previous_as_of=dt.date.fromisoformat(previous) if previous else None,
+            added=tuple(data.get("added", ())),
+            delisted=tuple(data.get("delisted", ())),
+            changed={s: tuple(f) for s, f in data.get("changed", {}).items()},
+        )
+
+
+def diff_tables(previous: AssetTable | None, current: AssetTable) -> AssetDiff:
+    """Join two tables on symbol and report additions, removals and edits."""
+
+    if previous is None:
+        return AssetDiff(
+            as_of=current.as_of, previous_as_of=None, added=tuple(current.symbol.tolist()),
+        )
+    _, i_old, i_new = np.intersect1d(
+        previous.symbol, current.symbol, assume_unique=True, return_indices=True,
+    )
+    name_changed = previous.name[i_old] != current.name[i_new]
+    exchange_changed = previous.exchange[i_old] != current.exchange[i_new]
+    flag_changes = previous.flags[i_old] ^ current.flags[i_new]
+    changed: dict[str, tuple[str, ...]] = {}
+    for row in np.flatnonzero(name_changed | exchange_changed | (flag_changes != 0)):
+        fields = [
+            label
+            for label, hit in (("name", name_changed[row]), ("exchange", exchange_changed[row]))
+            if hit
+        ]
+        fields.extend(
+            str(flag.name).lower() for flag in AssetFlag if int(flag_changes[row]) & flag
+        )
+        changed[str(current.symbol[i_new[row]])] = tuple(fields)
+    return AssetDiff(
+        as_of=current.as_of,
+        previous_as_of=previous.as_of,
+        added=tuple(np.setdiff1d(current.symbol, previous.symbol, assume_unique=True).tolist()),
+        delisted=tuple(
+            np.setdiff1d(previous.symbol, current.symbol, assume_unique=True).tolist()
+        ),
+        changed=changed,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+class AssetMaster:
+    """The last asset table on disk plus the log of daily diffs."""
+
+    def __init__(self, root: Path | str | None = None) -> None:
+        self._root = Path(root) if root is not None else _DEFAULT_ROOT
+        self._lock = threading.Lock()
+        self._cached: tuple[tuple[int, int], AssetTable] | None = None
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def path(self) -> Path:
+        return self._root / f"master-v{_FORMAT_VERSION}.npz"
+
+    @property
+    def diff_path(self) -> Path:
+        return self._root / "diffs.jsonl"
+
+    def load(self) -> AssetTable | None:
+        """The stored table, or ``None`` before the first refresh.
+
+        The parsed table is reused until the file on disk changes.
+        """
+
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cached
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with np.load(self.path, allow_pickle=False) as data:
+            if int(data["version"]) != _FORMAT_VERSION:
+                return None
+            table = AssetTable(
+                as_of=day_to_date(int(data["as_of"])),
+                symbol=data["symbol"],
+                name=data["name"],
+                exchange=data["exchange"],
+                flags=data["flags"],
+            )
+        self._cached = (key, table)
+        return table
+
+    def update(self, table: AssetTable) -> AssetDiff:
+        """Diff ``table`` against the stored one, log the diff, then store it."""
+
+        with self._lock:
+            diff = diff_tables(self.load(), table)
+            self._root.mkdir(parents=True, exist_ok=True)
+            with self.diff_path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(diff.to_json(), sort_keys=True) + "\n")
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with tmp_path.open("wb") as fh:
+                np.savez(
+                    fh,
+                    version=np.int64(_FORMAT_VERSION),
+                    as_of=np.int64(epoch_day(table.as_of)),
+                    symbol=table.symbol,
+                    name=table.name,
+                    exchange=table.exchange,
+                    flags=table.flags,
+                )
+            os.replace(tmp_path, self.path)
+            return diff
+
+    def diffs(self, *, since: dt.date | None = None) -> tuple[AssetDiff, ...]:
+        """Logged diffs, oldest first, optionally only those on/after ``since``."""
+
+        try:
+            lines = self.diff_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return ()
+        out = [AssetDiff.from_json(json.loads(line)) for line in lines if line.strip()]
+        if since is not None:
+            out = [d for d in out if d.as_of >= since]
+        return tuple(out)
+
+
+__all__ = ("AssetDiff", "AssetFlag", "AssetMaster", "AssetTable", "classify", "diff_tables")
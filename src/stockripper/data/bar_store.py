@@ -0,0 +1,469 @@
+"""Memory-mapped local store for daily OHLCV bars.
+
+Daily bars are immutable once a session closes, yet every
+:meth:`MarketDataAdapter.get_daily_bars` call used to re-download the whole
+look-back window. This store keeps one flat binary file per symbol and the
+adapter only asks Alpaca for bars newer than the last stored day.
+
+Design notes:
+
+- **Fixed-width records.** Each bar is one 56-byte little-endian record
+  (epoch-day, epoch-second timestamp, OHLC as float64, volume as int64)
+  after a 16-byte header (format version, earliest day the history is known
+  to be complete from). Files are ``np.memmap``-ed, so a
+  :class:`BarSeries` is a set of zero-copy column views over the page cache.
+- **Append-only fast path.** New sessions are appended past the end of
+  the file, which no existing mapping covers. A re-sent last bar that is
+  unchanged is dropped first. Anything else — a still-forming last bar
+  that moved, a backfill of older history, a correction in the middle —
+  writes a new file under a unique temp name and ``os.replace``-s it, so
+  a reader holding an older mapping keeps seeing a consistent file. Bytes
+  under a live mapping are never rewritten.
+- **Arrays first, Bars on demand.** :class:`BarSeries` is what the adapter
+  hands out. ADV, returns and rolling statistics are computed over its
+  float64 columns; indexing or iterating it builds :class:`Bar` objects
+  (``Decimal`` fields) only for the rows actually touched.
+- **Multi-process writers.** The store lives under the shared
+  ``.data-cache``, so each merge holds an ``flock`` on the symbol's
+  ``.lock`` file (plus an in-process lock) from reading the coverage to
+  the write. Without ``fcntl`` (Windows) only the in-process lock applies.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import os
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Final, Literal, overload
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
+
+from stockripper.data.cache import safe_filename
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock; writers are serialised in-process only.
+    fcntl = None  # type: ignore[assignment]
+
+_FORMAT_VERSION: Final[int] = 1
+_DEFAULT_ROOT: Final[Path] = Path(".data-cache") / "bars"
+_EPOCH: Final[dt.date] = dt.date(1970, 1, 1)
+
+_HEADER_DTYPE: Final[np.dtype[Any]] = np.dtype([("version", "<i8"), ("covered_from", "<i8")])
+RECORD_DTYPE: Final[np.dtype[Any]] = np.dtype(
+    [
+        ("day", "<i8"),
+        ("ts", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<i8"),
+    ]
+)
+_HEADER_SIZE: Final[int] = _HEADER_DTYPE.itemsize
+_RECORD_SIZE: Final[int] = RECORD_DTYPE.itemsize
+
+BarField = Literal["open", "high", "low", "close", "volume", "dollar_volume"]
+
+
+def epoch_day(value: dt.date | dt.datetime) -> int:
+    """Days since 1970-01-01 (UTC date for datetimes)."""
+
+    if isinstance(value, dt.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt.UTC)
+        value = value.date()
+    return (value - _EPOCH).days
+
+
+def day_to_date(day: int) -> dt.date:
+    return _EPOCH + dt.timedelta(days=int(day))
+
+
+# ---------------------------------------------------------------------------
+# Series view
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Bar:
+    timestamp: dt.datetime
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    volume: int
+
+    @property
+    def dollar_volume(self) -> Decimal:
+        return self.close * Decimal(self.volume)
+
+
+@dataclass(frozen=True, eq=False)
+class BarSeries(Sequence[Bar]):
+    """Column view over a symbol's daily bars, oldest first.
+
+    The arrays are views into a memory-mapped :class:`BarStore` file (or an
+    in-memory record array); slicing with :meth:`tail` or ``[a:b]`` never
+    copies. As a sequence it yields :class:`Bar` objects, built lazily.
+    Two series are equal when symbol and every record match.
+    """
+
+    symbol: str
+    records: npt.NDArray[Any]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BarSeries):
+            return NotImplemented
+        return self.symbol == other.symbol and bool(
+            np.array_equal(self.records, other.records)
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.symbol, len(self)))
+
+    @classmethod
+    def empty(cls, symbol: str) -> BarSeries:
+        return cls(symbol=symbol, records=np.empty(0, dtype=RECORD_DTYPE))
+
+    @classmethod
+    def from_raw(cls, symbol: str, bars_raw: Iterable[Any]) -> BarSeries:
+        """Build an in-memory series from alpaca-py bar objects."""
+
+        return cls(symbol=symbol, records=records_from_raw(bars_raw))
+
+    def __len__(self) -> int:
+        return int(self.records.shape[0])
+
+    @property
+    def day(self) -> npt.NDArray[np.int64]:
+        return self.records["day"]
+
+    @property
+    def timestamp(self) -> npt.NDArray[np.int64]:
+        return self.records["ts"]
+
+    @property
+    def open(self) -> npt.NDArray[np.float64]:
+        return self.records["open"]
+
+    @property
+    def high(self) -> npt.NDArray[np.float64]:
+        return self.records["high"]
+
+    @property
+    def low(self) -> npt.NDArray[np.float64]:
+        return self.records["low"]
+
+    @property
+    def close(self) -> npt.NDArray[np.float64]:
+        return self.records["close"]
+
+    @property
+    def volume(self) -> npt.NDArray[np.int64]:
+        return self.records["volume"]
+
+    def tail(self, n: int) -> BarSeries:
+        if n <= 0:
+            return BarSeries(symbol=self.symbol, records=self.records[:0])
+        return BarSeries(symbol=self.symbol, records=self.records[-n:])
+
+    @overload
+    def __getitem__(self, index: int) -> Bar: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> BarSeries: ...
+
+    def __getitem__(self, index: int | slice) -> Bar | BarSeries:
+        if isinstance(index, slice):
+            return BarSeries(symbol=self.symbol, records=self.records[index])
+        return _to_bar(self.records[index])
+
+    def __iter__(self) -> Iterator[Bar]:
+        for record in self.records:
+            yield _to_bar(record)
+
+    def to_bars(self) -> tuple[Bar, ...]:
+        """Materialise every :class:`Bar` (``Decimal`` fields) at once."""
+
+        return tuple(self)
+
+    # ------------------------------------------------------------------
+    # Vectorised analytics
+    # ------------------------------------------------------------------
+    @property
+    def dollar_volume(self) -> npt.NDArray[np.float64]:
+        return self.close * self.volume
+
+    def column(self, field: BarField) -> npt.NDArray[np.float64]:
+        if field == "dollar_volume":
+            return self.dollar_volume
+        return self.records[field].astype(np.float64, copy=False)
+
+    def adv_usd(self, window: int | None = None) -> float:
+        """Mean dollar volume of the last ``window`` bars (all when ``None``).
+
+        ``0.0`` for an empty series.
+        """
+
+        series = self if window is None else self.tail(window)
+        if not len(series):
+            return 0.0
+        return float(np.dot(series.close, series.volume)) / len(series)
+
+    def returns(self, *, log: bool = False) -> npt.NDArray[np.float64]:
+        """Close-to-close returns, one shorter than the series."""
+
+        close = self.close
+        if len(close) < 2:
+            return np.empty(0, dtype=np.float64)
+        if log:
+            return np.diff(np.log(close))
+        return close[1:] / close[:-1] - 1.0
+
+    def rolling_mean(self, window: int, *, field: BarField = "close") -> npt.NDArray[np.float64]:
+        """Trailing ``window``-bar means; element ``i`` ends at bar ``i + window - 1``."""
+
+        return rolling_mean(self.column(field), window)
+
+    def rolling_std(
+        self, window: int, *, field: BarField = "close", ddof: int = 0,
+    ) -> npt.NDArray[np.float64]:
+        return rolling_std(self.column(field), window, ddof=ddof)
+
+
+def rolling_mean(values: npt.ArrayLike, window: int) -> npt.NDArray[np.float64]:
+    """Means of every full ``window``-long run of ``values`` (empty if too short)."""
+
+    return _windows(values, window).mean(axis=-1)
+
+
+def rolling_std(values: npt.ArrayLike, window: int, *, ddof: int = 0) -> npt.NDArray[np.float64]:
+    return _windows(values, window).std(axis=-1, ddof=ddof)
+
+
+def _windows(values: npt.ArrayLike, window: int) -> npt.NDArray[np.float64]:
+    if window <= 0:
+        raise ValueError("window must be positive")
+    arr = np.asarray(values, dtype=np.float64)
+    if len(arr) < window:
+        return np.empty((0, window), dtype=np.float64)
+    return sliding_window_view(arr, window)
+
+
+def _to_bar(record: Any) -> Bar:
+    return Bar(
+        timestamp=dt.datetime.fromtimestamp(int(record["ts"]), tz=dt.UTC),
+        open=Decimal(str(float(record["open"]))),
+        high=Decimal(str(float(record["high"]))),
+        low=Decimal(str(float(record["low"]))),
+        close=Decimal(str(float(record["close"]))),
+        volume=int(record["volume"]),
+    )
+
+
+def records_from_raw(bars_raw: Iterable[Any]) -> npt.NDArray[Any]:
+    """Convert alpaca-py bar objects into a day-sorted record array."""
+
+    rows = [
+        (
+            epoch_day(b.timestamp),
+            int(b.timestamp.timestamp()),
+            float(b.open),
+            float(b.high),
+            float(b.low),
+            float(b.close),
+            int(b.volume or 0),
+        )
+        for b in bars_raw
+    ]
+    records = np.array(rows, dtype=RECORD_DTYPE)
+    return records[np.argsort(records["day"], kind="stable")]
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Coverage:
+    """What the store knows about one symbol without mapping its records."""
+
+    covered_from: int  # earliest epoch-day the stored history is complete from
+    first_day: int | None
+    last_day: int | None
+    count: int
+
+
+class BarStore:
+    """One memory-mapped file of fixed-width daily bars per symbol."""
+
+    def __init__(self, root: Path | str | None = None) -> None:
+        self._root = Path(root) if root is not None else _DEFAULT_ROOT
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _path(self, symbol: str) -> Path:
+        return self._root / f"v{_FORMAT_VERSION}" / (safe_filename(symbol.upper()) + ".bars")
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def read(self, symbol: str) -> BarSeries:
+        """Zero-copy view of every stored bar for ``symbol``."""
+
+        symbol = symbol.upper()
+        path = self._path(symbol)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return BarSeries.empty(symbol)
+        count = (size - _HEADER_SIZE) // _RECORD_SIZE
+        if count <= 0:
+            return BarSeries.empty(symbol)
+        records = np.memmap(
+            path, dtype=RECORD_DTYPE, mode="r", offset=_HEADER_SIZE, shape=(count,),
+        )
+        return BarSeries(symbol=symbol, records=records)
+
+    def coverage(self, symbol: str) -> Coverage | None:
+        path = self._path(symbol.upper())
+        try:
+            with path.open("rb") as fh:
+                header = np.frombuffer(fh.read(_HEADER_SIZE), dtype=_HEADER_DTYPE)
+                size = os.fstat(fh.fileno()).st_size
+                count = max((size - _HEADER_SIZE) // _RECORD_SIZE, 0)
+                first = last = None
+                if count:
+                    first = int(np.frombuffer(fh.read(8), dtype="<i8")[0])
+                    fh.seek(_HEADER_SIZE + (count - 1) * _RECORD_SIZE)
+                    last = int(np.frombuffer(fh.read(8), dtype="<i8")[0])
+        except FileNotFoundError:
+            return None
+        if header.shape != (1,) or int(header["version"][0]) != _FORMAT_VERSION:
+            return None
+        return Coverage(
+            covered_from=int(header["covered_from"][0]),
+            first_day=first,
+            last_day=last,
+            count=count,
+        )
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def merge(
+        self, symbol: str, records: npt.NDArray[Any], *, covered_from: int | None = None,
+    ) -> None:
+        """Merge ``records`` into the symbol's history (incoming wins per day).
+
+        ``covered_from`` records that the caller fetched everything from that
+        epoch-day onwards, so later syncs know no backfill is needed.
+        """
+
+        symbol = symbol.upper()
+        path = self._path(symbol)
+        records = np.asarray(records, dtype=RECORD_DTYPE)
+        with self._lock, _file_lock(path):
+            cov = self.coverage(symbol)
+            if cov is None:
+                start = covered_from if covered_from is not None else _first_day(records)
+                self._rewrite(path, records, covered_from=start)
+                return
+            new_cov = cov.covered_from
+            if covered_from is not None:
+                new_cov = min(new_cov, covered_from)
+            if len(records) and cov.last_day is not None and new_cov == cov.covered_from:
+                first = int(records["day"][0])
+                if first == cov.last_day and _same_record(path, cov, records[0]):
+                    records = records[1:]  # the stored bar is already final
+                    if not len(records):
+                        return
+                    first = int(records["day"][0])
+                if first > cov.last_day:
+                    with path.open("ab") as fh:
+                        fh.write(records.tobytes())
+                    return
+            elif not len(records) and new_cov == cov.covered_from:
+                return
+            merged = _merge_records(self.read(symbol).records, records)
+            self._rewrite(path, merged, covered_from=new_cov)
+
+    def _rewrite(self, path: Path, records: npt.NDArray[Any], *, covered_from: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(_header(covered_from))
+                fh.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Exclusive ``flock`` on ``<path>.lock`` (a no-op without ``fcntl``)."""
+
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path.with_name(path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def _same_record(path: Path, cov: Coverage, record: Any) -> bool:
+    """Whether the stored last bar is byte-identical to ``record``."""
+
+    with path.open("rb") as fh:
+        fh.seek(_HEADER_SIZE + (cov.count - 1) * _RECORD_SIZE)
+        return fh.read(_RECORD_SIZE) == np.asarray(record, dtype=RECORD_DTYPE).tobytes()
+
+
+def _header(covered_from: int) -> bytes:
+    return np.array([(_FORMAT_VERSION, covered_from)], dtype=_HEADER_DTYPE).tobytes()
+
+
+def _first_day(records: npt.NDArray[Any]) -> int:
+    return int(records["day"][0]) if len(records) else epoch_day(dt.datetime.now(dt.UTC))
+
+
+def _merge_records(existing: npt.NDArray[Any], incoming: npt.NDArray[Any]) -> npt.NDArray[Any]:
+    combined = np.concatenate([np.asarray(existing), incoming])
+    # Stable sort then keep the *last* occurrence per day so incoming wins.
+    order = np.argsort(combined["day"], kind="stable")
+    combined = combined[order]
+    keep = np.ones(len(combined), dtype=np.bool_)
+    keep[:-1] = combined["day"][1:] != combined["day"][:-1]
+    return combined[keep]
+
+
+__all__ = (
+    "RECORD_DTYPE",
+    "Bar",
+    "BarField",
+    "BarSeries",
+    "BarStore",
+    "Coverage",
+    "day_to_date",
+    "epoch_day",
+    "records_from_raw",
+    "rolling_mean",
+    "rolling_std",
+)
@@ -0,0 +1,205 @@
+"""Content-addressed store for raw payloads behind ``raw_content_uri``.
+
+Evidence refs, provenance records and ledger rows carry a sha256 but, until
+now, nowhere to resolve it: the raw payload was either recomputed or lost.
+:class:`BlobStore` keeps each payload once, under the same digest
+:class:`Provenance` already computes, and hands back a ``blob://sha256/…``
+URI that packets and rows store instead of the bytes.
+
+Design notes:
+
+- **Keyed by content.** The key is sha256 of the bytes stored, which for
+  structured payloads is their canonical JSON (see
+  :func:`canonical_hash`), so ``Provenance.content_hash`` *is* the key.
+  Writing the same payload twice is a ``stat`` and nothing else.
+- **Sharded.** ``<root>/ab/cd/<digest>[.gz|.zst]``: two levels of 256
+  directories keep any one directory small at millions of blobs.
+- **Compressed when it pays.** Payloads of at least ``min_compress_bytes``
+  are compressed with the same codecs as the cache and kept compressed
+  only if that saves space. The codec is the file extension.
+  :meth:`BlobStore.put_chunks` compresses pieces as they arrive, so a
+  canonical document is stored without ever being joined in memory.
+- **Memory-mapped reads.** :meth:`BlobStore.view` maps the file and
+  decompresses straight from the mapping. Uncompressed blobs are served
+  zero-copy from the page cache.
+- **Write once.** Blobs are written to a temp file and ``os.replace``-d
+  into place, so a reader never sees a partial blob and racing writers of
+  the same digest both succeed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import itertools
+import mmap
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Final, cast
+
+from stockripper.data.cache import (
+    DEFAULT_COMPRESSION,
+    available_codecs,
+    compress,
+    compress_stream,
+    decompress,
+)
+
+_DEFAULT_ROOT: Final[Path] = Path(".data-cache") / "blobs"
+_URI_PREFIX: Final[str] = "blob://sha256/"
+_DIGEST_RE: Final[re.Pattern[str]] = re.compile(r"^[0-9a-f]{64}$")
+_EXTENSIONS: Final[dict[str, str]] = {"identity": "", "gzip": ".gz", "zstd": ".zst"}
+_DEFAULT_CODEC: Final[str] = DEFAULT_COMPRESSION["sec_edgar"]
+_COMPRESS_MIN_BYTES: Final[int] = 1024
+
+
+def blob_uri(digest: str) -> str:
+    return f"{_URI_PREFIX}{digest}"
+
+
+def parse_blob_uri(uri_or_digest: str) -> str:
+    """The digest named by a ``blob://sha256/…`` URI (or a bare digest)."""
+
+    digest = uri_or_digest.removeprefix(_URI_PREFIX)
+    if not _DIGEST_RE.match(digest):
+        raise ValueError(f"not a sha256 blob reference: {uri_or_digest!r}")
+    return digest
+
+
+class BlobStore:
+    """Sharded, compressed, deduplicated blobs keyed by sha256."""
+
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        *,
+        codec: str = _DEFAULT_CODEC,
+        min_compress_bytes: int = _COMPRESS_MIN_BYTES,
+    ) -> None:
+        if codec not in available_codecs() or codec not in _EXTENSIONS:
+            raise ValueError(f"unknown codec {codec!r}")
+        self._root = Path(root) if root is not None else _DEFAULT_ROOT
+        self._codec = codec
+        self._min_compress_bytes = min_compress_bytes
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def _base(self, digest: str) -> Path:
+        return self._root / digest[:2] / digest[2:4] / digest
+
+    def _find(self, digest: str) -> tuple[Path, str] | None:
+        base = self._base(digest)
+        for codec, ext in _EXTENSIONS.items():
+            path = base.with_name(base.name + ext)
+            if path.exists():
+                return path, codec
+        return None
+
+    def contains(self, uri_or_digest: str) -> bool:
+        return self._find(parse_blob_uri(uri_or_digest)) is not None
+
+    def put(self, data: bytes | str, *, digest: str | None = None) -> str:
+        """Store ``data`` (if new) and return its URI.
+
+        ``digest`` skips re-hashing when the caller already has it; it must
+        be the sha256 of ``data``.
+        """
+
+        raw = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+        digest = digest if digest is not None else hashlib.sha256(raw).hexdigest()
+        parse_blob_uri(digest)
+        if self._find(digest) is not None:
+            return blob_uri(digest)
+        codec, payload = "identity", raw
+        if self._codec != "identity" and len(raw) >= self._min_compress_bytes:
+            packed = compress(raw, self._codec)
+            if len(packed) < len(raw):
+                codec, payload = self._codec, packed
+        self._write(digest, codec, (payload,))
+        return blob_uri(digest)
+
+    def put_chunks(self, chunks: Iterable[bytes], *, digest: str) -> str:
+        """Store the concatenation of ``chunks`` (if new) and return its URI.
+
+        The pieces are compressed and written as they arrive, so the whole
+        payload is never held at once. ``digest`` must be the sha256 of the
+        concatenation. Streamed blobs are kept compressed once they reach
+        ``min_compress_bytes``, without the size check :meth:`put` makes.
+        """
+
+        parse_blob_uri(digest)
+        if self._find(digest) is not None:
+            return blob_uri(digest)
+        pieces = iter(chunks)
+        head: list[bytes] = []
+        size = 0
+        for chunk in pieces:
+            head.append(chunk)
+            size += len(chunk)
+            if size >= self._min_compress_bytes:
+                break
+        if self._codec == "identity" or size < self._min_compress_bytes:
+            self._write(digest, "identity", itertools.chain(head, pieces))
+        else:
+            packed = compress_stream(itertools.chain(head, pieces), self._codec)
+            self._write(digest, self._codec, packed)
+        return blob_uri(digest)
+
+    def _write(self, digest: str, codec: str, pieces: Iterable[bytes]) -> None:
+        base = self._base(digest)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=base.parent, prefix=f".{digest[:8]}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                for piece in pieces:
+                    fh.write(piece)
+            os.replace(tmp, base.with_name(base.name + _EXTENSIONS[codec]))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    @contextlib.contextmanager
+    def view(self, uri_or_digest: str) -> Iterator[memoryview]:
+        """Map the blob; the view is only valid inside the ``with`` block.
+
+        Raises :class:`KeyError` when the blob is not stored.
+        """
+
+        digest = parse_blob_uri(uri_or_digest)
+        found = self._find(digest)
+        if found is None:
+            raise KeyError(digest)
+        path, codec = found
+        with open(path, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if codec != "identity":
+                    # The decompressors take any buffer; no copy of the file.
+                    yield memoryview(decompress(cast(bytes, mapped), codec))
+                    return
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def read(self, uri_or_digest: str, *, verify: bool = False) -> bytes:
+        """The blob's bytes; ``verify`` re-hashes them against the key."""
+
+        digest = parse_blob_uri(uri_or_digest)
+        with self.view(digest) as view:
+            data = bytes(view)
+        if verify and hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"blob {digest} does not match its digest")
+        return data
+
+
+__all__ = ("BlobStore", "blob_uri", "parse_blob_uri")
@@ -1,4 +1,4 @@
-"""TTL JSON file cache used by data adapters.
+"""TTL caches used by data adapters.
 
 Design notes (per Phase 2 rubber-duck critique):
 
@@ -8,33 +8,182 @@ Design notes (per Phase 2 rubber-duck critique):
   treated as a cache miss and the file is unlinked; the caller will refetch
   and overwrite.
 - **Versioned payloads.** Each on-disk record carries a ``schema_version``
-  so future format changes are non-breaking.
-- **No concurrency promises across processes.** This is a single-process
-  TTL cache. Phase 3 may replace it with a SQL cache table if needed.
+  so future format changes are non-breaking. Version 2 stores the value as
+  a separately encoded payload so it can be compressed.
+- **Per-namespace compression.** Payloads of at least
+  ``_COMPRESS_MIN_BYTES`` are compressed with the namespace's codec (zstd
+  where the stdlib has it, else gzip; ``sec_edgar`` by default — multi-MB
+  company-facts documents shrink ~10x). Each record names its codec, so
+  changing the configuration never invalidates existing entries.
+  :meth:`JsonFileCache.usage` / :meth:`SqliteCache.usage` report on-disk
+  versus logical bytes.
+- **Two backends.** :class:`JsonFileCache` is a single-process TTL cache,
+  one file per key — easy to eyeball while debugging. :class:`SqliteCache`
+  keeps every namespace in one WAL-mode SQLite file with atomic upserts
+  and an indexed expiry column, so ``run-day``, the dashboard and ad-hoc
+  ``research`` runs can share it concurrently. The process-wide default
+  (:func:`shared_cache`) uses SQLite; JSON entries left in its root by
+  earlier versions are imported into it once and their files removed.
+- **Optional memory tier.** :class:`MemoryCacheTier` is a bounded LRU that
+  sits in front of any backend so hot keys (the SEC ticker map, multi-MB
+  company-facts documents) skip the read/parse on repeat hits within a
+  process. It honours the backing TTL and is invalidated by ``put`` /
+  ``delete`` through the tier.
+- **Stale-while-revalidate.** :func:`read_through` can serve an entry that
+  expired less than a per-namespace ``grace`` ago, returning at once and
+  refreshing it on a background thread; callers tag such results
+  ``served_stale`` in their provenance.
+- **Raw reads.** :func:`read_raw` hands back an entry's JSON text without
+  decoding it, for callers that parse only part of a large value;
+  :func:`read_raw_entry` adds the entry's validators.
+- **HTTP validators.** An entry may carry the ``ETag`` / ``Last-Modified``
+  it was served with. :func:`read_through_validated` keeps expired entries
+  for up to :data:`REVALIDATE_HORIZON`, hands their validators to the fetch
+  and, when the origin answers ``304 Not Modified``, only extends the
+  expiry (:meth:`SqliteCache.touch`) instead of rewriting the payload.
+  Only the validators of an expired entry are read (:func:`read_validators`);
+  the value is decoded once the origin has confirmed it.
+  :func:`read_through_validated_async` drives the same steps for coroutine
+  fetches, with every cache access on a worker thread.
+  ``purge_expired`` keeps such entries until the horizon has passed too.
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextlib
 import datetime as dt
+import functools
+import gzip
 import hashlib
+import importlib
 import json
+import logging
 import os
 import re
+import sqlite3
 import threading
-from dataclasses import dataclass
+import zlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Final
+from typing import Any, Final, NamedTuple, Protocol
 
-_SCHEMA_VERSION: Final[int] = 1
+from stockripper.data.singleflight import SingleFlight
+
+LOG: Final = logging.getLogger(__name__)
+
+_SCHEMA_VERSION: Final[int] = 2
 _DEFAULT_CACHE_ROOT: Final[Path] = Path(".data-cache")
 _SAFE_KEY_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+_NO_GRACE: Final[dt.timedelta] = dt.timedelta(0)
+_DEFAULT_SQLITE_NAME: Final[str] = "cache.sqlite3"
+_SQLITE_BUSY_TIMEOUT_S: Final[float] = 30.0
+# Table layout version, kept in ``PRAGMA user_version``.
+_SQLITE_LAYOUT_VERSION: Final[int] = 1
+# Last-access times are only rewritten when older than this, so hot keys
+# do not turn every read into a write.
+_ACCESS_RESOLUTION: Final[dt.timedelta] = dt.timedelta(minutes=1)
+_COMPRESS_MIN_BYTES: Final[int] = 1024
+_DEFAULT_MEMORY_MAX_ENTRIES: Final[int] = 512
+_DEFAULT_MEMORY_MAX_BYTES: Final[int] = 128 * 1024 * 1024
+# How long after expiry an entry is still worth revalidating rather than
+# refetching outright. ``purge_expired`` keeps entries with validators this
+# long past expiry; LRU eviction under a byte budget may still drop them.
+REVALIDATE_HORIZON: Final[dt.timedelta] = dt.timedelta(days=30)
 
 
 def _utcnow() -> dt.datetime:
     return dt.datetime.now(dt.UTC)
 
 
-def _safe_filename(key: str) -> str:
+# ---------------------------------------------------------------------------
+# Payload codecs
+# ---------------------------------------------------------------------------
+_Codec = tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+_CODECS: dict[str, _Codec] = {
+    "identity": (bytes, bytes),
+    "gzip": (lambda data: gzip.compress(data, compresslevel=6, mtime=0), gzip.decompress),
+}
+try:  # Python 3.14+
+    _zstd = importlib.import_module("compression.zstd")
+    _CODECS["zstd"] = (_zstd.compress, _zstd.decompress)
+except ImportError:
+    pass
+
+DEFAULT_COMPRESSION: Final[Mapping[str, str]] = {
+    "sec_edgar": "zstd" if "zstd" in _CODECS else "gzip",
+}
+
+
+def available_codecs() -> tuple[str, ...]:
+    return tuple(sorted(_CODECS))
+
+
+def _check_compression(compression: Mapping[str, str] | None) -> dict[str, str]:
+    resolved = dict(DEFAULT_COMPRESSION if compression is None else compression)
+    unknown = sorted(set(resolved.values()) - set(_CODECS))
+    if unknown:
+        raise ValueError(f"unsupported cache codec(s) {unknown}; available: {available_codecs()}")
+    return resolved
+
+
+def _encode(value: Any, codec: str) -> tuple[bytes, str, int]:
+    """``(payload, codec_used, logical_bytes)`` for ``value``."""
+
+    data = json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+    if codec == "identity" or len(data) < _COMPRESS_MIN_BYTES:
+        return data, "identity", len(data)
+    return compress(data, codec), codec, len(data)
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    """``data`` packed with one of :func:`available_codecs`."""
+
+    return _codec(codec)[0](data)
+
+
+def compress_stream(chunks: Iterable[bytes], codec: str) -> Iterator[bytes]:
+    """:func:`compress` over ``chunks`` without joining them first.
+
+    The concatenated output decompresses with :func:`decompress`.
+    """
+
+    _codec(codec)
+    if codec == "identity":
+        yield from chunks
+        return
+    packer: Any = (
+        zlib.compressobj(6, zlib.DEFLATED, 31) if codec == "gzip" else _zstd.ZstdCompressor()
+    )
+    for chunk in chunks:
+        packed = packer.compress(chunk)
+        if packed:
+            yield packed
+    yield packer.flush()
+
+
+def decompress(payload: bytes, codec: str) -> bytes:
+    """Inverse of :func:`compress`; accepts any bytes-like buffer."""
+
+    return _codec(codec)[1](payload)
+
+
+def _codec(codec: str) -> _Codec:
+    try:
+        return _CODECS[codec]
+    except KeyError:
+        raise ValueError(f"unknown codec {codec!r}") from None
+
+
+def _decode(payload: bytes, codec: str) -> Any:
+    return json.loads(decompress(payload, codec))
+
+
+def safe_filename(key: str) -> str:
     """Normalise an arbitrary cache key into a safe filename.
 
     Plain keys pass through; anything containing path separators or other
@@ -49,23 +198,98 @@ def _safe_filename(key: str) -> str:
 
 @dataclass
 class CacheEntry:
-    """In-memory view of a cache record."""
+    """In-memory view of a cache record.
+
+    ``size_bytes`` is what the backend stores (after compression);
+    ``logical_bytes`` is the uncompressed JSON size. Either is ``0`` when
+    unknown. ``validators`` are the HTTP ``etag`` / ``last_modified`` the
+    value was served with, if any.
+    """
 
     key: str
     value: Any
     expires_at: dt.datetime
     written_at: dt.datetime
+    size_bytes: int = 0
+    logical_bytes: int = 0
+    validators: Mapping[str, str] = field(default_factory=dict)
+
+    def is_expired(self, now: dt.datetime | None = None) -> bool:
+        """True for a stale entry returned under a ``grace`` period."""
+
+        return self.expires_at <= (now if now is not None else _utcnow())
+
+
+@dataclass(frozen=True)
+class RawEntry:
+    """A live entry's undecoded JSON text and its HTTP validators."""
+
+    data: bytes
+    validators: Mapping[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CacheUsage:
+    """Per-namespace storage footprint."""
+
+    entries: int
+    disk_bytes: int
+    logical_bytes: int
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.logical_bytes / self.disk_bytes if self.disk_bytes else 1.0
+
+
+@dataclass(frozen=True)
+class EntryInfo:
+    """Metadata for one stored entry (no payload)."""
+
+    namespace: str
+    key: str
+    disk_bytes: int
+    written_at: dt.datetime
+    expires_at: dt.datetime
+    accessed_at: dt.datetime
+
+
+class CacheBackend(Protocol):
+    """The get/put/delete surface every data adapter relies on."""
+
+    def get(
+        self, namespace: str, key: str, *, grace: dt.timedelta = ...,
+    ) -> CacheEntry | None: ...
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        *,
+        ttl: dt.timedelta,
+        validators: Mapping[str, str] | None = ...,
+    ) -> CacheEntry: ...
+
+    def delete(self, namespace: str, key: str) -> None: ...
 
 
 class JsonFileCache:
-    """Simple TTL JSON cache backed by a directory of files.
+    """Simple TTL cache backed by a directory of files.
 
     Each provider gets its own subdirectory (``alpaca``, ``sec_edgar`` etc.)
-    so on-disk layout is human-skimmable when debugging.
+    so on-disk layout is human-skimmable when debugging. A file is one JSON
+    header line (version, timestamps, codec) followed by the payload bytes;
+    uncompressed payloads are plain JSON.
     """
 
-    def __init__(self, root: Path | str | None = None) -> None:
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        *,
+        compression: Mapping[str, str] | None = None,
+    ) -> None:
         self._root = Path(root) if root is not None else _DEFAULT_CACHE_ROOT
+        self._compression = _check_compression(compression)
         self._lock = threading.Lock()
 
     @property
@@ -73,41 +297,81 @@ class JsonFileCache:
         return self._root
 
     def _path(self, namespace: str, key: str) -> Path:
-        return self._root / namespace / (_safe_filename(key) + ".json")
+        return self._root / namespace / (safe_filename(key) + ".json")
 
-    def get(self, namespace: str, key: str) -> CacheEntry | None:
-        """Return the entry if present and not expired; otherwise None."""
+    def get(
+        self, namespace: str, key: str, *, grace: dt.timedelta = _NO_GRACE,
+    ) -> CacheEntry | None:
+        """Return the entry if present and not expired; otherwise None.
+
+        ``grace`` also returns entries that expired less than ``grace`` ago
+        (check :meth:`CacheEntry.is_expired`).
+        """
 
         path = self._path(namespace, key)
         if not path.exists():
             return None
         try:
-            raw = path.read_text(encoding="utf-8")
-            record = json.loads(raw)
-        except (OSError, json.JSONDecodeError):
-            with self._lock:
-                path.unlink(missing_ok=True)
-            return None
-        if record.get("schema_version") != _SCHEMA_VERSION:
-            with self._lock:
-                path.unlink(missing_ok=True)
-            return None
-        try:
-            expires_at = dt.datetime.fromisoformat(record["expires_at"])
-            written_at = dt.datetime.fromisoformat(record["written_at"])
-        except (KeyError, ValueError):
+            raw = path.read_bytes()
+            header_line, _, payload = raw.partition(b"\n")
+            header = _parse_header(header_line)
+            if header is None:
+                raise ValueError("bad header")
+            expires_at, written_at, codec, logical, validators = header
+            if expires_at + grace <= _utcnow():
+                return None
+            value = _decode(payload, codec)
+        except (OSError, ValueError):
             with self._lock:
                 path.unlink(missing_ok=True)
             return None
-        if expires_at <= _utcnow():
-            return None
+        # The file's mtime doubles as its last-access time for LRU eviction.
+        with contextlib.suppress(OSError):
+            os.utime(path)
         return CacheEntry(
             key=key,
-            value=record["value"],
+            value=value,
             expires_at=expires_at,
             written_at=written_at,
+            size_bytes=len(raw),
+            logical_bytes=logical,
+            validators=validators,
         )
 
+    def get_bytes(self, namespace: str, key: str) -> bytes | None:
+        """The live entry's JSON text, without decoding it; None on a miss."""
+
+        raw = self.get_raw(namespace, key)
+        return raw.data if raw is not None else None
+
+    def get_raw(self, namespace: str, key: str) -> RawEntry | None:
+        """:meth:`get_bytes` plus the entry's validators."""
+
+        path = self._path(namespace, key)
+        try:
+            header_line, _, payload = path.read_bytes().partition(b"\n")
+            header = _parse_header(header_line)
+            if header is None or header[0] <= _utcnow():
+                return None
+            return RawEntry(decompress(payload, header[2]), header[4])
+        except (OSError, ValueError):
+            return None
+
+    def get_validators(self, namespace: str, key: str) -> Mapping[str, str] | None:
+        """Validators of an entry expired less than :data:`REVALIDATE_HORIZON` ago.
+
+        Reads the header line only. None when there is no such entry.
+        """
+
+        try:
+            with self._path(namespace, key).open("rb") as fh:
+                header = _parse_header(fh.readline())
+        except OSError:
+            return None
+        if header is None or header[0] + REVALIDATE_HORIZON <= _utcnow():
+            return None
+        return header[4]
+
     def put(
         self,
         namespace: str,
@@ -115,34 +379,1137 @@ class JsonFileCache:
         value: Any,
         *,
         ttl: dt.timedelta,
+        validators: Mapping[str, str] | None = None,
     ) -> CacheEntry:
         """Write a value atomically with the requested TTL."""
 
         now = _utcnow()
         expires_at = now + ttl
-        record = {
+        payload, codec, logical = _encode(value, self._compression.get(namespace, "identity"))
+        header = {
             "schema_version": _SCHEMA_VERSION,
             "namespace": namespace,
             "key": key,
-            "value": value,
             "written_at": now.isoformat(),
             "expires_at": expires_at.isoformat(),
+            "codec": codec,
+            "logical_bytes": logical,
         }
+        if validators:
+            header["validators"] = dict(validators)
+        data = json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n" + payload
         path = self._path(namespace, key)
         path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = path.with_suffix(path.suffix + ".tmp")
         with self._lock:
-            tmp_path.write_text(
-                json.dumps(record, default=str, separators=(",", ":")),
-                encoding="utf-8",
+            self._write(path, data)
+        return CacheEntry(
+            key=key,
+            value=value,
+            expires_at=expires_at,
+            written_at=now,
+            size_bytes=len(data),
+            logical_bytes=logical,
+            validators=dict(validators or {}),
+        )
+
+    def touch(self, namespace: str, key: str, *, ttl: dt.timedelta) -> dt.datetime | None:
+        """Make an entry (expired or not) live for ``ttl`` from now.
+
+        Only the header line is rewritten; the payload is copied through
+        without decoding. Returns the new expiry, or None if there is no
+        readable entry.
+        """
+
+        path = self._path(namespace, key)
+        with self._lock:
+            try:
+                header_line, _, payload = path.read_bytes().partition(b"\n")
+                header = json.loads(header_line)
+            except (OSError, ValueError):
+                return None
+            if not isinstance(header, dict) or _parse_header(header_line) is None:
+                return None
+            expires_at = _utcnow() + ttl
+            header["expires_at"] = expires_at.isoformat()
+            self._write(
+                path, json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n" + payload,
             )
-            os.replace(tmp_path, path)
-        return CacheEntry(key=key, value=value, expires_at=expires_at, written_at=now)
+        return expires_at
+
+    def _write(self, path: Path, data: bytes) -> None:
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
 
     def delete(self, namespace: str, key: str) -> None:
         path = self._path(namespace, key)
         with self._lock:
             path.unlink(missing_ok=True)
 
+    def entries(self, namespace: str | None = None) -> Iterator[EntryInfo]:
+        """Metadata for every readable entry; ``accessed_at`` is the mtime."""
+
+        if not self._root.is_dir():
+            return
+        dirs = [self._root / namespace] if namespace else sorted(self._root.iterdir())
+        for ns_dir in dirs:
+            if not ns_dir.is_dir():
+                continue
+            for path in ns_dir.glob("*.json"):
+                try:
+                    with path.open("rb") as fh:
+                        header = _parse_header(fh.readline())
+                        stat = os.fstat(fh.fileno())
+                except OSError:
+                    continue
+                if header is None:
+                    continue
+                yield EntryInfo(
+                    namespace=ns_dir.name,
+                    key=path.stem,
+                    disk_bytes=stat.st_size,
+                    written_at=header[1],
+                    expires_at=header[0],
+                    accessed_at=dt.datetime.fromtimestamp(stat.st_mtime, tz=dt.UTC),
+                )
+
+    def purge_expired(self, *, now: dt.datetime | None = None) -> int:
+        """Unlink every expired or unreadable file; returns how many went.
+
+        Files with validators are kept until :data:`REVALIDATE_HORIZON`
+        after expiry.
+        """
+
+        now = now if now is not None else _utcnow()
+        removed = 0
+        if not self._root.is_dir():
+            return removed
+        for path in self._root.glob("*/*.json"):
+            try:
+                with path.open("rb") as fh:
+                    header = _parse_header(fh.readline())
+            except OSError:
+                continue
+            if header is None or _purge_after(header[0], header[4]) <= now:
+                with self._lock:
+                    path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def usage(self) -> dict[str, CacheUsage]:
+        """On-disk vs logical bytes per namespace (reads headers only)."""
+
+        out: dict[str, CacheUsage] = {}
+        if not self._root.is_dir():
+            return out
+        for ns_dir in sorted(p for p in self._root.iterdir() if p.is_dir()):
+            entries = disk = logical = 0
+            for path in ns_dir.glob("*.json"):
+                try:
+                    with path.open("rb") as fh:
+                        header = _parse_header(fh.readline())
+                        size = os.fstat(fh.fileno()).st_size
+                except OSError:
+                    continue
+                if header is None:
+                    continue
+                entries += 1
+                disk += size
+                logical += header[3]
+            if entries:
+                out[ns_dir.name] = CacheUsage(
+                    entries=entries, disk_bytes=disk, logical_bytes=logical,
+                )
+        return out
+
+
+def _purge_after(expires_at: dt.datetime, validators: Mapping[str, str]) -> dt.datetime:
+    return expires_at + REVALIDATE_HORIZON if validators else expires_at
+
+
+def _parse_header(
+    line: bytes,
+) -> tuple[dt.datetime, dt.datetime, str, int, dict[str, str]] | None:
+    """``(expires_at, written_at, codec, logical_bytes, validators)`` or None."""
+
+    try:
+        header = json.loads(line)
+        if not isinstance(header, dict) or header.get("schema_version") != _SCHEMA_VERSION:
+            return None
+        return (
+            dt.datetime.fromisoformat(header["expires_at"]),
+            dt.datetime.fromisoformat(header["written_at"]),
+            str(header["codec"]),
+            int(header["logical_bytes"]),
+            {str(k): str(v) for k, v in (header.get("validators") or {}).items()},
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# SQLite backend
+# ---------------------------------------------------------------------------
+# A file whose ``PRAGMA user_version`` differs from _SQLITE_LAYOUT_VERSION
+# has its tables dropped and recreated (it is a cache — entries are simply
+# refetched).
+_SQLITE_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    schema_version INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    value BLOB NOT NULL,
+    logical_bytes INTEGER NOT NULL,
+    validators TEXT,
+    written_at_us INTEGER NOT NULL,
+    expires_at_us INTEGER NOT NULL,
+    accessed_at_us INTEGER NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at_us);
+CREATE TABLE IF NOT EXISTS cache_counters (
+    namespace TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    evictions INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+_EPOCH: Final[dt.datetime] = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+
+def _to_us(value: dt.datetime) -> int:
+    return (value - _EPOCH) // dt.timedelta(microseconds=1)
+
+
+def _from_us(value: int) -> dt.datetime:
+    return _EPOCH + dt.timedelta(microseconds=value)
+
+
+class SqliteCache:
+    """TTL cache in one WAL-mode SQLite file, safe across processes.
+
+    Each thread gets its own connection (re-opened after ``fork``); writers
+    wait on ``busy_timeout`` rather than failing while another process
+    holds the write lock. Readers never block writers under WAL.
+
+    Hit/miss counters accumulate in memory and are added to the shared
+    ``cache_counters`` table by :meth:`flush_stats`, so ``stockripper cache
+    stats`` sees totals across every process. A :class:`MemoryCacheTier` in
+    front adds its own hits through :meth:`record_hits`.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        busy_timeout_s: float = _SQLITE_BUSY_TIMEOUT_S,
+        compression: Mapping[str, str] | None = None,
+    ) -> None:
+        self._path = Path(path) if path is not None else _DEFAULT_CACHE_ROOT / _DEFAULT_SQLITE_NAME
+        self._busy_timeout_s = busy_timeout_s
+        self._compression = _check_compression(compression)
+        self._local = threading.local()
+        self._pending: dict[str, CacheStats] = {}
+        self._pending_lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _conn(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self._path, timeout=self._busy_timeout_s, isolation_level=None,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != _SQLITE_LAYOUT_VERSION:
+                conn.execute("DROP TABLE IF EXISTS cache_entries")
+                conn.execute("DROP TABLE IF EXISTS cache_counters")
+                conn.execute(f"PRAGMA user_version = {_SQLITE_LAYOUT_VERSION}")
+            for statement in _SQLITE_SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(
+        self, namespace: str, key: str, *, grace: dt.timedelta = _NO_GRACE,
+    ) -> CacheEntry | None:
+        """Same contract as :meth:`JsonFileCache.get`."""
+
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT schema_version, codec, value, logical_bytes, validators, written_at_us, "
+            "expires_at_us, accessed_at_us FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        now_us = _to_us(_utcnow())
+        if row is None:
+            self._count(namespace, hit=False)
+            return None
+        version, codec, raw, logical, validators, written_us, expires_us, accessed_us = row
+        if expires_us <= now_us - grace // dt.timedelta(microseconds=1):
+            self._count(namespace, hit=False)
+            return None
+        try:
+            if version != _SCHEMA_VERSION:
+                raise ValueError(f"schema_version {version}")
+            value = _decode(raw, codec)
+        except (OSError, ValueError):
+            self.delete(namespace, key)
+            self._count(namespace, hit=False)
+            return None
+        self._count(namespace, hit=True)
+        if now_us - accessed_us >= _ACCESS_RESOLUTION // dt.timedelta(microseconds=1):
+            conn.execute(
+                "UPDATE cache_entries SET accessed_at_us = ? WHERE namespace = ? AND key = ?",
+                (now_us, namespace, key),
+            )
+        return CacheEntry(
+            key=key,
+            value=value,
+            expires_at=_from_us(expires_us),
+            written_at=_from_us(written_us),
+            size_bytes=len(raw),
+            logical_bytes=logical,
+            validators=json.loads(validators) if validators else {},
+        )
+
+    def get_bytes(self, namespace: str, key: str) -> bytes | None:
+        """Same contract as :meth:`JsonFileCache.get_bytes`."""
+
+        raw = self.get_raw(namespace, key)
+        return raw.data if raw is not None else None
+
+    def get_raw(self, namespace: str, key: str) -> RawEntry | None:
+        """Same contract as :meth:`JsonFileCache.get_raw`."""
+
+        row = self._conn().execute(
+            "SELECT schema_version, codec, value, validators FROM cache_entries "
+            "WHERE namespace = ? AND key = ? AND expires_at_us > ?",
+            (namespace, key, _to_us(_utcnow())),
+        ).fetchone()
+        if row is None or row[0] != _SCHEMA_VERSION:
+            return None
+        try:
+            return RawEntry(decompress(row[2], row[1]), json.loads(row[3]) if row[3] else {})
+        except (OSError, ValueError):
+            return None
+
+    def get_validators(self, namespace: str, key: str) -> Mapping[str, str] | None:
+        """Same contract as :meth:`JsonFileCache.get_validators`; the value is not read."""
+
+        horizon_us = REVALIDATE_HORIZON // dt.timedelta(microseconds=1)
+        row = self._conn().execute(
+            "SELECT validators FROM cache_entries "
+            "WHERE namespace = ? AND key = ? AND expires_at_us > ?",
+            (namespace, key, _to_us(_utcnow()) - horizon_us),
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            validators: dict[str, str] = json.loads(row[0]) if row[0] else {}
+        except ValueError:
+            return None
+        return validators
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        *,
+        ttl: dt.timedelta,
+        validators: Mapping[str, str] | None = None,
+    ) -> CacheEntry:
+        """Insert or replace a value in one atomic statement."""
+
+        now = _utcnow()
+        expires_at = now + ttl
+        payload, codec, logical = _encode(value, self._compression.get(namespace, "identity"))
+        self._conn().execute(
+            "INSERT INTO cache_entries (namespace, key, schema_version, codec, value, "
+            "logical_bytes, validators, written_at_us, expires_at_us, accessed_at_us) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (namespace, key) DO UPDATE SET "
+            "schema_version = excluded.schema_version, codec = excluded.codec, "
+            "value = excluded.value, logical_bytes = excluded.logical_bytes, "
+            "validators = excluded.validators, written_at_us = excluded.written_at_us, expires_at_us = excluded.expires_at_us, "
+            "accessed_at_us = excluded.accessed_at_us",
+            (
+                namespace,
+                key,
+                _SCHEMA_VERSION,
+                codec,
+                payload,
+                logical,
+                json.dumps(dict(validators), sort_keys=True) if validators else None,
+                _to_us(now),
+                _to_us(expires_at),
+                _to_us(now),
+            ),
+        )
+        return CacheEntry(
+            key=key,
+            value=value,
+            expires_at=expires_at,
+            written_at=now,
+            size_bytes=len(payload),
+            logical_bytes=logical,
+            validators=dict(validators or {}),
+        )
+
+    def touch(self, namespace: str, key: str, *, ttl: dt.timedelta) -> dt.datetime | None:
+        """Same contract as :meth:`JsonFileCache.touch`: one ``UPDATE``."""
+
+        now = _utcnow()
+        expires_at = now + ttl
+        cursor = self._conn().execute(
+            "UPDATE cache_entries SET expires_at_us = ?, accessed_at_us = ? "
+            "WHERE namespace = ? AND key = ?",
+            (_to_us(expires_at), _to_us(now), namespace, key),
+        )
+        return expires_at if cursor.rowcount else None
+
+    def delete(self, namespace: str, key: str) -> None:
+        self._conn().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key),
+        )
+
+    def purge_expired(self, *, now: dt.datetime | None = None) -> int:
+        """Delete every expired row in one statement; returns the row count.
+
+        Rows with validators are kept until :data:`REVALIDATE_HORIZON`
+        after expiry.
+        """
+
+        now_us = _to_us(now if now is not None else _utcnow())
+        cursor = self._conn().execute(
+            "DELETE FROM cache_entries WHERE expires_at_us <= ? "
+            "AND (validators IS NULL OR expires_at_us <= ?)",
+            (now_us, now_us - REVALIDATE_HORIZON // dt.timedelta(microseconds=1)),
+        )
+        return cursor.rowcount
+
+    def entries(self, namespace: str | None = None) -> Iterator[EntryInfo]:
+        """Metadata for every row (oldest access first)."""
+
+        sql = (
+            "SELECT namespace, key, LENGTH(value), written_at_us, expires_at_us, accessed_at_us "
+            "FROM cache_entries"
+        )
+        params: tuple[str, ...] = ()
+        if namespace is not None:
+            sql += " WHERE namespace = ?"
+            params = (namespace,)
+        rows = self._conn().execute(sql + " ORDER BY accessed_at_us", params).fetchall()
+        for ns, key, size, written_us, expires_us, accessed_us in rows:
+            yield EntryInfo(
+                namespace=ns,
+                key=key,
+                disk_bytes=size,
+                written_at=_from_us(written_us),
+                expires_at=_from_us(expires_us),
+                accessed_at=_from_us(accessed_us),
+            )
+
+    def import_json(self, root: Path | str) -> int:
+        """Move the entries of a :class:`JsonFileCache` at ``root`` in here.
+
+        Payloads are copied as stored, codec and validators included; a row
+        already present wins. Each imported or dead file is unlinked, so a
+        second call finds nothing to do. Files that are not cache entries
+        are left alone. Returns the number of entries imported.
+        """
+
+        now = _utcnow()
+        rows: list[tuple[Any, ...]] = []
+        done: list[Path] = []
+        for path in Path(root).glob("*/*.json"):
+            try:
+                header_line, _, payload = path.read_bytes().partition(b"\n")
+                parsed = _parse_header(header_line)
+                header = json.loads(header_line) if parsed is not None else None
+            except (OSError, ValueError):
+                continue
+            if parsed is None or not isinstance(header, dict):
+                continue
+            expires_at, written_at, codec, logical, validators = parsed
+            done.append(path)
+            if _purge_after(expires_at, validators) <= now or codec not in _CODECS:
+                continue
+            accessed_us = int(path.stat().st_mtime * 1_000_000)
+            rows.append((
+                str(header.get("namespace") or path.parent.name),
+                str(header.get("key") or path.stem),
+                _SCHEMA_VERSION,
+                codec,
+                payload,
+                logical,
+                json.dumps(validators, sort_keys=True) if validators else None,
+                _to_us(written_at),
+                _to_us(expires_at),
+                accessed_us,
+            ))
+        if rows:
+            conn = self._conn()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT INTO cache_entries (namespace, key, schema_version, codec, value, "
+                    "logical_bytes, validators, written_at_us, expires_at_us, accessed_at_us) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO NOTHING",
+                    rows,
+                )
+        for path in done:
+            path.unlink(missing_ok=True)
+        if done:
+            LOG.info("imported %d of %d JSON cache files from %s", len(rows), len(done), root)
+        return len(rows)
+
+    def record_evictions(self, namespace: str, count: int) -> None:
+        with self._pending_lock:
+            self._pending.setdefault(namespace, CacheStats()).evictions += count
+
+    def record_hits(self, namespace: str, count: int) -> None:
+        """Count hits a tier in front of this cache answered without asking it."""
+
+        with self._pending_lock:
+            self._pending.setdefault(namespace, CacheStats()).hits += count
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Counters from every process that has flushed, plus our unflushed ones."""
+
+        rows = self._conn().execute(
+            "SELECT namespace, hits, misses, evictions FROM cache_counters",
+        ).fetchall()
+        out = {ns: CacheStats(hits=h, misses=m, evictions=e) for ns, h, m, e in rows}
+        with self._pending_lock:
+            for ns, pending in self._pending.items():
+                total = out.setdefault(ns, CacheStats())
+                total.hits += pending.hits
+                total.misses += pending.misses
+                total.evictions += pending.evictions
+        return out
+
+    def flush_stats(self) -> None:
+        """Add this process's pending counters to the shared table."""
+
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO cache_counters (namespace, hits, misses, evictions) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (namespace) DO UPDATE SET "
+                "hits = hits + excluded.hits, misses = misses + excluded.misses, "
+                "evictions = evictions + excluded.evictions",
+                [(ns, c.hits, c.misses, c.evictions) for ns, c in pending.items()],
+            )
+
+    def _count(self, namespace: str, *, hit: bool) -> None:
+        with self._pending_lock:
+            stats = self._pending.setdefault(namespace, CacheStats())
+            if hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+
+    def usage(self) -> dict[str, CacheUsage]:
+        """On-disk (stored payload) vs logical bytes per namespace."""
+
+        rows = self._conn().execute(
+            "SELECT namespace, COUNT(*), SUM(LENGTH(value)), SUM(logical_bytes) "
+            "FROM cache_entries GROUP BY namespace ORDER BY namespace",
+        ).fetchall()
+        return {
+            ns: CacheUsage(entries=n, disk_bytes=disk, logical_bytes=logical)
+            for ns, n, disk, logical in rows
+        }
+
+    def close(self) -> None:
+        """Close the calling thread's connection (others close on GC)."""
+
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# ---------------------------------------------------------------------------
+# Memory tier
+# ---------------------------------------------------------------------------
+@dataclass
+class CacheStats:
+    """Per-namespace counters for :class:`MemoryCacheTier`."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MemoryCacheTier:
+    """Bounded in-process LRU in front of another :class:`CacheBackend`.
+
+    Bounded by both entry count and total logical (uncompressed) bytes; an entry larger
+    than the whole byte budget is never held in memory. Values are shared
+    between callers, so treat them as read-only.
+
+    Hits answered from memory never reach the backing store's counters;
+    :meth:`flush_stats` hands them over (misses fall through and are
+    counted there already) and flushes the backing store.
+    """
+
+    def __init__(
+        self,
+        backing: CacheBackend,
+        *,
+        max_entries: int = _DEFAULT_MEMORY_MAX_ENTRIES,
+        max_bytes: int = _DEFAULT_MEMORY_MAX_BYTES,
+    ) -> None:
+        self._backing = backing
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._stats: dict[str, CacheStats] = {}
+        self._unflushed_hits: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def backing(self) -> CacheBackend:
+        return self._backing
+
+    def get(
+        self, namespace: str, key: str, *, grace: dt.timedelta = _NO_GRACE,
+    ) -> CacheEntry | None:
+        slot = (namespace, key)
+        with self._lock:
+            stats = self._stats.setdefault(namespace, CacheStats())
+            entry = self._entries.get(slot)
+            if entry is not None:
+                if entry.expires_at + grace > _utcnow():
+                    self._entries.move_to_end(slot)
+                    stats.hits += 1
+                    self._unflushed_hits[namespace] = self._unflushed_hits.get(namespace, 0) + 1
+                    return entry
+                self._drop(slot)
+            stats.misses += 1
+        entry = self._backing.get(namespace, key, grace=grace)
+        if entry is not None:
+            self._remember(namespace, key, entry)
+        return entry
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        *,
+        ttl: dt.timedelta,
+        validators: Mapping[str, str] | None = None,
+    ) -> CacheEntry:
+        with self._lock:
+            self._drop((namespace, key))
+        entry = (
+            self._backing.put(namespace, key, value, ttl=ttl)
+            if validators is None
+            else self._backing.put(namespace, key, value, ttl=ttl, validators=validators)
+        )
+        self._remember(namespace, key, entry)
+        return entry
+
+    def touch(self, namespace: str, key: str, *, ttl: dt.timedelta) -> dt.datetime | None:
+        """Extend the backing entry and the in-memory copy, if held."""
+
+        expires_at = touch(self._backing, namespace, key, ttl=ttl)
+        slot = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if entry is not None:
+                if expires_at is None:
+                    self._drop(slot)
+                else:
+                    self._entries[slot] = replace(entry, expires_at=expires_at)
+        return expires_at
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._drop((namespace, key))
+        self._backing.delete(namespace, key)
+
+    def get_bytes(self, namespace: str, key: str) -> bytes | None:
+        """Raw read from the backing store; never fills the memory tier."""
+
+        return read_raw(self._backing, namespace, key)
+
+    def get_raw(self, namespace: str, key: str) -> RawEntry | None:
+        """Raw read from the backing store; never fills the memory tier."""
+
+        return read_raw_entry(self._backing, namespace, key)
+
+    def get_validators(self, namespace: str, key: str) -> Mapping[str, str] | None:
+        """Read from the backing store; neither fills the tier nor counts."""
+
+        return read_validators(self._backing, namespace, key)
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Snapshot of the per-namespace hit/miss/eviction counters."""
+
+        with self._lock:
+            return {
+                ns: CacheStats(hits=s.hits, misses=s.misses, evictions=s.evictions)
+                for ns, s in self._stats.items()
+            }
+
+    def flush_stats(self) -> None:
+        """Persist memory hits with the backing store's counters (if it keeps any)."""
+
+        with self._lock:
+            hits, self._unflushed_hits = self._unflushed_hits, {}
+        record = getattr(self._backing, "record_hits", None)
+        if record is not None:
+            for namespace, count in hits.items():
+                record(namespace, count)
+        flush = getattr(self._backing, "flush_stats", None)
+        if flush is not None:
+            flush()
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the backing store is untouched)."""
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remember(self, namespace: str, key: str, entry: CacheEntry) -> None:
+        if _weight(entry) > self._max_bytes or self._max_entries <= 0:
+            return
+        slot = (namespace, key)
+        with self._lock:
+            self._drop(slot)
+            self._entries[slot] = entry
+            self._bytes += _weight(entry)
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                (evicted_ns, _), evicted = self._entries.popitem(last=False)
+                self._bytes -= _weight(evicted)
+                self._stats.setdefault(evicted_ns, CacheStats()).evictions += 1
+
+    def _drop(self, slot: tuple[str, str]) -> None:
+        entry = self._entries.pop(slot, None)
+        if entry is not None:
+            self._bytes -= _weight(entry)
+
+
+def _weight(entry: CacheEntry) -> int:
+    # Decoded values live in memory, so budget by the uncompressed size.
+    return entry.logical_bytes or entry.size_bytes
+
+
+_SHARED: dict[Path, MemoryCacheTier] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def default_sqlite_path(root: Path | str | None = None) -> Path:
+    """Location of the shared SQLite cache file under ``root``."""
+
+    return (Path(root) if root is not None else _DEFAULT_CACHE_ROOT) / _DEFAULT_SQLITE_NAME
+
+
+def shared_cache(root: Path | str | None = None) -> MemoryCacheTier:
+    """Process-wide memory-tiered :class:`SqliteCache` under ``root``.
+
+    Adapters constructed without an explicit cache share this instance, so
+    several clients (one per track, say) reuse one another's hot entries.
+    Entries a :class:`JsonFileCache` left under ``root`` (the default
+    before SQLite) are imported on first use; see :meth:`SqliteCache.import_json`.
+    """
+
+    path = (Path(root) if root is not None else _DEFAULT_CACHE_ROOT).resolve()
+    with _SHARED_LOCK:
+        tier = _SHARED.get(path)
+        if tier is None:
+            backend = SqliteCache(default_sqlite_path(path))
+            backend.import_json(path)
+            tier = MemoryCacheTier(backend)
+            atexit.register(_flush_quietly, tier)
+            _SHARED[path] = tier
+        return tier
+
+
+def read_raw(cache: CacheBackend, namespace: str, key: str) -> bytes | None:
+    """A live entry's undecoded JSON text, if ``cache`` can serve it raw.
+
+    For callers that only need part of a large value (see
+    :mod:`stockripper.data.facts_stream`); backends without ``get_bytes``
+    return None.
+    """
+
+    get_bytes = getattr(cache, "get_bytes", None)
+    if get_bytes is None:
+        return None
+    raw: bytes | None = get_bytes(namespace, key)
+    return raw
+
+
+def read_raw_entry(cache: CacheBackend, namespace: str, key: str) -> RawEntry | None:
+    """:func:`read_raw` with the entry's validators, for backends with ``get_raw``."""
+
+    get_raw = getattr(cache, "get_raw", None)
+    if get_raw is None:
+        return None
+    raw: RawEntry | None = get_raw(namespace, key)
+    return raw
+
+
+def read_validators(cache: CacheBackend, namespace: str, key: str) -> Mapping[str, str]:
+    """Validators of ``key``'s entry, live or expired within :data:`REVALIDATE_HORIZON`.
+
+    Empty when there is nothing to revalidate. Backends without
+    ``get_validators`` decode the expired entry instead.
+    """
+
+    get_validators = getattr(cache, "get_validators", None)
+    if get_validators is not None:
+        validators: Mapping[str, str] | None = get_validators(namespace, key)
+        return validators or {}
+    entry = cache.get(namespace, key, grace=REVALIDATE_HORIZON)
+    return entry.validators if entry is not None else {}
+
+
+def touch(
+    cache: CacheBackend, namespace: str, key: str, *, ttl: dt.timedelta,
+) -> dt.datetime | None:
+    """Make ``key`` live for ``ttl`` again without re-encoding its value.
+
+    Backends without ``touch`` get the (possibly expired) value written
+    back with the same validators. Returns the new expiry, or None when
+    there is nothing to extend.
+    """
+
+    extend = getattr(cache, "touch", None)
+    if extend is not None:
+        expires_at: dt.datetime | None = extend(namespace, key, ttl=ttl)
+        return expires_at
+    entry = cache.get(namespace, key, grace=REVALIDATE_HORIZON)
+    if entry is None:
+        return None
+    return cache.put(namespace, key, entry.value, ttl=ttl, validators=entry.validators).expires_at
+
+
+def _flush_quietly(tier: MemoryCacheTier) -> None:
+    try:
+        tier.flush_stats()
+    except sqlite3.Error:
+        LOG.debug("could not flush cache counters", exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Read-through with stale-while-revalidate
+# ---------------------------------------------------------------------------
+_REFRESHING: set[tuple[int, str, str]] = set()
+_REFRESHING_LOCK = threading.Lock()
+
+
+def read_through(
+    cache: CacheBackend,
+    namespace: str,
+    key: str,
+    fetch: Callable[[], Any],
+    *,
+    ttl: dt.timedelta,
+    flight: SingleFlight,
+    stale_grace: dt.timedelta | None = None,
+) -> tuple[Any, bool]:
+    """Return ``(value, served_stale)`` for ``key``, fetching on a miss.
+
+    Concurrent misses on the same key of the same ``cache`` share one
+    ``fetch`` through ``flight``. With
+    ``stale_grace`` set, an entry that expired less than that long ago is
+    returned immediately (``served_stale=True``) while one background
+    thread per key refreshes it; a failed refresh is logged and the stale
+    value keeps being served until the grace period runs out.
+    """
+
+    grace = stale_grace if stale_grace is not None else _NO_GRACE
+    entry = cache.get(namespace, key, grace=grace)
+    if entry is not None and not entry.is_expired():
+        return entry.value, False
+
+    def refresh() -> Any:
+        value = fetch()
+        cache.put(namespace, key, value, ttl=ttl)
+        return value
+
+    if entry is not None:
+        _refresh_in_background(cache, namespace, key, refresh, flight)
+        return entry.value, True
+
+    def fill() -> Any:
+        # A flight that finished just before ours may have filled the cache.
+        again = cache.get(namespace, key)
+        return again.value if again is not None else refresh()
+
+    return flight.do((id(cache), namespace, key), fill), False
+
+
+@dataclass(frozen=True)
+class Fetched:
+    """Result of a conditional fetch for :func:`read_through_validated`.
+
+    Either a new ``value`` with the ``validators`` it was served with, or
+    ``not_modified`` when the origin confirmed the cached copy.
+    """
+
+    value: Any = None
+    validators: Mapping[str, str] = field(default_factory=dict)
+    not_modified: bool = False
+
+
+class Served(NamedTuple):
+    """Result of a validated read.
+
+    ``served_stale`` marks a copy returned while a refresh runs;
+    ``expires_at`` is the expiry of the entry the value came from.
+    """
+
+    value: Any
+    served_stale: bool
+    expires_at: dt.datetime
+
+
+def store_fetched(
+    cache: CacheBackend,
+    namespace: str,
+    key: str,
+    fetched: Fetched,
+    *,
+    previous: CacheEntry | None,
+    ttl: dt.timedelta,
+) -> Served:
+    """Record a conditional fetch; returns the value now current.
+
+    A ``304`` only moves the cached entry's expiry and returns ``previous``'s
+    value, or the entry read back once it is live again when there is no
+    ``previous``. Anything else replaces the entry.
+    """
+
+    if fetched.not_modified:
+        expires_at = touch(cache, namespace, key, ttl=ttl)
+        if expires_at is not None:
+            if previous is not None:
+                return Served(previous.value, False, expires_at)
+            entry = cache.get(namespace, key)
+            if entry is not None:
+                return Served(entry.value, False, entry.expires_at)
+        raise RuntimeError(f"{namespace}/{key}: not modified, but nothing is cached")
+    entry = cache.put(namespace, key, fetched.value, ttl=ttl, validators=fetched.validators)
+    return Served(fetched.value, False, entry.expires_at)
+
+
+class _ValidatedRead:
+    """The cache side of one validated read.
+
+    :func:`read_through_validated` and :func:`read_through_validated_async`
+    drive the same steps and differ only in how they wait: the async driver
+    runs each step on a worker thread.
+    """
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        namespace: str,
+        key: str,
+        *,
+        ttl: dt.timedelta,
+        stale_grace: dt.timedelta | None,
+    ) -> None:
+        self._cache = cache
+        self._namespace = namespace
+        self._key = key
+        self._ttl = ttl
+        # An entry past its grace is a miss; only its validators are read.
+        grace = stale_grace if stale_grace is not None else _NO_GRACE
+        self.entry = cache.get(namespace, key, grace=grace)
+
+    @property
+    def flight_key(self) -> tuple[int, str, str]:
+        return (id(self._cache), self._namespace, self._key)
+
+    def served(self) -> Served | None:
+        """The cached answer, fresh or within grace; None on a miss."""
+
+        if self.entry is None:
+            return None
+        return Served(self.entry.value, self.entry.is_expired(), self.entry.expires_at)
+
+    def current(self) -> Served | None:
+        """A live entry written since this read began (by another flight)."""
+
+        again = self._cache.get(self._namespace, self._key)
+        return Served(again.value, False, again.expires_at) if again is not None else None
+
+    def validators(self) -> Mapping[str, str]:
+        if self.entry is not None:
+            return self.entry.validators
+        return read_validators(self._cache, self._namespace, self._key)
+
+    def store(self, fetched: Fetched) -> Served:
+        return store_fetched(
+            self._cache, self._namespace, self._key, fetched, previous=self.entry, ttl=self._ttl,
+        )
+
+
+def read_through_validated(
+    cache: CacheBackend,
+    namespace: str,
+    key: str,
+    fetch: Callable[[Mapping[str, str]], Fetched],
+    *,
+    ttl: dt.timedelta,
+    flight: SingleFlight,
+    stale_grace: dt.timedelta | None = None,
+) -> Served:
+    """:func:`read_through` for fetches that can revalidate a cached copy.
+
+    ``fetch`` receives the validators of the expired entry (empty when
+    there is none) and returns a :class:`Fetched`. Stale-while-revalidate
+    and single-flight behave exactly as in :func:`read_through`.
+    """
+
+    read = _ValidatedRead(cache, namespace, key, ttl=ttl, stale_grace=stale_grace)
+    served = read.served()
+    if served is not None and not served.served_stale:
+        return served
+
+    def refresh() -> Served:
+        return read.store(fetch(read.validators()))
+
+    if served is not None:
+        _refresh_in_background(cache, namespace, key, refresh, flight)
+        return served
+
+    def fill() -> Served:
+        # A flight that finished just before ours may have filled the cache.
+        current = read.current()
+        return current if current is not None else refresh()
+
+    return flight.do(read.flight_key, fill)
+
+
+async def read_through_validated_async(
+    cache: CacheBackend,
+    namespace: str,
+    key: str,
+    fetch: Callable[[Mapping[str, str]], Awaitable[Fetched]],
+    *,
+    ttl: dt.timedelta,
+    flight: SingleFlight,
+    stale_grace: dt.timedelta | None = None,
+    refresh_in_background: Callable[[str, Callable[[], Awaitable[Any]]], None],
+) -> Served:
+    """:func:`read_through_validated` with a coroutine ``fetch``.
+
+    Every cache read and write runs on a worker thread: a SQLite busy wait,
+    decompression or a multi-MB ``json.loads`` never blocks the event loop.
+    A stale answer is returned at once and ``refresh_in_background`` is
+    handed ``key`` and the coroutine function that revalidates it.
+    """
+
+    read = await asyncio.to_thread(
+        _ValidatedRead, cache, namespace, key, ttl=ttl, stale_grace=stale_grace,
+    )
+    served = read.served()
+    if served is not None and not served.served_stale:
+        return served
+
+    async def refresh() -> Served:
+        fetched = await fetch(await asyncio.to_thread(read.validators))
+        return await asyncio.to_thread(read.store, fetched)
+
+    if served is not None:
+        refresh_in_background(key, functools.partial(flight.do_async, read.flight_key, refresh))
+        return served
+
+    async def fill() -> Served:
+        current = await asyncio.to_thread(read.current)
+        return current if current is not None else await refresh()
+
+    return await flight.do_async(read.flight_key, fill)
+
+
+def _refresh_in_background(
+    cache: CacheBackend,
+    namespace: str,
+    key: str,
+    refresh: Callable[[], Any],
+    flight: SingleFlight,
+) -> None:
+    slot = (id(cache), namespace, key)
+    with _REFRESHING_LOCK:
+        if slot in _REFRESHING:
+            return
+        _REFRESHING.add(slot)
+
+    def run() -> None:
+        try:
+            flight.do(slot, refresh)
+        except Exception:
+            LOG.warning("background refresh of %s/%s failed", namespace, key, exc_info=True)
+        finally:
+            with _REFRESHING_LOCK:
+                _REFRESHING.discard(slot)
+
+    threading.Thread(target=run, name=f"cache-refresh-{namespace}", daemon=True).start()
+
 
-__all__ = ("CacheEntry", "JsonFileCache")
+__all__ = (
+    "DEFAULT_COMPRESSION",
+    "REVALIDATE_HORIZON",
+    "CacheBackend",
+    "CacheEntry",
+    "CacheStats",
+    "CacheUsage",
+    "EntryInfo",
+    "Fetched",
+    "JsonFileCache",
+    "MemoryCacheTier",
+    "RawEntry",
+    "Served",
+    "SqliteCache",
+    "available_codecs",
+    "compress",
+    "compress_stream",
+    "decompress",
+    "default_sqlite_path",
+    "read_raw",
+    "read_raw_entry",
+    "read_through",
+    "read_through_validated",
+    "read_through_validated_async",
+    "read_validators",
+    "safe_filename",
+    "shared_cache",
+    "store_fetched",
+    "touch",
+)
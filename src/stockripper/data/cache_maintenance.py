@@ -0,0 +1,192 @@
+"""Cache maintenance: TTL purge, LRU eviction under byte budgets, sweeper.
+
+Nothing on the read path deletes an expired entry that is never read again,
+so a long-running deployment grows ``.data-cache`` without bound. This
+module keeps it in check:
+
+- **TTL first.** Every sweep bulk-purges expired entries, except that
+  entries carrying HTTP validators stay until
+  :data:`~stockripper.data.cache.REVALIDATE_HORIZON` past expiry so they
+  can still be revalidated with a conditional GET.
+- **Then LRU per namespace.** A namespace whose on-disk bytes exceed its
+  budget loses its least recently *accessed* entries until it fits.
+- **Background sweeper.** :class:`CacheSweeper` runs that on a daemon
+  thread at a fixed interval (``start``/``stop`` or ``with``) and flushes
+  SQLite hit/miss counters on each pass. Sweep the backing store of a
+  :class:`~stockripper.data.cache.MemoryCacheTier` and pass the tier's
+  ``flush_stats`` as ``flush`` so memory hits are persisted too.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Final, Protocol
+
+from stockripper.data.cache import CacheUsage, EntryInfo
+
+LOG: Final = logging.getLogger(__name__)
+
+_MIB: Final[int] = 1024 * 1024
+DEFAULT_BUDGETS: Final[Mapping[str, int]] = {"sec_edgar": 2048 * _MIB}
+DEFAULT_MAX_BYTES: Final[int] = 256 * _MIB
+DEFAULT_SWEEP_INTERVAL: Final[dt.timedelta] = dt.timedelta(minutes=10)
+
+# Upper bounds (exclusive) of the age histogram buckets, by written_at.
+AGE_BUCKETS: Final[tuple[tuple[str, dt.timedelta | None], ...]] = (
+    ("<1h", dt.timedelta(hours=1)),
+    ("<1d", dt.timedelta(days=1)),
+    ("<7d", dt.timedelta(days=7)),
+    (">=7d", None),
+)
+
+
+class MaintainableCache(Protocol):
+    """What both :class:`JsonFileCache` and :class:`SqliteCache` expose."""
+
+    def entries(self, namespace: str | None = None) -> Iterator[EntryInfo]: ...
+
+    def delete(self, namespace: str, key: str) -> None: ...
+
+    def purge_expired(self, *, now: dt.datetime | None = None) -> int: ...
+
+    def usage(self) -> dict[str, CacheUsage]: ...
+
+
+@dataclass(frozen=True)
+class SweepReport:
+    expired: int
+    evicted: int
+    evicted_bytes: int
+
+
+def sweep(
+    cache: MaintainableCache,
+    *,
+    budgets: Mapping[str, int] = DEFAULT_BUDGETS,
+    default_max_bytes: int = DEFAULT_MAX_BYTES,
+    now: dt.datetime | None = None,
+) -> SweepReport:
+    """Purge expired entries, then evict LRU entries from over-budget namespaces."""
+
+    expired = cache.purge_expired(now=now)
+    evicted = evicted_bytes = 0
+    for namespace, usage in cache.usage().items():
+        budget = budgets.get(namespace, default_max_bytes)
+        excess = usage.disk_bytes - budget
+        if excess <= 0:
+            continue
+        count = 0
+        for info in sorted(cache.entries(namespace), key=lambda e: e.accessed_at):
+            if excess <= 0:
+                break
+            cache.delete(namespace, info.key)
+            excess -= info.disk_bytes
+            evicted_bytes += info.disk_bytes
+            count += 1
+        evicted += count
+        record = getattr(cache, "record_evictions", None)
+        if record is not None and count:
+            record(namespace, count)
+    return SweepReport(expired=expired, evicted=evicted, evicted_bytes=evicted_bytes)
+
+
+def age_histogram(
+    entries: Iterable[EntryInfo], *, now: dt.datetime | None = None,
+) -> dict[str, dict[str, int]]:
+    """Per-namespace entry counts by age bucket (see :data:`AGE_BUCKETS`)."""
+
+    now = now if now is not None else dt.datetime.now(dt.UTC)
+    out: dict[str, dict[str, int]] = {}
+    for info in entries:
+        buckets = out.setdefault(info.namespace, {label: 0 for label, _ in AGE_BUCKETS})
+        age = now - info.written_at
+        for label, bound in AGE_BUCKETS:
+            if bound is None or age < bound:
+                buckets[label] += 1
+                break
+    return out
+
+
+class CacheSweeper:
+    """Run :func:`sweep` on a daemon thread every ``interval``.
+
+    After each pass ``flush`` persists the counters; it defaults to the
+    cache's own ``flush_stats``.
+    """
+
+    def __init__(
+        self,
+        cache: MaintainableCache,
+        *,
+        budgets: Mapping[str, int] = DEFAULT_BUDGETS,
+        default_max_bytes: int = DEFAULT_MAX_BYTES,
+        interval: dt.timedelta = DEFAULT_SWEEP_INTERVAL,
+        flush: Callable[[], None] | None = None,
+    ) -> None:
+        self._cache = cache
+        self._flush = flush if flush is not None else getattr(cache, "flush_stats", None)
+        self._budgets = budgets
+        self._default_max_bytes = default_max_bytes
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sweep_once(self) -> SweepReport:
+        report = sweep(
+            self._cache, budgets=self._budgets, default_max_bytes=self._default_max_bytes,
+        )
+        if self._flush is not None:
+            self._flush()
+        return report
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> CacheSweeper:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                report = self.sweep_once()
+            except Exception:
+                LOG.warning("cache sweep failed", exc_info=True)
+            else:
+                if report.expired or report.evicted:
+                    LOG.info(
+                        "cache sweep: %d expired, %d evicted (%d bytes)",
+                        report.expired,
+                        report.evicted,
+                        report.evicted_bytes,
+                    )
+            self._stop.wait(self._interval.total_seconds())
+
+
+__all__ = (
+    "AGE_BUCKETS",
+    "DEFAULT_BUDGETS",
+    "DEFAULT_MAX_BYTES",
+    "CacheSweeper",
+    "MaintainableCache",
+    "SweepReport",
+    "age_histogram",
+    "sweep",
+)
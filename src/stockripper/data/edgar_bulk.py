@@ -0,0 +1,186 @@
+"""Importer for the SEC's nightly bulk EDGAR archives.
+
+``companyfacts.zip`` and ``submissions.zip`` hold one JSON document per
+CIK — the same documents :class:`SecEdgarClient` fetches one at a time
+through the 10 rps limiter. Importing an archive writes each document under
+the exact cache key the client reads (``company_facts_{cik}`` /
+``submissions_{cik}``), so later ``get_company_facts`` calls are cache hits.
+
+Design notes:
+
+- **Streaming.** Entries are read one at a time straight out of the zip;
+  nothing is extracted to disk and only one document is in memory at once.
+  Documents are written past any :class:`MemoryCacheTier` to the store
+  behind it, whose in-memory copies are then dropped, so the import never
+  fills the in-process LRU with an archive's worth of them.
+- **Derived entries are dropped.** Replacing a full facts document
+  deletes the slim ``company_facts_{cik}@{digest}`` entries cut from the
+  old one; the next selective read cuts them again from the new one.
+- **Provenance per entry.** Every imported document gets a
+  :class:`Provenance` whose ``content_hash`` matches what the client would
+  compute for the same payload; ``source_url`` names the archive member.
+- **Auxiliary members are skipped.** ``submissions.zip`` also carries
+  ``CIK##########-submissions-NNN.json`` pages of older filings; the client
+  never reads those, so neither does the importer.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import re
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, Literal
+
+from stockripper.data.cache import CacheBackend, MemoryCacheTier, shared_cache
+from stockripper.data.provenance import Provenance
+from stockripper.data.sec_edgar import normalise_cik
+
+BulkKind = Literal["companyfacts", "submissions"]
+
+_MEMBER_RE: Final[re.Pattern[str]] = re.compile(r"(?:^|/)CIK(\d{10})\.json$")
+_KEY_PREFIX: Final[dict[str, str]] = {
+    "companyfacts": "company_facts_",
+    "submissions": "submissions_",
+}
+_DEFAULT_TTL: Final[dt.timedelta] = dt.timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class BulkImportReport:
+    kind: BulkKind
+    imported: int
+    skipped: int
+    failed: tuple[str, ...]
+    provenance: tuple[Provenance, ...]
+
+
+def detect_kind(path: Path | str) -> BulkKind:
+    """Infer the archive type from its file name, then from its members."""
+
+    name = Path(path).name.lower()
+    if "companyfacts" in name:
+        return "companyfacts"
+    if "submissions" in name:
+        return "submissions"
+    with zipfile.ZipFile(path) as zf:
+        for member in zf.namelist():
+            if "-submissions-" in member:
+                return "submissions"
+    raise ValueError(
+        f"cannot tell whether {name!r} is a companyfacts or submissions archive; pass kind",
+    )
+
+
+def iter_bulk_documents(
+    path: Path | str,
+    *,
+    ciks: Iterable[str] | None = None,
+) -> Iterator[tuple[str, str, bytes]]:
+    """Yield ``(cik, member_name, raw_json)`` one archive member at a time."""
+
+    wanted = {normalise_cik(c) for c in ciks} if ciks is not None else None
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            match = _MEMBER_RE.search(info.filename)
+            if match is None:
+                continue
+            cik = match.group(1)
+            if wanted is not None and cik not in wanted:
+                continue
+            with zf.open(info) as fh:
+                yield cik, info.filename, fh.read()
+
+
+def import_edgar_bulk(
+    path: Path | str,
+    *,
+    kind: BulkKind | None = None,
+    cache: CacheBackend | None = None,
+    ciks: Iterable[str] | None = None,
+    ttl: dt.timedelta = _DEFAULT_TTL,
+) -> BulkImportReport:
+    """Load a bulk archive into the ``sec_edgar`` cache namespace.
+
+    ``ciks`` restricts the import to a candidate set; other members are
+    counted as skipped. Members that are not valid JSON objects are listed
+    in ``failed`` and do not stop the import.
+    """
+
+    path = Path(path)
+    kind = kind if kind is not None else detect_kind(path)
+    cache = cache if cache is not None else shared_cache()
+    tier = cache if isinstance(cache, MemoryCacheTier) else None
+    store = tier.backing if tier is not None else cache
+    prefix = _KEY_PREFIX[kind]
+    derived = _derived_keys(store, prefix) if kind == "companyfacts" else {}
+    imported = 0
+    failed: list[str] = []
+    provenance: list[Provenance] = []
+    with zipfile.ZipFile(path) as zf:
+        members = sum(1 for n in zf.namelist() if not n.endswith("/"))
+    try:
+        for cik, member, raw in iter_bulk_documents(path, ciks=ciks):
+            try:
+                payload = json.loads(raw)
+            except ValueError:
+                failed.append(member)
+                continue
+            if not isinstance(payload, dict):
+                failed.append(member)
+                continue
+            key = f"{prefix}{cik}"
+            store.put("sec_edgar", key, payload, ttl=ttl)
+            for stale in derived.pop(key, ()):
+                store.delete("sec_edgar", stale)
+            provenance.append(
+                Provenance.for_payload(
+                    provider="sec_edgar_bulk",
+                    source_url=f"{path.name}!{member}",
+                    payload=payload,
+                    request_key=key,
+                )
+            )
+            imported += 1
+    finally:
+        if tier is not None and imported:
+            tier.clear()
+    return BulkImportReport(
+        kind=kind,
+        imported=imported,
+        skipped=members - imported - len(failed),
+        failed=tuple(failed),
+        provenance=tuple(provenance),
+    )
+
+
+def _derived_keys(cache: CacheBackend, prefix: str) -> dict[str, list[str]]:
+    """``{full_key: [full_key@digest, ...]}`` for the entries cut from full documents.
+
+    One pass over the namespace up front; backends that cannot list their
+    entries have none to report.
+    """
+
+    entries = getattr(cache, "entries", None)
+    if entries is None:
+        return {}
+    out: dict[str, list[str]] = {}
+    for info in entries("sec_edgar"):
+        full, sep, _ = info.key.partition("@")
+        if sep and full.startswith(prefix):
+            out.setdefault(full, []).append(info.key)
+    return out
+
+
+__all__ = (
+    "BulkImportReport",
+    "BulkKind",
+    "detect_kind",
+    "import_edgar_bulk",
+    "iter_bulk_documents",
+)
@@ -0,0 +1,162 @@
+"""Selective parse of EDGAR company-facts documents.
+
+A ``companyfacts`` document is several megabytes of JSON holding every XBRL
+tag a filer has ever reported, yet :func:`derive_fundamentals` reads about
+a dozen of them. ``json.loads`` on the whole document builds an object graph
+many times the size of the text. :func:`select_company_facts` walks the
+text instead and only materialises the taxonomy/tag/unit series a
+:class:`FactSelection` asks for.
+
+Design notes:
+
+- **Bounded peak.** Anything not selected is still scanned by the C JSON
+  decoder, but one unit series at a time, and dropped straight away. Peak
+  memory is the document text plus the largest single series, not the
+  whole tree.
+- **Same shape out.** The result looks like a company-facts payload
+  (``cik``, ``entityName``, ``facts``) that only holds the selected series,
+  so ``CompanyFacts`` and the derivers need no second code path.
+- **Strict JSON.** Malformed input raises :class:`ValueError`, like
+  ``json.loads`` does.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final
+
+_WS: Final[re.Pattern[str]] = re.compile(r"[ \t\n\r]*")
+_DECODER: Final[json.JSONDecoder] = json.JSONDecoder()
+_TOP_LEVEL_SCALARS: Final[frozenset[str]] = frozenset({"cik", "entityName"})
+
+
+@dataclass(frozen=True)
+class FactSelection:
+    """Which series to keep: ``{taxonomy: (tag, ...)}``, optionally per unit.
+
+    ``units=None`` keeps every unit of a selected tag.
+    """
+
+    tags: Mapping[str, tuple[str, ...]]
+    units: tuple[str, ...] | None = None
+
+    @property
+    def digest(self) -> str:
+        """Short stable id, used to key cached selections."""
+
+        canonical = json.dumps(
+            {
+                "tags": {tax: sorted(tags) for tax, tags in sorted(self.tags.items())},
+                "units": sorted(self.units) if self.units is not None else None,
+            },
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def select_company_facts(raw: bytes | str, selection: FactSelection) -> dict[str, Any]:
+    """Parse ``raw`` company-facts JSON, keeping only what ``selection`` names."""
+
+    text = raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else raw
+    wanted_units = selection.units
+    out: dict[str, Any] = {}
+    facts: dict[str, Any] = {}
+
+    def top(key: str, i: int) -> int:
+        if key == "facts":
+            return _walk_object(text, i, taxonomy)
+        if key in _TOP_LEVEL_SCALARS:
+            out[key], end = _DECODER.raw_decode(text, i)
+            return int(end)
+        return _skip(text, i)
+
+    def taxonomy(name: str, i: int) -> int:
+        wanted = selection.tags.get(name)
+        if not wanted:
+            return _skip(text, i)
+        kept: dict[str, Any] = {}
+
+        def tag(tag_name: str, j: int) -> int:
+            if tag_name not in wanted:
+                return _skip(text, j)
+            if wanted_units is None:
+                kept[tag_name], end = _DECODER.raw_decode(text, j)
+                return int(end)
+            fact: dict[str, Any] = {}
+            kept[tag_name] = fact
+            return _walk_object(text, j, lambda key, p: fact_member(fact, key, p, wanted_units))
+
+        end = _walk_object(text, i, tag)
+        if kept:
+            facts[name] = kept
+        return end
+
+    def fact_member(fact: dict[str, Any], key: str, i: int, units: tuple[str, ...]) -> int:
+        if key != "units":
+            fact[key], end = _DECODER.raw_decode(text, i)
+            return int(end)
+        series: dict[str, Any] = {}
+        fact["units"] = series
+
+        def unit(name: str, j: int) -> int:
+            if name not in units:
+                return _skip(text, j)
+            series[name], end = _DECODER.raw_decode(text, j)
+            return int(end)
+
+        return _walk_object(text, i, unit)
+
+    end = _walk_object(text, 0, top)
+    if _ws(text, end) != len(text):
+        raise ValueError(f"extra data after company-facts object at offset {end}")
+    out["facts"] = facts
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Scanner
+# ---------------------------------------------------------------------------
+def _ws(text: str, i: int) -> int:
+    match = _WS.match(text, i)
+    return match.end() if match is not None else i
+
+
+def _walk_object(text: str, i: int, member: Callable[[str, int], int]) -> int:
+    """Call ``member(key, value_start)`` per member; it returns the value's end."""
+
+    i = _ws(text, i)
+    if text[i : i + 1] != "{":
+        raise ValueError(f"expected an object at offset {i}")
+    i = _ws(text, i + 1)
+    if text[i : i + 1] == "}":
+        return i + 1
+    while True:
+        if text[i : i + 1] != '"':
+            raise ValueError(f"expected a member name at offset {i}")
+        key, i = _DECODER.raw_decode(text, i)
+        i = _ws(text, i)
+        if text[i : i + 1] != ":":
+            raise ValueError(f"expected ':' at offset {i}")
+        i = _ws(text, member(key, _ws(text, i + 1)))
+        sep = text[i : i + 1]
+        if sep == "}":
+            return i + 1
+        if sep != ",":
+            raise ValueError(f"expected ',' or '}}' at offset {i}")
+        i = _ws(text, i + 1)
+
+
+def _skip(text: str, i: int) -> int:
+    """End offset of the value at ``i``, decoding at most one member at a time."""
+
+    if text[i : i + 1] == "{":
+        return _walk_object(text, i, lambda _key, j: _skip(text, j))
+    _value, end = _DECODER.raw_decode(text, i)
+    return int(end)
+
+
+__all__ = ("FactSelection", "select_company_facts")
@@ -11,8 +11,9 @@ from __future__ import annotations
 import datetime as dt
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Literal
+from typing import Any, Final, Literal
 
+from stockripper.data.facts_stream import FactSelection
 from stockripper.data.provenance import Provenance
 from stockripper.data.sec_edgar import CompanyFacts
 
@@ -66,6 +67,23 @@ _TAG_EQUITY: tuple[str, ...] = (
     "StockholdersEquityIncludingPortionAttributableToNoncontrollingInterest",
 )
 
+# Everything :func:`derive_fundamentals` reads; pass it as ``select=`` to
+# ``get_company_facts`` to skip parsing the rest of the document.
+FUNDAMENTAL_FACTS: Final[FactSelection] = FactSelection(
+    tags={
+        "dei": _TAG_SHARES_OUT,
+        "us-gaap": (
+            _TAG_SHARES_OUT
+            + _TAG_REVENUE
+            + _TAG_NET_INCOME
+            + _TAG_DEBT_LONG
+            + _TAG_DEBT_SHORT
+            + _TAG_EQUITY
+        ),
+    },
+    units=("USD", "shares"),
+)
+
 
 def derive_fundamentals(
     facts: CompanyFacts,
@@ -235,6 +253,7 @@ def _combine_sum(
 
 
 __all__ = (
+    "FUNDAMENTAL_FACTS",
     "Confidence",
     "FundamentalValue",
     "FundamentalsSummary",
@@ -6,64 +6,118 @@ import alpaca-py and so the builder remains driveable from fakes.
 
 from __future__ import annotations
 
+import dataclasses
 import datetime as dt
-from collections.abc import Iterable, Mapping
+import logging
+from collections.abc import Iterable, Mapping, Sequence
+from decimal import Decimal
+from typing import Any, Final, Literal
+
+import numpy as np
 
 from stockripper.config import StockripperSettings
+from stockripper.data.asset_master import AssetDiff, AssetMaster, AssetTable
+from stockripper.data.bar_store import BarStore
+from stockripper.data.blob_store import BlobStore
 from stockripper.data.market_data import MarketDataAdapter
 from stockripper.data.news import NewsAdapter
+from stockripper.data.pit_fundamentals import SharesOutstandingSource
+from stockripper.data.rate_limit import Priority, PriorityTokenBucket, paced, shared_alpaca_limiter
 from stockripper.data.universe import AssetRecord, AssetSnapshot
+from stockripper.data.universe_policy import MarketCapBand
+from stockripper.integrations.alpaca import alpaca_errors
+
+LOG: Final = logging.getLogger(__name__)
 
-# These tickers / fragments are heuristic — leveraged ETF metadata isn't
-# available from the Alpaca asset list directly, so we tag a small allow-list
-# of obvious examples. Fully populating this is a Phase 3 problem.
-_LEVERAGED_ETF_HINTS: tuple[str, ...] = (
-    "TQQQ", "SQQQ", "SPXL", "SPXS", "SOXL", "SOXS", "TNA", "TZA",
-    "UPRO", "SPXU", "FAZ", "FAS", "UVXY", "SVXY", "LABU", "LABD",
+_LOW_VISIBILITY_BANDS: Final[frozenset[MarketCapBand]] = frozenset(
+    {MarketCapBand.SMALL, MarketCapBand.MICRO, MarketCapBand.NANO},
 )
 
 
 class AlpacaAssetsLoader:
-    """Callable that returns the tradable equity universe from Alpaca."""
+    """Callable that returns the tradable equity universe from Alpaca.
+
+    The asset list is kept in an :class:`AssetMaster`. While the stored
+    table is from ``today`` or later it is returned as is; otherwise the
+    list is downloaded once, classified, diffed against the stored table
+    and saved. ``master=False`` fetches on every call without persisting.
+    """
 
-    def __init__(self, *, settings: StockripperSettings | None = None) -> None:
-        from stockripper.integrations.alpaca import build_paper_reference_client
+    def __init__(
+        self,
+        *,
+        settings: StockripperSettings | None = None,
+        client: Any | None = None,
+        limiter: PriorityTokenBucket | None = None,
+        master: AssetMaster | Literal[False] | None = None,
+    ) -> None:
+        if client is None:
+            from stockripper.integrations.alpaca import build_paper_reference_client
 
-        self._client = build_paper_reference_client(settings)
+            client = build_paper_reference_client(settings)
+            limiter = limiter if limiter is not None else shared_alpaca_limiter()
+        self._client = client
+        self._limiter = limiter
+        self._master: AssetMaster | None = (
+            AssetMaster() if master is None else master if master is not False else None
+        )
 
     def __call__(self) -> Iterable[AssetRecord]:
+        return self.table().records
+
+    def table(self, *, today: dt.date | None = None) -> AssetTable:
+        """The classified asset table, refreshed at most once per day."""
+
+        today = today if today is not None else dt.date.today()
+        if self._master is not None:
+            stored = self._master.load()
+            if stored is not None and stored.as_of >= today:
+                return stored
+        return self.refresh(today=today)[0]
+
+    def refresh(self, *, today: dt.date | None = None) -> tuple[AssetTable, AssetDiff | None]:
+        """Download and classify the asset list now; store it when persisting."""
+
         from alpaca.trading.enums import AssetClass, AssetStatus
         from alpaca.trading.requests import GetAssetsRequest
 
         req = GetAssetsRequest(asset_class=AssetClass.US_EQUITY, status=AssetStatus.ACTIVE)
-        for asset in self._client.get_all_assets(req):
-            symbol = getattr(asset, "symbol", None)
-            if not symbol:
-                continue
-            is_etf = bool(
-                getattr(asset, "attributes", None)
-                and "etf" in {str(a).lower() for a in asset.attributes}
-            )
-            yield AssetRecord(
-                symbol=str(symbol).upper(),
-                name=str(getattr(asset, "name", "") or ""),
-                exchange=str(getattr(asset, "exchange", "") or ""),
-                tradable=bool(getattr(asset, "tradable", False)),
-                shortable=bool(getattr(asset, "shortable", False)),
-                fractionable=bool(getattr(asset, "fractionable", False)),
-                is_etf=is_etf,
-                is_leveraged_etf=str(symbol).upper() in _LEVERAGED_ETF_HINTS,
-            )
+        assets = paced(
+            self._limiter,
+            lambda: self._client.get_all_assets(req),
+            priority=Priority.BACKGROUND,
+        )
+        table = AssetTable.from_assets(
+            assets, as_of=today if today is not None else dt.date.today(),
+        )
+        if self._master is None:
+            return table, None
+        diff = self._master.update(table)
+        LOG.info(
+            "asset master %s: %d assets, %d added, %d delisted, %d changed",
+            table.as_of, len(table), len(diff.added), len(diff.delisted), len(diff.changed),
+        )
+        return table, diff
 
 
 class AlpacaSnapshotProvider:
     """Bulk snapshot provider backed by Alpaca data + news clients.
 
-    Phase-2 strategy: we don't fetch market-cap from Alpaca (it's not in the
-    snapshot endpoint) — we leave ``market_cap_usd=None`` and let the
-    universe filter reject anything that doesn't have a band when the
-    track's policy requires one. Phase 3 will batch SEC EDGAR
-    shares-outstanding lookups to populate this.
+    Market cap is not in Alpaca's snapshot endpoint. With a ``shares``
+    source (normally :class:`PitSharesSource` over the point-in-time
+    fundamentals table) it is joined for the whole universe at once as
+    price times shares outstanding as of the build date. Symbols without
+    shares keep ``market_cap_usd=None``, and the universe filter rejects
+    them when the track's policy requires a band.
+
+    ``recent_news_count_30d`` is filled only for symbols whose cap falls in
+    the small/micro/nano bands, the only ones the low-visibility check
+    looks at, through one bulk count over the 30 days before ``as_of``.
+    If counting fails the counts stay ``None``.
+
+    The default adapters spend the shared Alpaca budget at
+    :attr:`Priority.BACKGROUND`, behind window evidence and quotes, and
+    keep raw payloads in ``blobs`` when one is given.
     """
 
     def __init__(
@@ -73,33 +127,128 @@ class AlpacaSnapshotProvider:
         market: MarketDataAdapter | None = None,
         news: NewsAdapter | None = None,
         adv_days: int = 20,
+        chunk_size: int = 200,
+        shares: SharesOutstandingSource | None = None,
+        blobs: BlobStore | None = None,
     ) -> None:
-        self._market = market if market is not None else MarketDataAdapter()
-        self._news = news if news is not None else NewsAdapter()
+        self._market = (
+            market
+            if market is not None
+            else MarketDataAdapter(
+                bar_store=BarStore(), priority=Priority.BACKGROUND, blobs=blobs,
+            )
+        )
+        self._news = (
+            news
+            if news is not None
+            else NewsAdapter(priority=Priority.BACKGROUND, blobs=blobs)
+        )
         self._adv_days = adv_days
+        self._chunk_size = chunk_size
+        self._shares = shares
 
     def get_snapshots(
         self, symbols: Iterable[str], *, as_of: dt.date,
     ) -> Mapping[str, AssetSnapshot]:
+        """Prices and ADV via :meth:`refresh_prices`, then the cap and news joins."""
+
+        out = self.refresh_prices(symbols, as_of=as_of)
+        if self._shares is not None and out:
+            caps = market_caps(
+                out, self._shares.shares_outstanding(tuple(out), as_of=as_of),
+            )
+            for symbol, cap in caps.items():
+                out[symbol] = dataclasses.replace(out[symbol], market_cap_usd=cap)
+        self._join_news_counts(out, as_of=as_of)
+        return out
+
+    def refresh_prices(
+        self, symbols: Iterable[str], *, as_of: dt.date,
+    ) -> dict[str, AssetSnapshot]:
+        """Two multi-symbol requests per chunk (snapshots, then daily bars).
+
+        Only ``last_price`` and ``adv_usd_20d`` are filled; intraday
+        universe refreshes call this directly and skip the cap and news
+        joins. A chunk whose Alpaca requests fail is logged and skipped
+        rather than failing the whole build; those symbols surface as
+        ``missing_snapshot`` in the builder's diagnostics. Anything else
+        (a bug, not an outage) propagates.
+        """
+
+        ordered = tuple(dict.fromkeys(s.upper() for s in symbols))
         out: dict[str, AssetSnapshot] = {}
-        for symbol in symbols:
-            symbol = symbol.upper()
+        for i in range(0, len(ordered), self._chunk_size):
+            chunk = ordered[i : i + self._chunk_size]
             try:
-                snap = self._market.get_snapshot(symbol)
-                adv = self._market.compute_adv_usd(symbol, days=self._adv_days)
-            except Exception:
-                continue
-            if snap.last_price is None:
+                snaps = self._market.get_snapshots(chunk, chunk_size=self._chunk_size)
+                priced = [s for s in chunk if s in snaps and snaps[s].last_price is not None]
+                advs = self._market.compute_adv_usd_bulk(
+                    priced, days=self._adv_days, chunk_size=self._chunk_size,
+                )
+            except alpaca_errors() as exc:
+                LOG.warning(
+                    "snapshots for %d symbols (%s..%s) failed: %s",
+                    len(chunk), chunk[0], chunk[-1], exc,
+                )
                 continue
-            out[symbol] = AssetSnapshot(
-                symbol=symbol,
-                last_price=snap.last_price,
-                adv_usd_20d=adv.adv_usd,
-                market_cap_usd=None,
-                recent_8k_within_days=None,
-                recent_news_count_30d=None,
-            )
+            for symbol in priced:
+                last_price = snaps[symbol].last_price
+                adv = advs.get(symbol)
+                if last_price is None or adv is None:
+                    continue
+                out[symbol] = AssetSnapshot(
+                    symbol=symbol,
+                    last_price=last_price,
+                    adv_usd_20d=adv.adv_usd,
+                    market_cap_usd=None,
+                    recent_8k_within_days=None,
+                    recent_news_count_30d=None,
+                )
         return out
 
+    def _join_news_counts(self, out: dict[str, AssetSnapshot], *, as_of: dt.date) -> None:
+        small = [
+            symbol for symbol, snap in out.items()
+            if MarketCapBand.classify(snap.market_cap_usd) in _LOW_VISIBILITY_BANDS
+        ]
+        if not small:
+            return
+        # Whole UTC days, so every build on the same date shares cached counts.
+        since = dt.datetime.combine(as_of - dt.timedelta(days=30), dt.time(), dt.UTC)
+        today = dt.datetime.now(dt.UTC).date()
+        until = (
+            None if as_of >= today
+            else dt.datetime.combine(as_of + dt.timedelta(days=1), dt.time(), dt.UTC)
+        )
+        try:
+            counts = self._news.count_recent_news_bulk(small, since=since, until=until)
+        except alpaca_errors() as exc:
+            LOG.warning("news counts for %d small caps failed: %s", len(small), exc)
+            return
+        for symbol, count in counts.items():
+            out[symbol] = dataclasses.replace(out[symbol], recent_news_count_30d=count)
+
+
+def market_caps(
+    snapshots: Mapping[str, AssetSnapshot], shares: Mapping[str, Decimal],
+) -> dict[str, Decimal]:
+    """``last_price * shares`` for every symbol with both, in one array op.
+
+    Caps are rounded to whole dollars; float64 keeps them exact well past
+    any listed company's size.
+    """
+
+    symbols: Sequence[str] = [s for s in snapshots if s in shares]
+    if not symbols:
+        return {}
+    prices = np.fromiter((float(snapshots[s].last_price) for s in symbols), np.float64)
+    counts = np.fromiter((float(shares[s]) for s in symbols), np.float64)
+    caps = np.rint(prices * counts)
+    return {
+        symbol: Decimal(int(cap))
+        for symbol, cap in zip(symbols, caps.tolist(), strict=True)
+        if cap > 0
+    }
+
 
-__all__ = ("AlpacaAssetsLoader", "AlpacaSnapshotProvider")
+__all__ = ("AlpacaAssetsLoader", "AlpacaSnapshotProvider", "market_caps")
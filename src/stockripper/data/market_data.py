@@ -8,37 +8,46 @@ order.
 from __future__ import annotations
 
 import datetime as dt
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any
-
+from functools import partial
+from typing import Any, Final, TypeVar
+
+from stockripper.data.bar_store import (
+    Bar,
+    BarSeries,
+    BarStore,
+    day_to_date,
+    epoch_day,
+    records_from_raw,
+)
+from stockripper.data.blob_store import BlobStore
 from stockripper.data.provenance import Provenance
+from stockripper.data.rate_limit import Priority, PriorityTokenBucket, paced, shared_alpaca_limiter
+from stockripper.data.singleflight import SingleFlight
 from stockripper.integrations.alpaca import (
     StockDataLike,
     build_stock_data_client,
 )
 
 _ALPACA_DATA_BASE: str = "alpaca-data://stocks"
+# Symbols per multi-symbol request. Alpaca accepts comma-separated symbol
+# lists on the snapshot and bars endpoints; 200 keeps the query string well
+# under common URL-length limits while turning a ~10k-symbol universe
+# refresh into ~50 requests per endpoint.
+_BULK_CHUNK_SIZE: Final[int] = 200
+# Identical requests in flight at the same time (several tracks refreshing
+# the same chunk) share one Alpaca call.
+_SINGLE_FLIGHT: SingleFlight = SingleFlight()
+
+T = TypeVar("T")
 
 
 def _utcnow() -> dt.datetime:
     return dt.datetime.now(dt.UTC)
 
 
-@dataclass(frozen=True)
-class Bar:
-    timestamp: dt.datetime
-    open: Decimal
-    high: Decimal
-    low: Decimal
-    close: Decimal
-    volume: int
-
-    @property
-    def dollar_volume(self) -> Decimal:
-        return self.close * Decimal(self.volume)
-
-
 @dataclass(frozen=True)
 class Quote:
     symbol: str
@@ -69,10 +78,39 @@ class AdvResult:
 
 
 class MarketDataAdapter:
-    """Thin, typed facade over the alpaca-py historical stock-data client."""
-
-    def __init__(self, client: StockDataLike | None = None) -> None:
-        self._client = client if client is not None else build_stock_data_client()
+    """Thin, typed facade over the alpaca-py historical stock-data client.
+
+    With a :class:`BarStore`, daily bars are served from the local
+    memory-mapped store and Alpaca is only asked for sessions newer than
+    the last stored day (plus that day, whose bar may still be forming).
+    Bars come back as a :class:`BarSeries`; ADV is computed over its
+    arrays, and :class:`Bar` objects are only built when it is indexed or
+    iterated.
+
+    Requests spend tokens from the shared Alpaca :class:`PriorityTokenBucket`
+    at ``priority``; latest quotes always go as
+    :attr:`Priority.EXECUTION`. An injected ``client`` is paced only when a
+    ``limiter`` is passed with it. With ``blobs``, every payload hashed into
+    a :class:`Provenance` is also kept there (``raw_content_uri``).
+    """
+
+    def __init__(
+        self,
+        client: StockDataLike | None = None,
+        *,
+        bar_store: BarStore | None = None,
+        limiter: PriorityTokenBucket | None = None,
+        priority: Priority = Priority.EVIDENCE,
+        blobs: BlobStore | None = None,
+    ) -> None:
+        if client is None:
+            client = build_stock_data_client()
+            limiter = limiter if limiter is not None else shared_alpaca_limiter()
+        self._client = client
+        self._bar_store = bar_store
+        self._blobs = blobs
+        self._limiter = limiter
+        self._priority = priority
 
     # ------------------------------------------------------------------
     # Snapshot / quote
@@ -82,36 +120,71 @@ class MarketDataAdapter:
 
         symbol = symbol.upper()
         req = StockSnapshotRequest(symbol_or_symbols=symbol)
-        result = self._client.get_stock_snapshot(req)
+        result = self._coalesce(
+            f"snapshot:{symbol}", lambda: self._client.get_stock_snapshot(req),
+        )
         raw = _select(result, symbol)
-        latest_trade = getattr(raw, "latest_trade", None)
-        daily_bar = getattr(raw, "daily_bar", None)
-        prov = Provenance.for_payload(
-            provider="alpaca_data",
+        return _to_snapshot(
+            symbol,
+            raw,
             source_url=f"{_ALPACA_DATA_BASE}/{symbol}/snapshot",
-            payload=_to_jsonable(raw),
             request_key=f"snapshot:{symbol}",
+            blobs=self._blobs,
         )
-        return Snapshot(
-            symbol=symbol,
-            last_price=_decimal(getattr(latest_trade, "price", None)),
-            last_trade_at=getattr(latest_trade, "timestamp", None),
-            daily_volume=_int(getattr(daily_bar, "volume", None)),
-            provenance=prov,
-        )
+
+    def get_snapshots(
+        self,
+        symbols: Iterable[str],
+        *,
+        chunk_size: int = _BULK_CHUNK_SIZE,
+    ) -> dict[str, Snapshot]:
+        """Fetch snapshots for many symbols with one request per chunk.
+
+        Symbols Alpaca returns nothing for are simply absent from the
+        result. Each :class:`Snapshot` keeps a per-symbol ``content_hash``;
+        its ``request_key`` names the chunk request it arrived in so the
+        audit trail can group symbols by round-trip.
+        """
+
+        from alpaca.data.requests import StockSnapshotRequest
+
+        out: dict[str, Snapshot] = {}
+        for chunk in _chunks(symbols, chunk_size):
+            req = StockSnapshotRequest(symbol_or_symbols=list(chunk))
+            request_key = _chunk_request_key("snapshots", chunk)
+            result = self._coalesce(
+                f"snapshots:{','.join(chunk)}", partial(self._client.get_stock_snapshot, req),
+            )
+            for symbol in chunk:
+                raw = _lookup(result, symbol)
+                if raw is None:
+                    continue
+                out[symbol] = _to_snapshot(
+                    symbol,
+                    raw,
+                    source_url=f"{_ALPACA_DATA_BASE}/snapshots",
+                    request_key=request_key,
+                    blobs=self._blobs,
+                )
+        return out
 
     def get_latest_quote(self, symbol: str) -> Quote:
         from alpaca.data.requests import StockLatestQuoteRequest
 
         symbol = symbol.upper()
         req = StockLatestQuoteRequest(symbol_or_symbols=symbol)
-        result = self._client.get_stock_latest_quote(req)
+        result = self._coalesce(
+            f"latest_quote:{symbol}",
+            lambda: self._client.get_stock_latest_quote(req),
+            priority=Priority.EXECUTION,
+        )
         raw = _select(result, symbol)
         prov = Provenance.for_payload(
             provider="alpaca_data",
             source_url=f"{_ALPACA_DATA_BASE}/{symbol}/quotes/latest",
             payload=_to_jsonable(raw),
             request_key=f"latest_quote:{symbol}",
+            blobs=self._blobs,
         )
         return Quote(
             symbol=symbol,
@@ -124,67 +197,300 @@ class MarketDataAdapter:
     # ------------------------------------------------------------------
     # Bars + ADV
     # ------------------------------------------------------------------
-    def get_daily_bars(self, symbol: str, *, days: int) -> tuple[tuple[Bar, ...], Provenance]:
+    def get_daily_bars(self, symbol: str, *, days: int) -> tuple[BarSeries, Provenance]:
+        """Last ``days`` daily bars; index or iterate the series for :class:`Bar` s."""
+
         from alpaca.data.requests import StockBarsRequest
         from alpaca.data.timeframe import TimeFrame
 
         if days <= 0:
             raise ValueError("days must be positive")
         symbol = symbol.upper()
-        end = _utcnow()
-        # Add a small buffer so weekends/holidays don't shrink the window.
-        start = end - dt.timedelta(days=int(days * 1.6) + 2)
+        if self._bar_store is not None:
+            return self.get_bar_series(symbol, days=days)
+        start, end = _bars_window(days)
         req = StockBarsRequest(
             symbol_or_symbols=symbol,
             timeframe=TimeFrame.Day,
             start=start,
             end=end,
         )
-        result = self._client.get_stock_bars(req)
+        result = self._coalesce(
+            f"daily_bars:{symbol}:{days}d", lambda: self._client.get_stock_bars(req),
+        )
         bars_raw = _bars_from_result(result, symbol)
-        bars = tuple(
-            Bar(
-                timestamp=b.timestamp,
-                open=Decimal(str(b.open)),
-                high=Decimal(str(b.high)),
-                low=Decimal(str(b.low)),
-                close=Decimal(str(b.close)),
-                volume=int(b.volume or 0),
-            )
-            for b in bars_raw
-        )[-days:]
         prov = Provenance.for_payload(
             provider="alpaca_data",
             source_url=f"{_ALPACA_DATA_BASE}/{symbol}/bars/day",
             payload=[_to_jsonable(b) for b in bars_raw],
             request_key=f"daily_bars:{symbol}:{days}d",
+            blobs=self._blobs,
         )
-        return bars, prov
+        return BarSeries.from_raw(symbol, bars_raw).tail(days), prov
+
+    def get_daily_bars_bulk(
+        self,
+        symbols: Iterable[str],
+        *,
+        days: int,
+        chunk_size: int = _BULK_CHUNK_SIZE,
+    ) -> dict[str, tuple[BarSeries, Provenance]]:
+        """Multi-symbol :meth:`get_daily_bars`, one request per chunk.
+
+        Every requested symbol gets an entry (possibly with no bars) so
+        :meth:`compute_adv_usd_bulk` can flag ``no_bars`` instead of
+        silently dropping the name.
+        """
+
+        return self.get_bar_series_bulk(symbols, days=days, chunk_size=chunk_size)
+
+    def get_bar_series(self, symbol: str, *, days: int) -> tuple[BarSeries, Provenance]:
+        """Last ``days`` daily bars as a :class:`BarSeries`.
+
+        Zero-copy over the memory-mapped store when one is configured;
+        otherwise an in-memory series built from a fresh fetch.
+        """
+
+        symbol = symbol.upper()
+        return self.get_bar_series_bulk((symbol,), days=days)[symbol]
+
+    def get_bar_series_bulk(
+        self,
+        symbols: Iterable[str],
+        *,
+        days: int,
+        chunk_size: int = _BULK_CHUNK_SIZE,
+    ) -> dict[str, tuple[BarSeries, Provenance]]:
+        if days <= 0:
+            raise ValueError("days must be positive")
+        store = self._bar_store
+        if store is None:
+            return {
+                symbol: (BarSeries.from_raw(symbol, bars_raw).tail(days), prov)
+                for symbol, (bars_raw, prov) in self._fetch_bars_raw(
+                    symbols, days=days, chunk_size=chunk_size,
+                ).items()
+            }
+        ordered = tuple(dict.fromkeys(s.upper() for s in symbols))
+        self._sync_bar_store(store, ordered, days=days, chunk_size=chunk_size)
+        out: dict[str, tuple[BarSeries, Provenance]] = {}
+        for symbol in ordered:
+            series = store.read(symbol).tail(days)
+            out[symbol] = (
+                series,
+                Provenance.for_payload(
+                    provider="alpaca_data",
+                    source_url=f"{_ALPACA_DATA_BASE}/{symbol}/bars/day",
+                    payload=series.records.tobytes(),
+                    request_key=f"daily_bars:{symbol}:{days}d",
+                    blobs=self._blobs,
+                ),
+            )
+        return out
 
     def compute_adv_usd(self, symbol: str, *, days: int = 20) -> AdvResult:
-        bars, prov = self.get_daily_bars(symbol, days=days)
-        warnings: list[str] = []
-        if len(bars) < max(5, days // 2):
-            warnings.append("insufficient_history")
-        if bars:
-            adv = sum((b.dollar_volume for b in bars), start=Decimal("0")) / Decimal(len(bars))
-        else:
-            adv = Decimal("0")
-            warnings.append("no_bars")
-        if warnings:
-            prov = prov.model_copy(update={"data_quality_warnings": tuple(warnings)})
-        return AdvResult(
-            symbol=symbol.upper(),
-            window_days=days,
-            adv_usd=adv.quantize(Decimal("0.01")),
-            bars_used=len(bars),
-            provenance=prov,
+        series, prov = self.get_daily_bars(symbol, days=days)
+        return _series_to_adv(series, prov, days=days)
+
+    def compute_adv_usd_bulk(
+        self,
+        symbols: Iterable[str],
+        *,
+        days: int = 20,
+        chunk_size: int = _BULK_CHUNK_SIZE,
+    ) -> dict[str, AdvResult]:
+        """ADV for many symbols on top of :meth:`get_daily_bars_bulk`."""
+
+        return {
+            symbol: _series_to_adv(series, prov, days=days)
+            for symbol, (series, prov) in self.get_daily_bars_bulk(
+                symbols, days=days, chunk_size=chunk_size,
+            ).items()
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _coalesce(
+        self, key: str, fn: Callable[[], T], *, priority: Priority | None = None,
+    ) -> T:
+        if priority is None:
+            priority = self._priority
+        return _SINGLE_FLIGHT.do(
+            ("alpaca_data", id(self._client), key),
+            partial(paced, self._limiter, fn, priority=priority),
         )
 
+    def _fetch_bars_raw(
+        self,
+        symbols: Iterable[str],
+        *,
+        days: int,
+        chunk_size: int,
+        start: dt.datetime | None = None,
+    ) -> dict[str, tuple[list[Any], Provenance]]:
+        out: dict[str, tuple[list[Any], Provenance]] = {}
+        for request_key, bars_by_symbol in self._fetch_bar_chunks(
+            symbols, days=days, chunk_size=chunk_size, start=start,
+        ):
+            for symbol, bars_raw in bars_by_symbol.items():
+                out[symbol] = (
+                    bars_raw,
+                    Provenance.for_payload(
+                        provider="alpaca_data",
+                        source_url=f"{_ALPACA_DATA_BASE}/bars/day",
+                        payload=[_to_jsonable(b) for b in bars_raw],
+                        request_key=request_key,
+                        blobs=self._blobs,
+                    ),
+                )
+        return out
+
+    def _fetch_bar_chunks(
+        self,
+        symbols: Iterable[str],
+        *,
+        days: int,
+        chunk_size: int,
+        start: dt.datetime | None = None,
+    ) -> Iterator[tuple[str, dict[str, list[Any]]]]:
+        """``(request_key, raw bars per symbol)`` per request, without provenance."""
+
+        from alpaca.data.requests import StockBarsRequest
+        from alpaca.data.timeframe import TimeFrame
+
+        window_start, end = _bars_window(days)
+        if start is None:
+            start = window_start
+        for chunk in _chunks(symbols, chunk_size):
+            req = StockBarsRequest(
+                symbol_or_symbols=list(chunk),
+                timeframe=TimeFrame.Day,
+                start=start,
+                end=end,
+            )
+            result = self._coalesce(
+                f"bars:{start.date()}:{','.join(chunk)}",
+                partial(self._client.get_stock_bars, req),
+            )
+            yield (
+                _chunk_request_key(f"daily_bars:{days}d", chunk),
+                {symbol: _bars_for_symbol(result, symbol) for symbol in chunk},
+            )
+
+    def _sync_bar_store(
+        self,
+        store: BarStore,
+        symbols: tuple[str, ...],
+        *,
+        days: int,
+        chunk_size: int,
+    ) -> None:
+        """Fetch only what the store is missing, grouped by start day.
+
+        Symbols whose stored history does not reach back to the requested
+        window are (re)fetched from the window start; everything else is
+        fetched from its last stored day onwards.
+        """
+
+        window_day = epoch_day(_bars_window(days)[0])
+        cold: list[str] = []
+        warm: dict[int, list[str]] = {}
+        for symbol in symbols:
+            cov = store.coverage(symbol)
+            if cov is None or cov.covered_from > window_day:
+                cold.append(symbol)
+            else:
+                from_day = cov.last_day if cov.last_day is not None else window_day
+                warm.setdefault(from_day, []).append(symbol)
+
+        batches: list[tuple[int, list[str], bool]] = [(window_day, cold, True)]
+        batches.extend((day, syms, False) for day, syms in sorted(warm.items()))
+        for from_day, batch, is_cold in batches:
+            if not batch:
+                continue
+            start = dt.datetime.combine(day_to_date(from_day), dt.time(), tzinfo=dt.UTC)
+            # The store's provenance is computed over the stored records, so
+            # the fetched payloads are never hashed here.
+            for _key, bars_by_symbol in self._fetch_bar_chunks(
+                batch, days=days, chunk_size=chunk_size, start=start,
+            ):
+                for symbol, bars_raw in bars_by_symbol.items():
+                    store.merge(
+                        symbol,
+                        records_from_raw(bars_raw),
+                        covered_from=from_day if is_cold else None,
+                    )
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
+def _bars_window(days: int) -> tuple[dt.datetime, dt.datetime]:
+    end = _utcnow()
+    # Add a small buffer so weekends/holidays don't shrink the window.
+    start = end - dt.timedelta(days=int(days * 1.6) + 2)
+    return start, end
+
+
+def _chunks(symbols: Iterable[str], size: int) -> Iterator[tuple[str, ...]]:
+    """Upper-case, de-duplicate (order-preserving) and split ``symbols``."""
+
+    if size <= 0:
+        raise ValueError("chunk_size must be positive")
+    unique = tuple(dict.fromkeys(s.upper() for s in symbols))
+    for i in range(0, len(unique), size):
+        yield unique[i : i + size]
+
+
+def _chunk_request_key(prefix: str, chunk: tuple[str, ...]) -> str:
+    return f"{prefix}:{chunk[0]}..{chunk[-1]}:{len(chunk)}"
+
+
+def _to_snapshot(
+    symbol: str,
+    raw: Any,
+    *,
+    source_url: str,
+    request_key: str,
+    blobs: BlobStore | None = None,
+) -> Snapshot:
+    latest_trade = getattr(raw, "latest_trade", None)
+    daily_bar = getattr(raw, "daily_bar", None)
+    prov = Provenance.for_payload(
+        provider="alpaca_data",
+        source_url=source_url,
+        payload=_to_jsonable(raw),
+        request_key=request_key,
+        blobs=blobs,
+    )
+    return Snapshot(
+        symbol=symbol,
+        last_price=_decimal(getattr(latest_trade, "price", None)),
+        last_trade_at=getattr(latest_trade, "timestamp", None),
+        daily_volume=_int(getattr(daily_bar, "volume", None)),
+        provenance=prov,
+    )
+
+
+def _series_to_adv(series: BarSeries, prov: Provenance, *, days: int) -> AdvResult:
+    bars_used = len(series)
+    warnings: list[str] = []
+    if bars_used < max(5, days // 2):
+        warnings.append("insufficient_history")
+    if not bars_used:
+        warnings.append("no_bars")
+    if warnings:
+        prov = prov.model_copy(update={"data_quality_warnings": tuple(warnings)})
+    return AdvResult(
+        symbol=series.symbol,
+        window_days=days,
+        adv_usd=Decimal(repr(series.adv_usd())).quantize(Decimal("0.01")),
+        bars_used=bars_used,
+        provenance=prov,
+    )
+
+
 def _select(result: Any, symbol: str) -> Any:
     """alpaca-py returns a dict for batch calls; normalise to a single object."""
 
@@ -193,6 +499,21 @@ def _select(result: Any, symbol: str) -> Any:
     return result
 
 
+def _lookup(result: Any, symbol: str) -> Any:
+    """Strict per-symbol lookup in a batch response (no single-object fallback)."""
+
+    if isinstance(result, dict):
+        return result.get(symbol)
+    return None
+
+
+def _bars_for_symbol(result: Any, symbol: str) -> list[Any]:
+    data = result if isinstance(result, dict) else getattr(result, "data", None)
+    if isinstance(data, dict):
+        return list(data.get(symbol) or [])
+    return []
+
+
 def _bars_from_result(result: Any, symbol: str) -> list[Any]:
     if isinstance(result, dict):
         return list(result.get(symbol) or result.get(symbol.upper()) or [])
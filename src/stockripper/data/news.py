@@ -2,18 +2,56 @@
 
 Returns provenance-tagged :class:`NewsItem` records. The adapter is
 intentionally read-only and non-order-capable.
+
+Design notes:
+
+- **Answered from a local store.** Windowed calls (``since`` given) first
+  sync the requested symbols into a :class:`NewsStore`, then read from
+  it. A sync asks Alpaca only for articles at or after each symbol's
+  high-water ``created_at``. Symbols synced within ``refresh_after``, or
+  whose window ended before their last sync, cost no request at all.
+- **Many symbols per request.** Symbols that need a sync are grouped
+  ``chunk_size`` per request, ordered by where their cursor stands. An
+  article that mentions several symbols is stored once.
+- **Paging by time.** Articles come newest first. When a page is full, the
+  next request ends at the oldest article seen so far. The store's
+  id-keyed upsert absorbs the overlap at the page boundary.
+- **Counting reads postings only.** :meth:`NewsAdapter.count_recent_news_bulk`
+  answers from the per-symbol posting lists. No :class:`NewsItem` or
+  :class:`Provenance` is built. Stored articles keep the hash of their
+  payload, so serving them never re-hashes. With ``blobs``, that stored
+  text is what lands in the :class:`BlobStore`.
+- ``since=None`` keeps the old direct call for "the latest ``limit``
+  articles", which has no window to cover.
 """
 
 from __future__ import annotations
 
 import datetime as dt
+import functools
+import logging
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Final
 
+from stockripper.data.blob_store import BlobStore
+from stockripper.data.news_store import NewsCursor, NewsStore, StoredArticle
 from stockripper.data.provenance import Provenance
+from stockripper.data.rate_limit import Priority, PriorityTokenBucket, paced, shared_alpaca_limiter
+from stockripper.data.singleflight import SingleFlight
 from stockripper.integrations.alpaca import NewsClientLike, build_news_client
 
+LOG: Final = logging.getLogger(__name__)
+
 _ALPACA_NEWS_BASE: str = "alpaca-data://news"
+# Identical requests issued concurrently (several tracks asking for the same
+# symbol's news) share one API call.
+_SINGLE_FLIGHT: SingleFlight = SingleFlight()
+# Articles per sync request: Alpaca's page size, so each call is exactly one
+# HTTP request (and one rate-limiter token); the sync pages by ``end``.
+_PAGE_SIZE: Final[int] = 50
+_CHUNK_SIZE: Final[int] = 50
+_DEFAULT_COUNT_CAP: Final[int] = 100
 
 
 @dataclass(frozen=True)
@@ -31,10 +69,36 @@ class NewsItem:
 
 
 class NewsAdapter:
-    """Thin wrapper around alpaca-py's NewsClient."""
+    """Thin wrapper around alpaca-py's NewsClient, backed by a :class:`NewsStore`."""
 
-    def __init__(self, client: NewsClientLike | None = None) -> None:
-        self._client = client if client is not None else build_news_client()
+    def __init__(
+        self,
+        client: NewsClientLike | None = None,
+        *,
+        store: NewsStore | None = None,
+        refresh_after: dt.timedelta = dt.timedelta(minutes=5),
+        page_size: int = _PAGE_SIZE,
+        chunk_size: int = _CHUNK_SIZE,
+        limiter: PriorityTokenBucket | None = None,
+        priority: Priority = Priority.EVIDENCE,
+        blobs: BlobStore | None = None,
+    ) -> None:
+        if client is None:
+            client = build_news_client()
+            limiter = limiter if limiter is not None else shared_alpaca_limiter()
+        self._client = client
+        # An injected client is paced only when a limiter is passed with it.
+        self._limiter = limiter
+        self._priority = priority
+        self._store = store if store is not None else NewsStore()
+        self._refresh_after = refresh_after
+        self._page_size = page_size
+        self._chunk_size = chunk_size
+        self._blobs = blobs
+
+    @property
+    def store(self) -> NewsStore:
+        return self._store
 
     def get_recent_news(
         self,
@@ -43,38 +107,158 @@ class NewsAdapter:
         since: dt.datetime | None = None,
         limit: int = 50,
     ) -> tuple[NewsItem, ...]:
-        from alpaca.data.requests import NewsRequest
-
         if not symbols:
             return ()
         upper_symbols = [s.upper() for s in symbols]
-        kwargs: dict[str, Any] = {"symbols": ",".join(upper_symbols), "limit": limit}
-        if since is not None:
-            kwargs["start"] = since
-        req = NewsRequest(**kwargs)
-        result = self._client.get_news(req)
-        raw_items = _items_from_result(result)
+        request_key = f"news:{','.join(upper_symbols)}:{since}:{limit}"
+        if since is None:
+            return self._get_latest_news(upper_symbols, limit=limit, request_key=request_key)
+        self.sync(upper_symbols, since=since)
+        return tuple(
+            _item_from_stored(article, request_key, self._blobs)
+            for article in self._store.recent(upper_symbols, since=since, limit=limit)
+        )
+
+    def count_recent_news(
+        self,
+        symbol: str,
+        *,
+        since: dt.datetime,
+        limit: int = _DEFAULT_COUNT_CAP,
+    ) -> int:
+        """Articles mentioning ``symbol`` since ``since``, at most ``limit``."""
+
+        counts = self.count_recent_news_bulk([symbol], since=since, cap=limit)
+        return counts[symbol.upper()]
+
+    def count_recent_news_bulk(
+        self,
+        symbols: Iterable[str],
+        *,
+        since: dt.datetime,
+        until: dt.datetime | None = None,
+        cap: int = _DEFAULT_COUNT_CAP,
+    ) -> dict[str, int]:
+        """Articles per symbol in ``[since, until]``, each saturating at ``cap``.
+
+        Client errors propagate. Chunks synced before the failure are
+        already stored and are not fetched again.
+        """
+
+        upper = list(dict.fromkeys(s.upper() for s in symbols))
+        self.sync(upper, since=since, until=until)
+        counts = self._store.counts(upper, since=since, until=until)
+        return {symbol: min(n, cap) for symbol, n in counts.items()}
+
+    def sync(
+        self,
+        symbols: Sequence[str],
+        *,
+        since: dt.datetime,
+        until: dt.datetime | None = None,
+    ) -> int:
+        """Bring the store up to date for ``symbols`` over ``[since, until]``.
+
+        Returns the number of requests sent to Alpaca.
+        """
+
+        now = dt.datetime.now(dt.UTC)
+        upper = list(dict.fromkeys(s.upper() for s in symbols))
+        cursors = self._store.cursors(upper)
+        starts: dict[str, dt.datetime] = {}
+        for symbol in upper:
+            start = _sync_start(cursors.get(symbol), since, until, now, self._refresh_after)
+            if start is not None:
+                starts[symbol] = start
+        # Neighbouring cursors share a chunk, so one request's window fits them all.
+        pending = sorted(starts, key=lambda s: (starts[s], s))
+        requests = 0
+        for i in range(0, len(pending), self._chunk_size):
+            chunk = pending[i : i + self._chunk_size]
+            start = min(starts[s] for s in chunk)
+            sent, complete = self._fetch_window(chunk, start=start, retrieved_at=now)
+            requests += sent
+            if not complete:
+                LOG.warning("news sync for %s stalled on a full page", ",".join(chunk))
+                continue
+            self._store.advance(chunk, covered_from=start, synced_at=now)
+        return requests
+
+    def _coalesce(self, request_key: str, fn: Callable[[], Any]) -> Any:
+        return _SINGLE_FLIGHT.do(
+            ("alpaca_news", id(self._client), request_key),
+            functools.partial(paced, self._limiter, fn, priority=self._priority),
+        )
+
+    def _fetch_window(
+        self, symbols: list[str], *, start: dt.datetime, retrieved_at: dt.datetime,
+    ) -> tuple[int, bool]:
+        """Store every article from ``start`` on; ``(requests, window_complete)``."""
+
+        from alpaca.common.enums import Sort
+        from alpaca.data.requests import NewsRequest
+
+        end: dt.datetime | None = None
+        requests = 0
+        while True:
+            req = NewsRequest(
+                symbols=",".join(symbols),
+                start=start,
+                end=end,
+                sort=Sort.DESC,
+                limit=self._page_size,
+            )
+            request_key = f"news_sync:{req.symbols}:{start.isoformat()}:{end}"
+            result = self._coalesce(request_key, functools.partial(self._client.get_news, req))
+            requests += 1
+            raw_items = _items_from_result(result)
+            page = [_stored_article(raw, retrieved_at) for raw in raw_items]
+            self._store.upsert(page)
+            if len(raw_items) < self._page_size:
+                return requests, True
+            oldest = min((a.created_at for a in page), default=None)
+            if oldest is None or oldest == end:
+                # A full page sharing one timestamp: the cursor cannot move.
+                return requests, False
+            end = oldest
+
+    def _get_latest_news(
+        self, symbols: list[str], *, limit: int, request_key: str,
+    ) -> tuple[NewsItem, ...]:
+        from alpaca.data.requests import NewsRequest
+
+        req = NewsRequest(symbols=",".join(symbols), limit=limit)
+        result = self._coalesce(request_key, functools.partial(self._client.get_news, req))
         out: list[NewsItem] = []
-        for raw in raw_items:
+        for raw in _items_from_result(result):
             prov = Provenance.for_payload(
                 provider="alpaca_news",
                 source_url=f"{_ALPACA_NEWS_BASE}/{getattr(raw, 'id', '?')}",
                 payload=_to_jsonable(raw),
-                request_key=f"news:{','.join(upper_symbols)}:{since}:{limit}",
+                request_key=request_key,
+                blobs=self._blobs,
             )
             out.append(_to_news_item(raw, prov))
         return tuple(out)
 
-    def count_recent_news(
-        self,
-        symbol: str,
-        *,
-        since: dt.datetime,
-        limit: int = 100,
-    ) -> int:
-        """Used by the low-visibility filter to count items in a window."""
 
-        return len(self.get_recent_news([symbol], since=since, limit=limit))
+def _sync_start(
+    cursor: NewsCursor | None,
+    since: dt.datetime,
+    until: dt.datetime | None,
+    now: dt.datetime,
+    refresh_after: dt.timedelta,
+) -> dt.datetime | None:
+    """Where a sync for this symbol must start, or ``None`` if it is current."""
+
+    if cursor is None or cursor.covered_from > since:
+        return since
+    fresh_enough = now - refresh_after
+    if until is not None and until < fresh_enough:
+        fresh_enough = until
+    if cursor.synced_at >= fresh_enough:
+        return None
+    return max(cursor.high_water, since)
 
 
 # ---------------------------------------------------------------------------
@@ -104,6 +288,45 @@ def _items_from_result(result: Any) -> list[Any]:
     return list(data or [])
 
 
+def _stored_article(raw: Any, retrieved_at: dt.datetime) -> StoredArticle:
+    created = getattr(raw, "created_at", None) or retrieved_at
+    return StoredArticle.from_payload(
+        id=str(getattr(raw, "id", "")),
+        created_at=created,
+        updated_at=getattr(raw, "updated_at", None),
+        symbols=(str(s) for s in getattr(raw, "symbols", None) or ()),
+        payload=_to_jsonable(raw),
+        retrieved_at=retrieved_at,
+    )
+
+
+def _item_from_stored(
+    article: StoredArticle, request_key: str, blobs: BlobStore | None,
+) -> NewsItem:
+    payload = article.payload_dict()
+    # The stored text is the canonical JSON its content_hash was taken over.
+    uri = blobs.put(article.payload, digest=article.content_hash) if blobs is not None else None
+    return NewsItem(
+        id=article.id,
+        headline=str(payload.get("headline") or ""),
+        summary=str(payload.get("summary") or ""),
+        author=_opt_str(payload.get("author")),
+        url=_opt_str(payload.get("url")),
+        symbols=article.symbols,
+        created_at=article.created_at,
+        updated_at=article.updated_at,
+        source=_opt_str(payload.get("source")),
+        provenance=Provenance(
+            provider="alpaca_news",
+            source_url=f"{_ALPACA_NEWS_BASE}/{article.id}",
+            retrieved_at=article.retrieved_at,
+            content_hash=article.content_hash,
+            request_key=request_key,
+            raw_content_uri=uri,
+        ),
+    )
+
+
 def _to_news_item(raw: Any, provenance: Provenance) -> NewsItem:
     symbols = getattr(raw, "symbols", None) or []
     return NewsItem(
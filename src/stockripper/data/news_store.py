@@ -0,0 +1,357 @@
+"""Local, deduplicated store for Alpaca news articles.
+
+Alpaca returns the same article once per request that touches any of its
+symbols, and every window used to be refetched from scratch. The store
+keeps each article once, keyed by its Alpaca news ``id``, with a posting
+list per symbol and a per-symbol sync cursor. :class:`NewsAdapter` then
+asks Alpaca only for articles newer than the cursor and answers
+``get_recent_news`` / ``count_recent_news`` from here.
+
+Design notes:
+
+- **Three tables in one WAL-mode SQLite file.** ``news_articles`` holds
+  the canonical JSON payload and its sha256 (so provenance never re-hashes
+  a stored article). ``news_postings`` is a ``WITHOUT ROWID`` index on
+  ``(symbol, created_at, id)``, so a symbol's recent articles are one range
+  scan. ``news_cursors`` records, per symbol, from when the store is
+  complete (``covered_from``), the newest ``created_at`` seen
+  (``high_water``) and when it was last synced.
+- **Idempotent writes.** Articles are upserted and postings inserted with
+  ``OR IGNORE``, so the overlap at a cursor or page boundary is harmless.
+  A re-delivered article replaces the stored copy only when its
+  ``updated_at`` is newer.
+- **Cursors move last.** They are advanced only after a sync's articles
+  are written. A sync that fails partway just repeats on the next call.
+- **Shared across processes** like :class:`SqliteCache`: one connection
+  per thread (re-opened after ``fork``) and ``busy_timeout`` on writes.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+_DEFAULT_PATH: Final[Path] = Path(".data-cache") / "news.sqlite3"
+_BUSY_TIMEOUT_S: Final[float] = 30.0
+# Table layout version, kept in ``PRAGMA user_version``.
+_LAYOUT_VERSION: Final[int] = 1
+# SQLite's default limit on bound parameters is 999 on older builds.
+_MAX_PARAMS: Final[int] = 900
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS news_articles (
+    id TEXT PRIMARY KEY,
+    created_at_us INTEGER NOT NULL,
+    updated_at_us INTEGER NOT NULL,
+    retrieved_at_us INTEGER NOT NULL,
+    symbols TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS news_postings (
+    symbol TEXT NOT NULL,
+    created_at_us INTEGER NOT NULL,
+    article_id TEXT NOT NULL,
+    PRIMARY KEY (symbol, created_at_us, article_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS news_cursors (
+    symbol TEXT PRIMARY KEY,
+    covered_from_us INTEGER NOT NULL,
+    high_water_us INTEGER NOT NULL,
+    synced_at_us INTEGER NOT NULL
+);
+"""
+
+_EPOCH: Final[dt.datetime] = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+
+def _to_us(value: dt.datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt.UTC)
+    return (value - _EPOCH) // dt.timedelta(microseconds=1)
+
+
+def _from_us(value: int) -> dt.datetime:
+    return _EPOCH + dt.timedelta(microseconds=value)
+
+
+def canonical_payload(payload: Any) -> tuple[str, str]:
+    """``(json_text, sha256)`` exactly as :meth:`Provenance.for_payload` hashes it."""
+
+    text = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return text, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class StoredArticle:
+    id: str
+    created_at: dt.datetime
+    updated_at: dt.datetime
+    symbols: tuple[str, ...]
+    payload: str
+    content_hash: str
+    retrieved_at: dt.datetime
+
+    @classmethod
+    def from_payload(
+        cls,
+        *,
+        id: str,
+        created_at: dt.datetime,
+        updated_at: dt.datetime | None,
+        symbols: Iterable[str],
+        payload: Any,
+        retrieved_at: dt.datetime,
+    ) -> StoredArticle:
+        text, digest = canonical_payload(payload)
+        return cls(
+            id=id,
+            created_at=created_at,
+            updated_at=updated_at if updated_at is not None else created_at,
+            symbols=tuple(dict.fromkeys(s.upper() for s in symbols)),
+            payload=text,
+            content_hash=digest,
+            retrieved_at=retrieved_at,
+        )
+
+    def payload_dict(self) -> dict[str, Any]:
+        value: dict[str, Any] = json.loads(self.payload)
+        return value
+
+
+@dataclass(frozen=True)
+class NewsCursor:
+    symbol: str
+    covered_from: dt.datetime
+    high_water: dt.datetime
+    synced_at: dt.datetime
+
+
+class NewsStore:
+    """Articles by id, postings by symbol, and a sync cursor per symbol."""
+
+    def __init__(
+        self, path: Path | str | None = None, *, busy_timeout_s: float = _BUSY_TIMEOUT_S,
+    ) -> None:
+        self._path = Path(path) if path is not None else _DEFAULT_PATH
+        self._busy_timeout_s = busy_timeout_s
+        self._local = threading.local()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _conn(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=self._busy_timeout_s, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != _LAYOUT_VERSION:
+                for table in ("news_articles", "news_postings", "news_cursors"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"PRAGMA user_version = {_LAYOUT_VERSION}")
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def upsert(self, articles: Iterable[StoredArticle]) -> int:
+        """Store ``articles`` and their postings; returns how many were given."""
+
+        rows = list(articles)
+        if not rows:
+            return 0
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO news_articles (id, created_at_us, updated_at_us, retrieved_at_us, "
+                "symbols, content_hash, payload) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET created_at_us = excluded.created_at_us, "
+                "updated_at_us = excluded.updated_at_us, "
+                "retrieved_at_us = excluded.retrieved_at_us, symbols = excluded.symbols, "
+                "content_hash = excluded.content_hash, payload = excluded.payload "
+                "WHERE excluded.updated_at_us > news_articles.updated_at_us",
+                [
+                    (
+                        a.id,
+                        _to_us(a.created_at),
+                        _to_us(a.updated_at),
+                        _to_us(a.retrieved_at),
+                        ",".join(a.symbols),
+                        a.content_hash,
+                        a.payload,
+                    )
+                    for a in rows
+                ],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO news_postings (symbol, created_at_us, article_id) "
+                "VALUES (?, ?, ?)",
+                [(s, _to_us(a.created_at), a.id) for a in rows for s in a.symbols],
+            )
+        return len(rows)
+
+    def advance(
+        self,
+        symbols: Iterable[str],
+        *,
+        covered_from: dt.datetime,
+        synced_at: dt.datetime,
+    ) -> None:
+        """Record a completed sync of ``[covered_from, synced_at]`` for ``symbols``.
+
+        A sync that starts inside or before the covered range extends it, so
+        ``covered_from`` moves back. One that starts after the last
+        ``synced_at`` left a gap that was never fetched, so the range restarts
+        at ``covered_from``. ``high_water`` is recomputed from the postings.
+        """
+
+        covered_us, synced_us = _to_us(covered_from), _to_us(synced_at)
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO news_cursors (symbol, covered_from_us, high_water_us, synced_at_us) "
+                "VALUES (:symbol, :covered, COALESCE((SELECT MAX(created_at_us) FROM news_postings "
+                "WHERE symbol = :symbol), :covered), :synced) "
+                "ON CONFLICT (symbol) DO UPDATE SET "
+                "covered_from_us = CASE WHEN excluded.covered_from_us <= synced_at_us "
+                "THEN MIN(covered_from_us, excluded.covered_from_us) "
+                "ELSE excluded.covered_from_us END, "
+                "high_water_us = MAX(high_water_us, excluded.high_water_us), "
+                "synced_at_us = MAX(synced_at_us, excluded.synced_at_us)",
+                [
+                    {"symbol": s.upper(), "covered": covered_us, "synced": synced_us}
+                    for s in symbols
+                ],
+            )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def cursors(self, symbols: Sequence[str]) -> dict[str, NewsCursor]:
+        out: dict[str, NewsCursor] = {}
+        for chunk in _chunks([s.upper() for s in symbols]):
+            rows = self._conn().execute(
+                "SELECT symbol, covered_from_us, high_water_us, synced_at_us FROM news_cursors "
+                f"WHERE symbol IN ({_marks(chunk)})",
+                chunk,
+            ).fetchall()
+            for symbol, covered, high, synced in rows:
+                out[symbol] = NewsCursor(
+                    symbol=symbol,
+                    covered_from=_from_us(covered),
+                    high_water=_from_us(high),
+                    synced_at=_from_us(synced),
+                )
+        return out
+
+    def recent(
+        self,
+        symbols: Sequence[str],
+        *,
+        since: dt.datetime,
+        limit: int,
+    ) -> list[StoredArticle]:
+        """Newest-first articles mentioning any of ``symbols``, each once."""
+
+        upper = list(dict.fromkeys(s.upper() for s in symbols))
+        if not upper or limit <= 0:
+            return []
+        rows = self._conn().execute(
+            "SELECT a.id, a.created_at_us, a.updated_at_us, a.retrieved_at_us, a.symbols, "
+            "a.content_hash, a.payload FROM news_articles a WHERE a.id IN ("
+            "SELECT article_id FROM news_postings "
+            f"WHERE symbol IN ({_marks(upper)}) AND created_at_us >= ?) "
+            "ORDER BY a.created_at_us DESC, a.id DESC LIMIT ?",
+            (*upper, _to_us(since), limit),
+        ).fetchall()
+        return [
+            StoredArticle(
+                id=article_id,
+                created_at=_from_us(created),
+                updated_at=_from_us(updated),
+                symbols=tuple(tagged.split(",")) if tagged else (),
+                payload=payload,
+                content_hash=digest,
+                retrieved_at=_from_us(retrieved),
+            )
+            for article_id, created, updated, retrieved, tagged, digest, payload in rows
+        ]
+
+    def counts(
+        self,
+        symbols: Sequence[str],
+        *,
+        since: dt.datetime,
+        until: dt.datetime | None = None,
+    ) -> dict[str, int]:
+        """Articles per symbol in ``[since, until]``; symbols with none map to 0."""
+
+        upper = list(dict.fromkeys(s.upper() for s in symbols))
+        out = dict.fromkeys(upper, 0)
+        end_us = _to_us(until) if until is not None else None
+        for chunk in _chunks(upper):
+            sql = (
+                "SELECT symbol, COUNT(*) FROM news_postings "
+                f"WHERE symbol IN ({_marks(chunk)}) AND created_at_us >= ?"
+            )
+            params: list[Any] = [*chunk, _to_us(since)]
+            if end_us is not None:
+                sql += " AND created_at_us <= ?"
+                params.append(end_us)
+            for symbol, n in self._conn().execute(sql + " GROUP BY symbol", params):
+                out[symbol] = int(n)
+        return out
+
+    def stats(self) -> Mapping[str, int]:
+        conn = self._conn()
+        return {
+            table: int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+            for table in ("news_articles", "news_postings", "news_cursors")
+        }
+
+    def close(self) -> None:
+        """Close the calling thread's connection (others close on GC)."""
+
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _marks(values: Sequence[object]) -> str:
+    return ", ".join("?" * len(values))
+
+
+def _chunks(values: list[str]) -> Iterable[list[str]]:
+    for i in range(0, len(values), _MAX_PARAMS):
+        yield values[i : i + _MAX_PARAMS]
+
+
+__all__ = (
+    "NewsCursor",
+    "NewsStore",
+    "StoredArticle",
+    "canonical_payload",
+)
@@ -0,0 +1,296 @@
+"""Point-in-time fundamentals: bulk load from cached company facts.
+
+:func:`derive_fundamentals` answers "what is this filer's latest value"
+for one CIK at a time and is not time-aware. Universe construction needs
+the opposite shape: one fact (shares outstanding) for thousands of filers,
+as it was known on the build date. This module flattens cached EDGAR
+company-facts documents into ``fundamental_facts`` rows keyed by
+``(cik, fact, period_end, filed_date)``, and serves shares outstanding
+back per symbol for the snapshot provider's market-cap join.
+
+Design notes:
+
+- **Cache only.** :func:`load_pit_fundamentals` never calls EDGAR; warm the
+  cache first (``cache warm``, ``research import-edgar-bulk`` or the async
+  client). It reads the raw cached document through
+  :func:`select_company_facts`, so the full object graph is never built.
+- **Every filing, not just the latest.** Each observation keeps its
+  ``filed`` date, so a query for an earlier day ignores values filed after
+  it, and a restatement replaces the original only once it is filed.
+- **Annual flows.** ``revenue`` and ``net_income`` keep ``FY`` values that
+  span about a year. Quarterly durations in annual filings are left out,
+  matching the deriver's FY proxy.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import re
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, Final, Literal, Protocol
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from stockripper.data.cache import CacheBackend, read_raw, shared_cache
+from stockripper.data.facts_stream import select_company_facts
+from stockripper.data.fundamentals import (
+    _TAG_DEBT_LONG,
+    _TAG_DEBT_SHORT,
+    _TAG_EQUITY,
+    _TAG_NET_INCOME,
+    _TAG_REVENUE,
+    _TAG_SHARES_OUT,
+    FUNDAMENTAL_FACTS,
+)
+from stockripper.data.sec_edgar import build_ticker_index, normalise_cik
+from stockripper.db.repository import Repository
+
+LOG: Final = logging.getLogger(__name__)
+
+PitFact = Literal[
+    "shares_outstanding",
+    "revenue",
+    "net_income",
+    "long_term_debt",
+    "short_term_debt",
+    "total_equity",
+]
+
+
+@dataclass(frozen=True)
+class _FactSource:
+    fact: PitFact
+    tags: tuple[tuple[str, tuple[str, ...]], ...]  # (taxonomy, tags) in priority order
+    unit: str
+    annual: bool = False
+
+
+_SOURCES: Final[tuple[_FactSource, ...]] = (
+    _FactSource(
+        "shares_outstanding", (("dei", _TAG_SHARES_OUT), ("us-gaap", _TAG_SHARES_OUT)), "shares",
+    ),
+    _FactSource("revenue", (("us-gaap", _TAG_REVENUE),), "USD", annual=True),
+    _FactSource("net_income", (("us-gaap", _TAG_NET_INCOME),), "USD", annual=True),
+    _FactSource("long_term_debt", (("us-gaap", _TAG_DEBT_LONG),), "USD"),
+    _FactSource("short_term_debt", (("us-gaap", _TAG_DEBT_SHORT),), "USD"),
+    _FactSource("total_equity", (("us-gaap", _TAG_EQUITY),), "USD"),
+)
+# A fiscal year reported as a duration: allow 52/53-week years.
+_MIN_ANNUAL_DAYS: Final[int] = 350
+_FACTS_KEY_RE: Final[re.Pattern[str]] = re.compile(r"^company_facts_(\d{10})(?:@|$)")
+# The ticker map is only needed to translate symbols; an expired copy is
+# far better than no market caps at all.
+_TICKER_MAP_GRACE: Final[dt.timedelta] = dt.timedelta(days=30)
+
+
+@dataclass(frozen=True)
+class FactObservation:
+    """One ``fundamental_facts`` row before it is persisted."""
+
+    fact: PitFact
+    period_end: dt.date
+    filed_date: dt.date
+    value: Decimal
+    unit: str
+    source_tag: str
+    form: str | None
+    fiscal_period: str | None
+    accession: str | None
+
+
+@dataclass(frozen=True)
+class PitLoadReport:
+    filers: int
+    observations: int
+    missing: tuple[str, ...]
+
+
+def observations_from_facts(facts: Mapping[str, Any]) -> list[FactObservation]:
+    """Flatten a company-facts ``facts`` mapping into point-in-time rows.
+
+    For each fact the first tag (in priority order) that reported a given
+    ``(period_end, filed_date)`` wins.
+    """
+
+    out: list[FactObservation] = []
+    for source in _SOURCES:
+        seen: set[tuple[dt.date, dt.date]] = set()
+        for taxonomy, tags in source.tags:
+            namespace = facts.get(taxonomy) or {}
+            for tag in tags:
+                entries = ((namespace.get(tag) or {}).get("units") or {}).get(source.unit) or []
+                for obs in _observations(source, tag, entries):
+                    slot = (obs.period_end, obs.filed_date)
+                    if slot not in seen:
+                        seen.add(slot)
+                        out.append(obs)
+    return out
+
+
+def _observations(
+    source: _FactSource, tag: str, entries: Iterable[Mapping[str, Any]],
+) -> Iterator[FactObservation]:
+    for entry in entries:
+        try:
+            end = dt.date.fromisoformat(entry["end"])
+            filed = dt.date.fromisoformat(entry["filed"])
+            value = Decimal(str(entry["val"]))
+            if source.annual:
+                if entry.get("fp") != "FY":
+                    continue
+                start = dt.date.fromisoformat(entry["start"])
+                if (end - start).days < _MIN_ANNUAL_DAYS:
+                    continue
+        except (KeyError, TypeError, ValueError, InvalidOperation):
+            continue
+        yield FactObservation(
+            fact=source.fact,
+            period_end=end,
+            filed_date=filed,
+            value=value,
+            unit=source.unit,
+            source_tag=tag,
+            form=entry.get("form"),
+            fiscal_period=entry.get("fp"),
+            accession=entry.get("accn"),
+        )
+
+
+def cached_facts_ciks(cache: CacheBackend) -> list[str]:
+    """CIKs with a company-facts document (full or selected) in ``cache``."""
+
+    backend = getattr(cache, "backing", cache)
+    entries = getattr(backend, "entries", None)
+    if entries is None:
+        return []
+    ciks = {
+        match.group(1)
+        for info in entries("sec_edgar")
+        if (match := _FACTS_KEY_RE.match(info.key)) is not None
+    }
+    return sorted(ciks)
+
+
+def _cached_facts(cache: CacheBackend, cik: str) -> Mapping[str, Any] | None:
+    raw = read_raw(cache, "sec_edgar", f"company_facts_{cik}")
+    if raw is not None:
+        selected: dict[str, Any] = select_company_facts(raw, FUNDAMENTAL_FACTS)["facts"]
+        return selected
+    entry = cache.get("sec_edgar", f"company_facts_{cik}@{FUNDAMENTAL_FACTS.digest}")
+    if entry is None:
+        entry = cache.get("sec_edgar", f"company_facts_{cik}")
+    if entry is None:
+        return None
+    facts = entry.value.get("facts") if isinstance(entry.value, dict) else None
+    return facts if isinstance(facts, dict) else None
+
+
+def load_pit_fundamentals(
+    session: Session,
+    *,
+    cache: CacheBackend | None = None,
+    ciks: Iterable[str] | None = None,
+) -> PitLoadReport:
+    """Replace ``fundamental_facts`` rows for ``ciks`` from cached company facts.
+
+    ``ciks=None`` loads every filer with a cached document. CIKs with
+    nothing cached are reported in ``missing`` and keep their stored rows.
+    """
+
+    cache = cache if cache is not None else shared_cache()
+    wanted = (
+        [normalise_cik(c) for c in dict.fromkeys(ciks)]
+        if ciks is not None
+        else cached_facts_ciks(cache)
+    )
+    repo = Repository(session)
+    filers = observations = 0
+    missing: list[str] = []
+    for cik in wanted:
+        facts = _cached_facts(cache, cik)
+        if facts is None:
+            missing.append(cik)
+            continue
+        rows = [asdict(obs) for obs in observations_from_facts(facts)]
+        observations += repo.replace_fundamental_facts(cik, rows)
+        filers += 1
+    return PitLoadReport(filers=filers, observations=observations, missing=tuple(missing))
+
+
+# ---------------------------------------------------------------------------
+# Shares outstanding per symbol
+# ---------------------------------------------------------------------------
+class SharesOutstandingSource(Protocol):
+    def shares_outstanding(
+        self, symbols: Sequence[str], *, as_of: dt.date,
+    ) -> Mapping[str, Decimal]: ...
+
+
+class PitSharesSource:
+    """Shares outstanding per symbol from ``fundamental_facts``, as of a date."""
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        *,
+        ticker_index: Mapping[str, str],
+    ) -> None:
+        self._session_factory = session_factory
+        self._ticker_index = ticker_index
+
+    @classmethod
+    def from_cache(
+        cls,
+        session_factory: sessionmaker[Session],
+        *,
+        cache: CacheBackend | None = None,
+    ) -> PitSharesSource:
+        """Map tickers through the cached SEC ticker map (no network)."""
+
+        cache = cache if cache is not None else shared_cache()
+        entry = cache.get("sec_edgar", "company_tickers", grace=_TICKER_MAP_GRACE)
+        index = build_ticker_index(entry.value) if entry is not None else {}
+        if not index:
+            LOG.warning("no cached SEC ticker map; market caps will be unknown")
+        return cls(session_factory, ticker_index=index)
+
+    def shares_outstanding(
+        self, symbols: Sequence[str], *, as_of: dt.date,
+    ) -> dict[str, Decimal]:
+        by_cik: dict[str, list[str]] = {}
+        for symbol in symbols:
+            cik = self._ticker_index.get(symbol.upper())
+            if cik is not None:
+                by_cik.setdefault(cik, []).append(symbol)
+        if not by_cik:
+            return {}
+        try:
+            with self._session_factory() as session:
+                rows = Repository(session).fundamental_facts_as_of(
+                    "shares_outstanding", as_of=as_of, ciks=by_cik,
+                )
+        except SQLAlchemyError as exc:
+            LOG.warning("point-in-time shares lookup failed: %s", exc)
+            return {}
+        return {
+            symbol: row.value
+            for cik, row in rows.items()
+            for symbol in by_cik[cik]
+            if row.value > 0
+        }
+
+
+__all__ = (
+    "FactObservation",
+    "PitFact",
+    "PitLoadReport",
+    "PitSharesSource",
+    "SharesOutstandingSource",
+    "cached_facts_ciks",
+    "load_pit_fundamentals",
+    "observations_from_facts",
+)
@@ -2,16 +2,51 @@
 
 Phase 2 keeps this in adapter return values; Phase 3 will mechanically
 persist it into a ``data_provenance`` table without the adapters changing.
+
+Design notes:
+
+- **One canonical form.** ``content_hash`` is sha256 over
+  ``json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))``
+  for structured payloads, and over the bytes themselves for ``bytes`` /
+  ``str``. :func:`canonical_hash` yields exactly those bytes.
+- **Streamed.** Nested documents (EDGAR company facts, submissions) are
+  encoded a few levels down, one member at a time, by the C encoder and
+  fed straight into the hasher. Large lists (bars) are encoded in slices.
+  The full canonical string is never built.
+- **Raw payload on request.** Given a :class:`BlobStore`,
+  :meth:`Provenance.for_payload` streams the same pieces into
+  :meth:`BlobStore.put_chunks` under ``content_hash`` (once; later calls
+  find it) and records the ``raw_content_uri``.
+- **Version memo.** A :class:`HashMemo` remembers digests under a key the
+  caller guarantees names one payload version (a cache key plus the
+  entry's expiry, say), so a document served again from the cache is not
+  hashed again. :meth:`Provenance.for_payload` takes the digest as
+  ``content_hash``.
 """
 
 from __future__ import annotations
 
 import datetime as dt
 import hashlib
-from typing import Any
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from typing import Any, Final
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from stockripper.data.blob_store import BlobStore, blob_uri
+
+_ENCODER: Final[json.JSONEncoder] = json.JSONEncoder(
+    sort_keys=True, default=str, separators=(",", ":"),
+)
+# Dicts holding dicts are split into members this many levels down; below
+# that a value is one C-encoder call (an EDGAR tag, a filings column).
+_SPLIT_DEPTH: Final[int] = 3
+_LIST_SLICE: Final[int] = 512
+_DEFAULT_MEMO_ENTRIES: Final[int] = 4096
+
 
 def _utcnow() -> dt.datetime:
     return dt.datetime.now(dt.UTC)
@@ -39,6 +74,10 @@ class Provenance(BaseModel):
         default=(),
         description="Adapter-emitted warnings such as 'shares_out_stale' or 'partial_facts'.",
     )
+    raw_content_uri: str | None = Field(
+        default=None,
+        description="blob:// URI of the hashed payload when it was kept in a BlobStore.",
+    )
 
     @classmethod
     def for_payload(
@@ -50,28 +89,111 @@ class Provenance(BaseModel):
         request_key: str | None = None,
         retrieved_at: dt.datetime | None = None,
         data_quality_warnings: tuple[str, ...] = (),
+        blobs: BlobStore | None = None,
+        content_hash: str | None = None,
     ) -> Provenance:
-        """Build a Provenance with ``content_hash`` derived from ``payload``."""
-
-        hasher = hashlib.sha256()
-        if isinstance(payload, (bytes, bytearray)):
-            hasher.update(bytes(payload))
-        elif isinstance(payload, str):
-            hasher.update(payload.encode("utf-8"))
-        else:
-            import json
-
-            hasher.update(
-                json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+        """Build a Provenance with ``content_hash`` derived from ``payload``.
+
+        A ``content_hash`` the caller already has (see :class:`HashMemo`)
+        is used as is; it must be ``canonical_hash(payload)``.
+        """
+
+        digest = content_hash if content_hash is not None else canonical_hash(payload)
+        uri = None
+        if blobs is not None:
+            uri = (
+                blob_uri(digest)
+                if blobs.contains(digest)
+                else blobs.put_chunks(_encoded_chunks(payload), digest=digest)
             )
         return cls(
             provider=provider,
             source_url=source_url,
-            content_hash=hasher.hexdigest(),
+            content_hash=digest,
+            raw_content_uri=uri,
             request_key=request_key,
             retrieved_at=retrieved_at if retrieved_at is not None else _utcnow(),
             data_quality_warnings=data_quality_warnings,
         )
 
 
-__all__ = ("Provenance",)
+def canonical_hash(payload: Any) -> str:
+    """sha256 hex digest of ``payload`` in the canonical form (see module notes)."""
+
+    hasher = hashlib.sha256()
+    for chunk in _encoded_chunks(payload):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def canonical_bytes(payload: Any) -> bytes:
+    """The exact bytes :func:`canonical_hash` digests."""
+
+    return b"".join(_encoded_chunks(payload))
+
+
+class HashMemo:
+    """Bounded, thread-safe LRU of :func:`canonical_hash` results.
+
+    Keys name a payload *version*: the caller must never pair one key with
+    two different payloads.
+    """
+
+    def __init__(self, max_entries: int = _DEFAULT_MEMO_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._digests: OrderedDict[Hashable, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def digest(self, version: Hashable, payload: Any) -> str:
+        """``canonical_hash(payload)``, computed once per ``version``."""
+
+        with self._lock:
+            digest = self._digests.get(version)
+            if digest is not None:
+                self._digests.move_to_end(version)
+                return digest
+        digest = canonical_hash(payload)
+        with self._lock:
+            self._digests[version] = digest
+            while len(self._digests) > self._max_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+
+def _encoded_chunks(payload: Any) -> Iterator[bytes]:
+    """The canonical bytes of ``payload``, in pieces."""
+
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        yield bytes(payload)
+    elif isinstance(payload, str):
+        yield payload.encode("utf-8")
+    else:
+        for chunk in _canonical_chunks(payload, _SPLIT_DEPTH):
+            yield chunk.encode("utf-8")
+
+
+def _canonical_chunks(obj: Any, depth: int) -> Iterator[str]:
+    """The canonical JSON of ``obj`` in pieces whose concatenation is exact."""
+
+    if (
+        depth > 0
+        and isinstance(obj, dict)
+        and all(isinstance(k, str) for k in obj)
+        and any(isinstance(v, dict) for v in obj.values())
+    ):
+        yield "{"
+        for i, key in enumerate(sorted(obj)):
+            yield ("," if i else "") + _ENCODER.encode(key) + ":"
+            yield from _canonical_chunks(obj[key], depth - 1)
+        yield "}"
+    elif depth == _SPLIT_DEPTH and isinstance(obj, (list, tuple)) and len(obj) > _LIST_SLICE:
+        yield "["
+        for i in range(0, len(obj), _LIST_SLICE):
+            encoded = _ENCODER.encode(list(obj[i : i + _LIST_SLICE]))
+            yield ("," if i else "") + encoded[1:-1]
+        yield "]"
+    else:
+        yield _ENCODER.encode(obj)
+
+
+__all__ = ("HashMemo", "Provenance", "canonical_bytes", "canonical_hash")
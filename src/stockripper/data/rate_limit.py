@@ -0,0 +1,527 @@
+"""Shared request budgets for the upstream data providers.
+
+Alpaca meters data requests per API key per minute, but
+:class:`MarketDataAdapter`, :class:`NewsAdapter`, :class:`AlpacaAssetsLoader`
+and the alpaca-mcp data tools each used to call it on their own. A universe
+build could spend the whole minute's quota and leave the trading window's
+latest-quote calls queued behind it (or rejected with 429). Every Alpaca
+data path now draws from one :class:`PriorityTokenBucket`.
+
+Design notes:
+
+- **Priority classes.** Waiters are granted tokens strictly by
+  :class:`Priority` (execution-critical quotes, then window evidence, then
+  background warm-up), first come first served within a class. Only
+  :attr:`Priority.EXECUTION` may spend the last ``reserve`` tokens, so a
+  quote never waits for a refill after a background burst.
+- **429-aware.** :meth:`PriorityTokenBucket.call` retries a rate-limited
+  call with exponential backoff (or the server's ``Retry-After`` /
+  ``X-RateLimit-Reset`` hint). The quota is per key, so a 429 pauses the
+  whole bucket, not just the caller. alpaca-py's own fixed-wait retry on
+  429 is switched off in the client factories so the bucket sees them
+  (see :mod:`stockripper.integrations.alpaca._sdk_retry` for the guard).
+- **Sync and async waiters.** Threads wait on the condition variable,
+  coroutines on an event the same notifications set. Both queue in one
+  line per class, and a cancelled coroutine leaves it without a token.
+- **Observable.** :meth:`PriorityTokenBucket.metrics` reports the queue
+  depth, grants and time spent waiting per class, plus 429s seen.
+- **Per process.** The alpaca-mcp server is a separate process; its data
+  tools are paced on the client side by :class:`AlpacaMcpClient`.
+
+SEC EDGAR's fair-access limit (10 requests/second) is per machine, not per
+process: ``run-day``, an ad-hoc ``research fundamentals`` and a worker pool
+can each stay under it and together get the IP blocked.
+:class:`SlidingWindowLimiter` keeps its window in a small ``flock``-ed file
+that every process on the machine shares.
+
+- **Reservations, not polling.** An ``acquire`` holds the lock only to
+  claim the oldest slot of a ring of ``max_calls`` send times and write its
+  own: ``max(now, oldest + window)``. It then sleeps, outside the lock,
+  until that time. Any ``window`` therefore holds at most ``max_calls``
+  sends across all processes, and waiters go in arrival order.
+- **One budget, sync and async.** :meth:`SlidingWindowLimiter.acquire`
+  sleeps; :meth:`SlidingWindowLimiter.acquire_async` takes the file lock on
+  a worker thread and awaits. The sync and async SEC clients share one
+  instance.
+- **Wall clock.** Slots hold ``time.time()`` so they mean the same thing in
+  every process. A slot more than :data:`_MAX_BACKLOG` seconds ahead can
+  only come from a clock step; the ring is then reset.
+- **Fallback.** Without ``path``, or where the file cannot be locked, the
+  ring lives in memory and only this process is covered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import email.utils
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Final, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock; limiters fall back to in-process.
+    fcntl = None  # type: ignore[assignment]
+
+LOG: Final = logging.getLogger(__name__)
+
+# Alpaca's basic market-data plan allows 200 requests/minute per key.
+_ALPACA_RATE_PER_MINUTE: Final[float] = 200.0
+_RATE_ENV: Final[str] = "ALPACA_DATA_RATE_PER_MINUTE"
+_DEFAULT_BURST: Final[int] = 10
+_DEFAULT_RESERVE: Final[int] = 2
+_DEFAULT_MAX_RETRIES: Final[int] = 3
+_BACKOFF_BASE: Final[float] = 1.0
+_BACKOFF_CAP: Final[float] = 60.0
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Who gets the next token; lower values go first."""
+
+    EXECUTION = 0  # latest quotes feeding an order decision
+    EVIDENCE = 1  # per-window snapshots, bars and news
+    BACKGROUND = 2  # universe builds, cache warm-up, asset list
+
+
+@dataclass(frozen=True)
+class ClassMetrics:
+    queued: int  # waiting right now
+    max_queued: int
+    granted: int
+    waited_seconds: float
+
+
+@dataclass(frozen=True)
+class LimiterMetrics:
+    tokens: float
+    throttled: int  # rate-limited responses seen by :meth:`PriorityTokenBucket.call`
+    paused_for: float  # seconds left of the current 429 pause
+    by_priority: Mapping[Priority, ClassMetrics]
+
+
+class _ClassStats:
+    __slots__ = ("granted", "max_queued", "waited")
+
+    def __init__(self) -> None:
+        self.granted = 0
+        self.max_queued = 0
+        self.waited = 0.0
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True for an HTTP 429 surfaced by alpaca-py (``APIError``) or httpx."""
+
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429
+
+
+def retry_after(exc: BaseException, *, now: float | None = None) -> float | None:
+    """Seconds the server asked us to wait, if the response says."""
+
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After")
+    if value is not None:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                when = email.utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            return max((when - dt.datetime.now(dt.UTC)).total_seconds(), 0.0)
+    reset = headers.get("X-RateLimit-Reset")
+    if reset is not None:
+        try:
+            return max(float(reset) - (now if now is not None else time.time()), 0.0)
+        except ValueError:
+            return None
+    return None
+
+
+class PriorityTokenBucket:
+    """Thread-safe token bucket that serves waiters by :class:`Priority`.
+
+    ``rate_per_minute`` refills the bucket continuously up to ``burst``
+    tokens; classes other than :attr:`Priority.EXECUTION` leave ``reserve``
+    tokens untouched.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float = _ALPACA_RATE_PER_MINUTE,
+        *,
+        burst: int = _DEFAULT_BURST,
+        reserve: int = _DEFAULT_RESERVE,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        backoff_base: float = _BACKOFF_BASE,
+        backoff_cap: float = _BACKOFF_CAP,
+    ) -> None:
+        if rate_per_minute <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        if not 0 <= reserve < burst:
+            raise ValueError("reserve must be non-negative and below burst")
+        self._rate = rate_per_minute / 60.0
+        self._burst = burst
+        self._reserve = reserve
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_cap = backoff_cap
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._throttled = 0
+        self._cond = threading.Condition()
+        self._queues: dict[Priority, deque[object]] = {p: deque() for p in Priority}
+        self._stats: dict[Priority, _ClassStats] = {p: _ClassStats() for p in Priority}
+        # Coroutines in acquire_async wait on an event set from _notify.
+        self._async_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    # ------------------------------------------------------------------
+    # Tokens
+    # ------------------------------------------------------------------
+    def acquire(self, priority: Priority = Priority.EVIDENCE) -> float:
+        """Block until ``priority`` is granted a token; return the seconds waited."""
+
+        start = time.monotonic()
+        ticket = object()
+        queue = self._queues[priority]
+        stats = self._stats[priority]
+        with self._cond:
+            queue.append(ticket)
+            stats.max_queued = max(stats.max_queued, len(queue))
+            try:
+                while True:
+                    wait = self._wait_for(priority, ticket)
+                    if wait == 0.0:
+                        self._tokens -= 1
+                        break
+                    self._cond.wait(wait)
+            finally:
+                queue.remove(ticket)
+                self._notify()
+            waited = time.monotonic() - start
+            stats.granted += 1
+            stats.waited += waited
+        return waited
+
+    async def acquire_async(self, priority: Priority = Priority.EVIDENCE) -> float:
+        """:meth:`acquire` for coroutines: waits on the event loop, not a thread.
+
+        Sync and async waiters share one queue per class. Cancelling the
+        wait gives up the place in it without spending a token.
+        """
+
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        wake = waiter[1]
+        start = time.monotonic()
+        ticket = object()
+        queue = self._queues[priority]
+        stats = self._stats[priority]
+        with self._cond:
+            queue.append(ticket)
+            stats.max_queued = max(stats.max_queued, len(queue))
+            self._async_waiters.add(waiter)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._wait_for(priority, ticket)
+                    if wait == 0.0:
+                        self._tokens -= 1
+                        waited = time.monotonic() - start
+                        stats.granted += 1
+                        stats.waited += waited
+                        return waited
+                    wake.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(wake.wait(), wait)
+        finally:
+            with self._cond:
+                queue.remove(ticket)
+                self._async_waiters.discard(waiter)
+                self._notify()
+
+    def _notify(self) -> None:
+        """Wake every sync and async waiter; the caller holds ``_cond``."""
+
+        self._cond.notify_all()
+        for loop, wake in self._async_waiters:
+            with contextlib.suppress(RuntimeError):  # that loop has closed
+                loop.call_soon_threadsafe(wake.set)
+
+    def _wait_for(self, priority: Priority, ticket: object) -> float | None:
+        """``0.0`` to grant now, seconds to sleep, or ``None`` to await a notify."""
+
+        if self._queues[priority][0] is not ticket or any(
+            self._queues[p] for p in Priority if p < priority
+        ):
+            return None
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        floor = 0 if priority is Priority.EXECUTION else self._reserve
+        missing = 1 + floor - self._tokens
+        return 0.0 if missing <= 0 else missing / self._rate
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    def call(self, fn: Callable[[], T], *, priority: Priority = Priority.EVIDENCE) -> T:
+        """Spend a token on ``fn()``; on 429 back off, pause everyone and retry."""
+
+        attempt = 0
+        while True:
+            self.acquire(priority)
+            try:
+                return fn()
+            except Exception as exc:
+                if not is_rate_limited(exc) or attempt >= self._max_retries:
+                    raise
+                self.throttle(exc, attempt=attempt)
+                attempt += 1
+
+    def throttle(self, exc: BaseException | None = None, *, attempt: int = 0) -> float:
+        """Record a 429 and pause the bucket; return the pause in seconds."""
+
+        hinted = retry_after(exc) if exc is not None else None
+        delay = (
+            hinted
+            if hinted is not None
+            else min(self._backoff_cap, self._backoff_base * 2**attempt)
+        )
+        with self._cond:
+            self._throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            # The server says the window is spent: refill from the end of the pause.
+            self._tokens = 0.0
+            self._updated = self._paused_until
+            self._notify()
+        LOG.warning("alpaca rate limited; pausing requests for %.1fs", delay)
+        return delay
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def metrics(self) -> LimiterMetrics:
+        with self._cond:
+            now = time.monotonic()
+            # During a pause _updated lies in the future; no tokens until it ends.
+            refill = max(now - self._updated, 0.0) * self._rate
+            tokens = min(self._burst, self._tokens + refill)
+            return LimiterMetrics(
+                tokens=tokens,
+                throttled=self._throttled,
+                paused_for=max(self._paused_until - now, 0.0),
+                by_priority={
+                    p: ClassMetrics(
+                        queued=len(self._queues[p]),
+                        max_queued=s.max_queued,
+                        granted=s.granted,
+                        waited_seconds=s.waited,
+                    )
+                    for p, s in self._stats.items()
+                },
+            )
+
+
+_SHARED: PriorityTokenBucket | None = None
+_SHARED_LOCK: Final = threading.Lock()
+
+
+def shared_alpaca_limiter() -> PriorityTokenBucket:
+    """The process-wide Alpaca data budget.
+
+    ``ALPACA_DATA_RATE_PER_MINUTE`` overrides the rate for plans with a
+    higher quota.
+    """
+
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            rate = float(os.environ.get(_RATE_ENV) or _ALPACA_RATE_PER_MINUTE)
+            _SHARED = PriorityTokenBucket(rate)
+        return _SHARED
+
+
+def paced(  # noqa: UP047 - TypeVar style, as elsewhere in the repo
+    limiter: PriorityTokenBucket | None, fn: Callable[[], T], *, priority: Priority,
+) -> T:
+    """``limiter.call(fn)``, or just ``fn()`` for an unpaced (test) client."""
+
+    if limiter is None:
+        return fn()
+    return limiter.call(fn, priority=priority)
+
+
+# ---------------------------------------------------------------------------
+# Machine-wide sliding window
+# ---------------------------------------------------------------------------
+_RING_MAGIC: Final[int] = 0x53524C31  # "SRL1"
+_RING_HEADER: Final[struct.Struct] = struct.Struct("<qqq")  # magic, slots, head
+# A slot further ahead than this was not written by a healthy limiter.
+_MAX_BACKLOG: Final[float] = 300.0
+
+
+class SlidingWindowLimiter:
+    """At most ``max_calls`` sends per ``window`` seconds.
+
+    With ``path`` the window is shared by every process that opens the same
+    file; without it (or where locking is unavailable) it covers this
+    process only.
+    """
+
+    def __init__(
+        self, max_calls: int, window: float, *, path: Path | str | None = None,
+    ) -> None:
+        if max_calls < 1 or window <= 0:
+            raise ValueError("max_calls must be at least 1 and window positive")
+        self._max = max_calls
+        self._window = window
+        self._ring_format = struct.Struct(f"<{max_calls}d")
+        self._path = Path(path) if path is not None and fcntl is not None else None
+        self._lock = threading.Lock()
+        self._head = 0
+        self._slots = [0.0] * max_calls
+        self._fd: int | None = None
+        self._fd_pid = 0
+
+    @classmethod
+    def from_rate(
+        cls, rate: float, *, burst: int = 1, path: Path | str | None = None,
+    ) -> SlidingWindowLimiter:
+        """``burst`` calls per ``burst / rate`` seconds; ``burst=1`` spaces calls evenly."""
+
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        return cls(burst, burst / rate, path=path)
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    def reserve(self) -> float:
+        """Claim the next send slot; return how long to wait for it."""
+
+        with self._lock:
+            now = time.time()
+            fd = self._shared_fd()
+            if fd is None:
+                return self._claim(now)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                self._load(fd)
+                wait = self._claim(now)
+                self._store(fd)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            return wait
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Reserve on a worker thread (``flock`` blocks), then await the slot."""
+
+        wait = await asyncio.to_thread(self.reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _claim(self, now: float) -> float:
+        oldest = self._slots[self._head]
+        if oldest > now + _MAX_BACKLOG:
+            self._slots = [0.0] * self._max
+            oldest = 0.0
+        send_at = max(now, oldest + self._window)
+        self._slots[self._head] = send_at
+        self._head = (self._head + 1) % self._max
+        return send_at - now
+
+    # ------------------------------------------------------------------
+    # Shared file
+    # ------------------------------------------------------------------
+    def _shared_fd(self) -> int | None:
+        if self._path is None:
+            return None
+        pid = os.getpid()
+        if self._fd is not None and self._fd_pid == pid:
+            return self._fd
+        # A forked child must not share the parent's open file description,
+        # or flock would not exclude the two.
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
+        except OSError as exc:
+            LOG.warning(
+                "cannot open rate-limit file %s (%s); limiting this process only",
+                self._path, exc,
+            )
+            self._path = None
+            return None
+        self._fd_pid = pid
+        return self._fd
+
+    def _load(self, fd: int) -> None:
+        data = os.pread(fd, _RING_HEADER.size + self._ring_format.size, 0)
+        if len(data) == _RING_HEADER.size + self._ring_format.size:
+            magic, slots, head = _RING_HEADER.unpack_from(data)
+            if magic == _RING_MAGIC and slots == self._max and 0 <= head < slots:
+                self._head = head
+                self._slots = list(self._ring_format.unpack_from(data, _RING_HEADER.size))
+                return
+        # New file, or one written for another ``max_calls``: start empty.
+        self._head = 0
+        self._slots = [0.0] * self._max
+
+    def _store(self, fd: int) -> None:
+        os.pwrite(
+            fd,
+            _RING_HEADER.pack(_RING_MAGIC, self._max, self._head)
+            + self._ring_format.pack(*self._slots),
+            0,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None and self._fd_pid == os.getpid():
+                os.close(self._fd)
+            self._fd = None
+
+
+def machine_rate_file(name: str) -> Path:
+    """Default location of a machine-wide limiter file: the system temp dir."""
+
+    return Path(tempfile.gettempdir()) / f"stockripper-{name}.ratelimit"
+
+
+__all__ = (
+    "ClassMetrics",
+    "LimiterMetrics",
+    "Priority",
+    "PriorityTokenBucket",
+    "SlidingWindowLimiter",
+    "is_rate_limited",
+    "machine_rate_file",
+    "paced",
+    "retry_after",
+    "shared_alpaca_limiter",
+)
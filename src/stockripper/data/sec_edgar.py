@@ -3,9 +3,15 @@
 Honors SEC fair-access guidance:[^sec-edgar]
 
 - Sends a meaningful ``User-Agent`` containing contact info (required).
-- Process-wide ceiling of 10 requests/second across all clients (the SEC
-  documented limit).
+- Machine-wide ceiling of 10 requests/second across all clients, sync and
+  async, in every process (the SEC documented limit), through a shared
+  :class:`SlidingWindowLimiter` file.
 - Bounded retries with backoff on 429/5xx.
+- Conditional requests: cached documents keep their ``ETag`` /
+  ``Last-Modified`` and are revalidated with ``If-None-Match`` /
+  ``If-Modified-Since`` once their TTL runs out. A ``304`` just extends the
+  TTL, so unchanged submissions and company facts cost neither the body
+  download nor a re-parse.
 
 [^sec-edgar]: https://www.sec.gov/search-filings/edgar-application-programming-interfaces
 """
@@ -16,28 +22,45 @@ import datetime as dt
 import os
 import threading
 import time
-from collections import deque
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Final
 
 import httpx
 
-from stockripper.data.cache import JsonFileCache
-from stockripper.data.provenance import Provenance
+from stockripper.data.blob_store import BlobStore
+from stockripper.data.cache import (
+    CacheBackend,
+    Fetched,
+    Served,
+    read_raw_entry,
+    read_through_validated,
+    shared_cache,
+)
+from stockripper.data.facts_stream import FactSelection, select_company_facts
+from stockripper.data.provenance import HashMemo, Provenance
+from stockripper.data.rate_limit import SlidingWindowLimiter, machine_rate_file
+from stockripper.data.singleflight import SingleFlight
 
 _EDGAR_SUBMISSIONS_BASE: Final[str] = "https://data.sec.gov/submissions"
 _EDGAR_COMPANY_FACTS_BASE: Final[str] = "https://data.sec.gov/api/xbrl/companyfacts"
 _EDGAR_TICKER_LOOKUP: Final[str] = "https://www.sec.gov/files/company_tickers.json"
 
-_MAX_RPS: Final[int] = 10
+SEC_MAX_RPS: Final[int] = 10
+# While the cached ticker map is being served stale, rebuild the index from
+# it at most this often.
+TICKER_INDEX_MIN_LIFETIME: Final[dt.timedelta] = dt.timedelta(minutes=1)
 _RATE_WINDOW: Final[float] = 1.0
+# Every process pointing here shares one 10 rps window.
+_RATE_FILE_ENV: Final[str] = "SEC_EDGAR_RATE_FILE"
 
 
 class SecEdgarConfigError(RuntimeError):
     """Raised when SEC EDGAR access is misconfigured (e.g., missing User-Agent)."""
 
 
-def _resolve_user_agent() -> str:
+def resolve_user_agent() -> str:
     """Return a non-empty SEC-compliant User-Agent string.
 
     SEC requires identifying contact information; a bare app name is
@@ -59,29 +82,35 @@ def _resolve_user_agent() -> str:
     return ua
 
 
-class _ProcessRateLimiter:
-    """Sliding-window limiter — at most ``_MAX_RPS`` calls per second across the process."""
+def _rate_file() -> Path:
+    override = os.environ.get(_RATE_FILE_ENV, "").strip()
+    return Path(override) if override else machine_rate_file("sec-edgar")
 
-    def __init__(self, max_rps: int = _MAX_RPS, window: float = _RATE_WINDOW) -> None:
-        self._max = max_rps
-        self._window = window
-        self._timestamps: deque[float] = deque()
-        self._lock = threading.Lock()
 
-    def acquire(self) -> None:
-        while True:
-            with self._lock:
-                now = time.monotonic()
-                while self._timestamps and now - self._timestamps[0] >= self._window:
-                    self._timestamps.popleft()
-                if len(self._timestamps) < self._max:
-                    self._timestamps.append(now)
-                    return
-                sleep_for = self._window - (now - self._timestamps[0])
-            time.sleep(max(sleep_for, 0.01))
+_RATE_LIMITER: SlidingWindowLimiter | None = None
+_RATE_LIMITER_LOCK: Final = threading.Lock()
+
+
+def edgar_rate_limiter() -> SlidingWindowLimiter:
+    """The machine-wide SEC window, opened on first request.
+
+    ``SEC_EDGAR_RATE_FILE`` overrides where the shared window file lives.
+    """
 
+    global _RATE_LIMITER
+    with _RATE_LIMITER_LOCK:
+        if _RATE_LIMITER is None:
+            _RATE_LIMITER = SlidingWindowLimiter(SEC_MAX_RPS, _RATE_WINDOW, path=_rate_file())
+        return _RATE_LIMITER
 
-_RATE_LIMITER: _ProcessRateLimiter = _ProcessRateLimiter()
+
+# Concurrent misses on the same (namespace, key) share one upstream fetch,
+# across every client in the process.
+_SINGLE_FLIGHT: SingleFlight = SingleFlight()
+# A cache entry keeps its expiry until it is rewritten or touched, so
+# (cache, key, expiry) names one payload: a document served again from the
+# cache is hashed once per process.
+_HASHES: Final[HashMemo] = HashMemo()
 
 
 # ---------------------------------------------------------------------------
@@ -120,16 +149,20 @@ class SecEdgarClient:
     def __init__(
         self,
         *,
-        cache: JsonFileCache | None = None,
+        cache: CacheBackend | None = None,
         http: httpx.Client | None = None,
         user_agent: str | None = None,
         max_retries: int = 3,
         ttl_company_facts: dt.timedelta = dt.timedelta(hours=12),
         ttl_submissions: dt.timedelta = dt.timedelta(hours=1),
         ttl_ticker_map: dt.timedelta = dt.timedelta(days=1),
+        stale_grace: dt.timedelta | None = None,
+        blobs: BlobStore | None = None,
     ) -> None:
-        self._cache = cache if cache is not None else JsonFileCache()
-        ua = user_agent if user_agent is not None else _resolve_user_agent()
+        self._cache = cache if cache is not None else shared_cache()
+        # Optional raw-payload sink; provenance then carries raw_content_uri.
+        self._blobs = blobs
+        ua = user_agent if user_agent is not None else resolve_user_agent()
         self._http = http if http is not None else httpx.Client(
             headers={"User-Agent": ua, "Accept": "application/json"},
             timeout=httpx.Timeout(15.0, connect=5.0),
@@ -138,6 +171,13 @@ class SecEdgarClient:
         self._ttl_company_facts = ttl_company_facts
         self._ttl_submissions = ttl_submissions
         self._ttl_ticker_map = ttl_ticker_map
+        # Stale-while-revalidate grace for the ``sec_edgar`` namespace; None
+        # keeps the blocking refetch on expiry.
+        self._stale_grace = stale_grace
+        # ticker -> CIK, rebuilt whenever the cached ticker map expires.
+        self._ticker_index: dict[str, str] | None = None
+        self._ticker_index_expires = dt.datetime.min.replace(tzinfo=dt.UTC)
+        self._ticker_index_lock = threading.Lock()
 
     def close(self) -> None:
         self._http.close()
@@ -154,49 +194,36 @@ class SecEdgarClient:
     def lookup_cik(self, ticker: str) -> str | None:
         """Return the zero-padded 10-digit CIK for ``ticker`` or ``None``."""
 
-        mapping = self._get_ticker_map()
-        upper = ticker.upper()
-        for entry in mapping.values():
-            if isinstance(entry, dict) and str(entry.get("ticker", "")).upper() == upper:
-                cik_int = int(entry["cik_str"])
-                return f"{cik_int:010d}"
-        return None
+        return self._get_ticker_index().get(ticker.upper())
 
-    def _get_ticker_map(self) -> dict[str, Any]:
-        ns, key = "sec_edgar", "company_tickers"
-        cached = self._cache.get(ns, key)
-        if cached is not None:
-            return dict(cached.value)
-        payload = self._get_json(_EDGAR_TICKER_LOOKUP)
-        self._cache.put(ns, key, payload, ttl=self._ttl_ticker_map)
-        return dict(payload)
+    def lookup_ciks(self, tickers: Iterable[str]) -> dict[str, str | None]:
+        """Bulk :meth:`lookup_cik`, keyed by upper-cased ticker."""
+
+        index = self._get_ticker_index()
+        return {t.upper(): index.get(t.upper()) for t in tickers}
+
+    def _get_ticker_index(self) -> dict[str, str]:
+        with self._ticker_index_lock:
+            now = dt.datetime.now(dt.UTC)
+            if self._ticker_index is not None and now < self._ticker_index_expires:
+                return self._ticker_index
+            served = self._cached_json(TICKER_MAP_DOCUMENT, self._ttl_ticker_map)
+            self._ticker_index = build_ticker_index(served.value)
+            self._ticker_index_expires = max(served.expires_at, now + TICKER_INDEX_MIN_LIFETIME)
+            return self._ticker_index
 
     # ------------------------------------------------------------------
     # Submissions (form list)
     # ------------------------------------------------------------------
     def get_submissions(self, cik: str) -> CompanySubmissions:
-        cik = _normalise_cik(cik)
-        ns, key = "sec_edgar", f"submissions_{cik}"
-        cached = self._cache.get(ns, key)
-        if cached is not None:
-            payload = cached.value
-        else:
-            url = f"{_EDGAR_SUBMISSIONS_BASE}/CIK{cik}.json"
-            payload = self._get_json(url)
-            self._cache.put(ns, key, payload, ttl=self._ttl_submissions)
-        recent = payload.get("filings", {}).get("recent", {}) or {}
-        filings = _zip_filings(recent)
-        prov = Provenance.for_payload(
-            provider="sec_edgar",
-            source_url=f"{_EDGAR_SUBMISSIONS_BASE}/CIK{cik}.json",
-            payload=payload,
-            request_key=key,
-        )
-        return CompanySubmissions(
-            cik=cik,
-            entity_name=payload.get("name"),
-            recent_filings=tuple(filings),
-            provenance=prov,
+        doc = submissions_document(cik)
+        served = self._cached_json(doc, self._ttl_submissions)
+        return submissions_from_payload(
+            cik,
+            served.value,
+            served_stale=served.served_stale,
+            blobs=self._blobs,
+            content_hash=served_content_hash(self._cache, doc, served),
         )
 
     def get_recent_filings(
@@ -222,65 +249,286 @@ class SecEdgarClient:
     # ------------------------------------------------------------------
     # Company facts (XBRL)
     # ------------------------------------------------------------------
-    def get_company_facts(self, cik: str) -> CompanyFacts:
-        cik = _normalise_cik(cik)
-        ns, key = "sec_edgar", f"company_facts_{cik}"
-        cached = self._cache.get(ns, key)
-        if cached is not None:
-            payload = cached.value
+    def get_company_facts(
+        self, cik: str, *, select: FactSelection | None = None,
+    ) -> CompanyFacts:
+        """XBRL company facts for ``cik``.
+
+        With ``select``, only the named series are parsed and kept (see
+        :mod:`stockripper.data.facts_stream`); the slim payload is cached
+        under its own key and built from a cached full document when there
+        is one.
+        """
+
+        doc = company_facts_document(cik, select)
+        if select is None:
+            served = self._cached_json(doc, self._ttl_company_facts)
         else:
-            url = f"{_EDGAR_COMPANY_FACTS_BASE}/CIK{cik}.json"
-            payload = self._get_json(url)
-            self._cache.put(ns, key, payload, ttl=self._ttl_company_facts)
-        prov = Provenance.for_payload(
-            provider="sec_edgar",
-            source_url=f"{_EDGAR_COMPANY_FACTS_BASE}/CIK{cik}.json",
-            payload=payload,
-            request_key=key,
-        )
-        return CompanyFacts(
-            cik=cik,
-            entity_name=payload.get("entityName"),
-            facts=payload.get("facts", {}) or {},
-            provenance=prov,
+            served = self._cached(
+                doc,
+                self._ttl_company_facts,
+                lambda validators: self._select_facts(cik, select, validators),
+            )
+        return company_facts_from_payload(
+            cik,
+            served.value,
+            select=select,
+            served_stale=served.served_stale,
+            blobs=self._blobs,
+            content_hash=served_content_hash(self._cache, doc, served),
         )
 
     # ------------------------------------------------------------------
     # HTTP
     # ------------------------------------------------------------------
-    def _get_json(self, url: str) -> dict[str, Any]:
-        last_exc: Exception | None = None
-        for attempt in range(self._max_retries + 1):
-            _RATE_LIMITER.acquire()
+    def _cached_json(self, doc: EdgarDocument, ttl: dt.timedelta) -> Served:
+        """The cached or fetched JSON object; concurrent misses share one fetch."""
+
+        return self._cached(
+            doc,
+            ttl,
+            lambda validators: fetched_json(
+                self._get(doc.url, headers=conditional_headers(validators)),
+            ),
+        )
+
+    def _cached(
+        self,
+        doc: EdgarDocument,
+        ttl: dt.timedelta,
+        fetch: Callable[[Mapping[str, str]], Fetched],
+    ) -> Served:
+        served = read_through_validated(
+            self._cache,
+            "sec_edgar",
+            doc.key,
+            fetch,
+            ttl=ttl,
+            flight=_SINGLE_FLIGHT,
+            stale_grace=self._stale_grace,
+        )
+        return served._replace(value=dict(served.value))
+
+    def _select_facts(
+        self, cik: str, select: FactSelection, validators: Mapping[str, str],
+    ) -> Fetched:
+        cached = select_cached_facts(self._cache, cik, select)
+        if cached is not None:
+            return cached
+        resp = self._get(
+            company_facts_document(cik).url, headers=conditional_headers(validators),
+        )
+        return fetched_facts(resp, select)
+
+    def _get(self, url: str, *, headers: Mapping[str, str] | None = None) -> httpx.Response:
+        """GET with retries (see :func:`retry_delay`); a ``304`` is returned."""
+
+        attempt = 0
+        while True:
+            edgar_rate_limiter().acquire()
             try:
-                resp = self._http.get(url)
+                resp = self._http.get(url, headers=headers)
             except httpx.HTTPError as exc:
-                last_exc = exc
-                if attempt >= self._max_retries:
-                    raise
-                time.sleep(0.5 * (2 ** attempt))
-                continue
-            if resp.status_code == 429 or 500 <= resp.status_code < 600:
-                last_exc = httpx.HTTPStatusError(
-                    f"SEC EDGAR returned {resp.status_code}",
-                    request=resp.request,
-                    response=resp,
-                )
-                if attempt >= self._max_retries:
-                    raise last_exc
-                time.sleep(0.5 * (2 ** attempt))
-                continue
-            resp.raise_for_status()
-            data = resp.json()
-            if not isinstance(data, dict):
-                raise RuntimeError(f"SEC EDGAR returned non-object JSON for {url}")
-            return data
-        if last_exc is not None:
-            raise last_exc
-        raise RuntimeError("SEC EDGAR request failed without an exception")
+                error: httpx.HTTPError = exc
+            else:
+                retryable = retryable_error(resp)
+                if retryable is None:
+                    return resp
+                error = retryable
+            time.sleep(retry_delay(error, attempt, self._max_retries))
+            attempt += 1
+
+
+# ---------------------------------------------------------------------------
+# Transport-independent pieces, shared with the async client
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class EdgarDocument:
+    """One EDGAR JSON document: its ``sec_edgar`` cache key and URL."""
+
+    key: str
+    url: str
+
+
+TICKER_MAP_DOCUMENT: Final[EdgarDocument] = EdgarDocument(
+    "company_tickers", _EDGAR_TICKER_LOOKUP,
+)
+
+
+def submissions_document(cik: str | int) -> EdgarDocument:
+    cik = normalise_cik(cik)
+    return EdgarDocument(f"submissions_{cik}", f"{_EDGAR_SUBMISSIONS_BASE}/CIK{cik}.json")
+
+
+def company_facts_document(
+    cik: str | int, select: FactSelection | None = None,
+) -> EdgarDocument:
+    """The full facts document, or with ``select`` its slim cache entry."""
+
+    cik = normalise_cik(cik)
+    key = f"company_facts_{cik}"
+    return EdgarDocument(
+        f"{key}@{select.digest}" if select is not None else key,
+        f"{_EDGAR_COMPANY_FACTS_BASE}/CIK{cik}.json",
+    )
+
+
+def submissions_from_payload(
+    cik: str | int,
+    payload: Mapping[str, Any],
+    *,
+    served_stale: bool = False,
+    blobs: BlobStore | None = None,
+    content_hash: str | None = None,
+) -> CompanySubmissions:
+    doc = submissions_document(cik)
+    recent = payload.get("filings", {}).get("recent", {}) or {}
+    return CompanySubmissions(
+        cik=normalise_cik(cik),
+        entity_name=payload.get("name"),
+        recent_filings=tuple(_zip_filings(recent)),
+        provenance=Provenance.for_payload(
+            provider="sec_edgar",
+            source_url=doc.url,
+            payload=payload,
+            request_key=doc.key,
+            data_quality_warnings=("served_stale",) if served_stale else (),
+            blobs=blobs,
+            content_hash=content_hash,
+        ),
+    )
+
+
+def company_facts_from_payload(
+    cik: str | int,
+    payload: Mapping[str, Any],
+    *,
+    select: FactSelection | None = None,
+    served_stale: bool = False,
+    blobs: BlobStore | None = None,
+    content_hash: str | None = None,
+) -> CompanyFacts:
+    doc = company_facts_document(cik, select)
+    return CompanyFacts(
+        cik=normalise_cik(cik),
+        entity_name=payload.get("entityName"),
+        facts=payload.get("facts", {}) or {},
+        provenance=Provenance.for_payload(
+            provider="sec_edgar",
+            source_url=doc.url,
+            payload=payload,
+            request_key=doc.key,
+            data_quality_warnings=("served_stale",) if served_stale else (),
+            blobs=blobs,
+            content_hash=content_hash,
+        ),
+    )
+
+
+def served_content_hash(cache: CacheBackend, doc: EdgarDocument, served: Served) -> str:
+    """Provenance hash of a document read from ``cache``, computed once per entry."""
+
+    return _HASHES.digest((id(cache), doc.key, served.expires_at), served.value)
+
+
+def select_cached_facts(
+    cache: CacheBackend, cik: str | int, select: FactSelection,
+) -> Fetched | None:
+    """``select`` applied to a live cached full facts document, if there is one.
+
+    The result keeps the full document's validators: once that is purged,
+    the slim entry can still be revalidated with a conditional GET.
+    """
+
+    raw = read_raw_entry(cache, "sec_edgar", company_facts_document(cik).key)
+    if raw is None:
+        return None
+    return Fetched(select_company_facts(raw.data, select), raw.validators)
+
+
+def conditional_headers(validators: Mapping[str, str]) -> dict[str, str]:
+    """``If-None-Match`` / ``If-Modified-Since`` for a cached document."""
+
+    headers: dict[str, str] = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def fetched_json(resp: httpx.Response) -> Fetched:
+    """A conditional GET's outcome: ``not_modified``, or the JSON object."""
+
+    if resp.status_code == 304:
+        return Fetched(not_modified=True)
+    data = resp.json()
+    if not isinstance(data, dict):
+        raise RuntimeError(f"SEC EDGAR returned non-object JSON for {resp.request.url}")
+    return Fetched(data, _response_validators(resp))
+
+
+def fetched_facts(resp: httpx.Response, select: FactSelection) -> Fetched:
+    """:func:`fetched_json` for company facts, keeping only ``select``."""
+
+    if resp.status_code == 304:
+        return Fetched(not_modified=True)
+    return Fetched(select_company_facts(resp.content, select), _response_validators(resp))
+
+
+def retryable_error(resp: httpx.Response) -> httpx.HTTPStatusError | None:
+    """The error a 429 or 5xx stands for; None to accept ``resp``.
+
+    Other error statuses raise at once. A ``304`` is accepted like a success.
+    """
+
+    if resp.status_code == 429 or 500 <= resp.status_code < 600:
+        return httpx.HTTPStatusError(
+            f"SEC EDGAR returned {resp.status_code}", request=resp.request, response=resp,
+        )
+    if resp.status_code != 304:
+        resp.raise_for_status()
+    return None
+
+
+def retry_delay(error: httpx.HTTPError, attempt: int, max_retries: int) -> float:
+    """Exponential backoff before retrying after ``error``; raises it once retries are spent."""
+
+    if attempt >= max_retries:
+        raise error
+    return 0.5 * 2.0**attempt
+
+
+def _response_validators(resp: httpx.Response) -> dict[str, str]:
+    """The response's ``ETag`` / ``Last-Modified``, as cache validators."""
+
+    validators: dict[str, str] = {}
+    if etag := resp.headers.get("ETag"):
+        validators["etag"] = etag
+    if last_modified := resp.headers.get("Last-Modified"):
+        validators["last_modified"] = last_modified
+    return validators
+
+
+def build_ticker_index(mapping: dict[str, Any]) -> dict[str, str]:
+    """``company_tickers.json`` payload -> ``{TICKER: zero-padded CIK}``.
+
+    The first row wins when a ticker repeats, as the old linear scan did.
+    """
+
+    index: dict[str, str] = {}
+    for entry in mapping.values():
+        if not isinstance(entry, dict):
+            continue
+        ticker = str(entry.get("ticker", "")).upper()
+        if ticker and ticker not in index:
+            index[ticker] = f"{int(entry['cik_str']):010d}"
+    return index
+
 
+def normalise_cik(cik: str | int) -> str:
+    """Zero-padded 10-digit CIK from ``320193``, ``CIK320193`` and the like."""
 
-def _normalise_cik(cik: str | int) -> str:
     text = str(cik).strip().lstrip("CIK").lstrip("cik")
     if not text:
         raise ValueError("CIK cannot be empty")
@@ -312,9 +560,28 @@ def _zip_filings(recent: dict[str, Any]) -> list[Filing]:
 
 
 __all__ = (
+    "SEC_MAX_RPS",
+    "TICKER_INDEX_MIN_LIFETIME",
+    "TICKER_MAP_DOCUMENT",
     "CompanyFacts",
     "CompanySubmissions",
+    "EdgarDocument",
     "Filing",
     "SecEdgarClient",
     "SecEdgarConfigError",
+    "build_ticker_index",
+    "company_facts_document",
+    "company_facts_from_payload",
+    "conditional_headers",
+    "edgar_rate_limiter",
+    "fetched_facts",
+    "fetched_json",
+    "normalise_cik",
+    "resolve_user_agent",
+    "retry_delay",
+    "retryable_error",
+    "select_cached_facts",
+    "served_content_hash",
+    "submissions_document",
+    "submissions_from_payload",
 )
@@ -0,0 +1,300 @@
+"""Async SEC EDGAR client for bulk fetches.
+
+:class:`SecEdgarClient` blocks on each request and sleeps inside its rate
+limiter, so populating fundamentals for a 2,000-symbol candidate set runs
+one CIK at a time. :class:`AsyncSecEdgarClient` shares its cache layout,
+keys, provenance and rate limiter, but runs many requests concurrently on
+one pooled ``httpx.AsyncClient`` while the limiter keeps the whole machine
+at the SEC's 10 requests/second.
+
+Design notes:
+
+- **Shared budget.** By default requests draw from the sync client's
+  machine-wide :class:`SlidingWindowLimiter`, awaiting their reserved
+  send time instead of blocking the loop. A sync bulk job, this client and
+  other processes can run side by side without exceeding the limit. Tests
+  and one-off jobs can pass their own, e.g.
+  :meth:`SlidingWindowLimiter.from_rate`.
+- **One protocol, two transports.** Document keys and URLs, conditional
+  headers, ``304`` handling, retry decisions, slim facts built from a
+  cached full document and result/provenance construction are the
+  functions in :mod:`stockripper.data.sec_edgar` the sync client uses.
+  The read-through itself is :func:`read_through_validated_async`, the
+  same steps as the sync client's :func:`read_through_validated`.
+- **Cache off the loop.** Cache reads and writes (SQLite, decompression,
+  multi-MB JSON) run on worker threads; only HTTP is awaited on the loop.
+- **Stale-while-revalidate.** With ``stale_grace`` an entry that expired
+  less than that long ago is returned at once (``served_stale``) while a
+  background task revalidates it. :meth:`AsyncSecEdgarClient.aclose`
+  waits for those tasks.
+- **Partial results.** ``*_many`` methods return what succeeded; CIKs that
+  still fail after retries are logged and left out, like a failing chunk
+  in :class:`AlpacaSnapshotProvider`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import functools
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Final, TypeVar
+
+import httpx
+
+from stockripper.data.blob_store import BlobStore
+from stockripper.data.cache import (
+    CacheBackend,
+    Fetched,
+    Served,
+    read_through_validated_async,
+    shared_cache,
+)
+from stockripper.data.facts_stream import FactSelection
+from stockripper.data.rate_limit import SlidingWindowLimiter
+from stockripper.data.sec_edgar import (
+    TICKER_INDEX_MIN_LIFETIME,
+    TICKER_MAP_DOCUMENT,
+    CompanyFacts,
+    CompanySubmissions,
+    EdgarDocument,
+    build_ticker_index,
+    company_facts_document,
+    company_facts_from_payload,
+    conditional_headers,
+    edgar_rate_limiter,
+    fetched_facts,
+    fetched_json,
+    normalise_cik,
+    resolve_user_agent,
+    retry_delay,
+    retryable_error,
+    select_cached_facts,
+    served_content_hash,
+    submissions_document,
+    submissions_from_payload,
+)
+from stockripper.data.singleflight import SingleFlight
+
+LOG: Final = logging.getLogger(__name__)
+
+_DEFAULT_CONCURRENCY: Final[int] = 16
+
+T = TypeVar("T")
+
+
+_SINGLE_FLIGHT: SingleFlight = SingleFlight()
+
+
+class AsyncSecEdgarClient:
+    """Async counterpart of :class:`SecEdgarClient` with bulk fetch methods."""
+
+    def __init__(
+        self,
+        *,
+        cache: CacheBackend | None = None,
+        http: httpx.AsyncClient | None = None,
+        user_agent: str | None = None,
+        max_retries: int = 3,
+        max_concurrency: int = _DEFAULT_CONCURRENCY,
+        limiter: SlidingWindowLimiter | None = None,
+        ttl_company_facts: dt.timedelta = dt.timedelta(hours=12),
+        ttl_submissions: dt.timedelta = dt.timedelta(hours=1),
+        ttl_ticker_map: dt.timedelta = dt.timedelta(days=1),
+        stale_grace: dt.timedelta | None = None,
+        blobs: BlobStore | None = None,
+    ) -> None:
+        self._cache = cache if cache is not None else shared_cache()
+        self._blobs = blobs
+        ua = user_agent if user_agent is not None else resolve_user_agent()
+        self._http = http if http is not None else httpx.AsyncClient(
+            headers={"User-Agent": ua, "Accept": "application/json"},
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=max_concurrency, max_keepalive_connections=max_concurrency,
+            ),
+        )
+        self._max_retries = max_retries
+        self._max_concurrency = max_concurrency
+        # None: the machine-wide window, opened on the first request.
+        self._limiter = limiter
+        self._ttl_company_facts = ttl_company_facts
+        self._ttl_submissions = ttl_submissions
+        self._ttl_ticker_map = ttl_ticker_map
+        self._stale_grace = stale_grace
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+        self._ticker_index: dict[str, str] | None = None
+        self._ticker_index_expires = dt.datetime.min.replace(tzinfo=dt.UTC)
+        self._ticker_index_lock = asyncio.Lock()
+
+    async def aclose(self) -> None:
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+        await self._http.aclose()
+
+    async def __aenter__(self) -> AsyncSecEdgarClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    # ------------------------------------------------------------------
+    # Ticker -> CIK
+    # ------------------------------------------------------------------
+    async def lookup_cik(self, ticker: str) -> str | None:
+        return (await self._get_ticker_index()).get(ticker.upper())
+
+    async def lookup_ciks(self, tickers: Iterable[str]) -> dict[str, str | None]:
+        index = await self._get_ticker_index()
+        return {t.upper(): index.get(t.upper()) for t in tickers}
+
+    async def _get_ticker_index(self) -> dict[str, str]:
+        async with self._ticker_index_lock:
+            now = dt.datetime.now(dt.UTC)
+            if self._ticker_index is not None and now < self._ticker_index_expires:
+                return self._ticker_index
+            served = await self._cached_json(TICKER_MAP_DOCUMENT, self._ttl_ticker_map)
+            self._ticker_index = build_ticker_index(served.value)
+            self._ticker_index_expires = max(served.expires_at, now + TICKER_INDEX_MIN_LIFETIME)
+            return self._ticker_index
+
+    # ------------------------------------------------------------------
+    # Submissions / company facts
+    # ------------------------------------------------------------------
+    async def get_submissions(self, cik: str) -> CompanySubmissions:
+        doc = submissions_document(cik)
+        served = await self._cached_json(doc, self._ttl_submissions)
+        return submissions_from_payload(
+            cik,
+            served.value,
+            served_stale=served.served_stale,
+            blobs=self._blobs,
+            content_hash=served_content_hash(self._cache, doc, served),
+        )
+
+    async def get_company_facts(
+        self, cik: str, *, select: FactSelection | None = None,
+    ) -> CompanyFacts:
+        """See :meth:`SecEdgarClient.get_company_facts`."""
+
+        doc = company_facts_document(cik, select)
+        if select is None:
+            served = await self._cached_json(doc, self._ttl_company_facts)
+        else:
+            served = await self._cached(
+                doc, self._ttl_company_facts, functools.partial(self._select_facts, cik, select),
+            )
+        return company_facts_from_payload(
+            cik,
+            served.value,
+            select=select,
+            served_stale=served.served_stale,
+            blobs=self._blobs,
+            content_hash=served_content_hash(self._cache, doc, served),
+        )
+
+    async def get_submissions_many(self, ciks: Iterable[str]) -> dict[str, CompanySubmissions]:
+        """Fetch many filing indexes concurrently; keyed by normalised CIK."""
+
+        return await self._many(ciks, self.get_submissions)
+
+    async def get_company_facts_many(
+        self, ciks: Iterable[str], *, select: FactSelection | None = None,
+    ) -> dict[str, CompanyFacts]:
+        """Fetch many company-facts documents concurrently; keyed by normalised CIK."""
+
+        return await self._many(ciks, functools.partial(self.get_company_facts, select=select))
+
+    async def _many(
+        self, ciks: Iterable[str], fetch: Callable[[str], Awaitable[T]],
+    ) -> dict[str, T]:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        ordered = list(dict.fromkeys(normalise_cik(c) for c in ciks))
+
+        async def one(cik: str) -> T | None:
+            async with semaphore:
+                try:
+                    return await fetch(cik)
+                except (httpx.HTTPError, RuntimeError, ValueError) as exc:
+                    LOG.warning("SEC EDGAR fetch for CIK %s failed: %s", cik, exc)
+                    return None
+
+        results = await asyncio.gather(*(one(cik) for cik in ordered))
+        return {cik: r for cik, r in zip(ordered, results, strict=True) if r is not None}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    async def _cached_json(self, doc: EdgarDocument, ttl: dt.timedelta) -> Served:
+        async def fetch(validators: Mapping[str, str]) -> Fetched:
+            return fetched_json(await self._get(doc.url, headers=conditional_headers(validators)))
+
+        return await self._cached(doc, ttl, fetch)
+
+    async def _cached(
+        self,
+        doc: EdgarDocument,
+        ttl: dt.timedelta,
+        fetch: Callable[[Mapping[str, str]], Awaitable[Fetched]],
+    ) -> Served:
+        served = await read_through_validated_async(
+            self._cache,
+            "sec_edgar",
+            doc.key,
+            fetch,
+            ttl=ttl,
+            flight=_SINGLE_FLIGHT,
+            stale_grace=self._stale_grace,
+            refresh_in_background=self._refresh_in_background,
+        )
+        return served._replace(value=dict(served.value))
+
+    def _refresh_in_background(
+        self, key: str, refresh: Callable[[], Awaitable[object]],
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        async def run() -> None:
+            try:
+                await refresh()
+            except Exception:
+                LOG.warning("background refresh of sec_edgar/%s failed", key, exc_info=True)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(run())
+
+    async def _select_facts(
+        self, cik: str, select: FactSelection, validators: Mapping[str, str],
+    ) -> Fetched:
+        cached = await asyncio.to_thread(select_cached_facts, self._cache, cik, select)
+        if cached is not None:
+            return cached
+        resp = await self._get(
+            company_facts_document(cik).url, headers=conditional_headers(validators),
+        )
+        return fetched_facts(resp, select)
+
+    async def _get(
+        self, url: str, *, headers: Mapping[str, str] | None = None,
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            limiter = self._limiter if self._limiter is not None else edgar_rate_limiter()
+            await limiter.acquire_async()
+            try:
+                resp = await self._http.get(url, headers=headers)
+            except httpx.HTTPError as exc:
+                error: httpx.HTTPError = exc
+            else:
+                retryable = retryable_error(resp)
+                if retryable is None:
+                    return resp
+                error = retryable
+            await asyncio.sleep(retry_delay(error, attempt, self._max_retries))
+            attempt += 1
+
+
+__all__ = ("AsyncSecEdgarClient",)
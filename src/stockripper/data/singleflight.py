@@ -0,0 +1,105 @@
+"""Single-flight coalescing of concurrent upstream calls.
+
+When several threads or coroutines miss the same cache key at once, each
+of them would otherwise call upstream — and each call spends a token from
+the provider's rate limiter. :class:`SingleFlight` lets the first caller
+for a key run the fetch while later callers for the same key wait for, and
+share, its result (or its exception).
+
+Design notes:
+
+- **No caching.** Once the in-flight call finishes the key is forgotten;
+  callers pair this with a cache and re-check it inside the flight.
+- **Threads and asyncio.** :meth:`SingleFlight.do` blocks on an event;
+  :meth:`SingleFlight.do_async` awaits a shared task, scoped to the running
+  loop. A cancelled waiter never cancels the shared fetch.
+- **Shared values.** Every waiter receives the same object; treat it as
+  read-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar, cast
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "error", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[tuple[int, Hashable], asyncio.Future[Any]] = {}
+        self._coalesced = 0
+
+    @property
+    def coalesced(self) -> int:
+        """How many callers were served by another caller's fetch."""
+
+        return self._coalesced
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn`` unless a call for ``key`` is in flight; then share it."""
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self._coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return cast(T, call.result)
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return cast(T, call.result)
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async :meth:`do`: concurrent awaiters on one loop share one task."""
+
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(slot)
+            if task is None:
+                task = asyncio.ensure_future(fn())
+                self._tasks[slot] = task
+                task.add_done_callback(lambda t: self._forget(slot, t))
+            else:
+                self._coalesced += 1
+        return cast(T, await asyncio.shield(task))
+
+    def _forget(self, slot: tuple[int, Hashable], task: asyncio.Future[Any]) -> None:
+        with self._lock:
+            if self._tasks.get(slot) is task:
+                del self._tasks[slot]
+        if not task.cancelled():
+            # Mark the exception retrieved; awaiters have already seen it.
+            task.exception()
+
+
+__all__ = ("SingleFlight",)
@@ -8,15 +8,22 @@ admitted.
 The builder is intentionally **pluggable**: market-data, fundamentals, and
 news access happen through small adapter callables so unit tests can drive
 the entire flow with deterministic in-memory fakes (no network).
+
+Later windows of the same day need not start over. :meth:`UniverseBuilder.refresh_many`
+reuses the morning build's assets and static attributes (instrument type,
+cap band, 8-K recency, news counts). It re-fetches price and ADV only for
+symbols close enough to a price floor, ADV floor or top-``limit`` cut for
+the move to matter, and reports each track's membership change.
 """
 
 from __future__ import annotations
 
+import dataclasses
 import datetime as dt
-from collections.abc import Callable, Iterable, Mapping
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Protocol
+from typing import Final, Protocol
 
 from stockripper.data.reasons import CandidateReason, CandidateReasonCode
 from stockripper.data.universe_policy import (
@@ -42,6 +49,9 @@ class AssetRecord:
     fractionable: bool
     is_etf: bool = False
     is_leveraged_etf: bool = False
+    is_inverse_etf: bool = False
+    is_otc: bool = False
+    is_adr: bool = False
 
 
 @dataclass(frozen=True)
@@ -82,6 +92,25 @@ class UniverseBuildResult:
     diagnostics: dict[str, int] = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class UniverseRefresh:
+    """An intraday rebuild and how its membership moved since the last one.
+
+    ``added`` / ``removed`` are symbols, in candidate order, relative to the
+    track's previous build for the same ``as_of``. ``refetched`` counts the
+    symbols whose price fields were fetched again for this refresh.
+    """
+
+    result: UniverseBuildResult
+    added: tuple[str, ...]
+    removed: tuple[str, ...]
+    refetched: int
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+
 # ---------------------------------------------------------------------------
 # Adapter contracts
 # ---------------------------------------------------------------------------
@@ -97,6 +126,24 @@ class SnapshotProvider(Protocol):
     ) -> Mapping[str, AssetSnapshot]: ...
 
 
+class PriceRefresher(Protocol):
+    """Optional snapshot-provider method used by intraday refreshes.
+
+    Returns snapshots whose ``last_price`` and ``adv_usd_20d`` are current;
+    every other field is ignored, so implementations can skip the joins
+    that fill them. Providers without it are asked for full snapshots.
+    """
+
+    def refresh_prices(
+        self, symbols: Iterable[str], *, as_of: dt.date,
+    ) -> Mapping[str, AssetSnapshot]: ...
+
+
+# A symbol is re-fetched when its price or ADV lies within this fraction of
+# a floor or of the top-``limit`` ADV cut of a policy it otherwise passes.
+_DEFAULT_BOUNDARY: Final[Decimal] = Decimal("0.10")
+
+
 # ---------------------------------------------------------------------------
 # Builder
 # ---------------------------------------------------------------------------
@@ -115,61 +162,276 @@ class UniverseBuilder:
     policies: Mapping[str, UniversePolicyParams] = field(
         default_factory=lambda: DEFAULT_UNIVERSE_POLICIES
     )
+    # Evaluate policies with the NumPy engine in
+    # :mod:`stockripper.data.universe_columnar`. Output is identical; it only
+    # pays off at full-market scale.
+    columnar: bool = False
+    # The latest build day's loaded data and each track's latest result, the
+    # baseline for :meth:`refresh_many`. Earlier days are dropped so a
+    # long-running process or a backfill does not keep every day in memory.
+    _days: dict[dt.date, _Day] = field(default_factory=dict, init=False, repr=False)
 
     def build(self, request: UniverseBuildRequest) -> UniverseBuildResult:
-        policy = self.policies.get(request.track_id)
-        if policy is None:
-            raise KeyError(f"No universe policy registered for track {request.track_id!r}")
+        return self.build_many((request,))[0]
+
+    def build_many(
+        self, requests: Iterable[UniverseBuildRequest],
+    ) -> tuple[UniverseBuildResult, ...]:
+        """Build several tracks' universes from one shared market snapshot.
+
+        Assets and snapshots are loaded once per distinct ``as_of`` and every
+        request's policy is evaluated against that same data, so N tracks
+        cost one market-data fetch instead of N. Results come back in
+        request order. Unknown track ids raise :class:`KeyError` before any
+        I/O happens.
+        """
+
+        requests = tuple(requests)
+        policies = self._policies_for(requests)
+        days: dict[dt.date, _Day] = {}
+        for request in requests:
+            if request.as_of not in days:
+                assets, snapshots = self._load(request.as_of)
+                days[request.as_of] = _Day(assets=assets, snapshots=dict(snapshots))
+        results = self._evaluate(requests, policies, days)
+        for request, result in zip(requests, results, strict=True):
+            days[request.as_of].results[request.track_id] = result
+        latest = max(days, default=None)
+        if latest is not None:
+            kept = self._days.get(latest)
+            if kept is not None:
+                # Tracks not rebuilt keep their last result as the diff baseline.
+                days[latest].results = {**kept.results, **days[latest].results}
+            self._days = {latest: days[latest]}
+        return results
+
+    def refresh_many(
+        self,
+        requests: Iterable[UniverseBuildRequest],
+        *,
+        boundary: Decimal = _DEFAULT_BOUNDARY,
+    ) -> tuple[UniverseRefresh, ...]:
+        """Rebuild from the last build for each ``as_of``, re-fetching prices sparingly.
+
+        Assets and static snapshot fields come from that build. Only symbols
+        within ``boundary`` (a fraction) of some requested policy's price
+        floor, ADV floor or current top-``limit`` ADV cut, among those that
+        pass the policy's instrument and cap-band checks, get a new
+        ``last_price`` / ``adv_usd_20d``. A symbol the provider returns
+        nothing for keeps its earlier values. An ``as_of`` with no earlier
+        build falls back to :meth:`build_many`, with every candidate
+        reported as added.
+        """
+
+        requests = tuple(requests)
+        policies = self._policies_for(requests)
+        out: list[UniverseRefresh | None] = [None] * len(requests)
+        for as_of in dict.fromkeys(r.as_of for r in requests):
+            index = [i for i, r in enumerate(requests) if r.as_of == as_of]
+            group = tuple(requests[i] for i in index)
+            day = self._days.get(as_of)
+            if day is None:
+                built = self.build_many(group)
+                loaded = len(self._days[as_of].assets)
+                for i, result in zip(index, built, strict=True):
+                    added = tuple(c.symbol for c in result.candidates)
+                    out[i] = UniverseRefresh(result, added, (), loaded)
+                continue
+            group_policies = [policies[i] for i in index]
+            near = _near_boundary(day, group, group_policies, boundary)
+            day.refresh_prices(self._fetch_prices(near, as_of=as_of))
+            for i, result in zip(
+                index, self._evaluate(group, group_policies, {as_of: day}), strict=True,
+            ):
+                track_id = requests[i].track_id
+                previous = day.results.get(track_id)
+                before = tuple(c.symbol for c in previous.candidates) if previous else ()
+                after = tuple(c.symbol for c in result.candidates)
+                out[i] = UniverseRefresh(
+                    result=result,
+                    added=tuple(s for s in after if s not in before),
+                    removed=tuple(s for s in before if s not in after),
+                    refetched=len(near),
+                )
+                day.results[track_id] = result
+        return tuple(r for r in out if r is not None)
+
+    def _policies_for(
+        self, requests: Sequence[UniverseBuildRequest],
+    ) -> list[UniversePolicyParams]:
+        policies: list[UniversePolicyParams] = []
+        for request in requests:
+            policy = self.policies.get(request.track_id)
+            if policy is None:
+                raise KeyError(f"No universe policy registered for track {request.track_id!r}")
+            policies.append(policy)
+        return policies
+
+    def _evaluate(
+        self,
+        requests: Sequence[UniverseBuildRequest],
+        policies: Sequence[UniversePolicyParams],
+        days: Mapping[dt.date, _Day],
+    ) -> tuple[UniverseBuildResult, ...]:
+        if self.columnar:
+            from stockripper.data.universe_columnar import UniverseColumns
+
+            columns: dict[dt.date, UniverseColumns] = {}
+            out: list[UniverseBuildResult] = []
+            for request, policy in zip(requests, policies, strict=True):
+                if request.as_of not in columns:
+                    day = days[request.as_of]
+                    columns[request.as_of] = UniverseColumns.from_inputs(
+                        day.assets, day.snapshots,
+                    )
+                out.append(columns[request.as_of].evaluate(request, policy))
+            return tuple(out)
 
+        return tuple(
+            _build_one(
+                request, policy, days[request.as_of].assets, days[request.as_of].snapshots,
+            )
+            for request, policy in zip(requests, policies, strict=True)
+        )
+
+    def _fetch_prices(
+        self, symbols: Sequence[str], *, as_of: dt.date,
+    ) -> Mapping[str, AssetSnapshot]:
+        if not symbols:
+            return {}
+        refresh = getattr(self.snapshot_provider, "refresh_prices", None)
+        fetch = refresh if refresh is not None else self.snapshot_provider.get_snapshots
+        fresh: Mapping[str, AssetSnapshot] = fetch(symbols, as_of=as_of)
+        return fresh
+
+    def _load(
+        self, as_of: dt.date,
+    ) -> tuple[list[AssetRecord], Mapping[str, AssetSnapshot]]:
         assets = [a for a in self.assets_loader() if a.tradable]
         snapshots = self.snapshot_provider.get_snapshots(
-            (a.symbol for a in assets), as_of=request.as_of,
+            (a.symbol for a in assets), as_of=as_of,
         )
+        return assets, snapshots
 
-        diagnostics: dict[str, int] = {
-            "total_assets": len(assets),
-            "missing_snapshot": 0,
-            "rejected_price_floor": 0,
-            "rejected_adv_floor": 0,
-            "rejected_cap_band": 0,
-            "rejected_instrument": 0,
-            "admitted_core": 0,
-            "admitted_low_visibility": 0,
-        }
-        admitted: list[Candidate] = []
-
-        for asset in assets:
-            snap = snapshots.get(asset.symbol.upper())
-            if snap is None:
-                diagnostics["missing_snapshot"] += 1
-                continue
 
-            verdict = _evaluate(asset, snap, policy)
-            if verdict.kind == "admit":
-                bucket = verdict.bucket
-                if bucket == "hidden_gem":
-                    diagnostics["admitted_low_visibility"] += 1
-                else:
-                    diagnostics["admitted_core"] += 1
-                admitted.append(
-                    Candidate(
-                        symbol=asset.symbol.upper(),
-                        reasons=tuple(verdict.reasons),
-                        bucket=bucket,
-                        snapshot=snap,
-                    )
+@dataclass
+class _Day:
+    """One ``as_of``'s loaded universe and each track's latest result."""
+
+    assets: list[AssetRecord]
+    snapshots: dict[str, AssetSnapshot]
+    results: dict[str, UniverseBuildResult] = field(default_factory=dict)
+
+    def refresh_prices(self, fresh: Mapping[str, AssetSnapshot]) -> None:
+        """Take only the price-sensitive fields from ``fresh``."""
+
+        for symbol, snap in fresh.items():
+            current = self.snapshots.get(symbol.upper())
+            if current is not None:
+                self.snapshots[symbol.upper()] = dataclasses.replace(
+                    current, last_price=snap.last_price, adv_usd_20d=snap.adv_usd_20d,
                 )
-            else:
-                diagnostics[verdict.reject_key] = diagnostics.get(verdict.reject_key, 0) + 1
-
-        admitted.sort(key=lambda c: (-int(c.snapshot.adv_usd_20d), c.symbol))
-        truncated = admitted[: request.limit]
-        return UniverseBuildResult(
-            request=request,
-            candidates=tuple(truncated),
-            rejected_count=len(assets) - len(truncated),
-            diagnostics=diagnostics,
+
+
+def _near_boundary(
+    day: _Day,
+    requests: Sequence[UniverseBuildRequest],
+    policies: Sequence[UniversePolicyParams],
+    boundary: Decimal,
+) -> list[str]:
+    """Symbols a price move could carry across some policy's filter or cut."""
+
+    cuts: list[Decimal | None] = []
+    for request in requests:
+        previous = day.results.get(request.track_id)
+        binding = (
+            previous is not None
+            and request.limit > 0
+            and len(previous.candidates) == request.limit
+            and previous.diagnostics.get("admitted_core", 0)
+            + previous.diagnostics.get("admitted_low_visibility", 0)
+            > request.limit
         )
+        cuts.append(previous.candidates[-1].snapshot.adv_usd_20d if binding and previous else None)
+
+    near: list[str] = []
+    for asset in day.assets:
+        symbol = asset.symbol.upper()
+        snap = day.snapshots.get(symbol)
+        if snap is None:
+            continue
+        band = MarketCapBand.classify(snap.market_cap_usd)
+        for policy, cut in zip(policies, cuts, strict=True):
+            if (
+                not _instrument_allowed(asset, policy)
+                or band is None
+                or band not in policy.market_cap_bands_allowed
+            ):
+                continue
+            if (
+                _within(snap.last_price, policy.price_floor_usd, boundary)
+                or _within(snap.adv_usd_20d, policy.min_adv_usd, boundary)
+                or (cut is not None and _within(snap.adv_usd_20d, cut, boundary))
+            ):
+                near.append(symbol)
+                break
+    return near
+
+
+def _within(value: Decimal, mark: Decimal, boundary: Decimal) -> bool:
+    return mark > 0 and abs(value - mark) <= mark * boundary
+
+
+def _build_one(
+    request: UniverseBuildRequest,
+    policy: UniversePolicyParams,
+    assets: list[AssetRecord],
+    snapshots: Mapping[str, AssetSnapshot],
+) -> UniverseBuildResult:
+    diagnostics: dict[str, int] = {
+        "total_assets": len(assets),
+        "missing_snapshot": 0,
+        "rejected_price_floor": 0,
+        "rejected_adv_floor": 0,
+        "rejected_cap_band": 0,
+        "rejected_instrument": 0,
+        "admitted_core": 0,
+        "admitted_low_visibility": 0,
+    }
+    admitted: list[Candidate] = []
+
+    for asset in assets:
+        snap = snapshots.get(asset.symbol.upper())
+        if snap is None:
+            diagnostics["missing_snapshot"] += 1
+            continue
+
+        verdict = _evaluate(asset, snap, policy)
+        if verdict.kind == "admit":
+            bucket = verdict.bucket
+            if bucket == "hidden_gem":
+                diagnostics["admitted_low_visibility"] += 1
+            else:
+                diagnostics["admitted_core"] += 1
+            admitted.append(
+                Candidate(
+                    symbol=asset.symbol.upper(),
+                    reasons=tuple(verdict.reasons),
+                    bucket=bucket,
+                    snapshot=snap,
+                )
+            )
+        else:
+            diagnostics[verdict.reject_key] = diagnostics.get(verdict.reject_key, 0) + 1
+
+    admitted.sort(key=lambda c: (-int(c.snapshot.adv_usd_20d), c.symbol))
+    truncated = admitted[: request.limit]
+    return UniverseBuildResult(
+        request=request,
+        candidates=tuple(truncated),
+        rejected_count=len(assets) - len(truncated),
+        diagnostics=diagnostics,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -189,7 +451,7 @@ def _evaluate(
     reasons: list[CandidateReason] = []
 
     instrument = _classify_instrument(asset)
-    if instrument not in policy.instrument_types_allowed:
+    if not _instrument_allowed(asset, policy):
         return _Verdict(kind="reject", reject_key="rejected_instrument")
     reasons.append(
         CandidateReason(
@@ -251,13 +513,23 @@ def _evaluate(
 
 
 def _classify_instrument(asset: AssetRecord) -> InstrumentType:
-    if asset.is_leveraged_etf:
+    if asset.is_leveraged_etf or asset.is_inverse_etf:
         return InstrumentType.LEVERAGED_ETF
     if asset.is_etf:
         return InstrumentType.ETF
     return InstrumentType.EQUITY_LONG
 
 
+def _instrument_allowed(asset: AssetRecord, policy: UniversePolicyParams) -> bool:
+    """The instrument type is allowed and no listing exclusion (OTC, ADR) applies."""
+
+    return (
+        _classify_instrument(asset) in policy.instrument_types_allowed
+        and (policy.otc_allowed or not asset.is_otc)
+        and (policy.adr_allowed or not asset.is_adr)
+    )
+
+
 def _is_low_visibility(
     snap: AssetSnapshot, policy: UniversePolicyParams, band: MarketCapBand,
 ) -> bool:
@@ -275,8 +547,10 @@ __all__ = (
     "AssetRecord",
     "AssetSnapshot",
     "Candidate",
+    "PriceRefresher",
     "SnapshotProvider",
     "UniverseBuildRequest",
     "UniverseBuildResult",
     "UniverseBuilder",
+    "UniverseRefresh",
 )
@@ -56,7 +56,7 @@ class InstrumentType(StrEnum):
     OPTION_SINGLE = "option_single"
     OPTION_SPREAD = "option_spread"
     ETF = "etf"
-    LEVERAGED_ETF = "leveraged_etf"
+    LEVERAGED_ETF = "leveraged_etf"  # also inverse ETFs: daily-reset, path-dependent
 
 
 _ALL_BANDS: Final[tuple[MarketCapBand, ...]] = tuple(MarketCapBand)
@@ -85,6 +85,14 @@ class UniversePolicyParams(BaseModel):
     instrument_types_allowed: tuple[InstrumentType, ...] = Field(
         ..., description="Which instrument types this track may trade.",
     )
+    otc_allowed: bool = Field(
+        default=False,
+        description="Whether OTC-traded symbols are eligible (exchange-listed only otherwise).",
+    )
+    adr_allowed: bool = Field(
+        default=True,
+        description="Whether American depositary receipts are eligible.",
+    )
     low_visibility_enabled: bool = Field(
         default=False,
         description="Whether the low-visibility (hidden-gem) bucket is searched.",
@@ -167,6 +175,7 @@ DEFAULT_UNIVERSE_POLICIES: Final[dict[str, UniversePolicyParams]] = {
         price_floor_usd=Decimal("0.5"),
         market_cap_bands_allowed=_ALL_BANDS,
         instrument_types_allowed=tuple(InstrumentType),
+        otc_allowed=True,
         low_visibility_enabled=True,
         low_visibility_max_news_30d=10,
         require_recent_catalyst_days=None,
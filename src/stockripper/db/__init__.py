@@ -7,6 +7,7 @@ from stockripper.db.models import (
     Base,
     DecisionAction,
     Fill,
+    FundamentalFact,
     JudgeDecision,
     JudgeRegretEntry,
     KillSwitchState,
@@ -28,6 +29,7 @@ __all__ = (
     "Base",
     "DecisionAction",
     "Fill",
+    "FundamentalFact",
     "JudgeDecision",
     "JudgeRegretEntry",
     "KillSwitchState",
@@ -524,3 +524,40 @@ class JudgeRegretEntry(Base):
     created_at: Mapped[dt.datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=_utcnow,
     )
+
+
+# ---------------------------------------------------------------------------
+# Point-in-time fundamentals
+# ---------------------------------------------------------------------------
+class FundamentalFact(Base):
+    """One reported value of a fundamental as it was filed.
+
+    Keyed by ``(cik, fact, period_end, filed_date)``: a restatement of the
+    same period is a new row with a later ``filed_date``, so a query can
+    ask what was known on any given day. ``fact`` is a derived name
+    (``shares_outstanding``, ``revenue`` ...); ``source_tag`` is the XBRL
+    tag it came from.
+    """
+
+    __tablename__ = "fundamental_facts"
+    __table_args__ = (
+        UniqueConstraint(
+            "cik", "fact", "period_end", "filed_date",
+            name="uq_fundamental_facts_cik_fact_period_filed",
+        ),
+    )
+
+    fact_id: Mapped[str] = mapped_column(String(96), primary_key=True)
+    cik: Mapped[str] = mapped_column(String(10), nullable=False)
+    fact: Mapped[str] = mapped_column(String(32), nullable=False)
+    period_end: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    filed_date: Mapped[dt.date] = mapped_column(Date, nullable=False)
+    value: Mapped[Decimal] = mapped_column(Numeric(24, 4), nullable=False)
+    unit: Mapped[str] = mapped_column(String(16), nullable=False)
+    source_tag: Mapped[str] = mapped_column(String(128), nullable=False)
+    form: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    fiscal_period: Mapped[str | None] = mapped_column(String(8), nullable=True)
+    accession: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    created_at: Mapped[dt.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_utcnow,
+    )
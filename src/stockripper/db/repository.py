@@ -9,17 +9,19 @@ testable.
 from __future__ import annotations
 
 import datetime as dt
+from collections.abc import Iterable, Mapping
 from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session, aliased
 
 from stockripper.db.models import (
     AgentRun,
     AgentScore,
     DecisionAction,
     Fill,
+    FundamentalFact,
     JudgeDecision,
     JudgeRegretEntry,
     KillSwitchState,
@@ -34,6 +36,9 @@ from stockripper.db.models import (
     TrackSnapshot,
 )
 
+# Larger CIK filters are applied in Python instead of as bound parameters.
+_MAX_IN_CLAUSE = 900
+
 
 def _utcnow() -> dt.datetime:
     return dt.datetime.now(dt.UTC)
@@ -817,6 +822,66 @@ class Repository:
         stmt = select(Run).order_by(Run.started_at.desc()).limit(limit)
         return list(self.session.execute(stmt).scalars())
 
+    # ------------------------------------------------------------------
+    # Point-in-time fundamentals
+    # ------------------------------------------------------------------
+    def replace_fundamental_facts(
+        self, cik: str, rows: Iterable[Mapping[str, Any]],
+    ) -> int:
+        """Swap every stored fact for ``cik`` for ``rows`` in one bulk insert.
+
+        A company-facts document carries a filer's whole reporting history,
+        so each load replaces the previous one rather than merging with it.
+        """
+
+        self.session.execute(delete(FundamentalFact).where(FundamentalFact.cik == cik))
+        now = _utcnow()
+        values = [
+            {
+                "fact_id": (
+                    f"{cik}:{row['fact']}:{row['period_end'].isoformat()}"
+                    f":{row['filed_date'].isoformat()}"
+                ),
+                "cik": cik,
+                "created_at": now,
+                **row,
+            }
+            for row in rows
+        ]
+        if values:
+            self.session.execute(insert(FundamentalFact), values)
+        self.session.flush()
+        return len(values)
+
+    def fundamental_facts_as_of(
+        self,
+        fact: str,
+        *,
+        as_of: dt.date,
+        ciks: Iterable[str] | None = None,
+    ) -> dict[str, FundamentalFact]:
+        """Latest-period value of ``fact`` per CIK among rows filed by ``as_of``.
+
+        A restated period wins over the original filing once it is filed.
+        """
+
+        rank = func.row_number().over(
+            partition_by=FundamentalFact.cik,
+            order_by=(FundamentalFact.period_end.desc(), FundamentalFact.filed_date.desc()),
+        )
+        ranked = select(FundamentalFact, rank.label("rank")).where(
+            FundamentalFact.fact == fact, FundamentalFact.filed_date <= as_of,
+        )
+        wanted = set(ciks) if ciks is not None else None
+        if wanted is not None and len(wanted) <= _MAX_IN_CLAUSE:
+            ranked = ranked.where(FundamentalFact.cik.in_(wanted))
+        sub = ranked.subquery()
+        latest = aliased(FundamentalFact, sub)
+        rows = self.session.execute(select(latest).where(sub.c.rank == 1)).scalars()
+        return {
+            row.cik: row for row in rows if wanted is None or row.cik in wanted
+        }
+
 
 # ----------------------------------------------------------------------
 # Helpers
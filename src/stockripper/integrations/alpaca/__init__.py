@@ -10,6 +10,7 @@ from __future__ import annotations
 from typing import Any, Protocol
 
 from stockripper.config import StockripperSettings, load_settings
+from stockripper.integrations.alpaca._sdk_retry import without_sdk_retry
 
 
 class StockDataLike(Protocol):
@@ -34,6 +35,21 @@ class TradingClientLike(Protocol):
     def get_all_assets(self, filter: Any | None = None) -> Any: ...
 
 
+def alpaca_errors() -> tuple[type[BaseException], ...]:
+    """What a failed alpaca-py data request raises, imported on first use.
+
+    ``APIError`` for error responses. Transport failures come from
+    requests, whose ``RequestException`` is an :class:`OSError`, so
+    requests itself need not be imported. Use it at the ``except`` site
+    (``except alpaca_errors():``), which is only evaluated once something
+    was raised.
+    """
+
+    from alpaca.common.exceptions import APIError
+
+    return (APIError, OSError)
+
+
 def _credentials(settings: StockripperSettings | None) -> tuple[str, str]:
     cfg = settings if settings is not None else load_settings()
     cfg.assert_paper_only()
@@ -51,7 +67,7 @@ def build_stock_data_client(
     from alpaca.data.historical.stock import StockHistoricalDataClient
 
     key_id, secret = _credentials(settings)
-    return StockHistoricalDataClient(api_key=key_id, secret_key=secret)
+    return without_sdk_retry(StockHistoricalDataClient(api_key=key_id, secret_key=secret))
 
 
 def build_news_client(
@@ -62,7 +78,7 @@ def build_news_client(
     from alpaca.data.historical.news import NewsClient
 
     key_id, secret = _credentials(settings)
-    return NewsClient(api_key=key_id, secret_key=secret)
+    return without_sdk_retry(NewsClient(api_key=key_id, secret_key=secret))
 
 
 def build_paper_reference_client(
@@ -83,13 +99,14 @@ def build_paper_reference_client(
     from alpaca.trading.client import TradingClient
 
     key_id, secret = _credentials(settings)
-    return TradingClient(api_key=key_id, secret_key=secret, paper=True)
+    return without_sdk_retry(TradingClient(api_key=key_id, secret_key=secret, paper=True))
 
 
 __all__ = (
     "NewsClientLike",
     "StockDataLike",
     "TradingClientLike",
+    "alpaca_errors",
     "build_news_client",
     "build_paper_reference_client",
     "build_stock_data_client",
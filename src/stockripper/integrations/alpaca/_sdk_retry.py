@@ -0,0 +1,59 @@
+"""Turn off alpaca-py's own 429 retry so the shared token bucket sees it.
+
+Design notes
+------------
+* alpaca-py retries a 429 by sleeping a fixed ``_retry_wait`` seconds per
+  attempt, outside :class:`~stockripper.data.rate_limit.PriorityTokenBucket`,
+  which then never learns the quota is spent. We want the 429 raised so the
+  bucket does the backoff.
+* There is no public switch for that. ``RESTClient.__init__`` accepts
+  ``retry_attempts`` but ignores values ``<= 0``, and the data and trading
+  clients built here do not pass any retry argument through to it. So the
+  one thing we can do is zero the private ``_retry`` counter after
+  construction; ``_one_request`` only raises ``RetryException`` while it
+  is above 0.
+* That is a monkey-patch on a private attribute, so it lives here alone and
+  is guarded: it is applied only on the alpaca-py major version it was
+  verified against, and only when ``_retry`` is still an int. Otherwise
+  the client is returned untouched (the SDK keeps retrying) and a warning
+  says the patch needs re-checking.
+"""
+
+from __future__ import annotations
+
+import logging
+from importlib.metadata import PackageNotFoundError, version
+from typing import Final, TypeVar
+
+LOG: Final = logging.getLogger(__name__)
+
+C = TypeVar("C")
+
+# Verified against alpaca-py 0.44.0; the RESTClient retry fields have kept
+# this shape across the 0.x line.
+_VERIFIED_MAJOR: Final = 0
+
+
+def _sdk_major() -> int | None:
+    try:
+        return int(version("alpaca-py").split(".", 1)[0])
+    except (PackageNotFoundError, ValueError):
+        return None
+
+
+def without_sdk_retry(client: C) -> C:  # noqa: UP047 - repo TypeVar style
+    """Zero alpaca-py's private retry counter when it is safe to do so."""
+
+    major = _sdk_major()
+    if major != _VERIFIED_MAJOR or not isinstance(getattr(client, "_retry", None), int):
+        LOG.warning(
+            "alpaca-py %s: leaving the SDK's 429 retry on; re-verify %s",
+            "unknown" if major is None else f"{major}.x",
+            __name__,
+        )
+        return client
+    client._retry = 0  # type: ignore[attr-defined]
+    return client
+
+
+__all__ = ("without_sdk_retry",)
@@ -31,6 +31,7 @@ from stockripper.scoring.leaderboard import (
     persist_leaderboard,
 )
 from stockripper.scoring.reward import (
+    BarStorePriceProvider,
     PriceObservation,
     PriceProvider,
     StaticPriceProvider,
@@ -39,6 +40,7 @@ from stockripper.scoring.reward import (
 )
 
 __all__ = (
+    "BarStorePriceProvider",
     "JudgeRegretReport",
     "LeaderboardMetrics",
     "PriceObservation",
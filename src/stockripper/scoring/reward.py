@@ -8,12 +8,16 @@ import logging
 from collections.abc import Iterable
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Final, Protocol
+from typing import TYPE_CHECKING, Final, Protocol
 
+import numpy as np
 from sqlalchemy.orm import Session
 
 from stockripper.db.repository import Repository
 
+if TYPE_CHECKING:
+    from stockripper.data.bar_store import BarStore
+
 LOG: Final = logging.getLogger(__name__)
 
 _BUY_ACTIONS: Final[frozenset[str]] = frozenset({"buy", "buy_to_open_option"})
@@ -62,6 +66,46 @@ class StaticPriceProvider:
         return self.table.get((symbol.upper(), from_date, horizon_days))
 
 
+@dataclass(frozen=True)
+class BarStorePriceProvider:
+    """Realized close-to-close returns read from the local daily-bar store.
+
+    Entry is the last close on or before ``from_date``; exit is the last
+    close on or before ``from_date + horizon_days`` (calendar days). Returns
+    ``None`` until the store holds a bar at or beyond the horizon, so
+    unfinished horizons are skipped rather than scored early. Never touches
+    the network — keep the store fresh via :class:`MarketDataAdapter`.
+    """
+
+    store: BarStore
+
+    def get_realized_return(
+        self,
+        *,
+        symbol: str,
+        from_date: dt.date,
+        horizon_days: int,
+    ) -> Decimal | None:
+        from stockripper.data.bar_store import epoch_day
+
+        series = self.store.read(symbol)
+        if not len(series):
+            return None
+        entry_day = epoch_day(from_date)
+        exit_day = entry_day + horizon_days
+        if int(series.day[-1]) < exit_day:
+            return None
+        entry = int(np.searchsorted(series.day, entry_day, side="right")) - 1
+        exit_ = int(np.searchsorted(series.day, exit_day, side="right")) - 1
+        if entry < 0:
+            return None
+        entry_close = float(series.close[entry])
+        if entry_close <= 0:
+            return None
+        ret = float(series.close[exit_]) / entry_close - 1.0
+        return Decimal(repr(ret)).quantize(Decimal("0.000001"))
+
+
 def _signed_excess(
     action: str,
     sym_return: Decimal,
@@ -195,6 +239,7 @@ def compute_rewards_by_recommendation(
 
 
 __all__ = (
+    "BarStorePriceProvider",
     "PriceObservation",
     "PriceProvider",
     "StaticPriceProvider",
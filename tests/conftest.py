@@ -10,6 +10,8 @@ from collections.abc import Iterator
 
 import pytest
 
+from stockripper.data import sec_edgar
+
 _STOCKRIPPER_ENV_VARS = (
     "ALPACA_API_KEY_ID",
     "ALPACA_API_SECRET_KEY",
@@ -34,6 +36,9 @@ def _isolated_env(
     # `.env` at the repo root never leaks into the test process.
     workdir = tmp_path_factory.mktemp("stockripper-env")
     monkeypatch.chdir(workdir)
+    # Never share (or mutate) the machine-wide SEC window from a test.
+    monkeypatch.setenv("SEC_EDGAR_RATE_FILE", str(workdir / "sec-edgar.ratelimit"))
+    monkeypatch.setattr(sec_edgar, "_RATE_LIMITER", None)
     yield
 
 
@@ -0,0 +1,104 @@
+"""Local Alpaca quota simulator for rate-limiter tests.
+
+:class:`QuotaExhaustingClient` stands in for the stock-data and news
+clients and meters requests the way Alpaca does: at most ``quota`` per
+sliding ``window`` seconds for the key, after which it raises alpaca-py's
+own ``APIError`` with a 429 response whose ``Retry-After`` says when the
+oldest request leaves the window.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+from alpaca.common.exceptions import APIError
+
+
+@dataclass
+class _Trade:
+    price: float
+    timestamp: dt.datetime
+
+
+@dataclass
+class _DailyBar:
+    volume: int
+
+
+@dataclass
+class _Snapshot:
+    latest_trade: _Trade
+    daily_bar: _DailyBar
+
+
+@dataclass
+class _Quote:
+    bid_price: float
+    ask_price: float
+    timestamp: dt.datetime
+
+
+def rate_limited_error(retry_after: float | None = None) -> APIError:
+    """The ``APIError`` alpaca-py raises for a 429 once its retries are off."""
+
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers["Retry-After"] = f"{retry_after:.3f}"
+    http_error = requests.HTTPError("429 Too Many Requests", response=response)
+    # alpaca-py's APIError.__init__ is unannotated.
+    return APIError(  # type: ignore[no-untyped-call]
+        '{"code":42910000,"message":"too many requests."}', http_error,
+    )
+
+
+class QuotaExhaustingClient:
+    """Fake data + news client enforcing a sliding-window request quota."""
+
+    def __init__(self, *, quota: int, window: float) -> None:
+        self._quota = quota
+        self._window = window
+        self._sent: deque[float] = deque()
+        self._lock = threading.Lock()
+        self.served = 0
+        self.rejected = 0
+        self.calls: list[str] = []
+
+    def _spend(self, method: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= self._window:
+                self._sent.popleft()
+            if len(self._sent) >= self._quota:
+                self.rejected += 1
+                raise rate_limited_error(self._window - (now - self._sent[0]))
+            self._sent.append(now)
+            self.served += 1
+            self.calls.append(method)
+
+    def get_stock_snapshot(self, request: Any) -> dict[str, _Snapshot]:
+        self._spend("snapshot")
+        now = dt.datetime.now(dt.UTC)
+        symbols = request.symbol_or_symbols
+        return {
+            s: _Snapshot(_Trade(10.0, now), _DailyBar(1_000))
+            for s in ([symbols] if isinstance(symbols, str) else symbols)
+        }
+
+    def get_stock_bars(self, request: Any) -> dict[str, list[Any]]:
+        self._spend("bars")
+        return {}
+
+    def get_stock_latest_quote(self, request: Any) -> dict[str, _Quote]:
+        self._spend("latest_quote")
+        return {request.symbol_or_symbols: _Quote(9.99, 10.01, dt.datetime.now(dt.UTC))}
+
+    def get_news(self, request: Any) -> dict[str, list[Any]]:
+        self._spend("news")
+        return {"news": []}
@@ -16,6 +16,7 @@ from stockripper.agents import (
     AlpacaMcpClient,
     build_alpaca_mcp_env,
 )
+from stockripper.data.rate_limit import Priority, PriorityTokenBucket
 
 EXPECTED_TOOLS: frozenset[str] = frozenset({
     "get_account", "get_clock", "get_calendar",
@@ -103,3 +104,32 @@ async def test_spawn_lists_all_expected_tools() -> None:
     assert names >= EXPECTED_TOOLS, (
         f"missing tools: {EXPECTED_TOOLS - names}"
     )
+
+
+# ----------------------------------------------------------------------
+# Rate limiting (fake session, no subprocess)
+# ----------------------------------------------------------------------
+class _FakeSession:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def call_tool(self, name: str, arguments: dict[str, object]) -> object:
+        self.calls.append(name)
+        return object()
+
+
+async def test_call_tool_paces_only_market_data_tools() -> None:
+    limiter = PriorityTokenBucket(6000, burst=5, reserve=0)
+    session = _FakeSession()
+    client = AlpacaMcpClient(session, limiter=limiter)  # type: ignore[arg-type]
+
+    await client.call_tool("get_account", {})
+    await client.call_tool(
+        "get_stock_latest_quote", {"symbols": "AAPL"}, priority=Priority.EXECUTION,
+    )
+    await client.call_tool("get_news", {"symbols": "AAPL"})
+
+    assert session.calls == ["get_account", "get_stock_latest_quote", "get_news"]
+    metrics = limiter.metrics().by_priority
+    assert metrics[Priority.EXECUTION].granted == 1
+    assert metrics[Priority.EVIDENCE].granted == 1
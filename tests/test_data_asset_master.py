@@ -0,0 +1,143 @@
+"""Tests for the persisted, classified asset master and its daily diff."""
+
+from __future__ import annotations
+
+import datetime as dt
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+
+from stockripper.data.asset_master import AssetFlag, AssetMaster, AssetTable
+from stockripper.data.live import AlpacaAssetsLoader
+from stockripper.data.universe import AssetRecord
+
+_DAY1 = dt.date(2026, 5, 26)
+_DAY2 = dt.date(2026, 5, 27)
+
+
+def _asset(symbol: str, name: str, exchange: str = "NASDAQ", **kw: Any) -> SimpleNamespace:
+    fields: dict[str, Any] = {
+        "tradable": True,
+        "shortable": False,
+        "fractionable": False,
+        "marginable": True,
+        "easy_to_borrow": False,
+        "attributes": None,
+    }
+    fields.update(kw)
+    return SimpleNamespace(symbol=symbol, name=name, exchange=exchange, **fields)
+
+
+_ASSETS = (
+    _asset("AAPL", "Apple Inc. Common Stock", shortable=True, fractionable=True),
+    _asset("TQQQ", "ProShares UltraPro QQQ", fractionable=True),
+    _asset("SDS", "ProShares UltraShort S&P500", "ARCA"),
+    _asset("SOXS", "Direxion Daily Semiconductor Bear 3X Shares", "ARCA"),
+    _asset("SPY", "SPDR S&P 500 ETF Trust", "ARCA", shortable=True),
+    _asset("SHV", "iShares Short Treasury Bond ETF", "NASDAQ"),
+    _asset("TSM", "Taiwan Semiconductor Manufacturing Co. Ltd. ADR", "NYSE"),
+    _asset("NSRGY", "Nestle S.A. Sponsored ADR", "OTC", tradable=False),
+    _asset("UCTT", "Ultra Clean Holdings, Inc. Common Stock"),
+    _asset("GLD", "Gold Trust", "ARCA", attributes=["etf"]),
+)
+
+
+def _flags(table: AssetTable, symbol: str) -> AssetFlag:
+    (row,) = np.flatnonzero(table.symbol == symbol)
+    return AssetFlag(int(table.flags[row]))
+
+
+def test_classification_index() -> None:
+    table = AssetTable.from_assets(_ASSETS, as_of=_DAY1)
+
+    assert table.symbol.tolist() == sorted(a.symbol for a in _ASSETS)
+    assert _flags(table, "AAPL") == (
+        AssetFlag.TRADABLE | AssetFlag.SHORTABLE | AssetFlag.FRACTIONABLE | AssetFlag.MARGINABLE
+    )
+    leveraged = set(table.symbol[table.has(AssetFlag.LEVERAGED_ETF)].tolist())
+    inverse = set(table.symbol[table.has(AssetFlag.INVERSE_ETF)].tolist())
+    etf = set(table.symbol[table.has(AssetFlag.ETF)].tolist())
+    assert leveraged == {"TQQQ", "SDS", "SOXS"}
+    assert inverse == {"SDS", "SOXS"}
+    # A short-duration bond fund is not inverse; an "Ultra" company is no fund.
+    assert etf == {"TQQQ", "SDS", "SOXS", "SPY", "SHV", "GLD"}
+    assert set(table.symbol[table.has(AssetFlag.ADR)].tolist()) == {"TSM", "NSRGY"}
+    assert table.symbol[table.has(AssetFlag.OTC)].tolist() == ["NSRGY"]
+
+    assert table == table and table != AssetTable.from_assets(_ASSETS, as_of=_DAY1)
+    assert len({table, AssetTable.empty(_DAY1)}) == 2
+
+    records = {r.symbol: r for r in table.records}
+    assert records["SOXS"] == AssetRecord(
+        symbol="SOXS",
+        name="Direxion Daily Semiconductor Bear 3X Shares",
+        exchange="ARCA",
+        tradable=True,
+        shortable=False,
+        fractionable=False,
+        is_etf=True,
+        is_leveraged_etf=True,
+        is_inverse_etf=True,
+    )
+    assert records["NSRGY"].is_otc and records["NSRGY"].is_adr
+    assert not records["NSRGY"].tradable
+
+
+def test_master_round_trips_and_logs_daily_diffs(tmp_path: Path) -> None:
+    master = AssetMaster(tmp_path)
+    assert master.load() is None
+
+    first = master.update(AssetTable.from_assets(_ASSETS, as_of=_DAY1))
+    assert first.previous_as_of is None and len(first.added) == len(_ASSETS)
+
+    next_day = [a for a in _ASSETS if a.symbol != "UCTT"]
+    next_day[0] = _asset("AAPL", "Apple Inc. Common Stock", fractionable=True)
+    next_day.append(_asset("NEWCO", "NewCo Holdings Class A"))
+    second = master.update(AssetTable.from_assets(next_day, as_of=_DAY2))
+
+    assert second.previous_as_of == _DAY1
+    assert second.added == ("NEWCO",)
+    assert second.delisted == ("UCTT",)
+    assert second.changed == {"AAPL": ("shortable",)}
+
+    reopened = AssetMaster(tmp_path)
+    stored = reopened.load()
+    assert stored is not None and stored.as_of == _DAY2
+    assert stored.records == AssetTable.from_assets(next_day, as_of=_DAY2).records
+    assert reopened.diffs() == (first, second)
+    assert reopened.diffs(since=_DAY2) == (second,)
+
+
+class _AssetsClient:
+    def __init__(self, assets: list[SimpleNamespace]) -> None:
+        self.assets = assets
+        self.calls = 0
+
+    def get_all_assets(self, request: Any) -> list[SimpleNamespace]:
+        self.calls += 1
+        return self.assets
+
+
+def test_loader_fetches_at_most_once_per_day(tmp_path: Path) -> None:
+    client = _AssetsClient(list(_ASSETS))
+    loader = AlpacaAssetsLoader(client=client, master=AssetMaster(tmp_path))
+
+    assert len(loader.table(today=_DAY1)) == len(_ASSETS)
+    assert loader.table(today=_DAY1).as_of == _DAY1
+    assert client.calls == 1
+
+    client.assets = client.assets[1:]
+    assert "AAPL" not in loader.table(today=_DAY2).symbol
+    assert client.calls == 2
+
+    # A new loader (next process) reads the stored table for the same day.
+    again = AlpacaAssetsLoader(client=client, master=AssetMaster(tmp_path))
+    assert len(again.table(today=_DAY2)) == len(_ASSETS) - 1
+    assert client.calls == 2
+
+    unpersisted = AlpacaAssetsLoader(client=client, master=False)
+    unpersisted()
+    unpersisted()
+    assert client.calls == 4
@@ -0,0 +1,211 @@
+"""Tests for the memory-mapped daily-bar store and its adapter wiring."""
+
+from __future__ import annotations
+
+import datetime as dt
+import itertools
+import math
+import statistics
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from stockripper.data.bar_store import Bar, BarSeries, BarStore, epoch_day, records_from_raw
+from stockripper.data.market_data import MarketDataAdapter
+
+
+@dataclass
+class _RawBar:
+    timestamp: dt.datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+
+
+def _bar(day: dt.date, close: float, volume: int = 1_000) -> _RawBar:
+    # Alpaca stamps daily bars at midnight New York time (04:00/05:00 UTC).
+    ts = dt.datetime.combine(day, dt.time(4, 0), tzinfo=dt.UTC)
+    return _RawBar(ts, close, close, close, close, volume)
+
+
+def _days(n: int, *, end: dt.date) -> list[dt.date]:
+    return [end - dt.timedelta(days=n - 1 - i) for i in range(n)]
+
+
+class _HistoryClient:
+    """Serves bars from a fixed history, honouring the request's start."""
+
+    def __init__(self, history: dict[str, list[_RawBar]]) -> None:
+        self.history = history
+        self.requests: list[Any] = []
+
+    def get_stock_bars(self, request: Any) -> dict[str, list[_RawBar]]:
+        self.requests.append(request)
+        start = request.start.date()
+        return {
+            s: [b for b in self.history.get(s, []) if b.timestamp.date() >= start]
+            for s in request.symbol_or_symbols
+        }
+
+    def get_stock_snapshot(self, request: Any) -> Any:
+        raise AssertionError("not used")
+
+    def get_stock_latest_quote(self, request: Any) -> Any:
+        raise AssertionError("not used")
+
+
+def test_merge_appends_and_overwrites_forming_bar(tmp_path: Path) -> None:
+    store = BarStore(tmp_path)
+    d = _days(3, end=dt.date(2026, 5, 27))
+    store.merge("aapl", records_from_raw([_bar(d[0], 10.0), _bar(d[1], 11.0)]), covered_from=0)
+    # Same last day again (still forming) plus a new session.
+    store.merge("AAPL", records_from_raw([_bar(d[1], 11.5), _bar(d[2], 12.0)]))
+    series = store.read("AAPL")
+    assert list(series.close) == [10.0, 11.5, 12.0]
+    assert list(series.day) == [epoch_day(x) for x in d]
+    cov = store.coverage("AAPL")
+    assert cov is not None and cov.count == 3 and cov.covered_from == 0
+
+
+def test_open_mappings_never_see_a_bar_change_under_them(tmp_path: Path) -> None:
+    store = BarStore(tmp_path)
+    d = _days(4, end=dt.date(2026, 5, 27))
+    store.merge("X", records_from_raw([_bar(d[0], 1.0), _bar(d[1], 2.0)]), covered_from=0)
+    path = next(tmp_path.rglob("X.bars"))
+    held = store.read("X")
+
+    # An unchanged re-sent last bar plus a new session: appended in place.
+    inode = path.stat().st_ino
+    store.merge("X", records_from_raw([_bar(d[1], 2.0), _bar(d[2], 3.0)]))
+    assert path.stat().st_ino == inode
+
+    # The forming bar moved: a new file replaces the old one.
+    store.merge("X", records_from_raw([_bar(d[2], 3.5), _bar(d[3], 4.0)]))
+    assert path.stat().st_ino != inode
+    assert list(held.close) == [1.0, 2.0]
+    assert list(store.read("X").close) == [1.0, 2.0, 3.5, 4.0]
+    assert sorted(p.name for p in path.parent.iterdir()) == ["X.bars", "X.bars.lock"]
+
+
+def test_merge_backfill_rewrites_in_day_order(tmp_path: Path) -> None:
+    store = BarStore(tmp_path)
+    d = _days(4, end=dt.date(2026, 5, 27))
+    store.merge("X", records_from_raw([_bar(d[2], 3.0), _bar(d[3], 4.0)]))
+    store.merge("X", records_from_raw([_bar(d[0], 1.0), _bar(d[2], 30.0)]))
+    assert list(store.read("X").close) == [1.0, 30.0, 4.0]
+
+
+def test_read_is_zero_copy_memmap(tmp_path: Path) -> None:
+    store = BarStore(tmp_path)
+    d = _days(5, end=dt.date(2026, 5, 27))
+    store.merge("X", records_from_raw([_bar(x, float(i)) for i, x in enumerate(d)]))
+    series = store.read("X").tail(2)
+    assert isinstance(series.records, np.memmap)
+    assert not series.close.flags.owndata
+    assert list(series.close) == [3.0, 4.0]
+    bars = series.to_bars()
+    assert bars[-1].close == Decimal("4.0")
+    assert bars[-1].timestamp.date() == d[-1]
+
+
+def test_missing_symbol_reads_empty(tmp_path: Path) -> None:
+    store = BarStore(tmp_path)
+    assert len(store.read("NOPE")) == 0
+    assert store.coverage("NOPE") is None
+
+
+def test_adapter_only_fetches_bars_newer_than_last_stored_day(tmp_path: Path) -> None:
+    today = dt.datetime.now(dt.UTC).date()
+    days = _days(40, end=today - dt.timedelta(days=1))
+    history = {s: [_bar(x, 100.0, 1_000_000) for x in days] for s in ("AAA", "BBB")}
+    client = _HistoryClient(history)
+    adapter = MarketDataAdapter(client=client, bar_store=BarStore(tmp_path))
+
+    first = adapter.compute_adv_usd_bulk(["AAA", "BBB"], days=20)
+    assert first["AAA"].adv_usd == Decimal("100000000.00")
+    assert first["AAA"].bars_used == 20
+    assert len(client.requests) == 1
+
+    # A new session arrives; the next sync asks only from the last stored day.
+    for sym in history:
+        history[sym].append(_bar(today, 200.0, 1_000_000))
+    bars, _prov = adapter.get_daily_bars("AAA", days=20)
+    assert client.requests[-1].start.date() == days[-1]
+    assert bars[-1].close == Decimal("200.0")
+    assert len(bars) == 20
+
+
+def test_adapter_backfills_when_window_exceeds_stored_history(tmp_path: Path) -> None:
+    today = dt.datetime.now(dt.UTC).date()
+    days = _days(80, end=today)
+    client = _HistoryClient({"AAA": [_bar(x, 1.0) for x in days]})
+    adapter = MarketDataAdapter(client=client, bar_store=BarStore(tmp_path))
+    adapter.get_bar_series("AAA", days=5)
+    short_start = client.requests[-1].start
+    series, _ = adapter.get_bar_series("AAA", days=40)
+    assert client.requests[-1].start < short_start
+    assert len(series) == 40
+
+
+def test_series_is_a_lazy_sequence_of_bars() -> None:
+    d = _days(4, end=dt.date(2026, 5, 27))
+    series = BarSeries.from_raw("X", [_bar(x, 10.0 + i, 100 * (i + 1)) for i, x in enumerate(d)])
+
+    assert isinstance(series[-1], Bar)
+    assert series[-1].close == Decimal("13.0")
+    assert series[0].dollar_volume == Decimal("1000.0")
+    window = series[1:3]
+    assert isinstance(window, BarSeries)
+    assert [b.volume for b in window] == [200, 300]
+    assert not window.close.flags.owndata
+    assert series.to_bars() == tuple(series)
+
+
+def test_series_compare_by_value_and_hash() -> None:
+    d = _days(3, end=dt.date(2026, 5, 27))
+    series = BarSeries.from_raw("X", [_bar(x, 10.0) for x in d])
+
+    assert BarSeries.empty("A") == BarSeries.empty("A")
+    assert BarSeries.empty("A") != BarSeries.empty("B")
+    assert series == BarSeries.from_raw("X", [_bar(x, 10.0) for x in d])
+    assert series != BarSeries.from_raw("X", [_bar(x, 11.0) for x in d])
+    assert series[1:] != series
+    assert len({series, series[:], BarSeries.empty("X")}) == 2
+
+
+def test_series_analytics_match_the_bar_by_bar_definitions() -> None:
+    closes = [10.0, 11.0, 9.9, 12.5, 12.0, 13.1]
+    volumes = [1_000, 2_500, 400, 3_300, 1_200, 900]
+    d = _days(len(closes), end=dt.date(2026, 5, 27))
+    series = BarSeries.from_raw(
+        "X", [_bar(x, c, v) for x, c, v in zip(d, closes, volumes, strict=True)],
+    )
+
+    dollars = [c * v for c, v in zip(closes, volumes, strict=True)]
+    assert series.adv_usd() == pytest.approx(sum(dollars) / 6)
+    assert series.adv_usd(4) == pytest.approx(sum(dollars[-4:]) / 4)
+    assert BarSeries.empty("X").adv_usd(20) == 0.0
+
+    simple = [b / a - 1 for a, b in itertools.pairwise(closes)]
+    assert series.returns() == pytest.approx(simple)
+    assert series.returns(log=True) == pytest.approx([math.log(1 + r) for r in simple])
+    assert len(series[:1].returns()) == 0
+
+    assert series.rolling_mean(3) == pytest.approx(
+        [sum(closes[i : i + 3]) / 3 for i in range(4)],
+    )
+    assert series.rolling_mean(2, field="dollar_volume") == pytest.approx(
+        [(dollars[i] + dollars[i + 1]) / 2 for i in range(5)],
+    )
+    assert series.rolling_std(3, ddof=1) == pytest.approx(
+        [statistics.stdev(closes[i : i + 3]) for i in range(4)],
+    )
+    assert series.rolling_mean(10).shape == (0,)
+    with pytest.raises(ValueError):
+        series.rolling_mean(0)
@@ -0,0 +1,122 @@
+"""Tests for :class:`BlobStore` and provenance ``raw_content_uri``."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from stockripper.data import provenance
+from stockripper.data.blob_store import BlobStore, blob_uri, parse_blob_uri
+from stockripper.data.provenance import Provenance, canonical_bytes
+
+
+def test_put_is_content_addressed_sharded_and_deduplicated(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, codec="identity")
+    digest = hashlib.sha256(b"hello").hexdigest()
+
+    uri = store.put(b"hello")
+    assert uri == blob_uri(digest) == f"blob://sha256/{digest}"
+    assert store.put("hello") == uri
+    assert store.contains(uri) and store.contains(digest)
+
+    files = [p for p in tmp_path.rglob("*") if p.is_file()]
+    assert files == [tmp_path / digest[:2] / digest[2:4] / digest]
+    assert store.read(uri, verify=True) == b"hello"
+
+
+def test_compresses_only_when_it_pays(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, codec="gzip", min_compress_bytes=16)
+    repetitive = b"x" * 4096
+    random_ish = hashlib.sha512(b"seed").digest()  # 64 incompressible bytes
+    small = b"tiny"
+
+    for data in (repetitive, random_ish, small):
+        uri = store.put(data)
+        assert store.read(uri, verify=True) == data
+
+    names = {p.name.split(".")[0]: p.suffix for p in tmp_path.rglob("*") if p.is_file()}
+    assert names[hashlib.sha256(repetitive).hexdigest()] == ".gz"
+    assert names[hashlib.sha256(random_ish).hexdigest()] == ""
+    assert names[hashlib.sha256(small).hexdigest()] == ""
+
+
+def test_view_maps_uncompressed_blobs(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, codec="identity")
+    uri = store.put(b"0123456789")
+    empty = store.put(b"")
+
+    with store.view(uri) as view:
+        assert view[2:5].tobytes() == b"234"
+    with store.view(empty) as view:
+        assert view.tobytes() == b""
+
+
+def test_missing_and_corrupt_blobs(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, codec="identity")
+    digest = hashlib.sha256(b"original").hexdigest()
+    with pytest.raises(KeyError):
+        store.read(digest)
+
+    store.put(b"tampered", digest=digest)
+    assert store.read(digest) == b"tampered"
+    with pytest.raises(ValueError, match="does not match"):
+        store.read(digest, verify=True)
+
+
+@pytest.mark.parametrize("bad", ["", "blob://sha256/xyz", "s3://bucket/key", "A" * 64])
+def test_parse_blob_uri_rejects_non_digests(bad: str) -> None:
+    with pytest.raises(ValueError, match="not a sha256"):
+        parse_blob_uri(bad)
+
+
+def test_provenance_keeps_the_hashed_payload(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path)
+    payload = {"cik": 320193, "facts": {"dei": {"n": [1, 2, 3]}}, "entityName": "Apple"}
+
+    url = "https://data.sec.gov/api/xbrl/companyfacts/CIK0000320193.json"
+
+    prov = Provenance.for_payload(provider="sec_edgar", source_url=url, payload=payload)
+    assert prov.raw_content_uri is None
+
+    kept = Provenance.for_payload(
+        provider="sec_edgar", source_url=url, payload=payload, blobs=store,
+    )
+    assert kept.content_hash == prov.content_hash
+    assert kept.raw_content_uri == blob_uri(prov.content_hash)
+    assert store.read(kept.raw_content_uri, verify=True) == canonical_bytes(payload)
+
+
+def test_put_chunks_streams_into_the_same_blob_put_writes(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path, codec="gzip", min_compress_bytes=16)
+    chunks = [b"x" * 10, b"y" * 4000, b"z" * 90]
+    data = b"".join(chunks)
+    digest = hashlib.sha256(data).hexdigest()
+
+    assert store.put_chunks(iter(chunks), digest=digest) == blob_uri(digest)
+    assert store.read(digest, verify=True) == data
+    assert store.put_chunks(iter(()), digest=digest) == blob_uri(digest)  # already there
+
+    small = hashlib.sha256(b"tiny").hexdigest()
+    store.put_chunks([b"ti", b"ny"], digest=small)
+    names = {p.name.split(".")[0]: p.suffix for p in tmp_path.rglob("*") if p.is_file()}
+    assert names == {digest: ".gz", small: ""}
+
+
+def test_provenance_streams_the_payload_into_the_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    store = BlobStore(tmp_path, codec="gzip")
+    payload = {"facts": {"us-gaap": {f"Tag{i}": {"units": [i] * 50} for i in range(200)}}}
+    expected = canonical_bytes(payload)
+
+    def _joined(_payload: object) -> bytes:
+        raise AssertionError("the canonical document must not be built in memory")
+
+    monkeypatch.setattr(provenance, "canonical_bytes", _joined)
+    prov = Provenance.for_payload(
+        provider="sec_edgar", source_url="https://example.test", payload=payload, blobs=store,
+    )
+    assert prov.raw_content_uri is not None
+    assert store.read(prov.raw_content_uri, verify=True) == expected
@@ -4,9 +4,29 @@ from __future__ import annotations
 
 import datetime as dt
 import json
+import multiprocessing
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from stockripper.data.cache import JsonFileCache
+import pytest
+
+from stockripper.data import cache as cache_module
+from stockripper.data.cache import (
+    CacheEntry,
+    Fetched,
+    JsonFileCache,
+    MemoryCacheTier,
+    SqliteCache,
+    read_through,
+    read_through_validated,
+    read_validators,
+    shared_cache,
+)
+from stockripper.data.singleflight import SingleFlight
 
 
 def test_put_then_get_returns_value(tmp_path: Path) -> None:
@@ -65,3 +85,360 @@ def test_delete_removes_entry(tmp_path: Path) -> None:
     cache.put("p", "k", "v", ttl=dt.timedelta(minutes=1))
     cache.delete("p", "k")
     assert cache.get("p", "k") is None
+
+
+class _CountingBackend:
+    def __init__(self, inner: JsonFileCache) -> None:
+        self.inner = inner
+        self.gets = 0
+
+    def get(
+        self, namespace: str, key: str, *, grace: dt.timedelta = dt.timedelta(0),
+    ) -> CacheEntry | None:
+        self.gets += 1
+        return self.inner.get(namespace, key, grace=grace)
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: object,
+        *,
+        ttl: dt.timedelta,
+        validators: Mapping[str, str] | None = None,
+    ) -> CacheEntry:
+        return self.inner.put(namespace, key, value, ttl=ttl, validators=validators)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self.inner.delete(namespace, key)
+
+
+def test_memory_tier_serves_repeat_reads_without_backend(tmp_path: Path) -> None:
+    backend = _CountingBackend(JsonFileCache(tmp_path))
+    backend.put("sec_edgar", "company_tickers", {"0": "AAPL"}, ttl=dt.timedelta(minutes=1))
+    tier = MemoryCacheTier(backend)
+    for _ in range(3):
+        entry = tier.get("sec_edgar", "company_tickers")
+        assert entry is not None and entry.value == {"0": "AAPL"}
+    assert backend.gets == 1
+    stats = tier.stats()["sec_edgar"]
+    assert (stats.hits, stats.misses, stats.evictions) == (2, 1, 0)
+
+
+def test_memory_tier_honours_ttl(tmp_path: Path) -> None:
+    backend = _CountingBackend(JsonFileCache(tmp_path))
+    tier = MemoryCacheTier(backend)
+    tier.put("p", "k", 1, ttl=dt.timedelta(seconds=-1))
+    assert tier.get("p", "k") is None
+    assert backend.gets == 1
+
+
+def test_memory_tier_put_and_delete_invalidate(tmp_path: Path) -> None:
+    tier = MemoryCacheTier(JsonFileCache(tmp_path))
+    tier.put("p", "k", 1, ttl=dt.timedelta(minutes=1))
+    tier.put("p", "k", 2, ttl=dt.timedelta(minutes=1))
+    entry = tier.get("p", "k")
+    assert entry is not None and entry.value == 2
+    tier.delete("p", "k")
+    assert tier.get("p", "k") is None
+    assert JsonFileCache(tmp_path).get("p", "k") is None
+
+
+def test_memory_tier_evicts_by_count_and_bytes(tmp_path: Path) -> None:
+    tier = MemoryCacheTier(JsonFileCache(tmp_path), max_entries=2)
+    for key in ("a", "b", "c"):
+        tier.put("p", key, key, ttl=dt.timedelta(minutes=1))
+    assert tier.stats()["p"].evictions == 1
+
+    entry = JsonFileCache(tmp_path).put("q", "x", "x" * 100, ttl=dt.timedelta(minutes=1))
+    size = entry.logical_bytes
+    small = MemoryCacheTier(JsonFileCache(tmp_path), max_bytes=size + 10)
+    small.get("q", "x")
+    small.put("q", "y", "y" * 100, ttl=dt.timedelta(minutes=1))
+    assert small.stats()["q"].evictions == 1
+    # Least recently used ("x") went first; "y" is still served from memory.
+    small.get("q", "y")
+    assert small.stats()["q"].hits == 1
+
+
+def test_shared_cache_is_one_instance_per_root(tmp_path: Path) -> None:
+    assert shared_cache(tmp_path) is shared_cache(tmp_path)
+    assert shared_cache(tmp_path) is not shared_cache(tmp_path / "other")
+
+
+def _company_facts(n: int) -> dict[str, object]:
+    units = [
+        {"end": f"2024-{(i % 12) + 1:02d}-28", "val": i * 1000, "form": "10-Q"} for i in range(n)
+    ]
+    revenues = {"units": {"USD": units}}
+    return {"entityName": "Apple Inc.", "facts": {"us-gaap": {"Revenues": revenues}}}
+
+
+def test_compressed_namespace_roundtrips_and_reports_usage(tmp_path: Path) -> None:
+    facts = _company_facts(2000)
+    for cache in (JsonFileCache(tmp_path), SqliteCache(tmp_path / "cache.sqlite3")):
+        written = cache.put(
+            "sec_edgar", "company_facts_0000320193", facts, ttl=dt.timedelta(hours=1),
+        )
+        cache.put("alpaca", "k", facts, ttl=dt.timedelta(hours=1))
+        entry = cache.get("sec_edgar", "company_facts_0000320193")
+        assert entry is not None and entry.value == facts
+        assert written.size_bytes * 4 < written.logical_bytes
+
+        usage = cache.usage()
+        assert usage["sec_edgar"].entries == 1
+        assert usage["sec_edgar"].compression_ratio > 4
+        # Namespaces without a codec are stored as plain JSON.
+        assert usage["alpaca"].compression_ratio < 1.1
+
+
+def test_small_payloads_and_codec_changes_stay_readable(tmp_path: Path) -> None:
+    plain = JsonFileCache(tmp_path, compression={})
+    plain.put("sec_edgar", "big", _company_facts(500), ttl=dt.timedelta(hours=1))
+    gz = JsonFileCache(tmp_path, compression={"sec_edgar": "gzip"})
+    entry = gz.get("sec_edgar", "big")
+    assert entry is not None and entry.value == _company_facts(500)
+    gz.put("sec_edgar", "small", {"a": 1}, ttl=dt.timedelta(hours=1))
+    # Payloads under the size threshold skip the codec.
+    assert (tmp_path / "sec_edgar" / "small.json").read_bytes().endswith(b'{"a":1}')
+
+
+def test_unknown_codec_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="unsupported cache codec"):
+        JsonFileCache(tmp_path, compression={"sec_edgar": "lz4"})
+
+
+def test_sqlite_older_schema_is_dropped(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE cache_entries (namespace TEXT, key TEXT, value TEXT)")
+        conn.execute("INSERT INTO cache_entries VALUES ('p', 'k', '1')")
+    cache = SqliteCache(path)
+    assert cache.get("p", "k") is None
+    cache.put("p", "k", 2, ttl=dt.timedelta(minutes=1))
+    entry = cache.get("p", "k")
+    assert entry is not None and entry.value == 2
+
+
+def test_shared_cache_imports_json_entries_once(tmp_path: Path) -> None:
+    legacy = JsonFileCache(tmp_path)
+    legacy.put("sec_edgar", "company_facts_0000320193", _company_facts(200), ttl=dt.timedelta(days=1))
+    legacy.put("p", "tag", {"v": 1}, ttl=dt.timedelta(minutes=-1), validators={"ETag": '"a"'})
+    legacy.put("p", "gone", 1, ttl=dt.timedelta(minutes=-1))
+    (tmp_path / "p" / "notes.json").write_text('{"not": "a cache entry"}')
+
+    tier = shared_cache(tmp_path)
+
+    entry = tier.get("sec_edgar", "company_facts_0000320193")
+    assert entry is not None and entry.value == _company_facts(200)
+    assert read_validators(tier, "p", "tag") == {"ETag": '"a"'}
+    backing = tier.backing
+    assert isinstance(backing, SqliteCache)
+    assert [e.key for e in backing.entries("p")] == ["tag"]
+    assert sorted(p.name for p in tmp_path.glob("*/*.json")) == ["notes.json"]
+    assert backing.import_json(tmp_path) == 0
+
+
+def test_grace_returns_recently_expired_entries(tmp_path: Path) -> None:
+    for cache in (JsonFileCache(tmp_path), SqliteCache(tmp_path / "cache.sqlite3")):
+        cache.put("p", "k", 1, ttl=dt.timedelta(seconds=-5))
+        assert cache.get("p", "k") is None
+        stale = cache.get("p", "k", grace=dt.timedelta(minutes=1))
+        assert stale is not None and stale.is_expired()
+        assert cache.get("p", "k", grace=dt.timedelta(seconds=1)) is None
+
+
+def test_read_through_serves_stale_and_refreshes_in_background(tmp_path: Path) -> None:
+    cache = JsonFileCache(tmp_path)
+    cache.put("p", "k", "old", ttl=dt.timedelta(seconds=-5))
+    refreshed = threading.Event()
+
+    def fetch() -> str:
+        refreshed.set()
+        return "new"
+
+    value, stale = read_through(
+        cache, "p", "k", fetch,
+        ttl=dt.timedelta(minutes=5), flight=SingleFlight(), stale_grace=dt.timedelta(minutes=1),
+    )
+    assert (value, stale) == ("old", True)
+    assert refreshed.wait(2.0)
+    for _ in range(200):
+        entry = cache.get("p", "k")
+        if entry is not None:
+            break
+        time.sleep(0.01)
+    assert entry is not None and entry.value == "new"
+
+    # Without a grace period the expired entry is a plain miss.
+    cache.put("p", "k", "old", ttl=dt.timedelta(seconds=-5))
+    value, stale = read_through(
+        cache, "p", "k", lambda: "fetched", ttl=dt.timedelta(minutes=5), flight=SingleFlight(),
+    )
+    assert (value, stale) == ("fetched", False)
+
+
+def test_read_through_does_not_coalesce_across_caches(tmp_path: Path) -> None:
+    caches = (JsonFileCache(tmp_path / "a"), JsonFileCache(tmp_path / "b"))
+    flight = SingleFlight()
+    barrier = threading.Barrier(2)
+
+    def fetch() -> str:
+        time.sleep(0.1)
+        return "v"
+
+    def worker(cache: JsonFileCache) -> None:
+        barrier.wait()
+        read_through(cache, "p", "k", fetch, ttl=dt.timedelta(minutes=5), flight=flight)
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in caches]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert flight.coalesced == 0
+    assert all(c.get("p", "k") is not None for c in caches)
+
+
+def test_touch_extends_expiry_and_keeps_payload_and_validators(tmp_path: Path) -> None:
+    validators = {"etag": '"v1"', "last_modified": "Tue, 26 May 2026 10:00:00 GMT"}
+    backends = (
+        JsonFileCache(tmp_path, compression={"sec_edgar": "gzip"}),
+        SqliteCache(tmp_path / "cache.sqlite3"),
+    )
+    for cache in (*backends, MemoryCacheTier(JsonFileCache(tmp_path / "tier"))):
+        value = {"facts": "x" * 4096}
+        cache.put("sec_edgar", "k", value, ttl=dt.timedelta(seconds=-5), validators=validators)
+        stale = cache.get("sec_edgar", "k", grace=dt.timedelta(minutes=1))
+        assert stale is not None and stale.validators == validators
+
+        expires_at = cache.touch("sec_edgar", "k", ttl=dt.timedelta(minutes=5))
+        entry = cache.get("sec_edgar", "k")
+        assert entry is not None and entry.expires_at == expires_at
+        assert (entry.value, entry.validators) == (value, validators)
+        assert cache.touch("sec_edgar", "missing", ttl=dt.timedelta(minutes=5)) is None
+
+
+def test_read_through_validated_revalidates_expired_entries(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    seen: list[dict[str, str]] = []
+    replies = [
+        Fetched({"v": 1}, {"etag": '"a"'}),
+        Fetched(not_modified=True),
+        Fetched({"v": 2}, {"etag": '"b"'}),
+    ]
+
+    def fetch(validators: Mapping[str, str]) -> Fetched:
+        seen.append(dict(validators))
+        return replies.pop(0)
+
+    def read() -> object:
+        value, stale, _ = read_through_validated(
+            cache, "p", "k", fetch, ttl=dt.timedelta(minutes=5), flight=SingleFlight(),
+        )
+        assert not stale
+        return value
+
+    assert read() == {"v": 1}
+    cache.touch("p", "k", ttl=dt.timedelta(seconds=-5))
+    assert read() == {"v": 1}  # 304: same value, now live again
+    assert read() == {"v": 1}  # no fetch at all
+    cache.touch("p", "k", ttl=dt.timedelta(seconds=-5))
+    assert read() == {"v": 2}
+    assert seen == [{}, {"etag": '"a"'}, {"etag": '"a"'}]
+    entry = cache.get("p", "k")
+    assert entry is not None and entry.validators == {"etag": '"b"'}
+
+
+def test_revalidation_reads_only_the_validators_of_an_expired_entry(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    decoded: list[bytes] = []
+    decode = cache_module._decode
+
+    def counting_decode(payload: bytes, codec: str) -> object:
+        decoded.append(payload)
+        return decode(payload, codec)
+
+    monkeypatch.setattr(cache_module, "_decode", counting_decode)
+    seen: list[dict[str, str]] = []
+    for backend in (JsonFileCache(tmp_path), SqliteCache(tmp_path / "cache.sqlite3")):
+        tier = MemoryCacheTier(backend)
+        replies = [Fetched({"v": 2}, {"etag": '"b"'}), Fetched(not_modified=True)]
+        for reply in replies:
+            tier.put("p", "k", {"v": 1}, ttl=dt.timedelta(seconds=-5), validators={"etag": '"a"'})
+            decoded.clear()
+            seen.clear()
+
+            def fetch(validators: Mapping[str, str], reply: Fetched = reply) -> Fetched:
+                seen.append(dict(validators))
+                return reply
+
+            value, _, _ = read_through_validated(
+                tier, "p", "k", fetch, ttl=dt.timedelta(minutes=5), flight=SingleFlight(),
+            )
+            assert seen == [{"etag": '"a"'}]
+            # A new body is never decoded; a 304 decodes the confirmed copy once.
+            assert value == ({"v": 1} if reply.not_modified else {"v": 2})
+            assert len(decoded) == (1 if reply.not_modified else 0)
+        assert tier.stats()["p"].hits == 0
+
+
+# ---------------------------------------------------------------------------
+# SQLite backend
+# ---------------------------------------------------------------------------
+def _sqlite_writer(args: tuple[str, int]) -> None:
+    path, worker = args
+    cache = SqliteCache(path)
+    for i in range(25):
+        cache.put("p", f"{worker}:{i}", {"worker": worker, "i": i}, ttl=dt.timedelta(minutes=5))
+        cache.get("p", f"{worker}:{max(i - 1, 0)}")
+
+
+def test_sqlite_put_get_delete_roundtrip(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    written = cache.put(
+        "sec_edgar", "company_facts_0000320193", {"a": [1, 2]}, ttl=dt.timedelta(minutes=1),
+    )
+    entry = cache.get("sec_edgar", "company_facts_0000320193")
+    assert entry is not None
+    assert entry.value == {"a": [1, 2]}
+    assert entry.expires_at == written.expires_at
+    cache.put("sec_edgar", "company_facts_0000320193", {"a": [3]}, ttl=dt.timedelta(minutes=1))
+    entry = cache.get("sec_edgar", "company_facts_0000320193")
+    assert entry is not None and entry.value == {"a": [3]}
+    cache.delete("sec_edgar", "company_facts_0000320193")
+    assert cache.get("sec_edgar", "company_facts_0000320193") is None
+
+
+def test_sqlite_expiry_and_bulk_purge(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.put("p", "old-1", 1, ttl=dt.timedelta(seconds=-5))
+    cache.put("p", "old-2", 2, ttl=dt.timedelta(seconds=-5))
+    cache.put("p", "fresh", 3, ttl=dt.timedelta(minutes=5))
+    assert cache.get("p", "old-1") is None
+    assert cache.purge_expired() == 2
+    fresh = cache.get("p", "fresh")
+    assert fresh is not None and fresh.value == 3
+
+
+def test_sqlite_unknown_schema_version_is_invalidated(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.put("p", "k", 1, ttl=dt.timedelta(minutes=1))
+    cache._conn().execute("UPDATE cache_entries SET schema_version = 999")
+    assert cache.get("p", "k") is None
+    assert cache._conn().execute("SELECT COUNT(*) FROM cache_entries").fetchone() == (0,)
+
+
+def test_sqlite_concurrent_processes_share_one_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    SqliteCache(path).put("p", "seed", 0, ttl=dt.timedelta(minutes=5))
+    # Spawned, not forked: SQLite connections must not cross a fork.
+    with ProcessPoolExecutor(max_workers=4, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(_sqlite_writer, [(path, w) for w in range(4)]))
+    cache = SqliteCache(path)
+    for worker in range(4):
+        for i in range(25):
+            entry = cache.get("p", f"{worker}:{i}")
+            assert entry is not None and entry.value == {"worker": worker, "i": i}
@@ -0,0 +1,127 @@
+"""Tests for :mod:`stockripper.data.cache_maintenance` and ``stockripper cache``."""
+
+from __future__ import annotations
+
+import datetime as dt
+import os
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from stockripper.__main__ import app
+from stockripper.data.cache import (
+    JsonFileCache,
+    MemoryCacheTier,
+    SqliteCache,
+    default_sqlite_path,
+)
+from stockripper.data.cache_maintenance import CacheSweeper, age_histogram, sweep
+
+
+def _backends(tmp_path: Path) -> tuple[JsonFileCache, SqliteCache]:
+    return JsonFileCache(tmp_path / "files"), SqliteCache(tmp_path / "cache.sqlite3")
+
+
+def test_sweep_purges_expired_entries(tmp_path: Path) -> None:
+    for cache in _backends(tmp_path):
+        cache.put("p", "old", 1, ttl=dt.timedelta(seconds=-1))
+        cache.put("p", "fresh", 2, ttl=dt.timedelta(hours=1))
+        report = sweep(cache)
+        assert report.expired == 1
+        assert [e.key for e in cache.entries()] == ["fresh"]
+
+
+def test_sweep_evicts_least_recently_accessed_over_budget(tmp_path: Path) -> None:
+    json_cache, sqlite_cache = _backends(tmp_path)
+    for cache in (json_cache, sqlite_cache):
+        for key in ("a", "b", "c"):
+            cache.put("p", key, key * 200, ttl=dt.timedelta(hours=1))
+    # Make "a" the most recently used entry.
+    past = time.time() - 3600
+    for key in ("b", "c"):
+        os.utime(json_cache.root / "p" / f"{key}.json", (past, past))
+    sqlite_cache._conn().execute(
+        "UPDATE cache_entries SET accessed_at_us = accessed_at_us - 3600000000 WHERE key != 'a'",
+    )
+
+    for cache in (json_cache, sqlite_cache):
+        one_entry = max(e.disk_bytes for e in cache.entries())
+        report = sweep(cache, budgets={"p": one_entry}, default_max_bytes=0)
+        assert report.evicted == 2
+        assert [e.key for e in cache.entries()] == ["a"]
+    assert sqlite_cache.stats()["p"].evictions == 2
+
+
+def test_sqlite_counters_are_shared_after_flush(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    writer = SqliteCache(path)
+    writer.put("sec_edgar", "k", 1, ttl=dt.timedelta(hours=1))
+    writer.get("sec_edgar", "k")
+    writer.get("sec_edgar", "missing")
+    assert SqliteCache(path).stats() == {}
+    writer.flush_stats()
+    stats = SqliteCache(path).stats()["sec_edgar"]
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_memory_tier_hits_are_persisted_with_the_sweep(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite3"
+    backend = SqliteCache(path)
+    tier = MemoryCacheTier(backend)
+    tier.put("sec_edgar", "k", 1, ttl=dt.timedelta(hours=1))
+    for _ in range(3):
+        tier.get("sec_edgar", "k")  # answered from memory
+    tier.get("sec_edgar", "missing")  # falls through to SQLite
+
+    CacheSweeper(backend, flush=tier.flush_stats).sweep_once()
+    stats = SqliteCache(path).stats()["sec_edgar"]
+    assert (stats.hits, stats.misses) == (3, 1)
+
+    tier.flush_stats()  # nothing new to hand over
+    assert SqliteCache(path).stats()["sec_edgar"].hits == 3
+
+
+def test_age_histogram_buckets_by_written_at(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.put("p", "k", 1, ttl=dt.timedelta(days=30))
+    later = dt.datetime.now(dt.UTC) + dt.timedelta(days=2)
+    assert age_histogram(cache.entries(), now=later) == {
+        "p": {"<1h": 0, "<1d": 0, "<7d": 1, ">=7d": 0},
+    }
+
+
+def test_sweeper_thread_runs_and_stops(tmp_path: Path) -> None:
+    cache = SqliteCache(tmp_path / "cache.sqlite3")
+    cache.put("p", "old", 1, ttl=dt.timedelta(seconds=-1))
+    with CacheSweeper(cache, interval=dt.timedelta(milliseconds=10)):
+        for _ in range(200):
+            if not list(cache.entries()):
+                break
+            time.sleep(0.01)
+    assert list(cache.entries()) == []
+
+
+def test_cli_cache_stats_and_purge(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("COLUMNS", "240")
+    root = tmp_path / ".data-cache"
+    cache = SqliteCache(default_sqlite_path(root))
+    cache.put("sec_edgar", "company_tickers", {"0": {"ticker": "AAPL"}}, ttl=dt.timedelta(hours=1))
+    cache.put("sec_edgar", "stale", 1, ttl=dt.timedelta(seconds=-1))
+    cache.get("sec_edgar", "company_tickers")
+    cache.flush_stats()
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["cache", "stats", "--root", str(root)])
+    assert result.exit_code == 0, result.stdout
+    assert "sec_edgar" in result.stdout
+    assert "100%" in result.stdout
+
+    result = runner.invoke(app, ["cache", "purge", "--root", str(root)])
+    assert result.exit_code == 0, result.stdout
+    assert "purged 1 expired" in result.stdout
+
+    result = runner.invoke(app, ["cache", "purge", "--all", "--root", str(root)])
+    assert result.exit_code == 0, result.stdout
+    assert "removed 1 entries" in result.stdout
@@ -0,0 +1,107 @@
+"""Tests for :mod:`stockripper.data.edgar_bulk`."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import zipfile
+from pathlib import Path
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from stockripper.__main__ import app
+from stockripper.data.cache import JsonFileCache, MemoryCacheTier, SqliteCache
+from stockripper.data.edgar_bulk import detect_kind, import_edgar_bulk
+from stockripper.data.sec_edgar import SecEdgarClient
+
+_FACTS = {
+    "CIK0000320193.json": {"cik": 320193, "entityName": "Apple Inc.", "facts": {"dei": {}}},
+    "CIK0000789019.json": {"cik": 789019, "entityName": "MICROSOFT CORP", "facts": {}},
+}
+
+
+def _archive(tmp_path: Path, name: str = "companyfacts.zip") -> Path:
+    path = tmp_path / name
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for member, payload in _FACTS.items():
+            zf.writestr(member, json.dumps(payload))
+        zf.writestr("CIK0000000001.json", "{truncated")
+        zf.writestr("README.txt", "not a document")
+    return path
+
+
+def _offline_client(cache: JsonFileCache) -> SecEdgarClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError(f"unexpected request to {request.url}")
+
+    return SecEdgarClient(
+        cache=cache,
+        http=httpx.Client(transport=httpx.MockTransport(handler)),
+        user_agent="StockRipper test ops@example.com",
+    )
+
+
+def test_import_feeds_the_client_cache_with_matching_hashes(tmp_path: Path) -> None:
+    cache = JsonFileCache(tmp_path / "cache")
+    report = import_edgar_bulk(_archive(tmp_path), cache=cache)
+
+    assert report.kind == "companyfacts"
+    assert report.imported == 2
+    assert report.failed == ("CIK0000000001.json",)
+    assert report.skipped == 1
+    by_key = {p.request_key: p for p in report.provenance}
+    assert by_key["company_facts_0000320193"].source_url == (
+        "companyfacts.zip!CIK0000320193.json"
+    )
+
+    with _offline_client(cache) as client:
+        facts = client.get_company_facts("320193")
+    assert facts.entity_name == "Apple Inc."
+    assert facts.provenance.content_hash == by_key["company_facts_0000320193"].content_hash
+
+
+def test_import_can_be_restricted_to_ciks(tmp_path: Path) -> None:
+    cache = JsonFileCache(tmp_path / "cache")
+    report = import_edgar_bulk(_archive(tmp_path), cache=cache, ciks=["789019"])
+    assert report.imported == 1
+    assert cache.get("sec_edgar", "company_facts_0000320193") is None
+    assert cache.get("sec_edgar", "company_facts_0000789019") is not None
+
+
+def test_import_bypasses_the_memory_tier_and_drops_slim_entries(tmp_path: Path) -> None:
+    backing = SqliteCache(tmp_path / "cache.sqlite3")
+    tier = MemoryCacheTier(backing)
+    hour = dt.timedelta(hours=1)
+    tier.put("sec_edgar", "company_facts_0000320193", {"old": True}, ttl=hour)
+    tier.put("sec_edgar", "company_facts_0000320193@abc", {"slim": "old"}, ttl=hour)
+    tier.put("sec_edgar", "company_facts_0000999999@abc", {"slim": "other"}, ttl=hour)
+
+    report = import_edgar_bulk(_archive(tmp_path), cache=tier)
+    assert report.imported == 2
+
+    entry = tier.get("sec_edgar", "company_facts_0000320193")
+    assert entry is not None and entry.value["entityName"] == "Apple Inc."
+    assert tier.stats()["sec_edgar"].hits == 0  # read from SQLite, not a stale memory copy
+    assert tier.get("sec_edgar", "company_facts_0000320193@abc") is None
+    assert tier.get("sec_edgar", "company_facts_0000999999@abc") is not None
+
+
+def test_detect_kind_needs_a_hint_for_ambiguous_archives(tmp_path: Path) -> None:
+    assert detect_kind(_archive(tmp_path, "nightly-submissions.zip")) == "submissions"
+    with pytest.raises(ValueError, match="cannot tell"):
+        detect_kind(_archive(tmp_path, "nightly.zip"))
+
+
+def test_cli_import_writes_manifest(tmp_path: Path) -> None:
+    archive = _archive(tmp_path)
+    result = CliRunner().invoke(app, ["research", "import-edgar-bulk", str(archive)])
+    assert result.exit_code == 0, result.stdout
+    assert "imported 2 companyfacts documents" in result.stdout
+    manifest = tmp_path / "companyfacts.zip.manifest.jsonl"
+    rows = [json.loads(line) for line in manifest.read_text().splitlines()]
+    assert {r["request_key"] for r in rows} == {
+        "company_facts_0000320193",
+        "company_facts_0000789019",
+    }
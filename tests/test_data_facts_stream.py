@@ -0,0 +1,113 @@
+"""Tests for :mod:`stockripper.data.facts_stream`."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+from decimal import Decimal
+from typing import Any
+
+import pytest
+
+from stockripper.data.facts_stream import FactSelection, select_company_facts
+from stockripper.data.fundamentals import FUNDAMENTAL_FACTS, derive_fundamentals
+from stockripper.data.provenance import Provenance
+from stockripper.data.sec_edgar import CompanyFacts
+
+
+def _series(val: int, end: str, **extra: Any) -> list[dict[str, Any]]:
+    return [{"val": val, "end": end, "accn": "0000320193-24-000001", **extra}]
+
+
+def _document() -> dict[str, Any]:
+    end = (dt.date.today() - dt.timedelta(days=30)).isoformat()
+    return {
+        "cik": 320193,
+        "entityName": "Apple Inc.",
+        "facts": {
+            "dei": {
+                "EntityCommonStockSharesOutstanding": {
+                    "label": "Entity Common Stock, Shares Outstanding",
+                    "units": {"shares": _series(15_000_000_000, end, fp="FY")},
+                },
+                "EntityPublicFloat": {"units": {"USD": _series(1, end)}},
+            },
+            "us-gaap": {
+                "Revenues": {
+                    "label": "Revenues",
+                    "description": "Amount of revenue.",
+                    "units": {
+                        "USD": _series(380_000_000_000, end, fp="FY"),
+                        "EUR": _series(1, end, fp="FY"),
+                    },
+                },
+                "LongTermDebt": {"units": {"USD": _series(95_000_000_000, end)}},
+                "StockholdersEquity": {"units": {"USD": _series(60_000_000_000, end)}},
+                "AccountsPayableCurrent": {
+                    "units": {"USD": [{"val": i, "end": end} for i in range(500)]},
+                },
+                "NetIncomeLoss": {"units": {"USD": _series(95_000_000_000, end, fp="FY")}},
+            },
+            "srt": {"Unrelated": {"units": {"pure": _series(1, end)}}},
+        },
+    }
+
+
+def _company_facts(payload: dict[str, Any]) -> CompanyFacts:
+    return CompanyFacts(
+        cik="0000320193",
+        entity_name=payload.get("entityName"),
+        facts=payload["facts"],
+        provenance=Provenance.for_payload(provider="sec_edgar", source_url="x", payload={}),
+    )
+
+
+def test_keeps_only_selected_tags_and_units() -> None:
+    raw = json.dumps(_document(), indent=2).encode("utf-8")
+    selection = FactSelection(tags={"us-gaap": ("Revenues", "Missing")}, units=("USD",))
+
+    out = select_company_facts(raw, selection)
+
+    assert out["cik"] == 320193
+    assert out["entityName"] == "Apple Inc."
+    assert list(out["facts"]) == ["us-gaap"]
+    revenues = out["facts"]["us-gaap"]["Revenues"]
+    assert list(revenues["units"]) == ["USD"]
+    assert revenues["label"] == "Revenues"
+    assert revenues["description"] == "Amount of revenue."
+
+
+def test_without_unit_filter_keeps_whole_tags() -> None:
+    doc = _document()
+    out = select_company_facts(json.dumps(doc), FactSelection(tags={"us-gaap": ("Revenues",)}))
+    assert out["facts"]["us-gaap"]["Revenues"] == doc["facts"]["us-gaap"]["Revenues"]
+
+
+def test_fundamentals_match_the_full_parse() -> None:
+    doc = _document()
+    selected = select_company_facts(json.dumps(doc), FUNDAMENTAL_FACTS)
+
+    full = derive_fundamentals(_company_facts(doc), latest_price=Decimal("200"))
+    slim = derive_fundamentals(_company_facts(selected), latest_price=Decimal("200"))
+
+    assert "AccountsPayableCurrent" not in selected["facts"]["us-gaap"]
+    assert "srt" not in selected["facts"]
+    for field in ("shares_outstanding", "revenue_ttm", "net_income_ttm", "total_debt",
+                  "total_equity", "debt_to_equity", "market_cap"):
+        assert getattr(slim, field) == getattr(full, field), field
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [b"", b"[]", b'{"facts": {"dei": }', b'{"facts": {}} trailing', b'{"facts" {}}'],
+)
+def test_malformed_documents_raise_value_error(raw: bytes) -> None:
+    with pytest.raises(ValueError):
+        select_company_facts(raw, FUNDAMENTAL_FACTS)
+
+
+def test_digest_ignores_tag_order() -> None:
+    a = FactSelection(tags={"dei": ("A", "B"), "us-gaap": ("C",)}, units=("USD", "shares"))
+    b = FactSelection(tags={"us-gaap": ("C",), "dei": ("B", "A")}, units=("shares", "USD"))
+    assert a.digest == b.digest
+    assert a.digest != FactSelection(tags=a.tags).digest
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import datetime as dt
+import subprocess
+import sys
 from dataclasses import dataclass
 from decimal import Decimal
+from pathlib import Path
 from typing import Any
 
 import pytest
 
+from stockripper.data.blob_store import BlobStore, blob_uri
 from stockripper.data.market_data import MarketDataAdapter
+from stockripper.data.news import NewsAdapter
 
 
 @dataclass
@@ -123,3 +128,246 @@ def test_get_daily_bars_rejects_non_positive_days() -> None:
     adapter = MarketDataAdapter(client=_FakeStockClient())
     with pytest.raises(ValueError):
         adapter.get_daily_bars("AAPL", days=0)
+
+
+class _FakeBulkStockClient:
+    """Answers multi-symbol requests and records every round-trip."""
+
+    def __init__(self, symbols: list[str], *, bars: int = 20) -> None:
+        self._symbols = set(symbols)
+        self._bars = bars
+        self.snapshot_calls: list[list[str]] = []
+        self.bars_calls: list[list[str]] = []
+
+    def get_stock_snapshot(self, request: Any) -> dict[str, _FakeSnapshot]:
+        requested = list(request.symbol_or_symbols)
+        self.snapshot_calls.append(requested)
+        return {
+            s: _FakeSnapshot(
+                latest_trade=_FakeTrade(price=10.0, timestamp=dt.datetime.now(dt.UTC)),
+                daily_bar=_FakeDailyBar(volume=1_000),
+            )
+            for s in requested
+            if s in self._symbols
+        }
+
+    def get_stock_bars(self, request: Any) -> dict[str, list[_FakeBar]]:
+        requested = list(request.symbol_or_symbols)
+        self.bars_calls.append(requested)
+        return {
+            s: _make_bars(self._bars, close=10.0, volume=1_000)
+            for s in requested
+            if s in self._symbols
+        }
+
+    def get_stock_latest_quote(self, request: Any) -> dict[str, _FakeQuote]:
+        raise AssertionError("not used")
+
+
+def test_get_snapshots_chunks_multi_symbol_requests() -> None:
+    symbols = [f"S{i:04d}" for i in range(450)]
+    fake = _FakeBulkStockClient(symbols[:-1])  # last symbol unknown upstream
+    adapter = MarketDataAdapter(client=fake)
+    out = adapter.get_snapshots([s.lower() for s in symbols], chunk_size=200)
+    assert [len(c) for c in fake.snapshot_calls] == [200, 200, 50]
+    assert len(out) == 449
+    assert symbols[-1] not in out
+    snap = out["S0000"]
+    assert snap.last_price == Decimal("10.0")
+    assert snap.provenance.request_key == "snapshots:S0000..S0199:200"
+    assert snap.provenance.source_url == "alpaca-data://stocks/snapshots"
+
+
+def test_get_snapshots_deduplicates_symbols() -> None:
+    fake = _FakeBulkStockClient(["AAPL"])
+    adapter = MarketDataAdapter(client=fake)
+    adapter.get_snapshots(["aapl", "AAPL", "Aapl"])
+    assert fake.snapshot_calls == [["AAPL"]]
+
+
+def test_compute_adv_usd_bulk_matches_single_symbol_path() -> None:
+    symbols = ["AAA", "BBB", "CCC"]
+    fake = _FakeBulkStockClient(symbols[:2], bars=20)
+    adapter = MarketDataAdapter(client=fake)
+    advs = adapter.compute_adv_usd_bulk(symbols, days=20, chunk_size=2)
+    assert len(fake.bars_calls) == 2
+    assert advs["AAA"].adv_usd == Decimal("10000.00")
+    assert advs["AAA"].bars_used == 20
+    assert advs["AAA"].provenance.request_key == "daily_bars:20d:AAA..BBB:2"
+    assert "no_bars" in advs["CCC"].provenance.data_quality_warnings
+
+
+def test_snapshot_provider_uses_bulk_requests() -> None:
+    from stockripper.data.live import AlpacaSnapshotProvider
+
+    symbols = [f"S{i:04d}" for i in range(500)]
+    fake = _FakeBulkStockClient(symbols)
+    provider = AlpacaSnapshotProvider(
+        market=MarketDataAdapter(client=fake),
+        news=NewsAdapter(client=object()),  # type: ignore[arg-type]
+        chunk_size=250,
+    )
+    out = provider.get_snapshots(symbols, as_of=dt.date.today())
+    assert len(out) == 500
+    assert len(fake.snapshot_calls) == 2
+    assert len(fake.bars_calls) == 2
+    assert out["S0042"].adv_usd_20d == Decimal("10000.00")
+
+
+class _FakeShares:
+    def __init__(self, shares: dict[str, Decimal]) -> None:
+        self._shares = shares
+        self.calls: list[tuple[tuple[str, ...], dt.date]] = []
+
+    def shares_outstanding(
+        self, symbols: Any, *, as_of: dt.date,
+    ) -> dict[str, Decimal]:
+        self.calls.append((tuple(symbols), as_of))
+        return {s: self._shares[s] for s in symbols if s in self._shares}
+
+
+class _FailingNews(NewsAdapter):
+    """News counts that always fail with ``error``."""
+
+    def __init__(self, error: Exception) -> None:
+        self._error = error
+
+    def count_recent_news_bulk(self, *_: Any, **__: Any) -> dict[str, int]:
+        raise self._error
+
+
+def test_snapshot_provider_joins_market_cap_in_one_lookup() -> None:
+    from stockripper.data.live import AlpacaSnapshotProvider
+    from stockripper.data.universe_policy import MarketCapBand
+
+    symbols = [f"S{i:04d}" for i in range(300)]
+    shares = _FakeShares({"S0001": Decimal("30000000"), "S0002": Decimal("0.5")})
+    provider = AlpacaSnapshotProvider(
+        market=MarketDataAdapter(client=_FakeBulkStockClient(symbols)),
+        news=_FailingNews(ConnectionError("offline")),
+        chunk_size=100,
+        shares=shares,
+    )
+    as_of = dt.date(2026, 10, 16)
+    out = provider.get_snapshots(symbols, as_of=as_of)
+
+    assert len(shares.calls) == 1
+    assert shares.calls[0][1] == as_of
+    assert len(shares.calls[0][0]) == 300
+    assert out["S0001"].market_cap_usd == Decimal("300000000")
+    assert MarketCapBand.classify(out["S0001"].market_cap_usd) is not None
+    assert out["S0002"].market_cap_usd == Decimal("5")
+    assert out["S0003"].market_cap_usd is None
+
+
+def test_snapshot_provider_counts_news_for_small_caps_only() -> None:
+    from stockripper.data.live import AlpacaSnapshotProvider
+
+    class _CountingNews(NewsAdapter):
+        def __init__(self) -> None:
+            self.calls: list[tuple[list[str], dt.datetime, dt.datetime | None]] = []
+
+        def count_recent_news_bulk(
+            self, symbols: Any, *, since: dt.datetime, until: dt.datetime | None = None,
+            **_: Any,
+        ) -> dict[str, int]:
+            self.calls.append((list(symbols), since, until))
+            return dict.fromkeys(symbols, 2)
+
+    symbols = ["S0001", "S0002", "S0003"]
+    news = _CountingNews()
+    provider = AlpacaSnapshotProvider(
+        market=MarketDataAdapter(client=_FakeBulkStockClient(symbols)),
+        news=news,
+        shares=_FakeShares({"S0001": Decimal("30000000"), "S0002": Decimal("500000000")}),
+    )
+    out = provider.get_snapshots(symbols, as_of=dt.date(2026, 10, 16))
+
+    assert news.calls == [
+        (
+            ["S0001"],
+            dt.datetime(2026, 9, 16, tzinfo=dt.UTC),
+            dt.datetime(2026, 10, 17, tzinfo=dt.UTC),
+        ),
+    ]
+    assert out["S0001"].recent_news_count_30d == 2
+    assert out["S0002"].recent_news_count_30d is None
+    assert out["S0003"].recent_news_count_30d is None
+
+
+def test_snapshot_provider_only_swallows_alpaca_failures_when_counting_news() -> None:
+    from stockripper.data.live import AlpacaSnapshotProvider
+
+    symbols = ["S0001"]
+
+    def provider(error: Exception) -> AlpacaSnapshotProvider:
+        return AlpacaSnapshotProvider(
+            market=MarketDataAdapter(client=_FakeBulkStockClient(symbols)),
+            news=_FailingNews(error),
+            shares=_FakeShares({"S0001": Decimal("30000000")}),
+        )
+
+    as_of = dt.date(2026, 10, 16)
+    out = provider(ConnectionError("reset")).get_snapshots(symbols, as_of=as_of)
+    assert out["S0001"].recent_news_count_30d is None
+    with pytest.raises(KeyError):
+        provider(KeyError("bug")).get_snapshots(symbols, as_of=as_of)
+
+
+def test_live_wiring_imports_without_alpaca_py() -> None:
+    code = (
+        "import sys, stockripper.data.live; "
+        "assert not [m for m in sys.modules if m.split('.')[0] in ('alpaca', 'requests')]"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class _FailingChunkClient(_FakeBulkStockClient):
+    """Rejects any snapshot request that includes ``bad``."""
+
+    def __init__(self, symbols: list[str], bad: str, error: Exception) -> None:
+        super().__init__(symbols)
+        self._bad = bad
+        self._error = error
+
+    def get_stock_snapshot(self, request: Any) -> dict[str, _FakeSnapshot]:
+        if self._bad in request.symbol_or_symbols:
+            raise self._error
+        return super().get_stock_snapshot(request)
+
+
+def test_snapshot_provider_logs_and_skips_a_failed_chunk(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    from stockripper.data.live import AlpacaSnapshotProvider
+    from tests.fixtures_alpaca import rate_limited_error
+
+    symbols = [f"S{i:04d}" for i in range(30)]
+    provider = AlpacaSnapshotProvider(
+        market=MarketDataAdapter(client=_FailingChunkClient(symbols, "S0012", rate_limited_error())),
+        news=NewsAdapter(client=object()),  # type: ignore[arg-type]
+        chunk_size=10,
+    )
+    with caplog.at_level("WARNING", logger="stockripper.data.live"):
+        out = provider.refresh_prices(symbols, as_of=dt.date.today())
+    assert sorted(out) == symbols[:10] + symbols[20:]
+    assert "snapshots for 10 symbols (S0010..S0019) failed" in caplog.text
+
+    broken = AlpacaSnapshotProvider(
+        market=MarketDataAdapter(client=_FailingChunkClient(symbols, "S0012", KeyError("x"))),
+        news=NewsAdapter(client=object()),  # type: ignore[arg-type]
+        chunk_size=10,
+    )
+    with pytest.raises(KeyError):
+        broken.refresh_prices(symbols, as_of=dt.date.today())
+
+
+def test_blobs_keep_the_hashed_payloads(tmp_path: Path) -> None:
+    blobs = BlobStore(tmp_path)
+    adapter = MarketDataAdapter(client=_FakeStockClient(_make_bars(5)), blobs=blobs)
+
+    snap = adapter.get_snapshot("aapl")
+    _, bars_prov = adapter.get_daily_bars("aapl", days=5)
+    for prov in (snap.provenance, bars_prov):
+        assert prov.raw_content_uri == blob_uri(prov.content_hash)
+        assert blobs.contains(prov.content_hash)
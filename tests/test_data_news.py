@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import datetime as dt
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
+from stockripper.data.blob_store import BlobStore, blob_uri
 from stockripper.data.news import NewsAdapter
+from stockripper.data.news_store import NewsStore
 
 
 @dataclass
@@ -74,3 +77,161 @@ def test_get_recent_news_empty_symbols_short_circuits() -> None:
     adapter = NewsAdapter(client=fake)
     assert adapter.get_recent_news([]) == ()
     assert fake.calls == []
+
+
+class _WindowedNewsClient:
+    """Honours ``symbols``/``start``/``end``/``limit`` like the live endpoint."""
+
+    def __init__(self, items: list[_FakeRawNews]) -> None:
+        self._items = sorted(items, key=lambda r: r.created_at, reverse=True)
+        self.calls: list[Any] = []
+
+    def get_news(self, request: Any) -> dict[str, Any]:
+        self.calls.append(request)
+        wanted = set(request.symbols.split(","))
+        matched = [
+            r for r in self._items
+            if wanted & set(r.symbols)
+            and r.created_at >= request.start
+            and (request.end is None or r.created_at <= request.end)
+        ]
+        return {"news": matched[: request.limit]}
+
+    def add(self, items: list[_FakeRawNews]) -> None:
+        self._items = sorted(self._items + items, key=lambda r: r.created_at, reverse=True)
+
+
+def _tagged(symbol_sets: list[list[str]]) -> list[_FakeRawNews]:
+    base = dt.datetime(2026, 10, 1, tzinfo=dt.UTC)
+    return [
+        _FakeRawNews(
+            id=i,
+            headline=f"Headline {i}",
+            summary="",
+            author=None,  # type: ignore[arg-type]
+            url=None,  # type: ignore[arg-type]
+            symbols=symbols,
+            created_at=base + dt.timedelta(hours=i),
+            updated_at=base + dt.timedelta(hours=i),
+            source="benzinga",
+        )
+        for i, symbols in enumerate(symbol_sets)
+    ]
+
+
+def test_bulk_count_pages_multi_symbol_queries() -> None:
+    items = _tagged([["AAA"]] * 7 + [["AAA", "BBB"]] * 3 + [["CCC", "ZZZ"]] * 2)
+    fake = _WindowedNewsClient(items)
+    adapter = NewsAdapter(client=fake, page_size=4)
+    since = dt.datetime(2026, 9, 1, tzinfo=dt.UTC)
+
+    counts = adapter.count_recent_news_bulk(["aaa", "bbb", "ccc", "ddd"], since=since)
+
+    assert counts == {"AAA": 10, "BBB": 3, "CCC": 2, "DDD": 0}
+    # Full pages move the end cursor back instead of re-reading the window.
+    assert len(fake.calls) == 4
+    assert all(call.start == since for call in fake.calls)
+    assert fake.calls[1].end == items[8].created_at
+    # Articles mentioning several requested symbols are stored once.
+    assert adapter.store.stats()["news_articles"] == 12
+
+
+def test_bulk_count_saturates_at_cap() -> None:
+    fake = _WindowedNewsClient(_tagged([["AAA"]] * 20 + [["BBB"]]))
+    adapter = NewsAdapter(client=fake, page_size=5)
+    since = dt.datetime(2026, 9, 1, tzinfo=dt.UTC)
+
+    assert adapter.count_recent_news_bulk(["AAA", "BBB"], since=since, cap=3) == {
+        "AAA": 3,
+        "BBB": 1,
+    }
+
+
+def test_repeat_windows_are_served_from_the_store() -> None:
+    fake = _WindowedNewsClient(_tagged([["AAA"]] * 4 + [["BBB"]]))
+    adapter = NewsAdapter(client=fake)
+    since = dt.datetime(2026, 9, 1, tzinfo=dt.UTC)
+
+    adapter.count_recent_news_bulk(["AAA", "BBB"], since=since)
+    calls = len(fake.calls)
+    counts = adapter.count_recent_news_bulk(["AAA", "BBB", "CCC"], since=since, cap=2)
+    later = dt.datetime(2026, 10, 1, 2, tzinfo=dt.UTC)
+    items = adapter.get_recent_news(["AAA"], since=later, limit=10)
+
+    # Only the symbol with no cursor was fetched; the later window is covered.
+    assert counts == {"AAA": 2, "BBB": 1, "CCC": 0}
+    assert len(fake.calls) == calls + 1
+    assert fake.calls[-1].symbols == "CCC"
+    assert [item.id for item in items] == ["3", "2"]
+
+
+def test_stale_cursor_fetches_only_newer_articles() -> None:
+    items = _tagged([["AAA"]] * 3)
+    fake = _WindowedNewsClient(items)
+    adapter = NewsAdapter(client=fake, refresh_after=dt.timedelta(0))
+    since = dt.datetime(2026, 9, 1, tzinfo=dt.UTC)
+    adapter.count_recent_news_bulk(["AAA"], since=since)
+
+    fake.add(_tagged([["AAA"]] * 5)[3:])
+    assert adapter.count_recent_news_bulk(["AAA"], since=since) == {"AAA": 5}
+    assert fake.calls[-1].start == items[-1].created_at
+
+
+def test_stored_items_keep_the_payload_hash() -> None:
+    fake = _FakeNewsClient(_items(2))
+    since = dt.datetime.now(dt.UTC) - dt.timedelta(days=2)
+    stored = NewsAdapter(client=fake).get_recent_news(["AAPL"], since=since)
+    direct = NewsAdapter(client=fake).get_recent_news(["AAPL"], limit=2)
+
+    assert {i.id: i.provenance.content_hash for i in stored} == {
+        i.id: i.provenance.content_hash for i in direct
+    }
+
+
+def test_sync_after_a_gap_does_not_mark_the_gap_covered() -> None:
+    jan, feb, mar = (dt.datetime(2026, m, 1, tzinfo=dt.UTC) for m in (1, 2, 3))
+    stamps = [
+        month + dt.timedelta(days=day)
+        for month, n in ((jan, 3), (feb, 9), (mar, 4))
+        for day in range(n)
+    ]
+    items = [
+        _FakeRawNews(
+            id=i,
+            headline=f"Headline {i}",
+            summary="",
+            author=None,  # type: ignore[arg-type]
+            url=None,  # type: ignore[arg-type]
+            symbols=["AAA"],
+            created_at=stamp,
+            updated_at=stamp,
+            source="benzinga",
+        )
+        for i, stamp in enumerate(stamps)
+    ]
+    fake = _WindowedNewsClient(items)
+    adapter = NewsAdapter(client=fake)
+    # A January sync that finished on January 31st.
+    adapter.store.advance(["AAA"], covered_from=jan, synced_at=feb - dt.timedelta(days=1))
+
+    assert adapter.count_recent_news_bulk(["AAA"], since=mar) == {"AAA": 4}
+    assert fake.calls[-1].start == mar
+    assert adapter.store.cursors(["AAA"])["AAA"].covered_from == mar
+
+    february = adapter.count_recent_news_bulk(["AAA"], since=feb, until=mar - dt.timedelta(seconds=1))
+    assert february == {"AAA": 9}
+    assert fake.calls[-1].start == feb
+
+
+def test_blobs_keep_stored_articles_under_their_hash(tmp_path: Path) -> None:
+    blobs = BlobStore(tmp_path / "blobs")
+    adapter = NewsAdapter(
+        client=_FakeNewsClient(_items(2)), store=NewsStore(tmp_path / "news.sqlite3"), blobs=blobs,
+    )
+    out = adapter.get_recent_news(["AAPL"], since=dt.datetime.now(dt.UTC) - dt.timedelta(days=2))
+
+    assert len(out) == 2
+    for item in out:
+        uri = item.provenance.raw_content_uri
+        assert uri == blob_uri(item.provenance.content_hash)
+        assert blobs.read(uri, verify=True)
@@ -0,0 +1,74 @@
+"""Tests for :class:`NewsStore`."""
+
+from __future__ import annotations
+
+import datetime as dt
+from pathlib import Path
+
+from stockripper.data.news_store import NewsStore, StoredArticle
+
+_BASE = dt.datetime(2026, 10, 1, tzinfo=dt.UTC)
+
+
+def _article(
+    article_id: int, hours: int, symbols: list[str], *, headline: str = "h", edited: int = 0,
+) -> StoredArticle:
+    created = _BASE + dt.timedelta(hours=hours)
+    return StoredArticle.from_payload(
+        id=str(article_id),
+        created_at=created,
+        updated_at=created + dt.timedelta(minutes=edited),
+        symbols=symbols,
+        payload={"id": article_id, "headline": headline, "symbols": symbols},
+        retrieved_at=_BASE,
+    )
+
+
+def test_articles_are_stored_once_with_a_posting_per_symbol(tmp_path: Path) -> None:
+    store = NewsStore(tmp_path / "news.sqlite3")
+    store.upsert([_article(1, 0, ["aaa", "bbb"]), _article(2, 1, ["AAA"])])
+    store.upsert([_article(1, 0, ["AAA", "BBB"])])
+
+    assert store.stats() == {"news_articles": 2, "news_postings": 3, "news_cursors": 0}
+    assert store.counts(["AAA", "BBB", "CCC"], since=_BASE) == {"AAA": 2, "BBB": 1, "CCC": 0}
+    recent = store.recent(["aaa", "bbb"], since=_BASE, limit=10)
+    assert [a.id for a in recent] == ["2", "1"]
+    assert recent[1].symbols == ("AAA", "BBB")
+
+
+def test_redelivered_article_replaces_only_when_newer(tmp_path: Path) -> None:
+    store = NewsStore(tmp_path / "news.sqlite3")
+    store.upsert([_article(1, 0, ["AAA"], headline="first", edited=5)])
+    store.upsert([_article(1, 0, ["AAA"], headline="stale", edited=1)])
+    assert store.recent(["AAA"], since=_BASE, limit=1)[0].payload_dict()["headline"] == "first"
+
+    store.upsert([_article(1, 0, ["AAA"], headline="edited", edited=9)])
+    assert store.recent(["AAA"], since=_BASE, limit=1)[0].payload_dict()["headline"] == "edited"
+
+
+def test_counts_respect_the_window(tmp_path: Path) -> None:
+    store = NewsStore(tmp_path / "news.sqlite3")
+    store.upsert([_article(i, i, ["AAA"]) for i in range(10)])
+    counts = store.counts(
+        ["AAA"], since=_BASE + dt.timedelta(hours=2), until=_BASE + dt.timedelta(hours=5),
+    )
+    assert counts == {"AAA": 4}
+
+
+def test_cursor_tracks_coverage_and_high_water(tmp_path: Path) -> None:
+    store = NewsStore(tmp_path / "news.sqlite3")
+    store.upsert([_article(1, 3, ["AAA"])])
+    synced = _BASE + dt.timedelta(days=1)
+    store.advance(["AAA", "BBB"], covered_from=_BASE, synced_at=synced)
+
+    cursors = store.cursors(["aaa", "bbb", "ccc"])
+    assert set(cursors) == {"AAA", "BBB"}
+    assert cursors["AAA"].high_water == _BASE + dt.timedelta(hours=3)
+    # No articles yet: the cursor starts at the covered window.
+    assert cursors["BBB"].high_water == _BASE
+
+    store.upsert([_article(2, 30, ["AAA"])])
+    store.advance(["AAA"], covered_from=_BASE + dt.timedelta(hours=3), synced_at=synced)
+    cursor = store.cursors(["AAA"])["AAA"]
+    assert cursor.covered_from == _BASE
+    assert cursor.high_water == _BASE + dt.timedelta(hours=30)
@@ -0,0 +1,167 @@
+"""Tests for :mod:`stockripper.data.pit_fundamentals` and its repository methods."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from stockripper.data.cache import JsonFileCache, SqliteCache
+from stockripper.data.fundamentals import FUNDAMENTAL_FACTS
+from stockripper.data.pit_fundamentals import (
+    PitSharesSource,
+    cached_facts_ciks,
+    load_pit_fundamentals,
+    observations_from_facts,
+)
+from stockripper.db import Base, Repository, build_engine
+
+_TTL = dt.timedelta(hours=1)
+
+
+@pytest.fixture
+def factory() -> sessionmaker[Session]:
+    engine = build_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(engine, expire_on_commit=False, autoflush=False)
+
+
+def _obs(val: int, end: str, filed: str, **extra: Any) -> dict[str, Any]:
+    return {"val": val, "end": end, "filed": filed, "accn": "0000000001-26-000001", **extra}
+
+
+def _document(shares: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "cik": 1,
+        "entityName": "Test Co",
+        "facts": {
+            "dei": {"EntityCommonStockSharesOutstanding": {"units": {"shares": shares}}},
+            "us-gaap": {
+                "CommonStockSharesOutstanding": {
+                    "units": {"shares": [_obs(1, "2025-03-31", "2025-05-01")]},
+                },
+                "Revenues": {
+                    "units": {
+                        "USD": [
+                            _obs(400, "2025-12-31", "2026-02-01", start="2025-01-01", fp="FY"),
+                            _obs(100, "2025-12-31", "2026-02-01", start="2025-10-01", fp="FY"),
+                            _obs(90, "2025-09-30", "2025-11-01", start="2025-07-01", fp="Q3"),
+                        ],
+                    },
+                },
+                "LongTermDebt": {"units": {"USD": [_obs(50, "2025-12-31", "2026-02-01")]}},
+                "AccountsPayableCurrent": {"units": {"USD": [_obs(7, "2025-12-31", "2026-02-01")]}},
+            },
+        },
+    }
+
+
+_SHARES = [
+    _obs(1_000, "2025-03-31", "2025-05-01", form="10-Q"),
+    _obs(1_100, "2025-12-31", "2026-02-01", form="10-K"),
+    # Restatement of the year-end figure, filed later.
+    _obs(1_150, "2025-12-31", "2026-04-01", form="10-K/A"),
+]
+
+
+def test_observations_keep_every_filing_and_only_annual_flows() -> None:
+    observations = observations_from_facts(_document(_SHARES)["facts"])
+    by_fact: dict[str, list[Any]] = {}
+    for obs in observations:
+        by_fact.setdefault(obs.fact, []).append(obs)
+
+    shares = by_fact["shares_outstanding"]
+    assert [(o.period_end.isoformat(), o.value) for o in shares] == [
+        ("2025-03-31", Decimal(1_000)),
+        ("2025-12-31", Decimal(1_100)),
+        ("2025-12-31", Decimal(1_150)),
+    ]
+    # dei wins over the us-gaap tag reporting the same period/filing.
+    assert {o.source_tag for o in shares} == {"EntityCommonStockSharesOutstanding"}
+    assert [o.value for o in by_fact["revenue"]] == [Decimal(400)]
+    assert by_fact["long_term_debt"][0].value == Decimal(50)
+    assert "total_equity" not in by_fact
+
+
+def test_as_of_query_sees_only_what_was_filed(factory: sessionmaker[Session]) -> None:
+    cache = JsonFileCache("cache")
+    cache.put("sec_edgar", "company_facts_0000000001", _document(_SHARES), ttl=_TTL)
+    with factory() as session:
+        report = load_pit_fundamentals(session, cache=cache, ciks=["1", "2"])
+        session.commit()
+        repo = Repository(session)
+
+        def shares(day: str) -> Decimal | None:
+            rows = repo.fundamental_facts_as_of(
+                "shares_outstanding", as_of=dt.date.fromisoformat(day),
+            )
+            return rows["0000000001"].value if "0000000001" in rows else None
+
+        assert shares("2025-04-30") is None
+        assert shares("2025-05-01") == Decimal(1_000)
+        assert shares("2026-03-01") == Decimal(1_100)
+        assert shares("2026-04-01") == Decimal(1_150)
+
+    assert report.filers == 1
+    assert report.missing == ("0000000002",)
+    assert report.observations == len(observations_from_facts(_document(_SHARES)["facts"]))
+
+
+def test_reload_replaces_a_filers_rows(factory: sessionmaker[Session]) -> None:
+    cache = SqliteCache("cache.sqlite3")
+    cache.put("sec_edgar", "company_facts_0000000001", _document(_SHARES), ttl=_TTL)
+    with factory() as session:
+        load_pit_fundamentals(session, cache=cache)
+        cache.put("sec_edgar", "company_facts_0000000001", _document(_SHARES[:1]), ttl=_TTL)
+        load_pit_fundamentals(session, cache=cache)
+        rows = Repository(session).fundamental_facts_as_of(
+            "shares_outstanding", as_of=dt.date(2026, 12, 31),
+        )
+    assert rows["0000000001"].value == Decimal(1_000)
+
+
+def test_loader_reads_selected_payloads_and_lists_cached_ciks(
+    factory: sessionmaker[Session],
+) -> None:
+    cache = SqliteCache("cache.sqlite3")
+    slim_key = f"company_facts_0000000003@{FUNDAMENTAL_FACTS.digest}"
+    cache.put("sec_edgar", slim_key, _document(_SHARES), ttl=_TTL)
+    cache.put("sec_edgar", "company_facts_0000000001", _document(_SHARES), ttl=_TTL)
+    cache.put("sec_edgar", "company_tickers", {}, ttl=_TTL)
+    assert cached_facts_ciks(cache) == ["0000000001", "0000000003"]
+    with factory() as session:
+        report = load_pit_fundamentals(session, cache=cache)
+    assert report.filers == 2
+
+
+def test_shares_source_maps_symbols_through_the_cached_ticker_map(
+    factory: sessionmaker[Session],
+) -> None:
+    cache = SqliteCache("cache.sqlite3")
+    cache.put("sec_edgar", "company_facts_0000000001", _document(_SHARES), ttl=_TTL)
+    cache.put(
+        "sec_edgar",
+        "company_tickers",
+        {
+            "0": {"cik_str": 1, "ticker": "TST", "title": "Test Co"},
+            "1": {"cik_str": 2, "ticker": "NOPE", "title": "Unloaded Co"},
+        },
+        ttl=_TTL,
+    )
+    with factory() as session:
+        load_pit_fundamentals(session, cache=cache)
+        session.commit()
+
+    source = PitSharesSource.from_cache(factory, cache=cache)
+    got = source.shares_outstanding(["tst", "NOPE", "UNKNOWN"], as_of=dt.date(2026, 3, 1))
+    assert got == {"tst": Decimal(1_100)}
+
+
+def test_shares_source_degrades_to_empty_without_the_table() -> None:
+    engine = build_engine("sqlite:///:memory:")
+    factory = sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    source = PitSharesSource(factory, ticker_index={"TST": "0000000001"})
+    assert source.shares_outstanding(["TST"], as_of=dt.date(2026, 3, 1)) == {}
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import datetime as dt
+import hashlib
 import json
+from collections.abc import Iterator
+from decimal import Decimal
 
 import pytest
 from pydantic import ValidationError
 
-from stockripper.data.provenance import Provenance
+from stockripper.data.provenance import HashMemo, Provenance, canonical_hash
 
 
 def test_for_payload_is_deterministic_for_dicts() -> None:
@@ -47,3 +51,50 @@ def test_extra_fields_are_rejected() -> None:
     payload["unknown"] = "field"
     with pytest.raises(ValidationError):
         Provenance.model_validate(payload)
+
+
+def _reference_hash(payload: object) -> str:
+    text = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        [],
+        {"facts": {"us-gaap": {f"Tag{i}": {"units": {"USD": [{"val": i}]}} for i in range(5)}}},
+        {"b": {"y": 1, "x": [1, 2.5, None, True]}, "a": "\u00e9 \u2028 \"quoted\""},
+        {"ints": {1: "int key", 2: {"x": 1}}, "nested": {"k": {}}},
+        {1: {"x": 1}, 2: {"y": 2}},
+        {"when": dt.datetime(2026, 1, 2, tzinfo=dt.UTC), "amount": Decimal("1.10")},
+        [{"t": f"2026-01-{i % 28 + 1:02d}", "c": i * 1.5} for i in range(1300)],
+        ({"tuple": (1, 2)}, {"nan": float("nan")}),
+    ],
+)
+def test_canonical_hash_matches_one_shot_json(payload: object) -> None:
+    assert canonical_hash(payload) == _reference_hash(payload)
+
+
+def test_hash_memo_hashes_each_version_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    import stockripper.data.provenance as provenance
+
+    calls = 0
+    real = provenance._canonical_chunks
+
+    def counting(obj: object, depth: int) -> Iterator[str]:
+        nonlocal calls
+        calls += depth == provenance._SPLIT_DEPTH
+        return real(obj, depth)
+
+    monkeypatch.setattr(provenance, "_canonical_chunks", counting)
+    doc: dict[str, dict[str, dict[str, object]]] = {"facts": {"dei": {}}}
+    memo = HashMemo(max_entries=1)
+    first = memo.digest(("k", 1), doc)
+    assert first == canonical_hash(dict(doc))
+    # Copies of the same version are not hashed again.
+    assert memo.digest(("k", 1), dict(doc)) == first
+    assert calls == 2
+    memo.digest(("k", 2), doc)
+    memo.digest(("k", 1), doc)
+    assert calls == 4
@@ -0,0 +1,286 @@
+"""Tests for the shared request budgets in :mod:`stockripper.data.rate_limit`."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from alpaca.common.exceptions import APIError
+
+from stockripper.data.market_data import MarketDataAdapter
+from stockripper.data.rate_limit import (
+    Priority,
+    PriorityTokenBucket,
+    SlidingWindowLimiter,
+    is_rate_limited,
+    retry_after,
+)
+from stockripper.integrations.alpaca._sdk_retry import without_sdk_retry
+from tests.fixtures_alpaca import QuotaExhaustingClient, rate_limited_error
+
+
+def _wait_until(predicate: Any, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def test_execution_jumps_the_background_queue() -> None:
+    limiter = PriorityTokenBucket(240, burst=1, reserve=0)
+    limiter.acquire(Priority.BACKGROUND)  # drain the bucket
+    order: list[str] = []
+
+    def take(priority: Priority, name: str) -> None:
+        limiter.acquire(priority)
+        order.append(name)
+
+    threads = [
+        threading.Thread(target=take, args=(Priority.BACKGROUND, f"bg{i}")) for i in range(2)
+    ]
+    for t in threads:
+        t.start()
+    _wait_until(lambda: limiter.metrics().by_priority[Priority.BACKGROUND].queued == 2)
+    quote = threading.Thread(target=take, args=(Priority.EXECUTION, "quote"))
+    quote.start()
+    for t in [*threads, quote]:
+        t.join(timeout=5)
+
+    assert order == ["quote", "bg0", "bg1"]
+    metrics = limiter.metrics().by_priority
+    assert metrics[Priority.BACKGROUND].max_queued == 2
+    assert metrics[Priority.BACKGROUND].granted == 3
+    assert metrics[Priority.EXECUTION].granted == 1
+    assert all(m.queued == 0 for m in metrics.values())
+
+
+def test_reserve_is_left_for_execution() -> None:
+    limiter = PriorityTokenBucket(6, burst=3, reserve=2)
+    assert limiter.acquire(Priority.BACKGROUND) < 0.05
+    # Background may not touch the last two tokens; quotes still go at once.
+    assert limiter.acquire(Priority.EXECUTION) < 0.05
+    assert limiter.acquire(Priority.EXECUTION) < 0.05
+    assert limiter.metrics().tokens < 1
+
+
+async def test_cancelled_async_waiter_does_not_spend_a_token() -> None:
+    limiter = PriorityTokenBucket(60, burst=1, reserve=0)
+    limiter.acquire(Priority.BACKGROUND)  # drain the bucket
+    waiter = asyncio.create_task(limiter.acquire_async(Priority.BACKGROUND))
+    await asyncio.sleep(0.05)
+    assert limiter.metrics().by_priority[Priority.BACKGROUND].queued == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    metrics = limiter.metrics()
+    assert metrics.by_priority[Priority.BACKGROUND].queued == 0
+    assert metrics.by_priority[Priority.BACKGROUND].granted == 1
+    assert metrics.tokens > 0  # refilling from the drain, not from a cancelled grant
+
+
+async def test_async_waiters_share_the_priority_queue() -> None:
+    limiter = PriorityTokenBucket(240, burst=1, reserve=0)
+    limiter.acquire(Priority.BACKGROUND)
+    order: list[str] = []
+
+    async def take(priority: Priority, name: str) -> None:
+        await limiter.acquire_async(priority)
+        order.append(name)
+
+    background = asyncio.create_task(take(Priority.BACKGROUND, "bg"))
+    await asyncio.sleep(0.01)
+    quote = asyncio.create_task(take(Priority.EXECUTION, "quote"))
+    await asyncio.wait_for(asyncio.gather(background, quote), 5)
+
+    assert order == ["quote", "bg"]
+
+
+def test_metrics_report_no_tokens_during_a_pause() -> None:
+    limiter = PriorityTokenBucket(60, burst=5, reserve=0)
+    limiter.throttle(attempt=3)
+
+    metrics = limiter.metrics()
+    assert metrics.tokens == 0
+    assert metrics.paused_for > 0
+
+
+def test_rejects_reserve_that_would_starve_other_classes() -> None:
+    with pytest.raises(ValueError):
+        PriorityTokenBucket(60, burst=2, reserve=2)
+
+
+def test_rate_limit_detection_and_server_hints() -> None:
+    assert is_rate_limited(rate_limited_error())
+    assert not is_rate_limited(ValueError("boom"))
+    assert retry_after(rate_limited_error(1.5)) == pytest.approx(1.5)
+    assert retry_after(rate_limited_error()) is None
+    reset = SimpleNamespace(response=SimpleNamespace(headers={"X-RateLimit-Reset": "1000"}))
+    assert retry_after(reset, now=998.0) == pytest.approx(2.0)  # type: ignore[arg-type]
+
+
+def test_call_gives_up_on_other_errors_immediately() -> None:
+    limiter = PriorityTokenBucket(6000, burst=5, reserve=0)
+    calls = 0
+
+    def boom() -> None:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("not a 429")
+
+    with pytest.raises(RuntimeError):
+        limiter.call(boom)
+    assert calls == 1
+    assert limiter.metrics().throttled == 0
+
+
+def test_simulated_quota_exhaustion_without_a_limiter_surfaces_429() -> None:
+    server = QuotaExhaustingClient(quota=3, window=60.0)
+    adapter = MarketDataAdapter(client=server)
+    with pytest.raises(APIError) as info:
+        adapter.get_snapshots([f"S{i}" for i in range(5)], chunk_size=1)
+    assert info.value.status_code == 429
+    assert (server.served, server.rejected) == (3, 1)
+
+
+def test_limiter_backs_off_on_429_and_completes_the_build() -> None:
+    # The limiter is (mis)configured above the server's quota: the server
+    # pushes back and every caller pauses until its window frees up.
+    server = QuotaExhaustingClient(quota=4, window=0.4)
+    limiter = PriorityTokenBucket(6000, burst=10, reserve=0, max_retries=5)
+    adapter = MarketDataAdapter(client=server, limiter=limiter, priority=Priority.BACKGROUND)
+
+    out = adapter.get_snapshots([f"S{i}" for i in range(10)], chunk_size=1)
+    quote = adapter.get_latest_quote("S0")
+
+    assert len(out) == 10
+    assert quote.ask_price > quote.bid_price
+    metrics = limiter.metrics()
+    assert metrics.throttled == server.rejected >= 1
+    assert metrics.by_priority[Priority.BACKGROUND].granted == 10 + server.rejected
+    assert metrics.by_priority[Priority.EXECUTION].granted == 1
+    assert server.served == 11
+
+
+def test_sdk_retry_is_zeroed_only_where_the_patch_was_verified(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    from alpaca.data.historical.stock import StockHistoricalDataClient
+
+    client = without_sdk_retry(StockHistoricalDataClient(api_key="k", secret_key="s"))
+    assert client._retry == 0
+
+    reshaped = SimpleNamespace(retry_policy="sdk-owned")
+    assert without_sdk_retry(reshaped) is reshaped
+    assert vars(reshaped) == {"retry_policy": "sdk-owned"}
+    assert "leaving the SDK's 429 retry on" in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# SlidingWindowLimiter
+# ---------------------------------------------------------------------------
+_WORKER = """
+import sys, time
+from stockripper.data.rate_limit import SlidingWindowLimiter
+limiter = SlidingWindowLimiter(3, 0.2, path=sys.argv[1])
+for _ in range(4):
+    # Record the send time claimed in the ring; when the process actually
+    # wakes is up to the scheduler.
+    wait = limiter.reserve()
+    print(limiter._slots[limiter._head - 1], flush=True)
+    time.sleep(wait)
+"""
+
+
+def _max_in_window(times: list[float], window: float) -> int:
+    times = sorted(times)
+    return max(
+        sum(1 for t in times[i:] if t - start < window - 0.005)
+        for i, start in enumerate(times)
+    )
+
+
+def test_window_is_shared_by_processes(tmp_path: Path) -> None:
+    path = tmp_path / "sec.ratelimit"
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", _WORKER, str(path)], stdout=subprocess.PIPE, text=True,
+        )
+        for _ in range(3)
+    ]
+    sends = [float(line) for p in procs for line in p.communicate(timeout=30)[0].split()]
+    assert all(p.returncode == 0 for p in procs)
+
+    assert len(sends) == 12
+    # Alone, each process would send 3 at once; together they share 3 per 0.2s.
+    assert _max_in_window(sends, 0.2) <= 3
+    assert max(sends) - min(sends) >= 0.2 * 3
+
+
+def test_window_reservations_pace_sync_and_async_callers(tmp_path: Path) -> None:
+    limiter = SlidingWindowLimiter(2, 0.2, path=tmp_path / "shared.ratelimit")
+    sends: list[float] = []
+
+    async def async_caller() -> None:
+        for _ in range(2):
+            await limiter.acquire_async()
+            sends.append(time.time())
+
+    def sync_caller() -> None:
+        for _ in range(2):
+            limiter.acquire()
+            sends.append(time.time())
+
+    thread = threading.Thread(target=sync_caller)
+    thread.start()
+    asyncio.run(async_caller())
+    thread.join(timeout=5)
+
+    assert len(sends) == 4
+    assert _max_in_window(sends, 0.2) <= 2
+    # A second instance on the same file sees the reservations already made.
+    assert SlidingWindowLimiter(2, 0.2, path=tmp_path / "shared.ratelimit").reserve() > 0
+
+
+def test_async_reservation_leaves_the_event_loop_thread(tmp_path: Path) -> None:
+    limiter = SlidingWindowLimiter(2, 0.2, path=tmp_path / "w.ratelimit")
+    threads: list[threading.Thread] = []
+    reserve = limiter.reserve
+
+    def recording_reserve() -> float:
+        threads.append(threading.current_thread())
+        return reserve()
+
+    limiter.reserve = recording_reserve  # type: ignore[method-assign]
+    asyncio.run(limiter.acquire_async())
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_window_file_for_another_size_is_reset(tmp_path: Path) -> None:
+    path = tmp_path / "w.ratelimit"
+    SlidingWindowLimiter(5, 60.0, path=path).acquire()
+    fresh = SlidingWindowLimiter(1, 60.0, path=path)
+    assert fresh.reserve() == 0.0
+    assert fresh.reserve() == pytest.approx(60.0, abs=0.5)
+
+
+def test_window_from_rate_spaces_calls_evenly() -> None:
+    limiter = SlidingWindowLimiter.from_rate(50)
+
+    async def burst() -> None:
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(11)))
+
+    started = time.monotonic()
+    asyncio.run(burst())
+    # burst=1: the first call is free, the next ten are 20 ms apart.
+    assert time.monotonic() - started >= 0.19
+    with pytest.raises(ValueError):
+        SlidingWindowLimiter.from_rate(0)
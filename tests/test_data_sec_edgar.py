@@ -10,12 +10,16 @@ from typing import Any
 import httpx
 import pytest
 
-from stockripper.data.cache import JsonFileCache
+from stockripper.data import provenance, sec_edgar
+from stockripper.data.cache import CacheBackend, JsonFileCache, MemoryCacheTier, SqliteCache
+from stockripper.data.cache_maintenance import sweep
+from stockripper.data.facts_stream import FactSelection
+from stockripper.data.rate_limit import SlidingWindowLimiter
 from stockripper.data.sec_edgar import (
     SecEdgarClient,
     SecEdgarConfigError,
-    _ProcessRateLimiter,
-    _resolve_user_agent,
+    edgar_rate_limiter,
+    resolve_user_agent,
 )
 
 
@@ -38,7 +42,7 @@ def _mock_transport(routes: dict[str, dict[str, Any]]) -> httpx.MockTransport:
     return httpx.MockTransport(handler)
 
 
-def _client(transport: httpx.MockTransport, cache: JsonFileCache) -> SecEdgarClient:
+def _client(transport: httpx.MockTransport, cache: CacheBackend) -> SecEdgarClient:
     http = httpx.Client(
         transport=transport,
         headers={"User-Agent": "StockRipper test ops@example.com"},
@@ -50,13 +54,28 @@ def _client(transport: httpx.MockTransport, cache: JsonFileCache) -> SecEdgarCli
 def test_user_agent_requires_email(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("SEC_EDGAR_USER_AGENT", "StockRipper paper-bot")
     with pytest.raises(SecEdgarConfigError):
-        _resolve_user_agent()
+        resolve_user_agent()
 
 
 def test_user_agent_required(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv("SEC_EDGAR_USER_AGENT", raising=False)
     with pytest.raises(SecEdgarConfigError):
-        _resolve_user_agent()
+        resolve_user_agent()
+
+
+def test_rate_window_file_is_opened_on_first_request(
+    cache: JsonFileCache, tmp_path: Any, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    path = tmp_path / "sec.ratelimit"
+    monkeypatch.setenv("SEC_EDGAR_RATE_FILE", str(path))
+    client = _client(_mock_transport({}), cache)
+    try:
+        assert sec_edgar._RATE_LIMITER is None and not path.exists()
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_submissions("320193")
+        assert edgar_rate_limiter().path == path and path.exists()
+    finally:
+        client.close()
 
 
 def test_lookup_cik_returns_padded_value(cache: JsonFileCache) -> None:
@@ -77,6 +96,36 @@ def test_lookup_cik_returns_padded_value(cache: JsonFileCache) -> None:
         client.close()
 
 
+def test_lookup_ciks_uses_one_index_until_the_map_expires(cache: JsonFileCache) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(
+            200,
+            json={
+                "0": {"cik_str": 320193, "ticker": "AAPL", "title": "APPLE INC"},
+                "1": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+                "2": {"cik_str": 1, "ticker": "AAPL", "title": "DUPLICATE"},
+            },
+        )
+
+    client = _client(httpx.MockTransport(handler), cache)
+    try:
+        assert client.lookup_ciks(["aapl", "MSFT", "nope"]) == {
+            "AAPL": "0000320193",
+            "MSFT": "0000789019",
+            "NOPE": None,
+        }
+        # Drop the cached map: the in-memory index must keep serving.
+        cache.delete("sec_edgar", "company_tickers")
+        assert client.lookup_cik("msft") == "0000789019"
+        assert calls == 1
+    finally:
+        client.close()
+
+
 def test_get_company_facts_round_trips_and_caches(cache: JsonFileCache) -> None:
     url = "https://data.sec.gov/api/xbrl/companyfacts/CIK0000320193.json"
     routes = {
@@ -158,7 +207,7 @@ def test_retries_on_429_then_succeeds(
 
 
 def test_process_rate_limiter_blocks_when_full() -> None:
-    limiter = _ProcessRateLimiter(max_rps=2, window=0.2)
+    limiter = SlidingWindowLimiter(2, 0.2)
     # Burn the budget — first 2 are immediate, 3rd must wait roughly window.
     limiter.acquire()
     limiter.acquire()
@@ -170,7 +219,7 @@ def test_process_rate_limiter_blocks_when_full() -> None:
 
 def test_process_rate_limiter_is_thread_safe() -> None:
     # Hammer the limiter from N threads and ensure no double-count.
-    limiter = _ProcessRateLimiter(max_rps=5, window=0.5)
+    limiter = SlidingWindowLimiter(5, 0.5)
     barrier = threading.Barrier(10)
 
     def worker() -> None:
@@ -183,3 +232,243 @@ def test_process_rate_limiter_is_thread_safe() -> None:
     for t in threads:
         t.join(timeout=3.0)
         assert not t.is_alive()
+
+
+def test_concurrent_misses_share_one_fetch(cache: JsonFileCache) -> None:
+    calls = 0
+    calls_lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        with calls_lock:
+            calls += 1
+        time.sleep(0.1)
+        return httpx.Response(200, json={"entityName": "Apple Inc.", "facts": {}})
+
+    client = _client(httpx.MockTransport(handler), cache)
+    barrier = threading.Barrier(8)
+    names: list[str | None] = []
+
+    def worker() -> None:
+        barrier.wait()
+        names.append(client.get_company_facts("320193").entity_name)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == 1
+    assert names == ["Apple Inc."] * 8
+
+
+def test_stale_grace_serves_expired_facts_and_tags_provenance(cache: JsonFileCache) -> None:
+    cache.put(
+        "sec_edgar",
+        "company_facts_0000320193",
+        {"entityName": "Old Name", "facts": {}},
+        ttl=dt.timedelta(seconds=-5),
+    )
+    url = "https://data.sec.gov/api/xbrl/companyfacts/CIK0000320193.json"
+    transport = _mock_transport({url: {"json": {"entityName": "Apple Inc.", "facts": {}}}})
+    http = httpx.Client(transport=transport, timeout=5.0)
+    client = SecEdgarClient(
+        http=http,
+        cache=cache,
+        user_agent="StockRipper test ops@example.com",
+        stale_grace=dt.timedelta(hours=1),
+    )
+
+    stale = client.get_company_facts("320193")
+    assert stale.entity_name == "Old Name"
+    assert stale.provenance.data_quality_warnings == ("served_stale",)
+
+    for _ in range(200):
+        fresh = client.get_company_facts("320193")
+        if fresh.entity_name == "Apple Inc.":
+            break
+        time.sleep(0.01)
+    assert fresh.entity_name == "Apple Inc."
+    assert fresh.provenance.data_quality_warnings == ()
+
+
+def test_selected_company_facts_reuse_a_cached_full_document(cache: JsonFileCache) -> None:
+    document: dict[str, Any] = {
+        "entityName": "Apple Inc.",
+        "facts": {
+            "dei": {"EntityCommonStockSharesOutstanding": {"units": {"shares": []}}},
+            "us-gaap": {"AccountsPayableCurrent": {"units": {"USD": []}}},
+        },
+    }
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json=document)
+
+    selection = FactSelection(tags={"dei": ("EntityCommonStockSharesOutstanding",)})
+    client = _client(httpx.MockTransport(handler), cache)
+    try:
+        client.get_company_facts("320193")
+        assert calls == 1
+        slim = client.get_company_facts("320193", select=selection)
+        assert calls == 1
+        assert slim.facts == {"dei": document["facts"]["dei"]}
+        assert slim.provenance.request_key == f"company_facts_0000320193@{selection.digest}"
+
+        cache.delete("sec_edgar", "company_facts_0000320193")
+        again = client.get_company_facts("320193", select=selection)
+        assert calls == 1  # the slim payload has its own cache entry
+        assert again.facts == slim.facts
+
+        cache.delete("sec_edgar", again.provenance.request_key or "")
+        client.get_company_facts("320193", select=selection)
+        assert calls == 2
+    finally:
+        client.close()
+
+
+class _RevalidatingEdgar:
+    """Stub EDGAR honouring conditional GETs; counts full vs 304 responses."""
+
+    def __init__(self, document: dict[str, Any], *, etag: bool = True) -> None:
+        self.document = document
+        self.version = 1
+        self.etag = etag
+        self.full = 0
+        self.revalidated = 0
+        self.body_bytes = 0
+
+    def publish(self, document: dict[str, Any]) -> None:
+        self.document = document
+        self.version += 1
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        etag = f'"v{self.version}"'
+        last_modified = f"Tue, {25 + self.version} May 2026 10:00:00 GMT"
+        if self.etag:
+            unchanged = request.headers.get("If-None-Match") == etag
+            validators = {"ETag": etag}
+        else:
+            unchanged = request.headers.get("If-Modified-Since") == last_modified
+            validators = {"Last-Modified": last_modified}
+        if unchanged:
+            self.revalidated += 1
+            return httpx.Response(304, headers=validators)
+        self.full += 1
+        response = httpx.Response(200, json=self.document, headers=validators)
+        self.body_bytes += len(response.content)
+        return response
+
+
+@pytest.mark.parametrize("etag", [True, False], ids=["etag", "last-modified"])
+def test_expired_documents_are_revalidated_not_redownloaded(
+    cache: JsonFileCache, etag: bool,
+) -> None:
+    facts: dict[str, Any] = {"entityName": "Apple Inc.", "facts": {"dei": {"x": [1] * 2000}}}
+    server = _RevalidatingEdgar(facts, etag=etag)
+    client = _client(httpx.MockTransport(server.handler), cache)
+    key = "company_facts_0000320193"
+    try:
+        first = client.get_company_facts("320193")
+        full_bytes = server.body_bytes
+        for _ in range(5):  # five days in which the filing did not change
+            cache.touch("sec_edgar", key, ttl=dt.timedelta(seconds=-1))
+            again = client.get_company_facts("320193")
+            assert again.provenance.content_hash == first.provenance.content_hash
+        assert (server.full, server.revalidated) == (1, 5)
+        assert server.body_bytes == full_bytes
+
+        # The 304 made the entry live again: no request until it expires.
+        client.get_company_facts("320193")
+        assert server.full + server.revalidated == 6
+
+        server.publish({"entityName": "Apple Inc.", "facts": {}})
+        cache.touch("sec_edgar", key, ttl=dt.timedelta(seconds=-1))
+        assert client.get_company_facts("320193").facts == {}
+        assert (server.full, server.revalidated) == (2, 5)
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_swept_documents_can_still_be_revalidated(tmp_path: Any, backend: str) -> None:
+    cache = (
+        JsonFileCache(tmp_path / "cache") if backend == "json"
+        else SqliteCache(tmp_path / "cache.sqlite3")
+    )
+    server = _RevalidatingEdgar({"name": "Apple Inc.", "filings": {}})
+    client = _client(httpx.MockTransport(server.handler), cache)
+    try:
+        client.get_submissions("320193")
+        cache.touch("sec_edgar", "submissions_0000320193", ttl=-dt.timedelta(days=1))
+        cache.put("sec_edgar", "no_validators", {"x": 1}, ttl=-dt.timedelta(days=1))
+
+        assert sweep(cache).expired == 1
+        assert client.get_submissions("320193").entity_name == "Apple Inc."
+        assert (server.full, server.revalidated) == (1, 1)
+
+        # Past the horizon the entry goes, and the next read is a full fetch.
+        cache.touch("sec_edgar", "submissions_0000320193", ttl=-dt.timedelta(days=31))
+        assert sweep(cache).expired == 1
+        client.get_submissions("320193")
+        assert (server.full, server.revalidated) == (2, 1)
+    finally:
+        client.close()
+
+
+def test_selected_facts_inherit_the_full_documents_validators(cache: JsonFileCache) -> None:
+    document = {"entityName": "Apple Inc.", "facts": {"dei": {"x": [1]}, "us-gaap": {"y": [2]}}}
+    server = _RevalidatingEdgar(document)
+    selection = FactSelection(tags={"dei": ("x",)})
+    client = _client(httpx.MockTransport(server.handler), cache)
+    try:
+        client.get_company_facts("320193")
+        slim = client.get_company_facts("320193", select=selection)
+        assert (server.full, server.revalidated) == (1, 0)
+
+        cache.delete("sec_edgar", "company_facts_0000320193")
+        key = slim.provenance.request_key or ""
+        cache.touch("sec_edgar", key, ttl=dt.timedelta(seconds=-1))
+        assert client.get_company_facts("320193", select=selection).facts == slim.facts
+        assert (server.full, server.revalidated) == (1, 1)
+    finally:
+        client.close()
+
+
+def test_entries_without_validators_are_fetched_in_full(cache: JsonFileCache) -> None:
+    server = _RevalidatingEdgar({"name": "Apple Inc.", "filings": {}})
+    cache.put(
+        "sec_edgar", "submissions_0000320193", {"name": "Old"}, ttl=dt.timedelta(seconds=-1),
+    )
+    client = _client(httpx.MockTransport(server.handler), cache)
+    try:
+        assert client.get_submissions("320193").entity_name == "Apple Inc."
+        assert (server.full, server.revalidated) == (1, 0)
+        entry = cache.get("sec_edgar", "submissions_0000320193")
+        assert entry is not None and entry.validators == {"etag": '"v1"'}
+    finally:
+        client.close()
+
+
+def test_memory_tier_re_serves_are_hashed_once(
+    tmp_path: Any, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    url = "https://data.sec.gov/api/xbrl/companyfacts/CIK0000320193.json"
+    routes = {url: {"json": {"entityName": "Apple Inc.", "facts": {"dei": {"x": {}}}}}}
+    hashed: list[object] = []
+    canonical_hash = provenance.canonical_hash
+
+    def counting(payload: object) -> str:
+        hashed.append(payload)
+        return canonical_hash(payload)
+
+    monkeypatch.setattr(provenance, "canonical_hash", counting)
+    client = _client(_mock_transport(routes), MemoryCacheTier(SqliteCache(tmp_path / "c.sqlite3")))
+    try:
+        digests = {client.get_company_facts("320193").provenance.content_hash for _ in range(3)}
+    finally:
+        client.close()
+    assert len(digests) == 1
+    assert len(hashed) == 1
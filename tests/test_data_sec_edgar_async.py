@@ -0,0 +1,179 @@
+"""Tests for :mod:`stockripper.data.sec_edgar_async` against a stub transport."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from stockripper.data.cache import JsonFileCache
+from stockripper.data.rate_limit import SlidingWindowLimiter
+from stockripper.data.sec_edgar_async import AsyncSecEdgarClient
+
+_FACTS_RE = re.compile(r"/api/xbrl/companyfacts/CIK(\d{10})\.json$")
+
+
+class _StubEdgar:
+    """Async stub SEC server: counts requests and tracks peak concurrency.
+
+    Company facts carry a per-CIK ``ETag`` and a matching ``If-None-Match``
+    gets an empty ``304``.
+    """
+
+    def __init__(self, *, fail: frozenset[str] = frozenset(), delay: float = 0.01) -> None:
+        self.fail = fail
+        self.delay = delay
+        self.requests: list[float] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.revalidated = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(time.monotonic())
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if request.url.path.endswith("company_tickers.json"):
+            return httpx.Response(
+                200, json={"0": {"cik_str": 320193, "ticker": "AAPL", "title": "APPLE INC"}},
+            )
+        match = _FACTS_RE.search(request.url.path)
+        if match is None:
+            return httpx.Response(404, json={})
+        cik = match.group(1)
+        if cik in self.fail:
+            return httpx.Response(404, json={})
+        etag = f'"{cik}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.revalidated += 1
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200, json={"entityName": f"Entity {cik}", "facts": {}}, headers={"ETag": etag},
+        )
+
+
+def _client(
+    stub: _StubEdgar,
+    tmp_path: Path,
+    *,
+    rate: float = 1000.0,
+    concurrency: int = 8,
+    stale_grace: dt.timedelta | None = None,
+    cache: JsonFileCache | None = None,
+) -> AsyncSecEdgarClient:
+    return AsyncSecEdgarClient(
+        cache=cache if cache is not None else JsonFileCache(tmp_path / "cache"),
+        http=httpx.AsyncClient(transport=httpx.MockTransport(stub.handler)),
+        user_agent="StockRipper test ops@example.com",
+        max_retries=0,
+        max_concurrency=concurrency,
+        limiter=SlidingWindowLimiter.from_rate(rate),
+        stale_grace=stale_grace,
+    )
+
+
+async def test_company_facts_many_runs_concurrently_and_caches(tmp_path: Path) -> None:
+    stub = _StubEdgar()
+    ciks = [str(1000 + i) for i in range(40)]
+    async with _client(stub, tmp_path) as client:
+        facts = await client.get_company_facts_many(ciks)
+        assert len(facts) == 40
+        assert facts["0000001000"].entity_name == "Entity 0000001000"
+        assert 1 < stub.peak <= 8
+
+        again = await client.get_company_facts_many(ciks)
+        assert len(stub.requests) == 40
+        assert again["0000001039"].provenance.content_hash == (
+            facts["0000001039"].provenance.content_hash
+        )
+
+
+async def test_many_respects_the_rate_limit(tmp_path: Path) -> None:
+    stub = _StubEdgar(delay=0.0)
+    async with _client(stub, tmp_path, rate=100) as client:
+        await client.get_company_facts_many([str(i + 1) for i in range(21)])
+    # 21 requests at 100 rps with burst=1 cannot finish faster than 200 ms.
+    assert stub.requests[-1] - stub.requests[0] >= 0.19
+
+
+async def test_many_skips_failed_ciks(tmp_path: Path) -> None:
+    stub = _StubEdgar(fail=frozenset({"0000000002"}))
+    async with _client(stub, tmp_path) as client:
+        facts = await client.get_company_facts_many(["1", "2", "3"])
+    assert sorted(facts) == ["0000000001", "0000000003"]
+
+
+async def test_concurrent_lookups_share_one_ticker_map_fetch(tmp_path: Path) -> None:
+    stub = _StubEdgar()
+    async with _client(stub, tmp_path) as client:
+        ciks = await asyncio.gather(*(client.lookup_cik("aapl") for _ in range(5)))
+        assert ciks == ["0000320193"] * 5
+        assert await client.lookup_ciks(["AAPL", "ZZZZ"]) == {"AAPL": "0000320193", "ZZZZ": None}
+    assert len(stub.requests) == 1
+
+
+async def test_expired_facts_are_revalidated_in_bulk(tmp_path: Path) -> None:
+    stub = _StubEdgar()
+    ciks = [str(i + 1) for i in range(10)]
+    cache = JsonFileCache(tmp_path / "cache")  # the client's cache directory
+    async with _client(stub, tmp_path) as client:
+        first = await client.get_company_facts_many(ciks)
+        for cik in first:
+            cache.touch("sec_edgar", f"company_facts_{cik}", ttl=dt.timedelta(seconds=-1))
+        again = await client.get_company_facts_many(ciks)
+    assert len(stub.requests) == 20
+    assert stub.revalidated == 10
+    assert {c: f.entity_name for c, f in again.items()} == {
+        c: f.entity_name for c, f in first.items()
+    }
+
+
+async def test_stale_facts_are_served_while_revalidating(tmp_path: Path) -> None:
+    stub = _StubEdgar()
+    cache = JsonFileCache(tmp_path / "cache")
+    async with _client(stub, tmp_path, stale_grace=dt.timedelta(hours=1)) as client:
+        first = await client.get_company_facts("1")
+        assert first.provenance.data_quality_warnings == ()
+        cache.touch("sec_edgar", "company_facts_0000000001", ttl=dt.timedelta(seconds=-1))
+
+        stale = await client.get_company_facts("1")
+        assert stale.provenance.data_quality_warnings == ("served_stale",)
+        assert stale.entity_name == first.entity_name
+    # Closing the client waits for the background revalidation.
+    assert (len(stub.requests), stub.revalidated) == (2, 1)
+    entry = cache.get("sec_edgar", "company_facts_0000000001")
+    assert entry is not None and not entry.is_expired()
+
+
+class _ThreadRecordingCache(JsonFileCache):
+    def __init__(self, root: Path) -> None:
+        super().__init__(root)
+        self.threads: list[threading.Thread] = []
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        self.threads.append(threading.current_thread())
+        return super().get(*args, **kwargs)
+
+    def put(self, *args: Any, **kwargs: Any) -> Any:
+        self.threads.append(threading.current_thread())
+        return super().put(*args, **kwargs)
+
+
+async def test_cache_access_stays_off_the_event_loop(tmp_path: Path) -> None:
+    cache = _ThreadRecordingCache(tmp_path / "cache")
+    async with _client(_StubEdgar(), tmp_path, cache=cache) as client:
+        await client.get_company_facts("320193")
+        await client.get_company_facts("320193")
+        assert await client.lookup_cik("aapl") == "0000320193"
+
+    assert len(cache.threads) >= 4
+    assert threading.current_thread() not in cache.threads
@@ -0,0 +1,101 @@
+"""Tests for :mod:`stockripper.data.singleflight`."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
+
+from stockripper.data.singleflight import SingleFlight
+
+
+def _run_threads(n: int, target: Callable[[], None]) -> None:
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_threads_share_one_call() -> None:
+    flight = SingleFlight()
+    calls = 0
+    barrier = threading.Barrier(6)
+    results: list[int] = []
+
+    def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.1)
+        return 42
+
+    def worker() -> None:
+        barrier.wait()
+        results.append(flight.do(("sec_edgar", "company_tickers"), fetch))
+
+    _run_threads(6, worker)
+    assert calls == 1
+    assert results == [42] * 6
+    assert flight.coalesced == 5
+
+
+def test_errors_propagate_to_every_waiter_and_key_is_released() -> None:
+    flight = SingleFlight()
+    barrier = threading.Barrier(4)
+    errors: list[BaseException] = []
+
+    def fetch() -> int:
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    def worker() -> None:
+        barrier.wait()
+        try:
+            flight.do("k", fetch)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    _run_threads(4, worker)
+    assert len(errors) == 4
+    assert flight.do("k", lambda: 7) == 7
+
+
+def test_distinct_keys_do_not_coalesce() -> None:
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.coalesced == 0
+
+
+async def test_concurrent_coroutines_share_one_task() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "facts"
+
+    results = await asyncio.gather(*(flight.do_async("k", fetch) for _ in range(5)))
+    assert results == ["facts"] * 5
+    assert calls == 1
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_fetch() -> None:
+    flight = SingleFlight()
+
+    async def fetch() -> str:
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    first = asyncio.create_task(flight.do_async("k", fetch))
+    second = asyncio.create_task(flight.do_async("k", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == "ok"
@@ -6,6 +6,7 @@ corpus + in-memory snapshot provider so the test is fully offline.
 
 from __future__ import annotations
 
+import dataclasses
 import datetime as dt
 import random
 from collections.abc import Iterable, Mapping
@@ -165,6 +166,50 @@ def test_conservative_never_returns_hidden_gem(builder: UniverseBuilder) -> None
     assert all(c.bucket == "core" for c in result.candidates)
 
 
+@pytest.mark.parametrize("columnar", [False, True])
+def test_inverse_etfs_otc_and_adrs_follow_the_policy(columnar: bool) -> None:
+    liquid = AssetSnapshot(
+        symbol="",
+        last_price=Decimal("50"),
+        adv_usd_20d=Decimal("500000000"),
+        market_cap_usd=Decimal("500000000000"),
+        recent_8k_within_days=None,
+        recent_news_count_30d=20,
+    )
+    base = AssetRecord(
+        symbol="", name="", exchange="NYSE", tradable=True, shortable=True, fractionable=True,
+    )
+    assets = (
+        dataclasses.replace(base, symbol="PLAIN"),
+        dataclasses.replace(base, symbol="SH", is_etf=True, is_inverse_etf=True),
+        dataclasses.replace(base, symbol="OTCCO", exchange="OTC", is_otc=True),
+        dataclasses.replace(base, symbol="ADRCO", is_adr=True),
+    )
+    snaps = {a.symbol: dataclasses.replace(liquid, symbol=a.symbol) for a in assets}
+    policies = {
+        **DEFAULT_UNIVERSE_POLICIES,
+        "no_adr": DEFAULT_UNIVERSE_POLICIES["conservative"].model_copy(
+            update={"adr_allowed": False},
+        ),
+    }
+    builder = UniverseBuilder(
+        assets_loader=lambda: assets,
+        snapshot_provider=_InMemorySnapshotProvider(snaps),
+        policies=policies,
+        columnar=columnar,
+    )
+
+    def admitted(track: str) -> set[str]:
+        return {c.symbol for c in builder.build(_request(track)).candidates}
+
+    conservative = builder.build(_request("conservative"))
+    assert {c.symbol for c in conservative.candidates} == {"PLAIN", "ADRCO"}
+    assert conservative.diagnostics["rejected_instrument"] == 2
+    assert admitted("no_adr") == {"PLAIN"}
+    assert admitted("aggressive") == {"PLAIN", "SH", "ADRCO"}  # inverse = leveraged ETF
+    assert admitted("yolo") == {"PLAIN", "SH", "OTCCO", "ADRCO"}
+
+
 def test_unknown_track_raises_key_error(builder: UniverseBuilder) -> None:
     with pytest.raises(KeyError):
         builder.build(_request("not_a_real_track"))
@@ -183,3 +228,141 @@ def test_default_universe_policies_cover_all_phase1_tracks() -> None:
         assert spec.track_id in DEFAULT_UNIVERSE_POLICIES, (
             f"track {spec.track_id} is missing a universe policy"
         )
+
+
+class _CountingSnapshotProvider(_InMemorySnapshotProvider):
+    def __init__(self, snapshots: Mapping[str, AssetSnapshot]) -> None:
+        super().__init__(snapshots)
+        self.calls: list[dt.date] = []
+
+    def get_snapshots(
+        self, symbols: Iterable[str], *, as_of: dt.date,
+    ) -> Mapping[str, AssetSnapshot]:
+        self.calls.append(as_of)
+        return super().get_snapshots(symbols, as_of=as_of)
+
+
+def test_build_many_fetches_snapshot_once_per_as_of() -> None:
+    assets = _synthetic_assets(300)
+    provider = _CountingSnapshotProvider(_synthetic_snapshots(assets))
+    loads: list[int] = []
+
+    def loader() -> tuple[AssetRecord, ...]:
+        loads.append(1)
+        return assets
+
+    builder = UniverseBuilder(assets_loader=loader, snapshot_provider=provider)
+    tracks = tuple(DEFAULT_UNIVERSE_POLICIES)
+    results = builder.build_many(_request(t) for t in tracks)
+    assert len(loads) == 1
+    assert provider.calls == [dt.date(2026, 5, 27)]
+    assert tuple(r.request.track_id for r in results) == tracks
+    for result in results:
+        single = builder.build(result.request)
+        assert result.diagnostics == single.diagnostics
+        assert result.candidates == single.candidates
+
+
+def test_build_many_rejects_unknown_track_before_io() -> None:
+    provider = _CountingSnapshotProvider({})
+    builder = UniverseBuilder(assets_loader=lambda: (), snapshot_provider=provider)
+    with pytest.raises(KeyError):
+        builder.build_many((_request("aggressive"), _request("not_a_real_track")))
+    assert provider.calls == []
+
+
+class _MovingPriceProvider(_CountingSnapshotProvider):
+    """Morning snapshots, then prices and ADV scaled by ``move`` for refreshes."""
+
+    def __init__(self, snapshots: Mapping[str, AssetSnapshot], move: Decimal) -> None:
+        super().__init__(snapshots)
+        self.moved = {
+            symbol: dataclasses.replace(
+                snap,
+                last_price=snap.last_price * move,
+                adv_usd_20d=snap.adv_usd_20d * move,
+                # Refreshes must not take anything but prices from here.
+                recent_news_count_30d=None,
+            )
+            for symbol, snap in snapshots.items()
+        }
+        self.refreshed: list[str] = []
+
+    def refresh_prices(
+        self, symbols: Iterable[str], *, as_of: dt.date,
+    ) -> Mapping[str, AssetSnapshot]:
+        symbols = list(symbols)
+        self.refreshed.extend(symbols)
+        return {s: self.moved[s] for s in symbols}
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_refresh_reprices_only_boundary_symbols(columnar: bool) -> None:
+    assets = _synthetic_assets(300)
+    provider = _MovingPriceProvider(_synthetic_snapshots(assets), Decimal("0.93"))
+    builder = UniverseBuilder(
+        assets_loader=lambda: assets, snapshot_provider=provider, columnar=columnar,
+    )
+    requests = (_request("conservative", limit=500), _request("aggressive", limit=500))
+    morning = builder.build_many(requests)
+
+    refreshed = builder.refresh_many(requests)
+
+    assert provider.calls == [dt.date(2026, 5, 27)]
+    assert 0 < len(provider.refreshed) < len(assets) // 3
+    assert all(r.refetched == len(provider.refreshed) for r in refreshed)
+    # A 7% move cannot carry anything outside the 10% band across a floor,
+    # so the partial refresh admits exactly what a full rebuild would.
+    full = UniverseBuilder(
+        assets_loader=lambda: assets,
+        snapshot_provider=_InMemorySnapshotProvider(provider.moved),
+    ).build_many(requests)
+    for before, refresh, expected in zip(morning, refreshed, full, strict=True):
+        symbols = [c.symbol for c in refresh.result.candidates]
+        assert symbols == [c.symbol for c in expected.candidates]
+        before_symbols = [c.symbol for c in before.candidates]
+        assert refresh.added == ()
+        assert refresh.removed == tuple(s for s in before_symbols if s not in symbols)
+    assert any(r.changed for r in refreshed)
+    # Static fields survive from the morning snapshot.
+    kept = refreshed[1].result.candidates[0].snapshot
+    assert kept.recent_news_count_30d is not None
+
+    # The next refresh diffs against the previous refresh, not the morning.
+    again = builder.refresh_many(requests)
+    assert not any(r.changed for r in again)
+
+
+def test_refresh_without_a_morning_build_builds_in_full() -> None:
+    assets = _synthetic_assets(300)
+    provider = _CountingSnapshotProvider(_synthetic_snapshots(assets))
+    builder = UniverseBuilder(assets_loader=lambda: assets, snapshot_provider=provider)
+
+    (refresh,) = builder.refresh_many((_request("aggressive"),))
+
+    assert provider.calls == [dt.date(2026, 5, 27)]
+    assert refresh.refetched == len(assets)
+    assert refresh.added == tuple(c.symbol for c in refresh.result.candidates)
+    assert refresh.removed == ()
+    # Providers without ``refresh_prices`` are asked for full snapshots.
+    builder.refresh_many((_request("aggressive"),))
+    assert len(provider.calls) == 2
+
+
+def test_builder_keeps_only_the_latest_build_day() -> None:
+    assets = _synthetic_assets(60)
+    provider = _CountingSnapshotProvider(_synthetic_snapshots(assets))
+    builder = UniverseBuilder(assets_loader=lambda: assets, snapshot_provider=provider)
+    days = [dt.date(2026, 5, 27) + dt.timedelta(days=i) for i in range(3)]
+    for day in days:
+        builder.build(dataclasses.replace(_request("aggressive"), as_of=day))
+    builder.build(dataclasses.replace(_request("conservative"), as_of=days[-1]))
+    assert len(provider.calls) == 4
+
+    # The last day refreshes in place, for both tracks; earlier days rebuild.
+    refreshed = builder.refresh_many(
+        dataclasses.replace(_request(t), as_of=days[-1]) for t in ("aggressive", "conservative")
+    )
+    assert all(not r.changed for r in refreshed)
+    (old,) = builder.refresh_many((dataclasses.replace(_request("aggressive"), as_of=days[0]),))
+    assert old.added == tuple(c.symbol for c in old.result.candidates)
@@ -0,0 +1,114 @@
+"""Parity tests: the columnar universe engine must match the per-asset path."""
+
+from __future__ import annotations
+
+import datetime as dt
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from stockripper.data import (
+    DEFAULT_UNIVERSE_POLICIES,
+    AssetRecord,
+    AssetSnapshot,
+    MarketCapBand,
+    UniverseBuilder,
+    UniverseBuildRequest,
+)
+from stockripper.data.universe_columnar import classify_bands
+from tests.test_data_universe import (
+    _InMemorySnapshotProvider,
+    _synthetic_assets,
+    _synthetic_snapshots,
+)
+
+
+def _builders(
+    assets: tuple[AssetRecord, ...], snaps: dict[str, AssetSnapshot],
+) -> tuple[UniverseBuilder, UniverseBuilder]:
+    provider = _InMemorySnapshotProvider(snaps)
+    return (
+        UniverseBuilder(assets_loader=lambda: assets, snapshot_provider=provider),
+        UniverseBuilder(assets_loader=lambda: assets, snapshot_provider=provider, columnar=True),
+    )
+
+
+def _request(track: str, limit: int) -> UniverseBuildRequest:
+    return UniverseBuildRequest(
+        track_id=track,
+        as_of=dt.date(2026, 5, 27),
+        window_id="2026-05-27-open",
+        limit=limit,
+    )
+
+
+@pytest.mark.parametrize("limit", (0, 1, 7, 50, 200, 10_000))
+def test_columnar_matches_per_asset_for_every_policy(limit: int) -> None:
+    assets = _synthetic_assets(300)
+    snaps = _synthetic_snapshots(assets)
+    # Knock out some snapshots so missing_snapshot is exercised too.
+    for asset in assets[::17]:
+        snaps.pop(asset.symbol)
+    python, columnar = _builders(assets, snaps)
+    requests = tuple(_request(t, limit) for t in DEFAULT_UNIVERSE_POLICIES)
+    for expected, actual in zip(
+        python.build_many(requests), columnar.build_many(requests), strict=True,
+    ):
+        assert actual.diagnostics == expected.diagnostics
+        assert actual.rejected_count == expected.rejected_count
+        assert actual.candidates == expected.candidates
+
+
+def test_columnar_resolves_float_ties_with_decimal() -> None:
+    # Both values round to the same float as the floor but only one is >= it.
+    just_below = Decimal("9.99999999999999999999")
+    assert float(just_below) == 10.0
+    assets = tuple(
+        AssetRecord(
+            symbol=s, name=s, exchange="NYSE", tradable=True,
+            shortable=True, fractionable=True,
+        )
+        for s in ("BELOW", "EXACT", "TIEB", "TIEA")
+    )
+
+    def snap(symbol: str, price: Decimal, adv: Decimal) -> AssetSnapshot:
+        return AssetSnapshot(
+            symbol=symbol,
+            last_price=price,
+            adv_usd_20d=adv,
+            market_cap_usd=Decimal("500000000000"),
+            recent_8k_within_days=None,
+            recent_news_count_30d=None,
+        )
+
+    snaps = {
+        "BELOW": snap("BELOW", just_below, Decimal("90000000")),
+        "EXACT": snap("EXACT", Decimal("10"), Decimal("90000000")),
+        # Same int(ADV) -> symbol breaks the tie at the top-k cut.
+        "TIEB": snap("TIEB", Decimal("50"), Decimal("80000000.75")),
+        "TIEA": snap("TIEA", Decimal("50"), Decimal("80000000.25")),
+    }
+    python, columnar = _builders(assets, snaps)
+    for limit in (1, 2, 3):
+        expected = python.build(_request("conservative", limit))
+        actual = columnar.build(_request("conservative", limit))
+        assert actual == expected
+    assert [c.symbol for c in actual.candidates] == ["EXACT", "TIEA", "TIEB"]
+    assert actual.diagnostics["rejected_price_floor"] == 1
+
+
+def test_classify_bands_matches_scalar_classifier() -> None:
+    caps = [
+        -1.0, 0.0, float("nan"), 1.0, 50_000_000.0, 50_000_001.0,
+        300_000_000.0, 2_000_000_000.0, 10_000_000_000.0,
+        200_000_000_000.0, 200_000_000_001.0,
+    ]
+    order = (
+        MarketCapBand.NANO, MarketCapBand.MICRO, MarketCapBand.SMALL,
+        MarketCapBand.MID, MarketCapBand.LARGE, MarketCapBand.MEGA,
+    )
+    codes = classify_bands(np.array(caps))
+    for cap, code in zip(caps, codes, strict=True):
+        expected = None if cap != cap else MarketCapBand.classify(cap)
+        assert (order[code] if code >= 0 else None) == expected
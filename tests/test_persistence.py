@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import datetime as dt
+from pathlib import Path
 
 import pytest
 from sqlalchemy.orm import Session, sessionmaker
@@ -25,8 +26,9 @@ from stockripper.agents.persistence import (
     persist_track_run,
 )
 from stockripper.agents.registry import build_registry
+from stockripper.data.blob_store import BlobStore
 from stockripper.db import Base, Repository, build_engine
-from stockripper.db.models import AgentRun, JudgeDecision, TrackRun
+from stockripper.db.models import AgentRun, JudgeDecision, Recommendation, TrackRun
 from stockripper.tracks import seed_default_tracks
 
 _FROZEN_NOW = dt.datetime(2026, 5, 28, 14, 30, 0, tzinfo=dt.UTC)
@@ -181,3 +183,46 @@ def test_persist_failed_track_marker(session: Session) -> None:
     assert len(rows) == 1
     assert rows[0].status == "failed"
     assert rows[0].interrupt_reason == "boom"
+
+
+async def test_persist_track_run_keeps_raw_outputs_in_blob_store(
+    session: Session, tmp_path: Path,
+) -> None:
+    registry = build_registry()
+    run_id = derive_window_run_id(
+        window_label="opening", trading_day=_FROZEN_NOW.date(),
+        config_hash="cfg", started_at=_FROZEN_NOW,
+    )
+    pid = derive_packet_id(
+        track_id="balanced", window_run_id=run_id, symbol="AAPL",
+    )
+    packet = build_demo_packet(
+        symbol="AAPL", track_id="balanced", window_id="opening",
+        packet_id=pid, now=_FROZEN_NOW,
+    )
+    llm = CannedCouncilLLM(packet=packet, clock=_FROZEN_NOW)
+    result = await run_track(
+        registry=registry, track_id="balanced", packet=packet, llm=llm,
+        window_id="opening", window_run_id=run_id, now=_FROZEN_NOW,
+    )
+
+    repo = Repository(session)
+    repo.create_run(
+        run_id=run_id, window_label="opening", trading_day=_FROZEN_NOW.date(),
+        config_hash="cfg", started_at=_FROZEN_NOW,
+    )
+    blobs = BlobStore(tmp_path / "blobs")
+    persist_track_run(
+        repo, run_id=run_id, result=result, completed_at=_FROZEN_NOW, blobs=blobs,
+    )
+    session.commit()
+
+    decision = session.query(JudgeDecision).filter(JudgeDecision.run_id == run_id).one()
+    assert result.judge_run.raw_response_text
+    assert decision.raw_output_uri is not None
+    assert blobs.read(decision.raw_output_uri, verify=True).decode() == (
+        result.judge_run.raw_response_text
+    )
+    recs = session.query(Recommendation).filter(Recommendation.run_id == run_id).all()
+    assert recs
+    assert all(r.raw_output_uri is not None and blobs.contains(r.raw_output_uri) for r in recs)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import datetime as dt
 from decimal import Decimal
+from pathlib import Path
 
 import pytest
 from sqlalchemy.orm import Session, sessionmaker
@@ -205,3 +206,34 @@ def test_score_rolls_up_multiple_recs_same_agent(session: Session) -> None:
     assert len(scores) == 1
     assert scores[0].reward_score == Decimal("0.020000")
     assert scores[0].observation_count == 2
+
+
+def test_bar_store_price_provider_reads_close_to_close(tmp_path: Path) -> None:
+    from dataclasses import dataclass as _dc
+
+    from stockripper.data.bar_store import BarStore, records_from_raw
+    from stockripper.scoring.reward import BarStorePriceProvider
+
+    @_dc
+    class _Raw:
+        timestamp: dt.datetime
+        open: float
+        high: float
+        low: float
+        close: float
+        volume: int
+
+    start = dt.date(2026, 1, 5)
+    raw = [
+        _Raw(dt.datetime.combine(start + dt.timedelta(days=i), dt.time(5), tzinfo=dt.UTC),
+             0.0, 0.0, 0.0, 100.0 + i, 1)
+        for i in range(0, 10, 2)  # gaps, like weekends
+    ]
+    store = BarStore(tmp_path)
+    store.merge("SPY", records_from_raw(raw))
+    provider = BarStorePriceProvider(store=store)
+    # Entry close 100 (day 0); horizon 5 -> last close on/before day 5 is day 4 (104).
+    ret = provider.get_realized_return(symbol="spy", from_date=start, horizon_days=5)
+    assert ret == Decimal("0.040000")
+    assert provider.get_realized_return(symbol="SPY", from_date=start, horizon_days=30) is None
+    assert provider.get_realized_return(symbol="NOPE", from_date=start, horizon_days=1) is None